@@ -0,0 +1,38 @@
+import com.github.mauricioaniche.ck.Runner; // The CK command line runner
+
+import java.io.BufferedReader; // For reading the jobs from the standard input
+import java.io.FileOutputStream; // For keeping the original standard output
+import java.io.FileDescriptor; // For keeping the original standard output
+import java.io.InputStreamReader; // For reading the jobs from the standard input
+import java.io.PrintStream; // For writing the jobs results to the standard output
+import java.nio.charset.StandardCharsets; // For the standard input and output encoding
+
+/**
+ * Runs CK for many directories in the same JVM, avoiding the JVM startup, classloading and JIT warm-up of every commit.
+ * It is started by the code_metrics.py script with: java -cp CK_JAR_PATH CKBatchRunner.java USE_JARS MAX_FILES_PER_PARTITION VARIABLES_AND_FIELDS
+ * Every line of the standard input is a job in the format "PROJECT_DIRECTORY\tOUTPUT_DIRECTORY" and, for every job, a line in the format
+ * "DONE\tOUTPUT_DIRECTORY" or "ERROR\tOUTPUT_DIRECTORY\tMESSAGE" is written to the standard output.
+ */
+public class CKBatchRunner {
+   public static void main(String[] args) throws Exception {
+      PrintStream results = new PrintStream(new FileOutputStream(FileDescriptor.out), true, "UTF-8"); // The original standard output, used only for the jobs results
+      System.setOut(System.err); // Redirect the CK output to the standard error, so it doesn't mix with the jobs results
+
+      BufferedReader jobs = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8)); // The jobs reader
+      String job; // The current job
+      while ((job = jobs.readLine()) != null) { // Loop through the jobs until the standard input is closed
+         String[] directories = job.split("\t", 2); // Split the project and output directories
+         if (directories.length != 2) { // If the job is malformed
+            results.println("ERROR\t" + job + "\tMalformed job"); // Report the malformed job
+            continue; // Skip the job
+         }
+
+         try { // Try to run CK for the project directory
+            Runner.main(new String[] {directories[0], args[0], args[1], args[2], directories[1], "true"}); // Run CK with the same arguments of the per-commit execution
+            results.println("DONE\t" + directories[1]); // Report the finished job
+         } catch (Throwable e) { // If CK failed for the project directory
+            results.println("ERROR\t" + directories[1] + "\t" + String.valueOf(e.getMessage()).replace('\n', ' ')); // Report the failed job
+         }
+      }
+   }
+}
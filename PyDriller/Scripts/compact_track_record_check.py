@@ -0,0 +1,135 @@
+import csv # For writing the metrics statistics rows
+import gc # For releasing the changes before the memory of the track records is measured
+import io # For writing the outputs in memory
+import os # OS module provides functions for interacting with the operating system
+import random # For generating the metrics of the synthetic track records
+import sys # For importing the metrics_changes.py script from the PyDriller directory
+import tempfile # For writing the metrics evolution files in a temporary directory
+import time # For measuring the time of the writers
+import tracemalloc # For measuring the memory of the track records
+from colorama import Style # Colorama is a Python library for printing colored text and stylizing terminal output.
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # Add the PyDriller directory to the path, so the metrics_changes.py script can be imported
+import metrics_changes # The script whose compact and dictionary track records are compared
+
+# Macros:
+class BackgroundColors: # Colors for the terminal
+	CYAN = "\033[96m" # Cyan
+	GREEN = "\033[92m" # Green
+	YELLOW = "\033[93m" # Yellow
+	RED = "\033[91m" # Red
+	BOLD = "\033[1m" # Bold
+	UNDERLINE = "\033[4m" # Underline
+	CLEAR_TERMINAL = "\033[H\033[J" # Clear the terminal
+
+# Default values that can be changed:
+NUMBER_OF_CHANGES = 3000 # The number of changes of the synthetic track record
+MAXIMUM_SLOWDOWN = 5.0 # The maximum ratio between the time of the writers with the compact track record and with the dictionary track record
+MINIMUM_COMPARED_TIME = 0.05 # The time, in seconds, below which the writers times are not compared, as they are dominated by noise
+MINIMUM_MEMORY_RATIO = 1.5 # The minimum ratio between the memory retained by the dictionary track record and by the compact track record
+
+def generate_changes():
+	"""
+	Generates the synthetic changes of the track records, which are the same in every call.
+
+	:return: The list of tuples (commit id, metrics, lines added, lines deleted, modified files) of the changes
+	"""
+
+	random.seed(0) # Generate the same changes in every call
+	return [(f"{number}-{random.getrandbits(160):040x}", tuple(float(random.randint(0, 50)) for _ in metrics_changes.METRICS_INDEXES), random.randint(0, 100), random.randint(0, 100), ["A.java"] * random.randint(1, 5)) for number in range(1, NUMBER_OF_CHANGES + 1)] # The synthetic changes
+
+def build_track_record(compact, changes):
+	"""
+	Builds a track record of a single identifier with the update functions of the metrics_changes.py script.
+
+	:param compact: If True, then a compact track record is built, otherwise a dictionary track record is built
+	:param changes: The list of tuples (commit id, metrics, lines added, lines deleted, modified files) of the changes
+	:return: The metrics track record dictionary
+	"""
+
+	metrics_changes.COMPACT_METRICS_TRACK_RECORD = compact # Select the track record representation
+	metrics_track_record = {} # The metrics track record, always in memory
+	for commit_id, metrics, lines_added, lines_deleted, modified_files in changes: # For each change
+		commit_hash = commit_id.split("-")[1] # The commit hash of the change
+		metrics_changes.update_metrics_track_record(metrics_track_record, "org.example.Sample class", commit_id, metrics, "foo[1] bar[2]", "https://github.com/example/sample") # Add the metrics of the change
+		metrics_changes.update_code_churn_and_file_info(metrics_track_record, "org.example.Sample class", lines_added, lines_deleted, lines_added + lines_deleted, {commit_hash: modified_files}, commit_hash) # Add the code churn of the change
+
+	return metrics_track_record # Return the metrics track record
+
+def measure_track_record(compact):
+	"""
+	Builds a track record from freshly generated changes while tracing the memory allocations, so every object kept by the track record (including the commit table of the compact one) is measured.
+
+	:param compact: If True, then a compact track record is built, otherwise a dictionary track record is built
+	:return: A tuple containing the track record of the identifier, the bytes retained after the changes are released and the peak bytes while it was built
+	"""
+
+	tracemalloc.start() # Start tracing the memory allocations
+	metrics_track_record = build_track_record(compact, generate_changes()) # Build the track record, releasing the changes afterwards
+	gc.collect() # Release the changes that are only referenced by reference cycles
+	retained_bytes, peak_bytes = tracemalloc.get_traced_memory() # The memory retained by the track record and the peak memory
+	tracemalloc.stop() # Stop tracing the memory allocations
+
+	return metrics_track_record["org.example.Sample class"], retained_bytes, peak_bytes # Return the track record and its memory
+
+def run_writers(record):
+	"""
+	Runs the metrics evolution and metrics statistics writers for the record, the same way the process_metrics_track_record function does.
+
+	:param record: The track record of the identifier
+	:return: A tuple containing the outputs of the writers and their time in seconds
+	"""
+
+	start_time = time.time() # The start time of the writers
+	record = record.to_dict() if isinstance(record, metrics_changes.CompactTrackRecord) else record # Build the lists of the compact track record once
+
+	with tempfile.TemporaryDirectory() as temporary_directory: # The directory of the metrics evolution file
+		evolution_file_path = os.path.join(temporary_directory, "evolution.csv") # The path of the metrics evolution file
+		metrics_changes.write_metrics_evolution_to_csv("sample", evolution_file_path, "org.example.Sample", "class", record) # Write the metrics evolution
+		with open(evolution_file_path, "r") as evolution_file: # Open the metrics evolution file
+			evolution_output = evolution_file.read() # Read the metrics evolution
+
+	statistics_output = io.StringIO() # The metrics statistics output
+	metrics_changes.write_method_metrics_statistics(csv.writer(statistics_output), "org.example.Sample", "class", record, record["commit_hashes"][0], record["commit_hashes"][-1]) # Write the metrics statistics
+
+	return (evolution_output, statistics_output.getvalue()), time.time() - start_time # Return the outputs and the time of the writers
+
+def main():
+	"""
+	Main function.
+
+	:return: None
+	"""
+
+	print(f"{BackgroundColors.GREEN}Comparing the {BackgroundColors.CYAN}compact{BackgroundColors.GREEN} and {BackgroundColors.CYAN}dictionary{BackgroundColors.GREEN} track records with {BackgroundColors.CYAN}{NUMBER_OF_CHANGES}{BackgroundColors.GREEN} changes...{Style.RESET_ALL}")
+
+	dictionary_record, dictionary_bytes, dictionary_peak_bytes = measure_track_record(False) # The dictionary track record and its memory
+	compact_record, compact_bytes, compact_peak_bytes = measure_track_record(True) # The compact track record and its memory
+	compact_history_bytes = sum(len(values) * values.itemsize for values in (compact_record.commit_indexes, compact_record.metrics_values, compact_record.code_churns, compact_record.lines_added, compact_record.lines_deleted, compact_record.modified_files_count)) # The bytes of the arrays of the compact track record, without the shared commit table
+
+	dictionary_outputs, dictionary_time = run_writers(dictionary_record) # Run the writers with the dictionary track record
+	compact_outputs, compact_time = run_writers(compact_record) # Run the writers with the compact track record
+
+	errors = [] # The failed verifications
+	errors += [] if compact_record.to_dict() == dictionary_record else ["the compact track record differs from the dictionary track record"] # Verify the track records fields
+	errors += [] if compact_outputs == dictionary_outputs else ["the writers outputs differ"] # Verify the writers outputs
+	errors += [] if compact_time <= max(dictionary_time * MAXIMUM_SLOWDOWN, MINIMUM_COMPARED_TIME) else [f"the writers took {compact_time:.3f}s with the compact track record and {dictionary_time:.3f}s with the dictionary track record"] # Verify the writers times
+	errors += [] if dictionary_bytes >= compact_bytes * MINIMUM_MEMORY_RATIO else [f"the compact track record retains {compact_bytes} bytes and the dictionary track record retains {dictionary_bytes} bytes"] # Verify the memory of the track records
+
+	print(f"{BackgroundColors.GREEN}Writers time: {BackgroundColors.CYAN}{dictionary_time:.3f}s{BackgroundColors.GREEN} (dictionary) and {BackgroundColors.CYAN}{compact_time:.3f}s{BackgroundColors.GREEN} (compact).{Style.RESET_ALL}")
+	print(f"{BackgroundColors.GREEN}Retained memory per change: {BackgroundColors.CYAN}{dictionary_bytes / NUMBER_OF_CHANGES:.0f} B{BackgroundColors.GREEN} (dictionary) and {BackgroundColors.CYAN}{compact_bytes / NUMBER_OF_CHANGES:.0f} B{BackgroundColors.GREEN} (compact, {BackgroundColors.CYAN}{compact_history_bytes / NUMBER_OF_CHANGES:.0f} B{BackgroundColors.GREEN} without the shared commit table), a ratio of {BackgroundColors.CYAN}{dictionary_bytes / compact_bytes:.1f}x{BackgroundColors.GREEN}.{Style.RESET_ALL}")
+	print(f"{BackgroundColors.GREEN}Peak memory per change while building: {BackgroundColors.CYAN}{dictionary_peak_bytes / NUMBER_OF_CHANGES:.0f} B{BackgroundColors.GREEN} (dictionary) and {BackgroundColors.CYAN}{compact_peak_bytes / NUMBER_OF_CHANGES:.0f} B{BackgroundColors.GREEN} (compact), including the changes being added.{Style.RESET_ALL}")
+	for error in errors: # For each failed verification
+		print(f"{BackgroundColors.RED}Failed: {BackgroundColors.CYAN}{error}{BackgroundColors.RED}.{Style.RESET_ALL}")
+
+	print(f"\n{BackgroundColors.GREEN}The {BackgroundColors.CYAN}Compact Track Record Check{BackgroundColors.GREEN} script has {'failed' if errors else 'passed'}!{Style.RESET_ALL}")
+	sys.exit(1 if errors else 0) # Exit with an error code if any verification failed
+
+if __name__ == "__main__":
+	"""
+	This is the standard boilerplate that calls the main() function.
+
+	:return: None
+	"""
+
+	main() # Call the main function
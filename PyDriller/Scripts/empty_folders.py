@@ -1,6 +1,11 @@
 import os # This module provides a portable way of using operating system dependent functionality.
+import sqlite3 # For querying the output manifests generated by the code_metrics.py script
+import sys # For importing the log_messages.py file from the PyDriller directory
 from colorama import Style # Colorama is a Python library for printing colored text and stylizing terminal output.
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # Add the PyDriller directory to the path, so the log_messages.py file can be imported
+from log_messages import create_verbose_output # For the verbose_output function of this script
+
 # Macros:
 class BackgroundColors: # Colors for the terminal
 	CYAN = "\033[96m" # Cyan
@@ -13,21 +18,11 @@ class BackgroundColors: # Colors for the terminal
 
 # Default values that can be changed:
 DATA_FOLDERS = ["ck_metrics", "diffs", "metrics_evolution", "metrics_predictions", "metrics_statistics"] # The Data Folders
+MANIFEST_FOLDERS = ["ck_metrics", "diffs"] # The Data Folders whose files are indexed in the output manifests, in the <folder>/<repository_name>/<commit_number>-<commit_hash> format
+MANIFESTS_DIRECTORY = "manifests" # The directory that contains the output manifests generated by the code_metrics.py script
 VERBOSE = False # Verbose mode. If set to True, it will output messages at the start/call of each function.
 
-def verbose_output(true_string="", false_string=""):
-   """
-   Outputs a message if the VERBOSE constant is set to True.
-
-   :param true_string: The string to be outputted if the VERBOSE constant is set to True.
-   :param false_string: The string to be outputted if the VERBOSE constant is set to False.
-   :return: None
-   """
-
-   if VERBOSE and true_string != "": # If the VERBOSE constant is set to True and the true_string is set
-      print(true_string) # Output the true statement string
-   elif false_string != "":
-      print(false_string) # Output the false statement string
+verbose_output = create_verbose_output(globals()) # The verbose_output function of this script, bound to its VERBOSE constant
 
 def search_empty_folders(directory):
 	"""
@@ -54,6 +49,56 @@ def search_empty_folders(directory):
 	# Return the list of empty folders
 	return empty_folders
 
+def get_manifest_folders(manifest_file_path, folder_name, repository_name):
+	"""
+	Gets the commit folders that have files according to the output manifest of the repository.
+
+	:param manifest_file_path: The path of the output manifest
+	:param folder_name: The name of the data folder
+	:param repository_name: The name of the repository
+	:return: folders_with_files: The set of the commit folder names that have files
+	"""
+
+	prefix = f"{folder_name}/{repository_name}/" # The prefix of the paths of the repository files in the data folder
+
+	connection = sqlite3.connect(f"file:{manifest_file_path}?mode=ro", uri=True) # Connect to the output manifest in read only mode
+	try: # Always close the output manifest
+		paths = [row[0] for row in connection.execute("SELECT path FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix))] # The paths of the repository files in the data folder
+	finally: # Close the output manifest
+		connection.close() # Close the connection
+
+	return {path[len(prefix):].split("/")[0] for path in paths if "/" in path[len(prefix):]} # Return the commit folders that have files
+
+def search_empty_folders_with_manifests(directory):
+	"""
+	Search for empty folders in a data folder whose files are indexed in the output manifests. Only the commit folders that have no files in the output manifest are listed, instead of walking the whole data folder.
+	The repositories without an output manifest are walked.
+
+	:param directory: The data folder to search in
+	:return: empty_folders: The list of empty folders
+	"""
+
+	verbose_output(true_string=f"{BackgroundColors.GREEN}Searching for empty folders in {BackgroundColors.CYAN}{directory}{BackgroundColors.GREEN} with the output manifests{Style.RESET_ALL}")
+
+	empty_folders = [] # The list of empty folders
+	folder_name = os.path.basename(os.path.normpath(directory)) # The name of the data folder
+
+	for repository_entry in os.scandir(directory): # Loop through the repositories folders
+		if not repository_entry.is_dir(): # If it is not a folder
+			continue # Skip it
+
+		manifest_file_path = os.path.join(MANIFESTS_DIRECTORY, f"{repository_entry.name}-manifest.db") # The path of the output manifest of the repository
+		if not os.path.isfile(manifest_file_path): # If the repository has no output manifest
+			empty_folders += [repository_entry.path] if not os.listdir(repository_entry.path) else search_empty_folders(repository_entry.path) # Walk the repository folder
+			continue # Go to the next repository
+
+		folders_with_files = get_manifest_folders(manifest_file_path, folder_name, repository_entry.name) # The commit folders that have files
+		commit_entries = [entry for entry in os.scandir(repository_entry.path) if entry.is_dir()] # The commit folders of the repository
+		empty_folders += [entry.path for entry in commit_entries if entry.name not in folders_with_files and not os.listdir(entry.path)] # Confirm the folders that have no files in the output manifest
+		empty_folders += [repository_entry.path] if not commit_entries and not os.listdir(repository_entry.path) else [] # Add the repository folder if it is empty
+
+	return empty_folders # Return the list of empty folders
+
 def main():
 	"""
    Main function.
@@ -79,7 +124,7 @@ def main():
 			print(f"{BackgroundColors.RED}Invalid directory path: {BackgroundColors.CYAN}{directory}{Style.RESET_ALL}")
 			continue # Skip the directory
 
-		empty_folders = search_empty_folders(directory) # Search for empty folders in the directory
+		empty_folders = search_empty_folders_with_manifests(directory) if os.path.basename(os.path.normpath(directory)) in MANIFEST_FOLDERS and os.path.isdir(MANIFESTS_DIRECTORY) else search_empty_folders(directory) # Search for empty folders in the directory, querying the output manifests if possible
 
 		if empty_folders: # If empty folders are found
 			print(f"{BackgroundColors.GREEN}Empty folders found in {BackgroundColors.CYAN}{directory}{BackgroundColors.GREEN}:{Style.RESET_ALL}")
@@ -1,7 +1,12 @@
 import os # OS module provides functions for interacting with the operating system
 import re # Regular expression operations module
+import sqlite3 # For querying the output manifests generated by the code_metrics.py script
+import sys # For importing the log_messages.py file from the PyDriller directory
 from colorama import Style # Colorama is a Python library for printing colored text and stylizing terminal output.
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # Add the PyDriller directory to the path, so the log_messages.py file can be imported
+from log_messages import create_verbose_output # For the verbose_output function of this script
+
 # Macros:
 class BackgroundColors: # Colors for the terminal
 	CYAN = "\033[96m" # Cyan
@@ -15,21 +20,10 @@ class BackgroundColors: # Colors for the terminal
 # Default values that can be changed:
 REPOSITORIES = ["zookeeper"] # The list of repositories
 TARGET_FILENAMES = {"zookeeper": "CHANGES.txt.diff"} # The target file names
+MANIFESTS_DIRECTORY = "manifests" # The directory that contains the output manifests generated by the code_metrics.py script
 VERBOSE = False # Verbose mode. If set to True, it will output messages at the start/call of each function.
 
-def verbose_output(true_string="", false_string=""):
-   """
-   Outputs a message if the VERBOSE constant is set to True.
-
-   :param true_string: The string to be outputted if the VERBOSE constant is set to True.
-   :param false_string: The string to be outputted if the VERBOSE constant is set to False.
-   :return: None
-   """
-
-   if VERBOSE and true_string != "": # If the VERBOSE constant is set to True and the true_string is set
-      print(true_string) # Output the true statement string
-   elif false_string != "":
-      print(false_string) # Output the false statement string
+verbose_output = create_verbose_output(globals()) # The verbose_output function of this script, bound to its VERBOSE constant
 
 def search_files(search_directory, search_string):
 	"""
@@ -58,6 +52,32 @@ def search_files(search_directory, search_string):
 					
 	return found_file_paths, found_files_count # Return the list and the dictionary
 
+def search_manifest(current_directory, repository_name, search_string):
+	"""
+	Search for diff files in the output manifest of the repository, instead of walking the diffs directory.
+
+	:param current_directory: The current directory
+	:param repository_name: The name of the repository
+	:param search_string: The string to search for
+	:return: found_file_paths: A list of the paths of the found files, or None if the repository has no output manifest
+	:return: found_files_count: The number of files found, or None if the repository has no output manifest
+	"""
+
+	manifest_file_path = os.path.join(current_directory, MANIFESTS_DIRECTORY, f"{repository_name}-manifest.db") # The path of the output manifest
+	if not os.path.isfile(manifest_file_path): # If the repository has no output manifest
+		return None, None # The diffs directory must be walked
+
+	verbose_output(true_string=f"{BackgroundColors.GREEN}Searching for {BackgroundColors.CYAN}{search_string} {BackgroundColors.GREEN}files in {BackgroundColors.CYAN}{manifest_file_path}{Style.RESET_ALL}")
+
+	connection = sqlite3.connect(f"file:{manifest_file_path}?mode=ro", uri=True) # Connect to the output manifest in read only mode
+	try: # Always close the output manifest
+		paths = [row[0] for row in connection.execute("SELECT path FROM files WHERE stage = 'diffs'")] # The paths of the diff files
+	finally: # Close the output manifest
+		connection.close() # Close the connection
+
+	found_file_paths = [os.path.join(current_directory, path) for path in paths if search_string in path.split("/")[-1]] # The paths of the files whose name matches the search string
+	return found_file_paths, len(found_file_paths) # Return the list and the number of files found
+
 def write_file_paths(found_file_paths, found_files_count, repository_name, current_directory):
 	"""
 	Write the found file paths to a text file.
@@ -117,8 +137,10 @@ def main():
 			print(f"{BackgroundColors.RED}Target file name for {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} is empty{Style.RESET_ALL}")
 			continue
 
-		# Call the function to start the search
-		found_file_paths, found_files_count = search_files(search_directory, TARGET_FILENAMES[repository_name])
+		# Search the output manifest of the repository and, if it doesn't exist, walk the diffs directory
+		found_file_paths, found_files_count = search_manifest(current_directory, repository_name, TARGET_FILENAMES[repository_name])
+		if found_file_paths is None:
+			found_file_paths, found_files_count = search_files(search_directory, TARGET_FILENAMES[repository_name])
 
 		print(f"{BackgroundColors.GREEN}Number of {BackgroundColors.CYAN}{TARGET_FILENAMES[repository_name]} {BackgroundColors.GREEN}files found in {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN}: {BackgroundColors.CYAN}{found_files_count}{Style.RESET_ALL}")
 
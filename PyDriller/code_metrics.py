@@ -1,28 +1,88 @@
 import atexit # For playing a sound when the program finishes
 import concurrent.futures # For running tasks in parallel
 import csv # CSV (Comma Separated Values) is a simple file format used to store tabular data, such as a spreadsheet or database
+import functools # For binding the arguments of the functions that finalize the CK output of a commit
+import hashlib # For hashing the CK JAR file, which is part of the CK cache key
+import gzip # For compressing the commits metadata files
+import io # For reading the archives generated by git in memory
 import json # For creating JSON output
+import numpy as np # For fitting the execution time estimator
 import os # OS module in Python provides functions for interacting with the operating system
+import psutil # For measuring the free memory when scheduling the repository workers
 import pandas as pd # Pandas is a fast, powerful, flexible and easy to use open source data analysis and manipulation tool
+import queue # For sharing the pool of git worktrees between the CK worker threads
+import resource # For limiting the memory of the repository worker processes
 import shutil # Import the shutil module to perform file operations
+import sqlite3 # For storing the CK cache
 import subprocess # The subprocess module allows you to spawn new processes, connect to their input/output/error pipes, and obtain their return codes
+import tarfile # For extracting the files of a commit from the archives generated by git
+import tempfile # For creating the temporary directories used by the Delta-CK mode
+import threading # For synchronizing the CK cache statistics between the CK worker threads
 import time # This module provides various time-related functions
+import zlib # For compressing the diffs stored in the diff packs
+from collections import namedtuple # For the lightweight commit objects read from the commits metadata files
 from colorama import Style # For coloring the terminal
-from datetime import datetime # For date manipulation
+from concurrent.futures.process import BrokenProcessPool # For detecting the repository worker processes that died
+from datetime import datetime, timedelta, timezone # For date manipulation
 from dateutil import parser # The dateutil module provides powerful extensions to the standard datetime module
+from log_messages import create_verbose_output # For the verbose_output function of this script
 from pydriller import Repository # PyDriller is a Python framework that helps developers in analyzing Git repositories. 
 from tqdm import tqdm # For Generating the Progress Bars
 
+try: # PyArrow is only required by the CK metrics store
+   import pyarrow as pa # For building the columnar tables of the CK metrics store
+   import pyarrow.parquet as pq # For reading and writing the Parquet files of the CK metrics store
+except ImportError: # If PyArrow is not installed
+   pa, pq = None, None # The CK metrics store can't be written nor read
+
 # Imports from the repositories_picker.py file
 from repositories_picker import BackgroundColors # Import the BackgroundColors class
-from repositories_picker import FULL_REPOSITORIES_DIRECTORY_PATH, FULL_REPOSITORIES_LIST_JSON_FILEPATH, RELATIVE_REPOSITORIES_DIRECTORY_PATH, REPOSITORIES_SORTING_ATTRIBUTES, SOUND_FILE_PATH, START_PATH # Importing Constants from the repositories_picker.py file
-from repositories_picker import create_directory, get_adjusted_number_of_threads, get_threads, output_time, path_contains_whitespaces, play_sound, setup_repository, update_sound_file_path, verbose_output, verify_filepath_exists, verify_git # Importing Functions from the repositories_picker.py file
+from repositories_picker import FULL_REPOSITORIES_DIRECTORY_PATH, FULL_REPOSITORIES_LIST_JSON_FILEPATH, LOG_FORMAT, RELATIVE_REPOSITORIES_DIRECTORY_PATH, REPOSITORIES_SORTING_ATTRIBUTES, SOUND_FILE_PATH, SPARSE_CLONES, START_PATH # Importing Constants from the repositories_picker.py file
+from repositories_picker import apply_sparse_checkout, count_commits, create_directory, ensure_full_objects, get_adjusted_number_of_threads, get_default_branch_name, get_local_repository_path, get_repository_commit_hashes, get_repository_commits_count, get_threads, output_time, path_contains_whitespaces, play_sound, setup_repository, update_sound_file_path, verify_filepath_exists, verify_git # Importing Functions from the repositories_picker.py file
+
+verbose_output = create_verbose_output(globals()) # The verbose_output function of this script, bound to its VERBOSE constant and the LOG_FORMAT constant of the repositories_picker.py file
 
 # Default values that can be changed:
 VERBOSE = False # Verbose mode. If set to True, it will output messages at the start/call of each function (Note: It will output a lot of messages).
 PROCESS_JSON_REPOSITORIES = True # Process the JSON repositories. If set to True, it will process the JSON repositories, otherwise it will pick the ones defined in the DEFAULT_REPOSITORIES dictionary.
 REPROCESS_CANDIDATES = True # Reprocess the candidates. If set to True, it will reprocess the candidates if there isn't any repository that hasn't been processed yet.
 STARTING_REPOSITORY_REPROCESSING = 0 # The index of the repository to start reprocessing from. If set to 0, it will start from the first repository.
+CK_WORKERS = 1 # The number of commits of the same repository that are analyzed by CK concurrently, each one in its own git worktree. If set to 1, the commits are analyzed serially in the repository clone.
+REPOSITORY_WORKER_MEMORY_LIMIT_GB = None # The maximum memory (address space), in GB, of each repository worker process. If set to None, the memory is not limited.
+CK_JVM_MAX_HEAP = None # The maximum heap size of the CK JVM (for example, "4g"). If set to None, the JVM default is used.
+DEFAULT_SECONDS_PER_COMMIT = 1.0 # The estimated time, in seconds, to process a commit when there are no previous executions in the repositories attributes file.
+ETA_WARMUP_COMMITS = 20 # The number of commits processed in the current execution after which the live ETA relies only on the observed throughput, instead of the execution time estimator.
+ETA_UPDATE_SECONDS = 30 # The interval, in seconds, in which the live ETA file of the repository is updated.
+SCHEDULER_MEMORY_BUDGET_FRACTION = 0.8 # The fraction of the available memory that the repository workers started by the scheduler may use.
+SCHEDULER_DEFAULT_JVM_HEAP_GB = 2 # The estimated heap, in GB, of each CK JVM when CK_JVM_MAX_HEAP is None.
+SCHEDULER_PYTHON_WORKING_SET_GB = 1 # The estimated memory, in GB, used by the Python process of each repository worker.
+SCHEDULER_RAMP_UP_SECONDS = 60 # The time, in seconds, a started repository worker takes to allocate its memory, during which its estimated memory stays reserved.
+SCHEDULER_ADAPT_SECONDS = 300 # The interval, in seconds, in which the scheduler measures the throughput (commits per second) and adapts the number of concurrent repository workers.
+SCHEDULER_HIGH_MEMORY_PERCENT = 90 # If the used memory percentage is above this value, the scheduler reduces the number of concurrent repository workers.
+CK_DELTA_MODE = False # Delta-CK mode. If set to True, CK only analyzes the Java files modified by each commit and patches the CK metrics files of the previous commit.
+CK_SKIP_NON_JAVA_COMMITS = True # If set to True, the commits that don't modify any Java file reuse the CK metrics files of the previous commit, as hardlinks, instead of running CK.
+CK_CACHE = False # CK cache. If set to True, the CK metrics of every Java file are cached by its Git blob SHA, so CK only analyzes the files that were never seen before.
+CK_CACHE_MAX_SIZE_MB = 2048 # The maximum size, in MB, of the cached CK metrics. The least recently used entries are evicted when it is exceeded.
+CK_METRICS_STORE = False # CK metrics store. If set to True, the CK metrics of every commit are also appended to a partitioned Parquet dataset in the ck_metrics_store directory.
+CK_METRICS_STORE_ONLY = False # If set to True (and CK_METRICS_STORE is True), the CK metrics directory of every commit is deleted once it is stored, keeping only the last one.
+CK_METRICS_STORE_FLUSH_COMMITS = 100 # The number of commits buffered in memory before they are written to the CK metrics store.
+CK_METRICS_STORE_BUCKET_COMMITS = 1000 # The number of consecutive commits stored in the same partition of the CK metrics store.
+USE_PROGRESS_JOURNAL = True # Progress journal. If set to True, the progress of every repository is stored in a progress/<repository_name>-progress.db SQLite database, and the progress and commits list CSV files are only exported from it.
+PROGRESS_JOURNAL_BATCH_COMMITS = 50 # The number of completed commits written to the progress journal in the same transaction.
+SHARD_COUNT = 1 # Sharding. The number of contiguous commit number ranges (shards) the history of every repository is split into, so each one can be analyzed in a different host or container. If it is 1, the history is not sharded.
+SHARD_INDEX = 0 # The index (from 0 to SHARD_COUNT - 1) of the shard analyzed by this execution, when SHARD_COUNT is greater than 1.
+MERGE_SHARDS = False # If set to True, instead of analyzing the repositories, the outputs of their SHARD_COUNT shards are verified and merged into the canonical layout.
+USE_OUTPUT_MANIFEST = False # Output manifest. If set to True, the path, size, checksum and producing stage of every output file of a repository are indexed in a manifests/<repository_name>-manifest.db SQLite database as they are written, so the verification and the size accounting query it instead of walking the output directories. It is disabled by default, as the checksum reads every output file once more. The executions with it disabled delete the manifests of the repositories they write outputs to, so they are rebuilt when it is enabled again.
+VERIFY_OUTPUT_MANIFEST = False # If set to True, the commit directories of the CK metrics files in the output manifest are verified with a single listing of the CK metrics directory of the repository, so the directories deleted outside of these scripts are detected. Otherwise, the output manifest is trusted.
+USE_COMMITS_METADATA = True # Commits metadata. If set to True, the hash, parents, date, message and modified files (with their added and deleted lines) of every commit are extracted once with "git log --raw --numstat" into a commits_metadata/<repository_name>.jsonl.gz file, which is used instead of the PyDriller commits when the diffs are not generated and by the metrics_changes.py script.
+PACKED_DIFFS = False # Packed diffs. If set to True, the diffs of every repository are appended, compressed, to a single diffs/<repository_name>/diffs.pack file indexed by the commit and the full path of the modified file, instead of one .diff file per modified file per commit.
+COMMIT_SAMPLING_POLICY = None # Commit sampling policy. If set, only a sample of the commits is analyzed, keeping their global commit numbers: "every_k" (every COMMIT_SAMPLING_K-th commit and the last one), "tags" (only the tagged commits, such as the releases), "day", "week" or "month" (the last commit of every day, week or month). If set to None, every commit is analyzed.
+COMMIT_SAMPLING_K = 10 # The sampling interval of the "every_k" commit sampling policy.
+CK_SNAPSHOTS = False # CK snapshots. If set to True, CK analyzes a snapshot of the Java files of every commit, written from the Git object database into a RAM-backed scratch directory, instead of checking out the commit, so the working tree of the repository never moves. Every CK worker keeps its own snapshot and only rewrites the files that changed since its previous commit.
+CK_SNAPSHOTS_DIRECTORY_PATH = "/dev/shm" # The RAM-backed (tmpfs) directory in which the CK snapshots are written. If it doesn't exist, the temporary directory of the system is used.
+PIPELINE_QUEUE_COMMITS = 8 # The maximum number of commits read ahead by the history reader thread, which keeps the memory flat when the diffs or CK are slower than reading the history.
+PIPELINE_DIFF_WRITERS = 4 # The number of threads that write the diffs files. The packed diffs are always written by a single thread.
+CK_BATCH_MODE = False # CK batch mode. If set to True, every CK worker keeps a long-lived JVM that analyzes many commits, instead of starting a new JVM for every commit.
 
 DEFAULT_REPOSITORIES = { # The default repositories to be analyzed in the format: "repository_name": "repository_url"
    "CorfuDB": "https://github.com/CorfuDB/CorfuDB",
@@ -36,6 +96,7 @@ RUN_FUNCTIONS = { # Dictionary with the functions to run and their respective bo
    "CK Metrics": True, # Generate the CK metrics for the commits
    "Commits Information": True, # Write the commit information to a CSV file
    "Diffs": True, # Generate the diffs for the commits
+   "Execution Time Estimates": True, # Write the estimated execution time of the repositories to a CSV file before processing them
    "Repositories Attributes": True, # Write the repositories attributes to a CSV file
    "Verify CK Metrics Directory": True, # Verify if the CK metrics directory is up to date
 }
@@ -43,30 +104,79 @@ RUN_FUNCTIONS = { # Dictionary with the functions to run and their respective bo
 # File Extensions Constants:
 CSV_FILE_EXTENSION = ".csv" # The extension of the file that contains the commit hashes
 DIFF_FILE_EXTENSION = ".diff" # The diff file extension
+DIFF_PACK_FILENAME = "diffs.pack" # The name of the file that stores the packed diffs of a repository
+DIFF_PACK_INDEX_FILENAME = "diffs.pack.db" # The name of the database that indexes the packed diffs of a repository
 
 # CK Constants:
 CK_BRANCH = "FEAT-ClassMetric" # The branch of the CK repository to be used
 CK_METRICS_FILES = ["class.csv", "method.csv"] # The files that are generated by CK
+CK_OPTIONS = "false 0 false" # The options passed to CK: use jars, max files per partition and variables and fields metrics
+CK_CACHE_KEY = None # The key of the CK version and options in the CK cache. It is computed on its first use
+CK_CACHE_STATISTICS = {"hits": 0, "misses": 0} # The number of Java files found (hits) and not found (misses) in the CK cache
+CK_CACHE_LOCK = threading.Lock() # The lock of the CK cache statistics
+CK_METRICS_STORE_BUFFERS = {} # The CK metrics buffered in memory before they are written to the CK metrics store, in the format: repository_name: {"commits": [(commit_number, commit_hash)], "files": {ck_metric_file: {"header": [...], "rows": [...]}}}
+CK_METRICS_STORE_DICTIONARY_COLUMNS = ["class", "file", "method", "type"] # The CK columns that are dictionary encoded in memory, as they have many repeated values
+PROGRESS_JOURNAL_BUFFERS = {} # The completed commits not written to the progress journal yet, in the format: repository_name: [(commit tuple, (ck_done, diffs_done))]
+DIFF_PACKS = {} # The open diff packs of the repositories, in the format: repository_name: (pack file, index connection)
+OUTPUT_MANIFESTS = {} # The open output manifests of the repositories, in the format: repository_name: connection
+EXECUTION_TIME_FEATURES = {} # The features of the execution time estimator read from the local clones, in the format: repository_name: features vector
+REPOSITORIES_JSON_JOB_SIZES = {} # The job sizes of the repositories read from the repositories JSON file, in the format: repository_name: (number of commits, size in GB)
+DIFF_PACK_READERS = {} # The diff packs of the repositories open for reading, in the format: repository_name: (pack file, index connection)
+CommitMetadata = namedtuple("CommitMetadata", ["hash", "parents", "committer_date", "msg", "modified_files"]) # A commit read from the commits metadata file, with the same attributes of the PyDriller commits used by this script
+ModifiedFileMetadata = namedtuple("ModifiedFileMetadata", ["old_path", "new_path", "filename", "added_lines", "deleted_lines", "diff"], defaults=[None]) # A modified file read from the commits metadata file or materialized by the history reader, with the same attributes of the PyDriller modified files used by this script
+CK_BATCH_RUNNER = threading.local() # The long-lived CK batch runner process of each CK worker thread
+CK_BATCH_RUNNERS = [] # Every CK batch runner process started, so they can be stopped
+CK_BATCH_RUNNERS_LOCK = threading.Lock() # The lock of the CK batch runners list
+CK_SNAPSHOT = threading.local() # The CK snapshot of each CK worker thread, with its directory and the blob SHA of every file in it
+CK_SNAPSHOT_DIRECTORIES = [] # Every CK snapshot directory created, so they can be removed
+CK_SNAPSHOT_DIRECTORIES_LOCK = threading.Lock() # The lock of the CK snapshot directories list
+CK_BATCH_FAILED = threading.Event() # Set when a CK batch runner dies, so the CK metrics are generated per commit for the rest of the execution
 
 # Relative paths:
 RELATIVE_CK_SUBMODULE_PATH = "../CK" # The relative path of the CK submodule
+RELATIVE_CK_CACHE_DIRECTORY_PATH = "/ck_cache" # The relative path of the directory that contains the CK cache
+RELATIVE_CK_CACHE_FILE_PATH = f"{RELATIVE_CK_CACHE_DIRECTORY_PATH}/ck_cache.db" # The relative path of the CK cache database
 RELATIVE_CK_JAR_PATH = f"{RELATIVE_CK_SUBMODULE_PATH}/target/ck-0.7.1-SNAPSHOT-jar-with-dependencies.jar" # The relative path of the CK JAR file
+RELATIVE_CK_BATCH_RUNNER_PATH = "/Scripts/CKBatchRunner.java" # The relative path of the CK batch runner source file
 RELATIVE_CK_METRICS_DIRECTORY_PATH = "/ck_metrics" # The relative path of the directory that contains the CK generated files
+RELATIVE_CK_METRICS_STORE_DIRECTORY_PATH = "/ck_metrics_store" # The relative path of the directory that contains the CK metrics store
+RELATIVE_COMMITS_METADATA_DIRECTORY_PATH = "/commits_metadata" # The relative path of the directory that contains the commits metadata files
 RELATIVE_DIFFS_DIRECTORY_PATH = "/diffs" # The relative path of the directory that contains the diffs
+RELATIVE_MANIFESTS_DIRECTORY_PATH = "/manifests" # The relative path of the directory that contains the output manifests
 RELATIVE_PROGRESS_DIRECTORY_PATH = "/progress" # The relative path of the progress file
 RELATIVE_REFACTORINGS_DIRECTORY_PATH = "/refactorings" # The relative path of the directory that contains the refactorings
 RELATIVE_REPOSITORIES_ATTRIBUTES_FILE_PATH = f"{RELATIVE_REPOSITORIES_DIRECTORY_PATH}/repositories_attributes{CSV_FILE_EXTENSION}" # The relative path of the file that contains the repositories attributes
+RELATIVE_EXECUTION_TIME_ESTIMATES_FILE_PATH = f"{RELATIVE_REPOSITORIES_DIRECTORY_PATH}/execution_time_estimates{CSV_FILE_EXTENSION}" # The relative path of the file that contains the estimated execution time of the repositories
+RELATIVE_REPOSITORY_MANIFEST_FILE_PATH = f"{RELATIVE_MANIFESTS_DIRECTORY_PATH}/REPOSITORY_NAME-manifest.db" # The relative path of the database that contains the output manifest of the repository
+RELATIVE_REPOSITORY_ETA_FILE_PATH = f"{RELATIVE_PROGRESS_DIRECTORY_PATH}/REPOSITORY_NAME-eta.json" # The relative path of the file that contains the live ETA of the repository
 RELATIVE_REPOSITORY_PROGRESS_FILE_PATH = f"{RELATIVE_PROGRESS_DIRECTORY_PATH}/REPOSITORY_NAME-progress{CSV_FILE_EXTENSION}" # The relative path of the file that contains the repository progress
+RELATIVE_REPOSITORY_PROGRESS_JOURNAL_FILE_PATH = f"{RELATIVE_PROGRESS_DIRECTORY_PATH}/REPOSITORY_NAME-progress.db" # The relative path of the database that contains the repository progress journal
+RELATIVE_REPOSITORY_SAMPLING_POLICY_FILE_PATH = f"{RELATIVE_PROGRESS_DIRECTORY_PATH}/REPOSITORY_NAME-sampling_policy.txt" # The relative path of the file that contains the commit sampling policy of the repository, when the progress journal is not used
+RELATIVE_SHARDS_DIRECTORY_PATH = "/shards" # The relative path of the directory that contains the outputs of the shards analyzed in other hosts, in the shards/<repository_name>/shard-<shard_index> format
+RELATIVE_WORKTREES_DIRECTORY_PATH = "/worktrees" # The relative path of the directory that contains the git worktrees used by the CK workers
 
 # Full paths (Start Path + Relative Paths):
 FULL_CK_JAR_PATH = START_PATH.replace("PyDriller", "") + RELATIVE_CK_JAR_PATH.replace("../", "") # The full path of the CK JAR file
+FULL_CK_BATCH_RUNNER_PATH = START_PATH + RELATIVE_CK_BATCH_RUNNER_PATH # The full path of the CK batch runner source file
 FULL_CK_METRICS_DIRECTORY_PATH = START_PATH + RELATIVE_CK_METRICS_DIRECTORY_PATH # The full path of the directory that contains the CK generated files
+FULL_CK_METRICS_STORE_DIRECTORY_PATH = START_PATH + RELATIVE_CK_METRICS_STORE_DIRECTORY_PATH # The full path of the directory that contains the CK metrics store
+FULL_CK_CACHE_DIRECTORY_PATH = START_PATH + RELATIVE_CK_CACHE_DIRECTORY_PATH # The full path of the directory that contains the CK cache
+FULL_CK_CACHE_FILE_PATH = START_PATH + RELATIVE_CK_CACHE_FILE_PATH # The full path of the CK cache database
+FULL_COMMITS_METADATA_DIRECTORY_PATH = START_PATH + RELATIVE_COMMITS_METADATA_DIRECTORY_PATH # The full path of the directory that contains the commits metadata files
 FULL_DIFFS_DIRECTORY_PATH = START_PATH + RELATIVE_DIFFS_DIRECTORY_PATH # The full path of the directory that contains the diffs
 FULL_PROGRESS_DIRECTORY_PATH = START_PATH + RELATIVE_PROGRESS_DIRECTORY_PATH # The full path of the progress file
 FULL_REFACTORINGS_DIRECTORY_PATH = START_PATH + RELATIVE_REFACTORINGS_DIRECTORY_PATH # The full path of the directory that contains the refactorings
 FULL_REPOSITORIES_ATTRIBUTES_FILE_PATH = START_PATH + RELATIVE_REPOSITORIES_ATTRIBUTES_FILE_PATH # The full path of the file that contains the repositories attributes
+FULL_EXECUTION_TIME_ESTIMATES_FILE_PATH = START_PATH + RELATIVE_EXECUTION_TIME_ESTIMATES_FILE_PATH # The full path of the file that contains the estimated execution time of the repositories
+FULL_REPOSITORY_MANIFEST_FILE_PATH = START_PATH + RELATIVE_REPOSITORY_MANIFEST_FILE_PATH # The full path of the database that contains the output manifest of the repository
+FULL_REPOSITORY_ETA_FILE_PATH = START_PATH + RELATIVE_REPOSITORY_ETA_FILE_PATH # The full path of the file that contains the live ETA of the repository
 FULL_REPOSITORY_PROGRESS_FILE_PATH = START_PATH + RELATIVE_REPOSITORY_PROGRESS_FILE_PATH # The full path of the file that contains the repository progress
-OUTPUT_DIRECTORIES = [FULL_CK_METRICS_DIRECTORY_PATH, FULL_DIFFS_DIRECTORY_PATH, FULL_REPOSITORIES_DIRECTORY_PATH] # The list of output directories
+FULL_REPOSITORY_PROGRESS_JOURNAL_FILE_PATH = START_PATH + RELATIVE_REPOSITORY_PROGRESS_JOURNAL_FILE_PATH # The full path of the database that contains the repository progress journal
+FULL_REPOSITORY_SAMPLING_POLICY_FILE_PATH = START_PATH + RELATIVE_REPOSITORY_SAMPLING_POLICY_FILE_PATH # The full path of the file that contains the commit sampling policy of the repository, when the progress journal is not used
+FULL_SHARDS_DIRECTORY_PATH = START_PATH + RELATIVE_SHARDS_DIRECTORY_PATH # The full path of the directory that contains the outputs of the shards analyzed in other hosts
+FULL_WORKTREES_DIRECTORY_PATH = START_PATH + RELATIVE_WORKTREES_DIRECTORY_PATH # The full path of the directory that contains the git worktrees used by the CK workers
+OUTPUT_DIRECTORIES = [FULL_CK_METRICS_DIRECTORY_PATH, FULL_CK_METRICS_STORE_DIRECTORY_PATH, FULL_DIFFS_DIRECTORY_PATH, FULL_REPOSITORIES_DIRECTORY_PATH] # The list of output directories
+OUTPUT_MANIFEST_STAGES = {"ck_metrics": FULL_CK_METRICS_DIRECTORY_PATH, "ck_metrics_store": FULL_CK_METRICS_STORE_DIRECTORY_PATH, "diffs": FULL_DIFFS_DIRECTORY_PATH} # The stages whose outputs are indexed in the output manifest and their output directories
 
 def init_and_update_submodules():
    """
@@ -76,7 +186,7 @@ def init_and_update_submodules():
    """
 
    try:
-      verbose_output(true_string=f"{BackgroundColors.GREEN}Initializing and updating the CK Git Submodule...{Style.RESET_ALL}")
+      verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Initializing and updating the CK Git Submodule...{Style.RESET_ALL}")
 
       # Adjust path as necessary for reliability across environments
       submodule_path = os.path.abspath(f"{RELATIVE_CK_SUBMODULE_PATH}/.git") # Path to the ck submodule
@@ -113,7 +223,7 @@ def switch_branch(target_branch, repo_path):
    
    try:
       subprocess.run(["git", "checkout", target_branch], cwd=repo_path, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) # Switch to the target branch
-      verbose_output(true_string=f"{BackgroundColors.GREEN}Successfully switched to {BackgroundColors.CYAN}{target_branch}{BackgroundColors.GREEN} branch.{Style.RESET_ALL}")
+      verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Successfully switched to {BackgroundColors.CYAN}{target_branch}{BackgroundColors.GREEN} branch.{Style.RESET_ALL}")
       return True # Return True if the branch was successfully switched
    except subprocess.CalledProcessError:
       print(f"{BackgroundColors.RED}Failed to switch to {BackgroundColors.GREEN}{target_branch}{BackgroundColors.RED} branch.{Style.RESET_ALL}")
@@ -127,7 +237,7 @@ def build_ck_jar_file(repo_path):
    :return: True if the JAR file was successfully built, False otherwise
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Building the CK JAR file...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Building the CK JAR file...{Style.RESET_ALL}")
 
    if verify_filepath_exists(RELATIVE_CK_JAR_PATH): # Verify if the JAR file already exists
       return True # Return True if the JAR file already exists
@@ -144,7 +254,7 @@ def ensure_ck_jar_file_exists():
    :return: True if the CK JAR file was found or built successfully, False otherwise.
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Ensuring that the {BackgroundColors.CYAN}CK JAR{BackgroundColors.GREEN} file exists in the target directory...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Ensuring that the {BackgroundColors.CYAN}CK JAR{BackgroundColors.GREEN} file exists in the target directory...{Style.RESET_ALL}")
 
    # Initialize and update Git submodules
    if not init_and_update_submodules():
@@ -210,13 +320,14 @@ def load_repositories_from_json(file_path):
             repositories = filtered # Use only the repositories that have not generated candidates
 
          repositories.sort(key=lambda repo: repo.get("commits", 0)) # Sort the repositories by number of commits (default is 0)
+         REPOSITORIES_JSON_JOB_SIZES.update({repo["name"]: (repo.get("commits", 0) or 0, (repo.get("size", 0) or 0) / (1024 ** 2)) for repo in repositories}) # Store the number of commits and the size (in KB, as in the GitHub API) of the repositories, used to schedule the longest jobs first
 
          return {repo["name"]: repo["url"] for repo in repositories} # Return a dictionary with repository names as keys and URLs as values
       else: # If the loaded data is not a valid list or is empty
          print(f"{BackgroundColors.RED}The repositories JSON file is not in the correct format.{Style.RESET_ALL}") # Print an error if the file is not a valid list
          return None # Return None if the JSON file is not in the correct format
    except (json.JSONDecodeError, KeyError) as e: # Handle the exception if there is an error parsing the JSON file
-      verbose_output(true_string=f"{BackgroundColors.RED}Error parsing the repositories JSON file: {e}{Style.RESET_ALL}", is_error=True)
+      verbose_output(true_string=lambda: f"{BackgroundColors.RED}Error parsing the repositories JSON file: {e}{Style.RESET_ALL}", is_error=True)
       return None # Return None if there is an error parsing the JSON file
 
 def get_repositories_list_from_json():
@@ -226,7 +337,7 @@ def get_repositories_list_from_json():
    :return: Tuple containing True if the repositories list was successfully updated with values from the JSON file, and the JSON repositories if the repositories list was successfully updated, False otherwise.
    """
    
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Updating the repositories list file with the DEFAULT_REPOSITORIES dictionary...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Updating the repositories list file with the DEFAULT_REPOSITORIES dictionary...{Style.RESET_ALL}")
 
    global DEFAULT_REPOSITORIES # Use the global DEFAULT_REPOSITORIES variable
 
@@ -234,19 +345,19 @@ def get_repositories_list_from_json():
       filename = FULL_REPOSITORIES_LIST_JSON_FILEPATH.replace("SORTING_ATTRIBUTE", sorting_attribute) # Get the filename for the current attribute
       
       if not verify_filepath_exists(filename): # If file doesn't exist, skip to the next attribute
-         verbose_output(true_string=f"{BackgroundColors.YELLOW}File {filename} not found, checking next...{Style.RESET_ALL}")
+         verbose_output(true_string=lambda: f"{BackgroundColors.YELLOW}File {filename} not found, checking next...{Style.RESET_ALL}")
          continue # Skip to the next attribute
       
       if not verify_json_file(filename): # If the JSON file is not valid, skip to the next
-         verbose_output(true_string=f"{BackgroundColors.RED}Invalid JSON file: {filename}, checking next...{Style.RESET_ALL}")
+         verbose_output(true_string=lambda: f"{BackgroundColors.RED}Invalid JSON file: {filename}, checking next...{Style.RESET_ALL}")
          continue # Skip to the next attribute
       
       json_repositories = load_repositories_from_json(filename) # Verify if the JSON file exists
       if not json_repositories: # If loading the JSON file fails, skip to the next
-         verbose_output(true_string=f"{BackgroundColors.RED}Failed to load JSON data from {filename}, checking next...{Style.RESET_ALL}")
+         verbose_output(true_string=lambda: f"{BackgroundColors.RED}Failed to load JSON data from {filename}, checking next...{Style.RESET_ALL}")
          continue # Skip to the next attribute
 
-      verbose_output(true_string=f"{BackgroundColors.GREEN}The {BackgroundColors.CLEAR_TERMINAL}DEFAULT_REPOSITORIES{BackgroundColors.GREEN} dictionary was successfully updated from {BackgroundColors.CYAN}{filename}{BackgroundColors.GREEN}.{Style.RESET_ALL}")
+      verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}The {BackgroundColors.CLEAR_TERMINAL}DEFAULT_REPOSITORIES{BackgroundColors.GREEN} dictionary was successfully updated from {BackgroundColors.CYAN}{filename}{BackgroundColors.GREEN}.{Style.RESET_ALL}")
       return True, json_repositories # Return True if the DEFAULT_REPOSITORIES dictionary was successfully updated with values from the JSON file
    
    # If no valid files were found
@@ -279,13 +390,193 @@ def read_commit_file(commit_file_path):
    :return: DataFrame with commit details or None if an error occurs
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Reading the {BackgroundColors.CYAN}{commit_file_path}{BackgroundColors.GREEN} file...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Reading the {BackgroundColors.CYAN}{commit_file_path}{BackgroundColors.GREEN} file...{Style.RESET_ALL}")
 
    try: # Try to read the commit file
       return pd.read_csv(commit_file_path, sep=",", usecols=["Commit Number", "Commit Hash"], header=0) # Read the CSV file with the necessary columns
    except ValueError: # Handle ValueError exceptions
       return None # Return None if a ValueError occurs
 
+def get_output_manifest_relative_path(file_path):
+   """
+   Gets the path of an output file as it is stored in the output manifest, which is relative to the START_PATH directory.
+
+   :param file_path: The full path of the output file.
+   :return: The path of the output file relative to the START_PATH directory, with "/" separators.
+   """
+
+   return os.path.relpath(file_path, START_PATH).replace(os.sep, "/") # Return the relative path
+
+def get_file_checksum(file_path):
+   """
+   Gets the SHA-1 checksum of a file.
+
+   :param file_path: The path of the file.
+   :return: The hexadecimal SHA-1 checksum of the file.
+   """
+
+   checksum = hashlib.sha1() # The checksum of the file
+   with open(file_path, "rb") as file: # Open the file in binary mode
+      for chunk in iter(lambda: file.read(1024 * 1024), b""): # Read the file in chunks of 1 MB
+         checksum.update(chunk) # Update the checksum with the chunk
+
+   return checksum.hexdigest() # Return the checksum
+
+def open_output_manifest(repository_name):
+   """
+   Opens the output manifest of the repository, creating it if it doesn't exist. When it is created, the outputs written by the previous executions are indexed once, without their checksums.
+
+   :param repository_name: Name of the repository.
+   :return: The connection to the output manifest.
+   """
+
+   if repository_name in OUTPUT_MANIFESTS: # If the output manifest is already open
+      return OUTPUT_MANIFESTS[repository_name] # Return its connection
+
+   manifest_filepath = FULL_REPOSITORY_MANIFEST_FILE_PATH.replace("REPOSITORY_NAME", repository_name) # The path to the output manifest
+   os.makedirs(os.path.dirname(manifest_filepath), exist_ok=True) # Create the manifests directory
+
+   connection = sqlite3.connect(manifest_filepath, timeout=60) # Connect to the output manifest
+   connection.execute("PRAGMA journal_mode=WAL") # Write ahead log, so a crash never corrupts the manifest
+   connection.execute("PRAGMA synchronous=NORMAL") # Only sync the write ahead log on checkpoints
+   connection.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, checksum TEXT, stage TEXT)") # The output files
+   connection.execute("CREATE INDEX IF NOT EXISTS files_stage ON files (stage)") # The index used by the size accounting
+   connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)") # The manifest metadata
+
+   if connection.execute("SELECT value FROM meta WHERE key = 'indexed'").fetchone() is None: # If the existing outputs were not indexed yet
+      with connection: # Index the existing outputs in a single transaction
+         for stage, output_directory in OUTPUT_MANIFEST_STAGES.items(): # Loop through the stages
+            for dirpath, _, filenames in os.walk(os.path.join(output_directory, repository_name)): # Walk through the outputs of the repository
+               connection.executemany("INSERT OR REPLACE INTO files (path, size, checksum, stage) VALUES (?, ?, NULL, ?)", [(get_output_manifest_relative_path(os.path.join(dirpath, filename)), os.path.getsize(os.path.join(dirpath, filename)), stage) for filename in filenames]) # Index the files of the directory
+         connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('indexed', '1')") # Mark the existing outputs as indexed
+
+   OUTPUT_MANIFESTS[repository_name] = connection # Store the connection
+   return connection # Return the connection
+
+def record_output_files(repository_name, stage, file_paths):
+   """
+   Records the output files in the output manifest of the repository, with their size, checksum and producing stage.
+
+   :param repository_name: Name of the repository.
+   :param stage: The stage that produced the files, which is a key of the OUTPUT_MANIFEST_STAGES dictionary.
+   :param file_paths: List of the full paths of the output files. The files that don't exist are ignored.
+   :return: None
+   """
+
+   rows = [(get_output_manifest_relative_path(file_path), os.path.getsize(file_path), get_file_checksum(file_path), stage) for file_path in file_paths if os.path.isfile(file_path)] # The rows of the existing files
+   if not rows: # If there are no files to record
+      return # Nothing to record
+
+   connection = open_output_manifest(repository_name) # Open the output manifest
+   with connection: # Record the files in a single transaction
+      connection.executemany("INSERT OR REPLACE INTO files (path, size, checksum, stage) VALUES (?, ?, ?, ?)", rows) # Record the files
+
+def record_output_directory(repository_name, stage, directory_path):
+   """
+   Records the files of an output directory, such as the CK metrics directory of a commit, in the output manifest of the repository.
+
+   :param repository_name: Name of the repository.
+   :param stage: The stage that produced the files, which is a key of the OUTPUT_MANIFEST_STAGES dictionary.
+   :param directory_path: The full path of the output directory.
+   :return: None
+   """
+
+   if os.path.isdir(directory_path): # If the output directory exists
+      record_output_files(repository_name, stage, [entry.path for entry in os.scandir(directory_path) if entry.is_file()]) # Record the files of the directory
+
+def remove_output_directory_from_manifest(repository_name, directory_path):
+   """
+   Removes the files of a deleted output directory from the output manifest of the repository.
+
+   :param repository_name: Name of the repository.
+   :param directory_path: The full path of the deleted output directory.
+   :return: None
+   """
+
+   if not verify_filepath_exists(FULL_REPOSITORY_MANIFEST_FILE_PATH.replace("REPOSITORY_NAME", repository_name)): # If the repository has no output manifest
+      return # Nothing to remove
+
+   relative_directory_path = get_output_manifest_relative_path(directory_path).rstrip("/") # The path of the directory relative to the START_PATH directory
+   connection = open_output_manifest(repository_name) # Open the output manifest
+   with connection: # Remove the files in a single transaction
+      connection.execute("DELETE FROM files WHERE path = ? OR substr(path, 1, ?) = ?", (relative_directory_path, len(relative_directory_path) + 1, f"{relative_directory_path}/")) # Remove the files inside the directory
+
+def invalidate_output_manifest(repository_name):
+   """
+   Deletes the output manifest of the repository, as the outputs written while the USE_OUTPUT_MANIFEST constant is set to False are not indexed in it. The next execution that uses it indexes the existing outputs again.
+
+   :param repository_name: Name of the repository.
+   :return: None
+   """
+
+   close_output_manifest(repository_name) # Close the output manifest, if it is open
+   manifest_filepath = FULL_REPOSITORY_MANIFEST_FILE_PATH.replace("REPOSITORY_NAME", repository_name) # The path to the output manifest
+   for filepath in (manifest_filepath, f"{manifest_filepath}-wal", f"{manifest_filepath}-shm"): # Loop through the database and its write ahead log files
+      os.remove(filepath) if verify_filepath_exists(filepath) else None # Delete the file
+
+def close_output_manifest(repository_name):
+   """
+   Closes the output manifest of the repository, if it is open.
+
+   :param repository_name: Name of the repository.
+   :return: None
+   """
+
+   connection = OUTPUT_MANIFESTS.pop(repository_name, None) # Get and remove the open output manifest
+   connection.close() if connection is not None else None # Close the connection
+
+def query_output_manifest(repository_name, query, parameters=()):
+   """
+   Runs a read only query in the output manifest of the repository.
+
+   :param repository_name: Name of the repository.
+   :param query: The SQL query.
+   :param parameters: The parameters of the SQL query.
+   :return: The list of the result rows, or None if the repository has no output manifest.
+   """
+
+   manifest_filepath = FULL_REPOSITORY_MANIFEST_FILE_PATH.replace("REPOSITORY_NAME", repository_name) # The path to the output manifest
+   if not USE_OUTPUT_MANIFEST or not verify_filepath_exists(manifest_filepath): # If the output manifest is not used or doesn't exist
+      return None # There is no output manifest to query
+
+   connection = sqlite3.connect(f"file:{manifest_filepath}?mode=ro", uri=True, timeout=60) # Connect to the output manifest in read only mode
+   try: # Always close the output manifest
+      return connection.execute(query, parameters).fetchall() # Return the result rows
+   finally: # Close the output manifest
+      connection.close() # Close the connection
+
+def get_manifest_commit_files(repository_name, stage):
+   """
+   Gets the files of every commit directory of a stage from the output manifest of the repository.
+
+   :param repository_name: Name of the repository.
+   :param stage: The stage of the files, which is a key of the OUTPUT_MANIFEST_STAGES dictionary.
+   :return: Dictionary with the commit directory name ("<commit_number>-<commit_hash>") as key and the set of its file names as value, or None if the repository has no output manifest.
+   """
+
+   rows = query_output_manifest(repository_name, "SELECT path FROM files WHERE stage = ?", (stage,)) # The paths of the files of the stage
+   if rows is None: # If the repository has no output manifest
+      return None # There is no output manifest
+
+   commit_files = {} # The files of every commit directory
+   for (path,) in rows: # Loop through the paths
+      parts = path.split("/") # The parts of the path: output directory, repository name, commit directory and file name
+      commit_files.setdefault(parts[2], set()).add(parts[3]) if len(parts) == 4 else None # Add the file to its commit directory
+
+   return commit_files # Return the files of every commit directory
+
+def get_manifest_stage_size(repository_name, stage):
+   """
+   Gets the total size of the output files of a stage from the output manifest of the repository.
+
+   :param repository_name: Name of the repository.
+   :param stage: The stage of the files, which is a key of the OUTPUT_MANIFEST_STAGES dictionary.
+   :return: The total size of the files in bytes, or None if the repository has no output manifest.
+   """
+
+   rows = query_output_manifest(repository_name, "SELECT COALESCE(SUM(size), 0) FROM files WHERE stage = ?", (stage,)) # The total size of the files of the stage
+   return rows[0][0] if rows is not None else None # Return the total size of the files
+
 def handle_missing_commit_data(repo_path, commit_file_path):
    """
    Deletes the repository directory and commit file if the necessary columns are missing.
@@ -294,10 +585,11 @@ def handle_missing_commit_data(repo_path, commit_file_path):
    :param commit_file_path: Path to the commit file
    """
 
-   verbose_output(true_string=f"{BackgroundColors.RED}The necessary columns are missing in the {BackgroundColors.CYAN}{commit_file_path}{BackgroundColors.RED} file.{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.RED}The necessary columns are missing in the {BackgroundColors.CYAN}{commit_file_path}{BackgroundColors.RED} file.{Style.RESET_ALL}")
 
    if os.path.exists(repo_path): # If the repository directory exists
       os.system(f"rm -rf {repo_path}") # Delete the repository directory
+      remove_output_directory_from_manifest(os.path.basename(repo_path), repo_path) if USE_OUTPUT_MANIFEST else None # Remove the deleted files from the output manifest
    if os.path.exists(commit_file_path): # If the commit file exists
       os.remove(commit_file_path) # Delete the commit file
 
@@ -312,7 +604,7 @@ def get_commit_filepaths(repository_name, commit_file_path, repo_path):
    :return: List of file paths in the format '{Commit Number}-{Commit Hash}'
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Getting the commit filepaths for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Getting the commit filepaths for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 
    if not verify_filepath_exists(commit_file_path): # Verify if the file exists
       return [] # Return an empty list if the file does not exist
@@ -352,7 +644,7 @@ def is_local_repository_metrics_outdated(number_of_commits, total_commits_proces
    :return: The number of unprocessed commits.
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Checking if the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository is outdated...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Checking if the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository is outdated...{Style.RESET_ALL}")
 
    global RUN_FUNCTIONS # Access the global RUN_FUNCTIONS
 
@@ -361,20 +653,33 @@ def is_local_repository_metrics_outdated(number_of_commits, total_commits_proces
       RUN_FUNCTIONS["CK Metrics"] = True # Set CK metrics generation to True globally
    return unprocessed_commits # Return the number of unprocessed commits
 
-def verify_commit_files_exist(repo_path, commit_filepaths):
+def verify_commit_files_exist(repo_path, commit_filepaths, stored_commits=None, manifest_commit_files=None):
    """
-   Verifies that each commit in the list of commit filepaths has its corresponding folder and CK metrics files.
+   Verifies that each commit in the list of commit filepaths has its corresponding folder and CK metrics files, or is stored in the CK metrics store.
+   The commits whose CK metrics files are in the output manifest are trusted, unless the VERIFY_OUTPUT_MANIFEST constant is set to True, in which case their folders are verified with a single listing of the repository's CK metrics folder.
 
    :param repo_path: The base path of the repository's CK metrics folder.
    :param commit_filepaths: List of commit filepaths.
+   :param stored_commits: Dictionary with the commit number as key and the commit hash as value of the commits in the CK metrics store. If None, no commit is stored.
+   :param manifest_commit_files: Dictionary with the commit directory name as key and the set of its file names as value, from the output manifest. If None, no commit is in the output manifest.
    :return: True if all files exist, False otherwise.
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Verifying if all commit files exist in the {BackgroundColors.CYAN}{repo_path}{BackgroundColors.GREEN} directory...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Verifying if all commit files exist in the {BackgroundColors.CYAN}{repo_path}{BackgroundColors.GREEN} directory...{Style.RESET_ALL}")
+
+   stored_commits = stored_commits if stored_commits is not None else {} # The commits in the CK metrics store
+   manifest_commit_files = manifest_commit_files if manifest_commit_files is not None else {} # The CK metrics files of the commits in the output manifest
+   existing_folders = {entry.name for entry in os.scandir(repo_path) if entry.is_dir()} if VERIFY_OUTPUT_MANIFEST and manifest_commit_files and os.path.isdir(repo_path) else None # The commit folders that exist, listed once
 
    missing_files_count = 0 # Initialize the count of non-existing folders or files
 
    for ck_metrics_filepath in commit_filepaths: # Loop through the commit filepaths
+      if stored_commits.get(int(ck_metrics_filepath.split("-")[0])) == ck_metrics_filepath.split("-")[1]: # If the commit is in the CK metrics store
+         continue # The commit metrics exist
+
+      if manifest_commit_files.get(ck_metrics_filepath, set()).issuperset(CK_METRICS_FILES) and (existing_folders is None or ck_metrics_filepath in existing_folders): # If the CK metrics files of the commit are in the output manifest and its folder was not deleted
+         continue # The commit metrics exist
+
       folder_path = os.path.join(repo_path, ck_metrics_filepath) # Full path to the commit's metrics folder
 
       if verify_filepath_exists(folder_path): # Verify if the folder exists
@@ -395,9 +700,9 @@ def verify_ck_metrics_directory(repository_name, repository_url, number_of_commi
    :return: Tuple (bool, int) indicating if metrics are up to date or need further processing, and the number of unprocessed commits.
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Verifying if the metrics for {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} are calculated and up to date...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Verifying if the metrics for {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} are calculated and up to date...{Style.RESET_ALL}")
 
-   number_of_commits = sum(1 for _ in Repository(repository_url).traverse_commits()) if number_of_commits == 0 else number_of_commits # Get the total number of commits if not provided
+   number_of_commits = get_repository_commits_count(repository_name, repository_url) if number_of_commits == 0 else number_of_commits # Get the total number of commits if not provided
 
    repo_path = os.path.join(FULL_CK_METRICS_DIRECTORY_PATH, repository_name) # Full path to the repository's metrics directory
    commit_file = f"{repository_name}-commits_list{CSV_FILE_EXTENSION}" # The commit hashes file name
@@ -409,7 +714,9 @@ def verify_ck_metrics_directory(repository_name, repository_url, number_of_commi
       print(f"{BackgroundColors.RED}The list of commits for {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} is empty in the {BackgroundColors.CYAN}{commit_file}{BackgroundColors.RED} file.{Style.RESET_ALL}")
       return False, number_of_commits # Return False if the list is empty
 
-   missing_files_count = verify_commit_files_exist(repo_path, repository_ck_metrics_filepaths) # Verify if all commit files exist
+   stored_commits = get_metrics_store_commits(repository_name) if CK_METRICS_STORE else {} # Get the commits in the CK metrics store
+   manifest_commit_files = get_manifest_commit_files(repository_name, "ck_metrics") or {} # Get the CK metrics files of every commit from the output manifest
+   missing_files_count = verify_commit_files_exist(repo_path, repository_ck_metrics_filepaths, stored_commits, manifest_commit_files) # Verify if all commit files exist
    if missing_files_count > 0: # If there are missing commit files
       print(f"{BackgroundColors.RED}The {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository is missing {BackgroundColors.CYAN}{missing_files_count}{BackgroundColors.RED} commit files.{Style.RESET_ALL}")
       return False, missing_files_count # Return False if any commit metrics folder/files are missing
@@ -483,7 +790,7 @@ def get_last_execution_progress_filepath(repository_name):
    :return: The file path with the most progressed commits.
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Setting up the last execution progress file for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Setting up the last execution progress file for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 
    saved_progress_file = FULL_REPOSITORY_PROGRESS_FILE_PATH.replace("REPOSITORY_NAME", repository_name) # The path to the saved progress file
    commits_list_file = f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}-commits_list{CSV_FILE_EXTENSION}" # The path to the commits list file
@@ -568,6 +875,202 @@ def write_progress_file(file_path, commits_tuple_list):
       for commit_tuple in commits_tuple_list: # Loop through the commits tuple list
          writer.writerow(commit_tuple) # Write the current commit tuple to the CSV file
 
+def get_progress_journal_filepath(repository_name, shard_index=None, base_directory=START_PATH):
+   """
+   Gets the path of the progress journal of the repository or of one of its shards.
+
+   :param repository_name: Name of the repository to be analyzed.
+   :param shard_index: The index of the shard, or None for the progress journal of the whole repository.
+   :param base_directory: The directory that contains the progress directory.
+   :return: The path of the progress journal.
+   """
+
+   journal_filepath = base_directory + RELATIVE_REPOSITORY_PROGRESS_JOURNAL_FILE_PATH.replace("REPOSITORY_NAME", repository_name) # The path to the progress journal of the repository
+   return journal_filepath if shard_index is None else journal_filepath.replace("-progress.db", f"-shard-{shard_index}-of-{SHARD_COUNT}-progress.db") # Return the path to the progress journal of the repository or shard
+
+def open_progress_journal(repository_name, journal_filepath=None):
+   """
+   Opens the progress journal of the repository, creating it if it doesn't exist. When the progress journal of the whole repository is created, the commits of the progress or commits list CSV files of the previous executions are imported once.
+
+   :param repository_name: Name of the repository to be analyzed.
+   :param journal_filepath: The path of the progress journal. If None, it is the progress journal of the shard analyzed by this execution (SHARD_INDEX) or of the whole repository if it is not sharded.
+   :return: The connection to the progress journal.
+   """
+
+   journal_filepath = journal_filepath or get_progress_journal_filepath(repository_name, SHARD_INDEX if SHARD_COUNT > 1 else None) # The path to the progress journal
+   os.makedirs(os.path.dirname(journal_filepath), exist_ok=True) # Create the progress directory
+
+   connection = sqlite3.connect(journal_filepath, timeout=60) # Connect to the progress journal
+   connection.execute("PRAGMA journal_mode=WAL") # Write ahead log, so a crash never corrupts the journal
+   connection.execute("PRAGMA synchronous=NORMAL") # Only sync the write ahead log on checkpoints
+   connection.execute("CREATE TABLE IF NOT EXISTS commits (commit_number INTEGER PRIMARY KEY, commit_hash TEXT, commit_message TEXT, commit_date TEXT, lines_added INTEGER, lines_removed INTEGER, commit_code_churn INTEGER, code_churn_avg_per_file REAL, modified_files_count INTEGER, commit_url TEXT, ck_done INTEGER, diffs_done INTEGER)") # The completed commits
+   connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)") # The journal metadata, such as the last completed commit
+
+   if connection.execute("SELECT value FROM meta WHERE key = 'csv_imported'").fetchone() is None: # If the CSV files were not imported yet
+      lines = read_progress_file(get_last_execution_progress_filepath(repository_name)) if journal_filepath == get_progress_journal_filepath(repository_name) else [] # Read the most progressed CSV file, which only has the commits of the whole repository
+      commits_info = parse_commit_info(lines)[0] if lines else [] # Parse the commits of the CSV file
+      write_progress_journal_commits(connection, commits_info) # Import the commits
+      with connection: # Mark the CSV files as imported
+         connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('csv_imported', '1')") # Mark the CSV files as imported
+
+   return connection # Return the connection
+
+def write_progress_journal_commits(connection, commits_tuple_list, stages_done=None):
+   """
+   Writes the completed commits and the last completed commit to the progress journal in a single transaction.
+   The CK and diffs completion state of a commit that is already in the progress journal is kept, so an execution that doesn't run a stage doesn't mark it as not done.
+
+   :param connection: The connection to the progress journal.
+   :param commits_tuple_list: List of commit information tuples, in commit number order.
+   :param stages_done: List of tuples (ck_done, diffs_done) of the commits, in the same order, whose values are 1 if the stage output of the commit was written, 0 if it wasn't or None if it is unknown. If None, the completion state of every commit is unknown.
+   :return: None
+   """
+
+   if not commits_tuple_list: # If there are no commits to write
+      return # Nothing to write
+
+   stages_done = stages_done if stages_done is not None else [(None, None)] * len(commits_tuple_list) # The completion state of the commits
+
+   with connection: # Write the commits in a single transaction
+      connection.executemany("INSERT INTO commits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (commit_number) DO UPDATE SET commit_hash = excluded.commit_hash, commit_message = excluded.commit_message, commit_date = excluded.commit_date, lines_added = excluded.lines_added, lines_removed = excluded.lines_removed, commit_code_churn = excluded.commit_code_churn, code_churn_avg_per_file = excluded.code_churn_avg_per_file, modified_files_count = excluded.modified_files_count, commit_url = excluded.commit_url, ck_done = CASE WHEN commits.commit_hash != excluded.commit_hash THEN excluded.ck_done ELSE MAX(COALESCE(commits.ck_done, excluded.ck_done), COALESCE(excluded.ck_done, commits.ck_done)) END, diffs_done = CASE WHEN commits.commit_hash != excluded.commit_hash THEN excluded.diffs_done ELSE MAX(COALESCE(commits.diffs_done, excluded.diffs_done), COALESCE(excluded.diffs_done, commits.diffs_done)) END", [(*commit_tuple[:3], str(commit_tuple[3]), *commit_tuple[4:], *commit_stages_done) for commit_tuple, commit_stages_done in zip(commits_tuple_list, stages_done)]) # Write the commits, keeping the stages already done of the same commits
+      connection.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [("last_completed_commit_number", str(commits_tuple_list[-1][0])), ("last_completed_commit_hash", commits_tuple_list[-1][1])]) # Write the last completed commit
+
+def get_progress_journal_last_commit(connection):
+   """
+   Gets the last completed commit from the progress journal.
+
+   :param connection: The connection to the progress journal.
+   :return: A tuple with the last completed commit number and hash, or (0, None) if no commit was completed.
+   """
+
+   meta = dict(connection.execute("SELECT key, value FROM meta WHERE key IN ('last_completed_commit_number', 'last_completed_commit_hash')").fetchall()) # Read the last completed commit
+   return int(meta.get("last_completed_commit_number", 0)), meta.get("last_completed_commit_hash") # Return the last completed commit number and hash
+
+def read_progress_journal_commits(connection):
+   """
+   Reads the completed commits from the progress journal.
+
+   :param connection: The connection to the progress journal.
+   :return: List of commit information tuples, in commit number order.
+   """
+
+   rows = connection.execute("SELECT commit_number, commit_hash, commit_message, commit_date, lines_added, lines_removed, commit_code_churn, code_churn_avg_per_file, modified_files_count, commit_url FROM commits ORDER BY commit_number").fetchall() # Read the completed commits
+   return [(*row[:3], datetime.fromisoformat(row[3]), *row[4:]) for row in rows] # Return the commit tuples with the commit date as a datetime
+
+def read_progress_journal_stages(connection):
+   """
+   Reads the CK and diffs completion state of the completed commits from the progress journal.
+
+   :param connection: The connection to the progress journal.
+   :return: Dictionary with the commit number as key and the tuple (ck_done, diffs_done) as value.
+   """
+
+   return {row[0]: (row[1], row[2]) for row in connection.execute("SELECT commit_number, ck_done, diffs_done FROM commits")} # Return the completion state of the commits
+
+def export_progress_journal_to_csv(repository_name, file_path):
+   """
+   Exports the completed commits of the progress journal to a CSV file in the progress file format.
+
+   :param repository_name: Name of the repository to be analyzed.
+   :param file_path: Path of the exported CSV file.
+   :return: None
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Exporting the progress journal of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository to the {BackgroundColors.CYAN}{file_path}{BackgroundColors.GREEN} file...{Style.RESET_ALL}")
+
+   connection = open_progress_journal(repository_name) # Open the progress journal
+   try: # Always close the progress journal
+      write_progress_file(file_path, read_progress_journal_commits(connection)) # Write the completed commits to the CSV file
+   finally: # Close the progress journal
+      connection.close() # Close the connection
+
+def read_execution_time_training_data():
+   """
+   Reads the previous executions from the repositories attributes file, which are used to train the execution time estimator.
+
+   :return: Dictionary with the repository name as key and its seconds per commit as value.
+   """
+
+   training_data = {} # The previous executions of the repositories
+   if not verify_filepath_exists(FULL_REPOSITORIES_ATTRIBUTES_FILE_PATH): # If the repositories attributes file does not exist
+      return training_data # Return an empty dictionary
+
+   try: # Try to read the repositories attributes file
+      with open(FULL_REPOSITORIES_ATTRIBUTES_FILE_PATH, "r", newline="") as csv_file: # Open the repositories attributes file
+         for row in csv.DictReader(csv_file): # Loop through the repositories
+            commits = float(row["Number of Commits"] or 0) # The number of analyzed commits
+            if commits > 0: # If the repository has analyzed commits
+               training_data[row["Repository Name"]] = float(row["Execution Time (Minutes)"] or 0) * 60 / commits # Store the seconds per commit
+   except Exception as e: # Handle exceptions
+      print(f"{BackgroundColors.RED}An error occurred while reading the {BackgroundColors.CYAN}{FULL_REPOSITORIES_ATTRIBUTES_FILE_PATH}{BackgroundColors.RED} file: {e}{Style.RESET_ALL}")
+
+   return training_data # Return the previous executions
+
+def get_execution_time_features(repository_name):
+   """
+   Builds the features vector of the execution time estimator from the local clone of the repository, as they are cheap to compute before the repository is processed: its number of Java files, the size of its packed objects and its number of commits.
+
+   :param repository_name: Name of the repository.
+   :return: The features vector (bias, thousands of Java files, packed size in GB, thousands of commits), or None if the repository has no local clone.
+   """
+
+   if repository_name in EXECUTION_TIME_FEATURES: # If the features of the repository were already computed
+      return EXECUTION_TIME_FEATURES[repository_name] # Return the cached features
+
+   repository_directory_path = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the local clone
+   if not os.path.isdir(repository_directory_path): # If the repository was not cloned yet
+      return None # The features can't be computed
+
+   try: # Try to read the features from the local clone
+      java_files = subprocess.run(["git", "-C", repository_directory_path, "ls-files", "*.java"], capture_output=True, text=True, check=True).stdout.count("\n") # The number of Java files of the current commit
+      objects = dict(line.split(": ", 1) for line in subprocess.run(["git", "-C", repository_directory_path, "count-objects", "-v"], capture_output=True, text=True, check=True).stdout.splitlines()) # The statistics of the objects of the clone
+   except (subprocess.CalledProcessError, ValueError) as e: # If the local clone is not a valid git repository
+      print(f"{BackgroundColors.RED}An error occurred while reading the features of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository: {e}{Style.RESET_ALL}")
+      return None # The features can't be computed
+
+   packed_size_in_gb = (float(objects.get("size-pack", 0)) + float(objects.get("size", 0))) / (1024 ** 2) # The size of the packed and loose objects, which is reported in KB
+   EXECUTION_TIME_FEATURES[repository_name] = np.array([1.0, java_files / 1000, packed_size_in_gb, count_commits(repository_directory_path) / 1000]) # Cache the features vector
+   return EXECUTION_TIME_FEATURES[repository_name] # Return the features vector
+
+def estimate_seconds_per_commit(repository_name):
+   """
+   Estimates the time to process each commit of the repository, by fitting the seconds per commit of the previous executions to the number of Java files, packed size and number of commits of their local clones with least squares.
+   If the repository was executed before, its own seconds per commit is used. If the repository has no local clone or there are not enough previous executions with a local clone to fit the estimator, the average seconds per commit of the previous executions is used.
+
+   :param repository_name: Name of the repository.
+   :return: The estimated seconds per commit.
+   """
+
+   training_data = read_execution_time_training_data() # The previous executions
+   if not training_data: # If there are no previous executions
+      return DEFAULT_SECONDS_PER_COMMIT # Return the default seconds per commit
+
+   if repository_name in training_data: # If the repository was executed before
+      return float(training_data[repository_name]) # Return its seconds per commit
+
+   seconds_per_commit = np.array(list(training_data.values())) # The seconds per commit of the previous executions
+   repository_features = get_execution_time_features(repository_name) # The features of the repository
+   training_features = {name: get_execution_time_features(name) for name in training_data.keys()} # The features of the previous executions
+   training_names = [name for name, features in training_features.items() if features is not None] # The previous executions with a local clone
+
+   if repository_features is None or len(training_names) <= len(repository_features): # If the repository has no local clone or there are not enough previous executions to fit the estimator
+      return float(seconds_per_commit.mean()) # Return the average seconds per commit
+
+   features = np.array([training_features[name] for name in training_names]) # The features of the previous executions
+   coefficients = np.linalg.lstsq(features, np.array([training_data[name] for name in training_names]), rcond=None)[0] # Fit the estimator
+   return float(max(repository_features @ coefficients, seconds_per_commit.min())) # Return the estimated seconds per commit, which can't be lower than the fastest previous execution
+
+def estimate_repository_execution_time(repository_name, number_of_commits):
+   """
+   Estimates the time to process a number of commits of the repository.
+
+   :param repository_name: Name of the repository.
+   :param number_of_commits: Number of commits to be processed.
+   :return: The estimated execution time in seconds.
+   """
+
+   return round(estimate_seconds_per_commit(repository_name) * number_of_commits, 2) # Return the estimated execution time
+
 def get_last_execution_progress(repository_name, saved_progress_file, number_of_commits):
    """
    Gets the last execution progress of the repository.
@@ -578,20 +1081,30 @@ def get_last_execution_progress(repository_name, saved_progress_file, number_of_
    :return: The commits_info, last_commit_number, and last_commit_hash.
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Getting the last execution progress of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Getting the last execution progress of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 
-   lines = read_progress_file(saved_progress_file) # Read the progress file
    commits_info = [] # Initialize the list of commit information
    last_execution_progress = [0, None] # Initialize the last execution progress
 
-   if lines: # If there are lines in the progress file
-      commits_info, last_execution_progress[0], last_execution_progress[1] = parse_commit_info(lines) # Parse the commit information
+   if USE_PROGRESS_JOURNAL: # If the progress is stored in the progress journal
+      connection = open_progress_journal(repository_name) # Open the progress journal
+      try: # Always close the progress journal
+         last_execution_progress[0], last_execution_progress[1] = get_progress_journal_last_commit(connection) # Get the last completed commit, without reading the whole journal
+         commits_info = read_progress_journal_commits(connection) if last_execution_progress[0] > 0 else [] # Read the already typed completed commits
+      finally: # Close the progress journal
+         connection.close() # Close the connection
+   else: # If the progress is stored in the progress file
+      lines = read_progress_file(saved_progress_file) # Read the progress file
+      if lines: # If there are lines in the progress file
+         commits_info, last_execution_progress[0], last_execution_progress[1] = parse_commit_info(lines) # Parse the commit information
+      else: # If there is no progress file
+         write_progress_file(saved_progress_file, commits_info) # Create the file if no progress exists
+
+   if last_execution_progress[0] > 0: # If there is a previous execution progress
       percentage_progress = calculate_percentage_progress(last_execution_progress[0], number_of_commits) # Calculate the percentage progress
       print(f"{BackgroundColors.GREEN}{BackgroundColors.CYAN}{repository_name.title()}{BackgroundColors.GREEN} stopped executing at {BackgroundColors.CYAN}{percentage_progress}%{BackgroundColors.GREEN} of its progress in the {BackgroundColors.CYAN}{last_execution_progress[0]}º{BackgroundColors.GREEN} commit: {BackgroundColors.CYAN}{last_execution_progress[0]}{BackgroundColors.GREEN}.{Style.RESET_ALL}")
       execution_time = f"{BackgroundColors.GREEN}Estimated time for running the remaining iterations in {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN}: {Style.RESET_ALL}"
-      output_time(execution_time, number_of_commits - last_execution_progress[0]) # Output estimated time for remaining iterations
-   else:
-      write_progress_file(saved_progress_file, commits_info) # Create the file if no progress exists
+      output_time(execution_time, estimate_repository_execution_time(repository_name, number_of_commits - last_execution_progress[0])) # Output estimated time for remaining iterations
 
    return commits_info, last_execution_progress # Return the commits_info and last_commit_number
 
@@ -605,7 +1118,7 @@ def get_repository_attributes(repository_name, number_of_commits, elapsed_time):
    :return: A dictionary with repository attributes.
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Retrieving the repository attributes...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Retrieving the repository attributes...{Style.RESET_ALL}")
 
    output_directory = os.path.join(FULL_CK_METRICS_DIRECTORY_PATH, repository_name) # The path to the CK metrics directory
    sorted_dirs = get_filtered_sorted_directories(output_directory) # Get and sort directories
@@ -616,7 +1129,7 @@ def get_repository_attributes(repository_name, number_of_commits, elapsed_time):
    total_classes, total_lines_of_code = get_classes_count_and_loc_metrics(last_directory_path) # Get the total number of classes and lines of code
 
    # Get the size of the output directories in GB and the progress file size in GB
-   output_dirs_size = get_directories_size_in_gb(repository_name, OUTPUT_DIRECTORIES) + get_file_size_in_gb(FULL_REPOSITORY_PROGRESS_FILE_PATH.replace("REPOSITORY_NAME", repository_name))
+   output_dirs_size = get_directories_size_in_gb(repository_name, OUTPUT_DIRECTORIES) + get_file_size_in_gb(FULL_REPOSITORY_PROGRESS_FILE_PATH.replace("REPOSITORY_NAME", repository_name)) + get_file_size_in_gb(FULL_REPOSITORY_PROGRESS_JOURNAL_FILE_PATH.replace("REPOSITORY_NAME", repository_name))
 
    return { # Return the repository attributes dictionary
       "repository_name": repository_name, # Name of the repository
@@ -627,6 +1140,222 @@ def get_repository_attributes(repository_name, number_of_commits, elapsed_time):
       "size_in_gb": round(output_dirs_size, 2) # Size of the output directories in GB
    }
 
+def parse_git_log_commits(git_log_output):
+   """
+   Parses the output of "git log -z --raw --numstat" with the "%x1e%H%x1f%P%x1f%cI%x1f%B%x1f" format into the commits metadata records.
+
+   :param git_log_output: The output of the git log command.
+   :return: List of dictionaries with the "hash", "parents", "committer_date", "msg" and "files" keys, where every file is a list [old_path, new_path, added_lines, deleted_lines].
+   """
+
+   records = [] # The commits metadata records
+
+   for chunk in git_log_output.split("\x1e")[1:]: # Loop through the commits
+      commit_hash, parents, committer_date, message, changes = chunk.split("\x1f", 4) # Split the commit header and its changes
+      tokens = changes.lstrip("\0\n").split("\0") # The NUL separated raw and numstat entries
+      raw_entries, numstat_entries = [], [] # The (status, old path, new path) and (added lines, deleted lines) of every modified file
+
+      index = 0 # The index of the current token
+      while index < len(tokens): # Loop through the tokens
+         token = tokens[index].lstrip("\n") # The current token
+         if token.startswith(":"): # If it is a raw entry, such as ":100644 100644 sha sha M"
+            status = token.split()[-1][0] # The status letter of the modified file
+            raw_entries.append((status, tokens[index + 1], tokens[index + 2]) if status in "RC" else (status, tokens[index + 1], tokens[index + 1])) # Add the modified file with its old and new paths
+            index += 3 if status in "RC" else 2 # Go to the next entry
+         elif "\t" in token: # If it is a numstat entry, such as "added\tdeleted\tpath"
+            added_lines, deleted_lines, path = token.split("\t", 2) # Split the added lines, deleted lines and path
+            numstat_entries.append((int(added_lines) if added_lines != "-" else 0, int(deleted_lines) if deleted_lines != "-" else 0)) # Add the lines of the modified file, which are 0 for binary files
+            index += 1 if path else 3 # Go to the next entry, skipping the old and new paths of the renamed files
+         else: # If it is an empty token
+            index += 1 # Go to the next token
+
+      records.append({
+         "hash": commit_hash,
+         "parents": parents.split(),
+         "committer_date": committer_date,
+         "msg": message.strip(),
+         "files": [[old_path if status != "A" else None, new_path if status != "D" else None, added_lines, deleted_lines] for (status, old_path, new_path), (added_lines, deleted_lines) in zip(raw_entries, numstat_entries)],
+      }) # Add the commit metadata record
+
+   return records # Return the commits metadata records
+
+def extract_commits_metadata(repository_directory_path, revision_range):
+   """
+   Extracts the metadata of the commits of a revision range with a single git log command, which computes the added and deleted lines without generating the diffs in Python.
+
+   :param repository_directory_path: Path to the repository directory.
+   :param revision_range: The revision range, such as "HEAD" or "<commit_hash>..HEAD".
+   :return: List of the commits metadata records, from the oldest to the newest.
+   """
+
+   result = subprocess.run(["git", "log", "--reverse", "-z", "-M", "--raw", "--numstat", "--format=%x1e%H%x1f%P%x1f%cI%x1f%B%x1f", revision_range], cwd=repository_directory_path, capture_output=True, text=True, encoding="utf-8", errors="replace") # Stream the commits with their modified files
+   if result.returncode != 0: # If git log failed
+      print(f"{BackgroundColors.RED}Failed to extract the commits metadata of {BackgroundColors.CYAN}{repository_directory_path}{BackgroundColors.RED}: {result.stderr.strip()}{Style.RESET_ALL}")
+      return [] # Return no commits
+
+   return parse_git_log_commits(result.stdout) # Return the parsed commits
+
+def read_commits_metadata_file(commits_metadata_filepath):
+   """
+   Reads the commits metadata records of a commits metadata file.
+
+   :param commits_metadata_filepath: Path to the commits metadata file.
+   :return: List of the commits metadata records.
+   """
+
+   with gzip.open(commits_metadata_filepath, "rt", encoding="utf-8") as commits_metadata_file: # Open the commits metadata file, which may have many gzip members
+      return [json.loads(line) for line in commits_metadata_file if line.strip()] # Return the records
+
+def update_commits_metadata(repository_name, repository_url):
+   """
+   Updates the commits metadata file of the repository, appending only the commits that are not in it yet. If the history of the repository was rewritten, or the appended commits are not in the "git rev-list --reverse HEAD" order of the commit numbers, such as when a branch with older commits was merged, the file is generated again.
+
+   :param repository_name: Name of the repository.
+   :param repository_url: URL of the repository.
+   :return: List of the commits metadata records, from the oldest to the newest.
+   """
+
+   commits_metadata_filepath = f"{FULL_COMMITS_METADATA_DIRECTORY_PATH}/{repository_name}.jsonl.gz" # The commits metadata file of the repository
+   repository_directory_path = get_local_repository_path(repository_name, repository_url) # The path to the local clone
+   records = read_commits_metadata_file(commits_metadata_filepath) if verify_filepath_exists(commits_metadata_filepath) else [] # The stored commits metadata records
+
+   if records and subprocess.run(["git", "merge-base", "--is-ancestor", records[-1]["hash"], "HEAD"], cwd=repository_directory_path, capture_output=True).returncode != 0: # If the last stored commit is no longer in the history
+      print(f"{BackgroundColors.YELLOW}The history of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.YELLOW} repository changed, so its commits metadata are extracted again.{Style.RESET_ALL}")
+      records = [] # Discard the stored records
+      os.remove(commits_metadata_filepath) # Delete the outdated commits metadata file
+
+   new_records = extract_commits_metadata(repository_directory_path, f"{records[-1]['hash']}..HEAD" if records else "HEAD") # Extract the commits that are not stored yet
+   if new_records: # If there are new commits
+      verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Storing the metadata of {BackgroundColors.CYAN}{len(new_records)}{BackgroundColors.GREEN} commits of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+      os.makedirs(FULL_COMMITS_METADATA_DIRECTORY_PATH, exist_ok=True) # Create the commits metadata directory
+      with gzip.open(commits_metadata_filepath, "at", encoding="utf-8") as commits_metadata_file: # Append a new gzip member to the commits metadata file
+         commits_metadata_file.writelines(f"{json.dumps(record)}\n" for record in new_records) # Write one JSON record per line
+
+   records += new_records # Every commit metadata record
+   if new_records and [record["hash"] for record in records] != get_repository_commit_hashes(repository_name, repository_url): # If the appended commits diverged from the commit numbers order
+      print(f"{BackgroundColors.YELLOW}The new commits of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.YELLOW} repository are not in the commit numbers order, so its commits metadata are extracted again.{Style.RESET_ALL}")
+      records = extract_commits_metadata(repository_directory_path, "HEAD") # Extract every commit in the commit numbers order
+      with gzip.open(commits_metadata_filepath, "wt", encoding="utf-8") as commits_metadata_file: # Rewrite the commits metadata file
+         commits_metadata_file.writelines(f"{json.dumps(record)}\n" for record in records) # Write one JSON record per line
+
+   return records # Return every commit metadata record
+
+def get_commits_metadata(repository_name, repository_url):
+   """
+   Gets the commits of the repository from its commits metadata file, as lightweight commit objects with the hash, parents, committer_date, msg and modified_files attributes.
+
+   :param repository_name: Name of the repository.
+   :param repository_url: URL of the repository.
+   :return: List of the CommitMetadata objects, from the oldest to the newest.
+   """
+
+   return [CommitMetadata(
+      record["hash"],
+      record["parents"],
+      datetime.fromisoformat(record["committer_date"]),
+      record["msg"],
+      [ModifiedFileMetadata(old_path, new_path, os.path.basename(new_path or old_path), added_lines, deleted_lines) for old_path, new_path, added_lines, deleted_lines in record["files"]],
+   ) for record in update_commits_metadata(repository_name, repository_url)] # Return the commits
+
+def traverse_commits_metadata(repository_name, repository_url, only_commits=None, from_commit=None):
+   """
+   Traverses the commits of the repository from its commits metadata file, with the same only_commits and from_commit filters of the PyDriller Repository.
+
+   :param repository_name: Name of the repository.
+   :param repository_url: URL of the repository.
+   :param only_commits: List of the commit hashes to be traversed. If None, every commit is traversed.
+   :param from_commit: The commit hash to start from, which is included. If None, the traversal starts from the first commit.
+   :return: A generator of the CommitMetadata objects, from the oldest to the newest.
+   """
+
+   only_commits = set(only_commits) if only_commits is not None else None # The commit hashes to be traversed
+   started = from_commit is None # If the traversal already started
+
+   for commit in get_commits_metadata(repository_name, repository_url): # Loop through the commits
+      started = started or commit.hash == from_commit # Start the traversal at the from_commit commit
+      if started and (only_commits is None or commit.hash in only_commits): # If the commit must be traversed
+         yield commit # Yield the commit
+
+def materialize_commit(commit):
+   """
+   Materializes the attributes of a PyDriller commit used by this script, as the PyDriller commits compute the diffs of the modified files again every time they are accessed and they must only be accessed by the history reader thread.
+
+   :param commit: The PyDriller commit object or a CommitMetadata object.
+   :return: The CommitMetadata object of the commit, with the diffs of the modified files if the diffs are generated.
+   """
+
+   if isinstance(commit, CommitMetadata): # If the commit was read from the commits metadata file
+      return commit # It is already materialized
+
+   return CommitMetadata(
+      commit.hash,
+      commit.parents,
+      commit.committer_date,
+      commit.msg,
+      [ModifiedFileMetadata(modified_file.old_path, modified_file.new_path, modified_file.filename, modified_file.added_lines, modified_file.deleted_lines, modified_file.diff if RUN_FUNCTIONS["Diffs"] else None) for modified_file in commit.modified_files],
+   ) # Return the materialized commit
+
+def put_in_pipeline_queue(pipeline_queue, item, stop_event):
+   """
+   Puts an item in a bounded pipeline queue, waiting while it is full, unless the pipeline is stopped.
+
+   :param pipeline_queue: The bounded queue.
+   :param item: The item to be put in the queue.
+   :param stop_event: The event set when the consumer of the queue stops.
+   :return: True if the item was put in the queue, False if the pipeline was stopped.
+   """
+
+   while not stop_event.is_set(): # While the consumer is running
+      try: # Try to put the item in the queue
+         pipeline_queue.put(item, timeout=1) # Put the item, waiting up to 1 second for a free slot
+         return True # The item was put in the queue
+      except queue.Full: # If the queue is still full
+         continue # Wait again, verifying if the consumer stopped
+
+   return False # The pipeline was stopped
+
+def read_commits_into_queue(commits, commits_queue, stop_event):
+   """
+   Reads the commits of the history, materializing them, into the bounded commits queue. It runs in the history reader thread and puts None in the queue when the history ends, or the exception that stopped it.
+
+   :param commits: The iterable of the PyDriller commits or CommitMetadata objects.
+   :param commits_queue: The bounded queue of the materialized commits.
+   :param stop_event: The event set when the consumer of the queue stops.
+   :return: None
+   """
+
+   try: # Try to read the whole history
+      for commit in commits: # Loop through the commits of the history
+         if not put_in_pipeline_queue(commits_queue, materialize_commit(commit), stop_event): # If the consumer stopped
+            return # Stop reading the history
+      put_in_pipeline_queue(commits_queue, None, stop_event) # Signal the end of the history
+   except Exception as e: # If reading the history failed
+      put_in_pipeline_queue(commits_queue, e, stop_event) # Pass the exception to the consumer
+
+def prefetch_commits(commits, queue_size=PIPELINE_QUEUE_COMMITS):
+   """
+   Reads the commits of the history in a background thread, at most queue_size commits ahead of the consumer, so reading the history and computing the diffs overlaps with writing the diffs and running CK.
+
+   :param commits: The iterable of the PyDriller commits or CommitMetadata objects.
+   :param queue_size: The maximum number of commits read ahead.
+   :return: A generator of the materialized CommitMetadata objects, in the history order.
+   """
+
+   commits_queue = queue.Queue(maxsize=max(1, queue_size)) # The bounded queue between the history reader and the consumer
+   stop_event = threading.Event() # Set when the consumer stops, so the history reader stops too
+   threading.Thread(target=read_commits_into_queue, args=(commits, commits_queue, stop_event), daemon=True).start() # Start the history reader thread
+
+   try: # Stop the history reader when the consumer stops
+      while True: # Loop until the history ends
+         commit = commits_queue.get() # Get the next commit, waiting for the history reader
+         if commit is None: # If the history ended
+            return # Stop the generator
+         if isinstance(commit, Exception): # If reading the history failed
+            raise commit # Raise the exception of the history reader
+         yield commit # Yield the commit
+   finally: # When the consumer stops
+      stop_event.set() # Stop the history reader
+
 def calculate_code_churn(commit):
    """"
    Calculate the code churn for a commit.
@@ -649,7 +1378,7 @@ def write_diff_if_different(diff_file_path, file_diff):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Writing the diff to the {BackgroundColors.CYAN}{diff_file_path}{BackgroundColors.GREEN} file...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Writing the diff to the {BackgroundColors.CYAN}{diff_file_path}{BackgroundColors.GREEN} file...{Style.RESET_ALL}")
 
    if verify_filepath_exists(diff_file_path): # Verify if the diff file exists
       with open(diff_file_path, "r", encoding="utf-8", errors="ignore") as existing_file: # Read the existing content for comparison
@@ -662,45 +1391,205 @@ def write_diff_if_different(diff_file_path, file_diff):
       with open(diff_file_path, "w", encoding="utf-8", errors="ignore") as diff_file: # Open the diff file to write
          diff_file.write(file_diff) # Write the diff content
 
-def generate_diffs(repository_name, commit, commit_number):
+def get_diff_pack_paths(repository_name, base_directory=START_PATH):
    """
-   Generates the diffs for the commits of a repository.
+   Gets the paths of the diff pack and of its index of the repository.
 
-   :param repository_name: Name of the repository to be analyzed.
-   :param commit: The commit object to be analyzed.
-   :param commit_number: Number of the commit to be analyzed.
-   :return: None
+   :param repository_name: Name of the repository.
+   :param base_directory: The directory that contains the diffs directory.
+   :return: A tuple with the diff pack path and the diff pack index path.
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Generating the diffs for the {BackgroundColors.CYAN}{commit_number}º{BackgroundColors.GREEN} commit of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
-
-   for modified_file in commit.modified_files: # Loop through the modified files of the commit
-      file_diff = modified_file.diff # Get the diff of the modified file
+   repository_diffs_directory = f"{base_directory}{RELATIVE_DIFFS_DIRECTORY_PATH}/{repository_name}" # The diffs directory of the repository
+   return f"{repository_diffs_directory}/{DIFF_PACK_FILENAME}", f"{repository_diffs_directory}/{DIFF_PACK_INDEX_FILENAME}" # Return the diff pack and index paths
 
-      diff_file_directory = f"{START_PATH}{RELATIVE_DIFFS_DIRECTORY_PATH}/{repository_name}/{commit_number}-{commit.hash}/" # Define the diff file directory
-      diff_file_path = f"{diff_file_directory}{modified_file.filename}{DIFF_FILE_EXTENSION}" # Define the diff file path
+def verify_diff_pack_exists(repository_name):
+   """
+   Verifies if the diff pack of the repository exists.
 
-      if not verify_filepath_exists(diff_file_directory): # Verify if the directory does not exist
-         os.makedirs(diff_file_directory, exist_ok=True) # Create the directory
+   :param repository_name: Name of the repository.
+   :return: True if the diff pack and its index exist, False otherwise.
+   """
 
-      write_diff_if_different(diff_file_path, file_diff) # Call helper function to write the diff if it’s different
+   return all(verify_filepath_exists(path) for path in get_diff_pack_paths(repository_name)) # Return True if the diff pack and its index exist
 
-def checkout_branch(branch_name):
+def open_diff_pack_index(index_filepath):
    """
-   Checks out a specific branch.
+   Opens the index of a diff pack, creating its table if it doesn't exist.
 
-   :param branch_name: Name of the branch to be checked out.
-   :return: None
+   :param index_filepath: Path of the diff pack index.
+   :return: The connection to the diff pack index.
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Checking out the {BackgroundColors.CYAN}{branch_name}{BackgroundColors.GREEN} branch...{Style.RESET_ALL}")
+   connection = sqlite3.connect(index_filepath, timeout=60, check_same_thread=False) # Connect to the diff pack index
+   connection.execute("PRAGMA journal_mode=WAL") # Allow reading the index while the diffs are being written
+   connection.execute("CREATE TABLE IF NOT EXISTS diffs (commit_id TEXT, path TEXT, filename TEXT, offset INTEGER, length INTEGER, sha TEXT, PRIMARY KEY (commit_id, path))") # The position of the diff of each modified file of each commit in the pack
+   connection.execute("CREATE INDEX IF NOT EXISTS diffs_filename ON diffs (commit_id, filename)") # The index used to find the diffs by the file name
+   return connection # Return the connection
 
-   checkout_thread = subprocess.Popen(["git", "checkout", branch_name], stdout=subprocess.PIPE, stderr=subprocess.PIPE) # Run the Git command to checkout the branch
-   checkout_thread.wait() # Wait for the thread to finish
+def open_diff_pack(repository_name):
+   """
+   Opens the diff pack of the repository to append diffs, keeping it open until close_diff_pack is called.
 
-def generate_output_directory_paths(repository_name, commit_number, commit_hash):
+   :param repository_name: Name of the repository.
+   :return: A tuple with the diff pack file and the connection to its index.
    """
-   Generates the output directory path for the CK metrics generator.
+
+   if repository_name not in DIFF_PACKS: # If the diff pack is not open yet
+      pack_filepath, index_filepath = get_diff_pack_paths(repository_name) # Get the diff pack paths
+      os.makedirs(os.path.dirname(pack_filepath), exist_ok=True) # Create the diffs directory of the repository
+      DIFF_PACKS[repository_name] = (open(pack_filepath, "ab"), open_diff_pack_index(index_filepath)) # Open the diff pack to append and its index
+
+   return DIFF_PACKS[repository_name] # Return the diff pack file and index connection
+
+def close_diff_pack(repository_name):
+   """
+   Closes the diff pack of the repository, if it is open.
+
+   :param repository_name: Name of the repository.
+   :return: None
+   """
+
+   pack_file, connection = DIFF_PACKS.pop(repository_name, (None, None)) # Get and remove the open diff pack
+   if pack_file is not None: # If the diff pack was open
+      pack_file.close() # Close the diff pack
+      connection.close() # Close the index connection
+
+def write_packed_diffs(repository_name, commit_id, modified_files):
+   """
+   Appends the diffs of the modified files of a commit to the diff pack of the repository. A diff is only appended if its hash differs from the indexed one, so resuming an execution doesn't read nor rewrite the diffs already packed.
+
+   :param repository_name: Name of the repository.
+   :param commit_id: The commit id, in the "<commit_number>-<commit_hash>" format.
+   :param modified_files: The modified files of the commit.
+   :return: None
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Packing the diffs of the {BackgroundColors.CYAN}{commit_id}{BackgroundColors.GREEN} commit of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+
+   pack_file, connection = open_diff_pack(repository_name) # Open the diff pack of the repository
+   indexed_shas = dict(connection.execute("SELECT path, sha FROM diffs WHERE commit_id = ?", (commit_id,)).fetchall()) # The hashes of the diffs already packed for the commit
+
+   entries = [] # The index entries of the appended diffs
+   for modified_file in modified_files: # Loop through the modified files of the commit
+      path = modified_file.new_path or modified_file.old_path # The full path of the modified file, which is the old path if the file was deleted
+      diff_content = modified_file.diff.encode("utf-8", errors="ignore") # The diff content
+      diff_sha = hashlib.sha1(diff_content).hexdigest() # The hash of the diff content
+      if indexed_shas.get(path) == diff_sha: # If the same diff is already packed
+         continue # Skip the diff
+
+      compressed_diff = zlib.compress(diff_content) # Compress the diff
+      pack_file.seek(0, os.SEEK_END) # Go to the end of the diff pack
+      entries.append((commit_id, path, os.path.basename(path), pack_file.tell(), len(compressed_diff), diff_sha)) # Store the position of the diff in the pack
+      pack_file.write(compressed_diff) # Append the compressed diff
+
+   if entries: # If any diff was appended
+      pack_file.flush() # Write the diffs to the pack before indexing them
+      with connection: # Index the diffs in a single transaction
+         connection.executemany("INSERT OR REPLACE INTO diffs (commit_id, path, filename, offset, length, sha) VALUES (?, ?, ?, ?, ?, ?)", entries) # Index the appended diffs
+
+def read_packed_diff(repository_name, commit_id, filename, repository_file_path=None):
+   """
+   Reads a diff of a commit from the diff pack of the repository, finding it by the file name. If more than one modified file of the commit has that name, the one whose full path is a suffix of the repository file path is chosen.
+
+   :param repository_name: Name of the repository.
+   :param commit_id: The commit id, in the "<commit_number>-<commit_hash>" format.
+   :param filename: The name of the modified file, such as "Main.java".
+   :param repository_file_path: The path of the file in the repository, used to choose between modified files with the same name.
+   :return: The diff content, or None if the diff is not in the pack.
+   """
+
+   if repository_name not in DIFF_PACK_READERS: # If the diff pack is not open for reading yet
+      pack_filepath, index_filepath = get_diff_pack_paths(repository_name) # Get the diff pack paths
+      DIFF_PACK_READERS[repository_name] = (open(pack_filepath, "rb"), sqlite3.connect(f"file:{index_filepath}?mode=ro", uri=True)) # Open the diff pack and its index in read only mode
+
+   pack_file, connection = DIFF_PACK_READERS[repository_name] # Get the diff pack open for reading
+   candidates = connection.execute("SELECT path, offset, length FROM diffs WHERE commit_id = ? AND filename = ? ORDER BY path", (commit_id, filename)).fetchall() # The diffs of the commit with the file name
+
+   if not candidates: # If the diff is not in the pack
+      return None # Return None
+
+   matching_candidates = [candidate for candidate in candidates if repository_file_path and repository_file_path.replace("\\", "/").endswith(f"/{candidate[0]}")] # The diffs whose full path matches the repository file path
+   _, offset, length = (matching_candidates or candidates)[0] # The position of the diff in the pack
+
+   pack_file.seek(offset) # Go to the position of the diff
+   return zlib.decompress(pack_file.read(length)).decode("utf-8", errors="ignore") # Return the decompressed diff
+
+def merge_diff_pack(repository_name, source_directory):
+   """
+   Appends the diffs of the diff pack of a shard analyzed in another host to the diff pack of the repository.
+
+   :param repository_name: Name of the repository.
+   :param source_directory: The directory that contains the diffs directory of the shard.
+   :return: None
+   """
+
+   source_pack_filepath, source_index_filepath = get_diff_pack_paths(repository_name, source_directory) # The diff pack paths of the shard
+   if not verify_filepath_exists(source_pack_filepath) or not verify_filepath_exists(source_index_filepath): # If the shard has no diff pack
+      return # Nothing to merge
+
+   pack_file, connection = open_diff_pack(repository_name) # Open the diff pack of the repository
+   source_connection = sqlite3.connect(source_index_filepath) # Connect to the diff pack index of the shard
+   entries = [] # The index entries of the appended diffs
+
+   with open(source_pack_filepath, "rb") as source_pack_file: # Open the diff pack of the shard
+      for commit_id, path, filename, offset, length, diff_sha in source_connection.execute("SELECT commit_id, path, filename, offset, length, sha FROM diffs ORDER BY offset"): # Loop through the indexed diffs of the shard
+         source_pack_file.seek(offset) # Go to the position of the diff
+         pack_file.seek(0, os.SEEK_END) # Go to the end of the diff pack of the repository
+         entries.append((commit_id, path, filename, pack_file.tell(), length, diff_sha)) # Store the new position of the diff
+         pack_file.write(source_pack_file.read(length)) # Append the compressed diff
+
+   source_connection.close() # Close the connection to the diff pack index of the shard
+   pack_file.flush() # Write the diffs to the pack before indexing them
+   with connection: # Index the diffs in a single transaction
+      connection.executemany("INSERT OR REPLACE INTO diffs (commit_id, path, filename, offset, length, sha) VALUES (?, ?, ?, ?, ?, ?)", entries) # Index the appended diffs
+   close_diff_pack(repository_name) # Close the diff pack of the repository
+   record_output_files(repository_name, "diffs", list(get_diff_pack_paths(repository_name))) if USE_OUTPUT_MANIFEST else None # Record the diff pack and its index in the output manifest
+
+def generate_diffs(repository_name, commit, commit_number):
+   """
+   Generates the diffs for the commits of a repository.
+
+   :param repository_name: Name of the repository to be analyzed.
+   :param commit: The commit object to be analyzed.
+   :param commit_number: Number of the commit to be analyzed.
+   :return: None
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Generating the diffs for the {BackgroundColors.CYAN}{commit_number}º{BackgroundColors.GREEN} commit of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+
+   if PACKED_DIFFS: # If the diffs are stored in the diff pack of the repository
+      write_packed_diffs(repository_name, f"{commit_number}-{commit.hash}", commit.modified_files) # Append the diffs of the commit to the diff pack
+      return # The diffs files are not written
+
+   for modified_file in commit.modified_files: # Loop through the modified files of the commit
+      file_diff = modified_file.diff # Get the diff of the modified file
+
+      diff_file_directory = f"{START_PATH}{RELATIVE_DIFFS_DIRECTORY_PATH}/{repository_name}/{commit_number}-{commit.hash}/" # Define the diff file directory
+      diff_file_path = f"{diff_file_directory}{modified_file.filename}{DIFF_FILE_EXTENSION}" # Define the diff file path
+
+      if not verify_filepath_exists(diff_file_directory): # Verify if the directory does not exist
+         os.makedirs(diff_file_directory, exist_ok=True) # Create the directory
+
+      write_diff_if_different(diff_file_path, file_diff) # Call helper function to write the diff if it’s different
+
+def checkout_branch(branch_name, repository_directory_path=None):
+   """
+   Checks out a specific branch.
+
+   :param branch_name: Name of the branch to be checked out.
+   :param repository_directory_path: Path to the repository (or worktree) in which the branch will be checked out. If None, the current working directory is used.
+   :return: None
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Checking out the {BackgroundColors.CYAN}{branch_name}{BackgroundColors.GREEN} branch...{Style.RESET_ALL}")
+
+   checkout_thread = subprocess.Popen(["git", "checkout", branch_name], cwd=repository_directory_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE) # Run the Git command to checkout the branch
+   checkout_thread.wait() # Wait for the thread to finish
+
+def generate_output_directory_paths(repository_name, commit_number, commit_hash):
+   """
+   Generates the output directory path for the CK metrics generator.
 
    :param repository_name: Name of the repository to be analyzed.
    :param commit_number: Number of the commit to be analyzed.
@@ -708,25 +1597,1263 @@ def generate_output_directory_paths(repository_name, commit_number, commit_hash)
    :return: The output_directory and relative_output_directory paths.
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Generating the output directory paths...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Generating the output directory paths...{Style.RESET_ALL}")
+
+   output_directory = f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}/{commit_number}-{commit_hash}/" # Define the output directory path
+   relative_output_directory = f"{RELATIVE_CK_METRICS_DIRECTORY_PATH}/{repository_name}/{commit_number}-{commit_hash}/" # Define the relative output directory path
+
+   return output_directory, relative_output_directory # Return the output_directory and relative_output_directory paths
+   
+def set_memory_limit(memory_limit_gb):
+   """
+   Sets the soft address space limit of the current process. It is used as the initializer of the repository worker processes.
+
+   :param memory_limit_gb: The memory limit in GB. If None, the memory is not limited.
+   :return: None
+   """
+
+   if memory_limit_gb is None: # If the memory must not be limited
+      return # Nothing to set
+
+   _, hard_limit = resource.getrlimit(resource.RLIMIT_AS) # Get the hard address space limit
+   soft_limit = int(memory_limit_gb * 1024 ** 3) # Convert the memory limit to bytes
+   soft_limit = soft_limit if hard_limit == resource.RLIM_INFINITY else min(soft_limit, hard_limit) # The soft limit can't be greater than the hard limit
+   resource.setrlimit(resource.RLIMIT_AS, (soft_limit, hard_limit)) # Set the soft address space limit
+
+def build_jvm_command(cmd):
+   """
+   Builds the command that starts a JVM from a repository worker process. The JVM is deliberately kept outside of the REPOSITORY_WORKER_MEMORY_LIMIT_GB limit, as it reserves much more address space than it uses, so its memory is limited by the CK_JVM_MAX_HEAP constant instead.
+   The soft address space limit is raised back to the hard limit by the shell that starts the JVM, as a preexec_fn is not safe in a process that runs threads, such as the CK worker threads.
+
+   :param cmd: The list of arguments of the JVM command.
+   :return: The list of arguments of the command that starts the JVM.
+   """
+
+   if REPOSITORY_WORKER_MEMORY_LIMIT_GB is None: # If the memory of the repository workers is not limited
+      return cmd # The JVM inherits no limit
+
+   return ["sh", "-c", 'ulimit -S -v "$(ulimit -H -v)" && exec "$@"', "java"] + cmd # Raise the soft limit to the hard limit and replace the shell by the JVM
+
+def build_ck_command(workdir, output_directory):
+   """
+   Builds the command to run the CK metrics generator.
+
+   :param workdir: The directory to be analyzed by CK.
+   :param output_directory: The directory in which CK will store the metrics files.
+   :return: The command to run the CK metrics generator.
+   """
+
+   jvm_options = f"-Xmx{CK_JVM_MAX_HEAP} " if CK_JVM_MAX_HEAP else "" # The JVM options
+   return f"java {jvm_options}-jar {FULL_CK_JAR_PATH} {workdir} {CK_OPTIONS} {output_directory} true" # The command to run the CK metrics generator
+
+def run_ck_metrics_generator(cmd, cwd=None):
+   """
+   Runs the CK metrics generator in a subprocess.
+
+   :param cmd: Command to be executed.
+   :param cwd: Working directory of the CK process. If None, the current working directory is used.
+   :return: None
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Running the CK Metrics Generator Command...{Style.RESET_ALL}")
+
+   thread = subprocess.Popen(build_jvm_command(cmd.split()), cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE) # Run the CK metrics generator command
+   stdout, stderr = thread.communicate() # Get the stdout and stderr of the thread
+
+def start_ck_batch_runner():
+   """
+   Starts a long-lived CK batch runner process, which reads the CK jobs from its standard input. The CKBatchRunner.java file is run by the Java source launcher (Java 11+).
+
+   :return: The CK batch runner process.
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Starting a {BackgroundColors.CYAN}CK batch runner{BackgroundColors.GREEN} process...{Style.RESET_ALL}")
+
+   jvm_options = [f"-Xmx{CK_JVM_MAX_HEAP}"] if CK_JVM_MAX_HEAP else [] # The JVM options
+   cmd = ["java"] + jvm_options + ["-cp", FULL_CK_JAR_PATH, FULL_CK_BATCH_RUNNER_PATH] + CK_OPTIONS.split() # The command to run the CK batch runner
+
+   ck_batch_runner = subprocess.Popen(build_jvm_command(cmd), cwd=FULL_CK_METRICS_DIRECTORY_PATH, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1) # Start the CK batch runner
+
+   with CK_BATCH_RUNNERS_LOCK: # Lock the CK batch runners list
+      CK_BATCH_RUNNERS.append(ck_batch_runner) # Add the CK batch runner to the list
+
+   return ck_batch_runner # Return the CK batch runner process
+
+def stop_ck_batch_runners():
+   """
+   Stops every CK batch runner process by closing its standard input.
+
+   :return: None
+   """
+
+   with CK_BATCH_RUNNERS_LOCK: # Lock the CK batch runners list
+      while CK_BATCH_RUNNERS: # While there are CK batch runners
+         ck_batch_runner = CK_BATCH_RUNNERS.pop() # Get the CK batch runner
+         try: # Try to stop the CK batch runner gracefully
+            ck_batch_runner.stdin.close() # Close its standard input, so it finishes
+            ck_batch_runner.wait(timeout=60) # Wait for it to finish
+         except (OSError, subprocess.TimeoutExpired): # If it could not be stopped gracefully
+            ck_batch_runner.kill() # Kill the CK batch runner
+
+   CK_BATCH_RUNNER.__dict__.clear() # Forget the CK batch runner of the current thread
+
+def run_ck_in_batch_runner(workdir, output_directory):
+   """
+   Runs CK in the long-lived CK batch runner of the current thread, starting it if needed.
+
+   :param workdir: The directory to be analyzed by CK.
+   :param output_directory: The directory in which CK will store the metrics files.
+   :return: True if CK ran in the batch runner, False if it must run in a new JVM.
+   """
+
+   ck_batch_runner = getattr(CK_BATCH_RUNNER, "process", None) # Get the CK batch runner of the current thread
+   if ck_batch_runner is None or ck_batch_runner.poll() is not None: # If there is no CK batch runner running in the current thread
+      ck_batch_runner = start_ck_batch_runner() # Start a CK batch runner
+      CK_BATCH_RUNNER.process = ck_batch_runner # Store the CK batch runner of the current thread
+
+   try: # Try to send the job to the CK batch runner
+      ck_batch_runner.stdin.write(f"{workdir}\t{output_directory}\n") # Send the job
+      ck_batch_runner.stdin.flush() # Flush the job
+      result = ck_batch_runner.stdout.readline() # Wait for the job result
+   except OSError: # If the CK batch runner is not reachable
+      result = "" # Handle it as a dead CK batch runner
+
+   if not result: # If the CK batch runner died
+      print(f"{BackgroundColors.YELLOW}The {BackgroundColors.CYAN}CK batch runner{BackgroundColors.YELLOW} process died. Running CK per commit for the rest of the execution.{Style.RESET_ALL}")
+      CK_BATCH_FAILED.set() # Disable the CK batch mode
+      return False # Return False to run CK in a new JVM
+
+   return result.startswith("DONE") # Return True if CK ran, otherwise run it again in a new JVM
+
+def run_ck(workdir, output_directory):
+   """
+   Runs CK for the workdir directory, using the CK batch runner if the CK batch mode is enabled.
+
+   :param workdir: The directory to be analyzed by CK.
+   :param output_directory: The directory in which CK will store the metrics files.
+   :return: None
+   """
+
+   if CK_BATCH_MODE and not CK_BATCH_FAILED.is_set() and run_ck_in_batch_runner(workdir, output_directory): # If CK ran in the CK batch runner
+      return # Return as the CK metrics files were generated
+
+   run_ck_metrics_generator(build_ck_command(workdir, output_directory), cwd=output_directory) # Run CK in a new JVM
+
+def rewrite_ck_files_paths(output_directory, source_directory, target_directory):
+   """
+   Rewrites the "file" column of the CK metrics files, replacing the directory that CK analyzed by the repository directory, so the generated files are the same no matter where the commit was analyzed.
+
+   :param output_directory: Path to the directory containing the CK metrics files.
+   :param source_directory: The directory that was analyzed by CK.
+   :param target_directory: The directory that must appear in the CK metrics files.
+   :return: None
+   """
+
+   if source_directory.rstrip("/") == target_directory.rstrip("/"): # If the analyzed directory is already the repository directory
+      return # Nothing to rewrite
+
+   for ck_metric_file in CK_METRICS_FILES: # Loop through the CK metrics files
+      ck_metric_file_path = os.path.join(output_directory, ck_metric_file) # The path to the CK metric file
+      if not verify_filepath_exists(ck_metric_file_path): # If CK did not generate the file
+         continue # Skip the file
+
+      with open(ck_metric_file_path, "r", encoding="utf-8", errors="ignore") as ck_file: # Open the CK metric file to read
+         content = ck_file.read() # Read the content of the file
+
+      with open(ck_metric_file_path, "w", encoding="utf-8") as ck_file: # Open the CK metric file to write
+         ck_file.write(content.replace(f"{source_directory.rstrip('/')}/", f"{target_directory.rstrip('/')}/")) # Write the content with the rewritten paths
+
+def run_ck_for_commit(repository_name, commit_number, commit_hash, workdir):
+   """
+   Runs CK for a commit that is already checked out in the workdir directory and stores the output in the ck_metrics directory of the commit.
+
+   :param repository_name: Name of the repository to be analyzed.
+   :param commit_number: Number of the commit to be analyzed.
+   :param commit_hash: Commit hash of the commit to be analyzed.
+   :param workdir: The directory in which the commit is checked out.
+   :return: None
+   """
+
+   output_directory, relative_output_directory = generate_output_directory_paths(repository_name, commit_number, commit_hash) # Generate the output directory paths
+   create_directory(output_directory, relative_output_directory) # Create the ck_metrics directory
+
+   run_ck(workdir, output_directory) # Run the CK metrics generator
+
+   rewrite_ck_files_paths(output_directory, workdir, f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}") # Make the file paths point to the repository directory
+
+def is_safe_archive_member(member, destination_directory):
+   """
+   Verifies if a member of an archive generated by git is extracted inside the destination directory, as the paths and symbolic links of the repository files are not trusted.
+
+   :param member: The TarInfo of the member.
+   :param destination_directory: Path to the directory in which the files will be extracted.
+   :return: True if the member and its link target, if any, are inside the destination directory and it is a regular file, directory or link, False otherwise.
+   """
+
+   destination_directory = os.path.realpath(destination_directory) # The resolved destination directory
+   is_inside = lambda path: os.path.realpath(path) == destination_directory or os.path.realpath(path).startswith(destination_directory + os.sep) # Verify if a path is inside the destination directory
+   member_path = os.path.join(destination_directory, member.name) # The path of the extracted member
+
+   if not (member.isfile() or member.isdir() or member.issym() or member.islnk()) or not is_inside(member_path): # If it is a special file or it is outside of the destination directory
+      return False # The member is not safe
+   if member.issym(): # If it is a symbolic link, whose target is relative to its directory
+      return not os.path.isabs(member.linkname) and is_inside(os.path.join(os.path.dirname(member_path), member.linkname)) # Return True if the target is inside the destination directory
+   if member.islnk(): # If it is a hard link, whose target is relative to the archive root
+      return is_inside(os.path.join(destination_directory, member.linkname)) # Return True if the target is inside the destination directory
+   return True # The member is safe
+
+def extract_commit_files(repository_directory_path, commit_hash, destination_directory, paths=None):
+   """
+   Extracts the files of a commit into the destination directory using "git archive", without checking out the commit.
+
+   :param repository_directory_path: Path to the repository.
+   :param commit_hash: Commit hash of the commit to be extracted.
+   :param destination_directory: Path to the directory in which the files will be extracted.
+   :param paths: List of file paths to be extracted. If None, every file of the commit is extracted.
+   :return: True if the files were extracted, False otherwise.
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Extracting the files of the {BackgroundColors.CYAN}{commit_hash}{BackgroundColors.GREEN} commit...{Style.RESET_ALL}")
+
+   paths_batches = [paths[i:i + 500] for i in range(0, len(paths), 500)] if paths is not None else [[]] # Split the paths in batches to avoid exceeding the command line length limit
+
+   for paths_batch in paths_batches: # Loop through the paths batches
+      command = ["git", "-C", repository_directory_path, "archive", "--format=tar", commit_hash] + (["--"] + paths_batch if paths_batch else []) # The command to archive the files of the commit
+      result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) # Run the command and get the archive
+      if result.returncode != 0: # If the archive could not be generated
+         print(f"{BackgroundColors.RED}The files of the {BackgroundColors.CYAN}{commit_hash}{BackgroundColors.RED} commit could not be extracted.{Style.RESET_ALL}")
+         return False # Return False if the archive could not be generated
+
+      with tarfile.open(fileobj=io.BytesIO(result.stdout)) as archive: # Open the archive in memory
+         members = [member for member in archive.getmembers() if is_safe_archive_member(member, destination_directory)] # The members extracted inside the destination directory, skipping the unsafe ones, such as symbolic links to outside of the repository
+         archive.extractall(destination_directory, members=members, **({"filter": "data"} if hasattr(tarfile, "data_filter") else {})) # Extract the files into the destination directory, with the "data" filter where it is available
+
+   return True # Return True if the files were extracted
+
+def run_full_ck_from_archive(repository_name, commit_number, commit_hash):
+   """
+   Runs CK for every file of the commit, extracting them into a temporary directory instead of checking out the commit.
+
+   :param repository_name: Name of the repository to be analyzed.
+   :param commit_number: Number of the commit to be analyzed.
+   :param commit_hash: Commit hash of the commit to be analyzed.
+   :return: None
+   """
+
+   repository_directory_path = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the repository directory
+   snapshot_directory = tempfile.mkdtemp(prefix=f"{repository_name}-{commit_number}-") # The temporary directory of the commit files
+
+   try: # Try to run CK in the extracted files
+      if extract_commit_files(repository_directory_path, commit_hash, snapshot_directory): # If the commit files were extracted
+         run_ck_for_commit(repository_name, commit_number, commit_hash, snapshot_directory) # Run CK for the commit
+   finally: # Always delete the temporary directory
+      shutil.rmtree(snapshot_directory, ignore_errors=True) # Delete the temporary directory
+
+def get_commit_java_changes(commit):
+   """
+   Gets the Java files changed by the commit.
+
+   :param commit: The PyDriller commit object.
+   :return: A tuple with the list of Java files paths that exist after the commit and the set of Java files paths whose rows must be removed from the previous CK metrics files.
+   """
+
+   changed_paths = [] # The Java files paths that must be analyzed by CK
+   stale_paths = set() # The Java files paths whose previous CK metrics are no longer valid (modified, deleted or renamed)
+
+   for modified_file in commit.modified_files: # Loop through the modified files of the commit
+      for path in (modified_file.old_path, modified_file.new_path): # Loop through the old and new paths of the file
+         if path and path.endswith(".java"): # If it is a Java file
+            stale_paths.add(path.replace(os.sep, "/")) # Add the path to the stale paths
+      if modified_file.new_path and modified_file.new_path.endswith(".java"): # If the Java file exists after the commit
+         changed_paths.append(modified_file.new_path.replace(os.sep, "/")) # Add the path to the changed paths
+
+   return changed_paths, stale_paths # Return the changed and stale paths
+
+def is_delta_ck_possible(commit, previous_commit):
+   """
+   Verifies if the CK metrics of the commit can be generated by patching the CK metrics of the previous commit. That is only possible if the previous traversed commit is the only parent of the commit, as PyDriller doesn't list the modified files of merge commits.
+
+   :param commit: The PyDriller commit object.
+   :param previous_commit: A tuple (commit number, commit hash) of the previous traversed commit, or None.
+   :return: True if the Delta-CK mode can be used for the commit, False otherwise.
+   """
+
+   return CK_DELTA_MODE and previous_commit is not None and len(commit.parents) == 1 and commit.parents[0] == previous_commit[1] # Verify if the previous commit is the only parent of the commit
+
+def is_ck_alias_possible(commit, previous_commit):
+   """
+   Verifies if the CK metrics files of the commit are the same as the ones of the previous commit. That is the case if the previous traversed commit is the only parent of the commit and the commit doesn't modify any Java file.
+
+   :param commit: The PyDriller commit object.
+   :param previous_commit: A tuple (commit number, commit hash) of the previous traversed commit, or None.
+   :return: True if the commit can reuse the CK metrics files of the previous commit, False otherwise.
+   """
+
+   if not CK_SKIP_NON_JAVA_COMMITS or previous_commit is None or len(commit.parents) != 1 or commit.parents[0] != previous_commit[1]: # If the previous commit is not the only parent of the commit
+      return False # The CK metrics files may differ
+
+   return not any(path and path.endswith(".java") for modified_file in commit.modified_files for path in (modified_file.old_path, modified_file.new_path)) # Verify if the commit doesn't modify any Java file
+
+def link_previous_ck_files(repository_name, commit_number, commit_hash, previous_output_directory):
+   """
+   Creates the CK metrics files of the commit as hardlinks to the ones of the previous commit, copying them if the file system doesn't support hardlinks.
+   It is used as a finalizer, as it must run after the CK metrics files of the previous commit are finalized.
+
+   :param repository_name: Name of the repository to be analyzed.
+   :param commit_number: Number of the commit to be analyzed.
+   :param commit_hash: Commit hash of the commit to be analyzed.
+   :param previous_output_directory: Path to the CK metrics directory of the previous commit.
+   :return: None
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Linking the CK metrics files of the {BackgroundColors.CYAN}{commit_number}-{commit_hash}{BackgroundColors.GREEN} commit to the ones of the previous commit, as it doesn't modify any Java file...{Style.RESET_ALL}")
+
+   output_directory, relative_output_directory = generate_output_directory_paths(repository_name, commit_number, commit_hash) # Generate the output directory paths
+   create_directory(output_directory, relative_output_directory) # Create the ck_metrics directory of the commit
+
+   for ck_metric_file in CK_METRICS_FILES: # Loop through the CK metrics files
+      previous_file_path = os.path.join(previous_output_directory, ck_metric_file) # The CK metric file of the previous commit
+      file_path = os.path.join(output_directory, ck_metric_file) # The CK metric file of the commit
+      if not verify_filepath_exists(previous_file_path) or verify_filepath_exists(file_path): # If the previous commit has no such file or the commit already has it
+         continue # Skip the file
+
+      try: # Try to create a hardlink, which doesn't use any disk space
+         os.link(previous_file_path, file_path) # Link the CK metric file to the previous one
+      except OSError: # If the file system doesn't support hardlinks
+         shutil.copy2(previous_file_path, file_path) # Copy the CK metric file of the previous commit
+
+def merge_delta_ck_files(repository_name, commit_number, commit_hash, previous_output_directory, delta_output_directory, stale_paths):
+   """
+   Generates the CK metrics files of the commit by patching the CK metrics files of the previous commit: the rows of the stale files are removed and the rows generated by CK for the changed files are appended. If the previous CK metrics files are missing, CK is run for every file of the commit.
+
+   :param repository_name: Name of the repository to be analyzed.
+   :param commit_number: Number of the commit to be analyzed.
+   :param commit_hash: Commit hash of the commit to be analyzed.
+   :param previous_output_directory: Path to the CK metrics directory of the previous commit.
+   :param delta_output_directory: Path to the directory containing the CK metrics files of the changed files.
+   :param stale_paths: Set of the Java files paths whose previous rows must be removed.
+   :return: None
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Merging the Delta-CK metrics files of the {BackgroundColors.CYAN}{commit_number}-{commit_hash}{BackgroundColors.GREEN} commit...{Style.RESET_ALL}")
+
+   if not verify_ck_metrics_files(previous_output_directory, CK_METRICS_FILES): # If the previous CK metrics files are missing
+      print(f"{BackgroundColors.YELLOW}The CK metrics files of the commit before {BackgroundColors.CYAN}{commit_number}-{commit_hash}{BackgroundColors.YELLOW} are missing. Running CK for every file of the commit.{Style.RESET_ALL}")
+      shutil.rmtree(delta_output_directory, ignore_errors=True) # Delete the Delta-CK output directory
+      run_full_ck_from_archive(repository_name, commit_number, commit_hash) # Run CK for every file of the commit
+      return # Return as the CK metrics files were generated
+
+   output_directory, relative_output_directory = generate_output_directory_paths(repository_name, commit_number, commit_hash) # Generate the output directory paths
+   create_directory(output_directory, relative_output_directory) # Create the ck_metrics directory
+
+   repository_directory_path = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the repository directory
+   stale_files = {f"{repository_directory_path}/{path}" for path in stale_paths} # The stale files as they appear in the "file" column
+
+   for ck_metric_file in CK_METRICS_FILES: # Loop through the CK metrics files
+      with open(os.path.join(previous_output_directory, ck_metric_file), "r", newline="", encoding="utf-8", errors="ignore") as previous_file: # Open the previous CK metric file
+         reader = csv.reader(previous_file) # Create a CSV reader
+         header = next(reader, None) # Read the header
+         file_index = header.index("file") if header and "file" in header else 0 # The index of the "file" column
+         rows = [row for row in reader if row and row[file_index] not in stale_files] # Keep the rows of the files that were not changed
+
+      delta_file_path = os.path.join(delta_output_directory, ck_metric_file) # The path to the Delta-CK metric file
+      if verify_filepath_exists(delta_file_path): # If CK generated the metric file for the changed files
+         with open(delta_file_path, "r", newline="", encoding="utf-8", errors="ignore") as delta_file: # Open the Delta-CK metric file
+            delta_reader = csv.reader(delta_file) # Create a CSV reader
+            header = next(delta_reader, None) or header # Read the header
+            rows.extend(row for row in delta_reader if row) # Append the rows of the changed files
+
+      with open(os.path.join(output_directory, ck_metric_file), "w", newline="", encoding="utf-8") as output_file: # Open the CK metric file of the commit
+         writer = csv.writer(output_file) # Create a CSV writer
+         writer.writerow(header) if header else None # Write the header
+         writer.writerows(rows) # Write the merged rows
+
+   shutil.rmtree(delta_output_directory, ignore_errors=True) # Delete the Delta-CK output directory
+
+def run_delta_ck_for_commit(repository_name, commit_number, commit_hash, changed_paths, stale_paths, previous_output_directory):
+   """
+   Runs CK only for the Java files changed by the commit, extracting them into a temporary directory. The merge with the previous CK metrics files is returned as a finalizer, as it must run after the previous commit is finalized.
+
+   :param repository_name: Name of the repository to be analyzed.
+   :param commit_number: Number of the commit to be analyzed.
+   :param commit_hash: Commit hash of the commit to be analyzed.
+   :param changed_paths: List of the Java files paths that must be analyzed by CK.
+   :param stale_paths: Set of the Java files paths whose previous rows must be removed.
+   :param previous_output_directory: Path to the CK metrics directory of the previous commit.
+   :return: The function that merges the Delta-CK metrics files with the previous ones.
+   """
+
+   repository_directory_path = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the repository directory
+   snapshot_directory = tempfile.mkdtemp(prefix=f"{repository_name}-{commit_number}-") # The temporary directory of the changed files
+   delta_output_directory = tempfile.mkdtemp(prefix=f"{repository_name}-{commit_number}-ck-") + "/" # The temporary directory of the Delta-CK metrics files
+
+   try: # Try to run CK in the changed files
+      if changed_paths and extract_commit_files(repository_directory_path, commit_hash, snapshot_directory, changed_paths): # If there are changed Java files and they were extracted
+         run_ck(snapshot_directory, delta_output_directory) # Run CK only for the changed files
+         rewrite_ck_files_paths(delta_output_directory, snapshot_directory, repository_directory_path) # Make the file paths point to the repository directory
+   finally: # Always delete the temporary directory of the changed files
+      shutil.rmtree(snapshot_directory, ignore_errors=True) # Delete the temporary directory
+
+   return functools.partial(merge_delta_ck_files, repository_name, commit_number, commit_hash, previous_output_directory, delta_output_directory, stale_paths) # Return the merge function
+
+def get_ck_cache_key():
+   """
+   Gets the key of the CK version and options in the CK cache, which is the hash of the CK JAR file and the CK options, so the cached metrics are invalidated when CK changes.
+
+   :return: The CK cache key.
+   """
+
+   global CK_CACHE_KEY # Declare the CK_CACHE_KEY as a global variable
+
+   if CK_CACHE_KEY is None: # If the CK cache key was not computed yet
+      jar_hash = hashlib.sha1() # The hash of the CK JAR file
+      with open(FULL_CK_JAR_PATH, "rb") as jar_file: # Open the CK JAR file
+         for chunk in iter(lambda: jar_file.read(1024 * 1024), b""): # Read the CK JAR file in chunks
+            jar_hash.update(chunk) # Update the hash with the chunk
+      CK_CACHE_KEY = f"{jar_hash.hexdigest()}:{CK_OPTIONS}" # Combine the CK JAR hash and the CK options
+
+   return CK_CACHE_KEY # Return the CK cache key
+
+def open_ck_cache():
+   """
+   Opens the CK cache database, creating its tables if they don't exist. The CK cache is shared by every repository, so the metrics of the files shared between forks are reused.
+
+   :return: The connection to the CK cache database.
+   """
+
+   create_directory(FULL_CK_CACHE_DIRECTORY_PATH, RELATIVE_CK_CACHE_DIRECTORY_PATH) # Create the CK cache directory
+
+   connection = sqlite3.connect(FULL_CK_CACHE_FILE_PATH, timeout=60) # Connect to the CK cache database, waiting for the other workers to release it
+   connection.execute("PRAGMA journal_mode=WAL") # Allow reading while other workers are writing
+   connection.execute("CREATE TABLE IF NOT EXISTS ck_results (blob_sha TEXT, ck_key TEXT, class_rows TEXT, method_rows TEXT, size INTEGER, last_access REAL, PRIMARY KEY (blob_sha, ck_key))") # The CK rows of each blob
+   connection.execute("CREATE TABLE IF NOT EXISTS ck_headers (ck_key TEXT, ck_metric_file TEXT, header TEXT, PRIMARY KEY (ck_key, ck_metric_file))") # The header of each CK metrics file
+   connection.execute("CREATE INDEX IF NOT EXISTS ck_results_last_access ON ck_results (last_access)") # The index used to evict the least recently used entries
+   return connection # Return the connection
+
+def update_ck_cache_statistics(hits, misses):
+   """
+   Updates the CK cache hits and misses counters.
+
+   :param hits: The number of Java files found in the CK cache.
+   :param misses: The number of Java files not found in the CK cache.
+   :return: None
+   """
+
+   with CK_CACHE_LOCK: # Lock the CK cache statistics
+      CK_CACHE_STATISTICS["hits"] += hits # Update the hits counter
+      CK_CACHE_STATISTICS["misses"] += misses # Update the misses counter
+
+def get_commit_java_blobs(repository_directory_path, commit_hash):
+   """
+   Gets the blob SHA and path of every Java file of the commit.
+
+   :param repository_directory_path: Path to the repository.
+   :param commit_hash: Commit hash of the commit.
+   :return: A list of tuples (blob SHA, file path), or None if the commit tree could not be read.
+   """
+
+   result = subprocess.run(["git", "-C", repository_directory_path, "ls-tree", "-r", "-z", commit_hash], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) # List the files of the commit tree
+   if result.returncode != 0: # If the commit tree could not be read
+      return None # Return None if the commit tree could not be read
+
+   java_blobs = [] # The blob SHA and path of the Java files
+   for entry in result.stdout.decode("utf-8", errors="ignore").split("\0"): # Loop through the entries of the tree, in the format "mode type sha\tpath"
+      if not entry: # If the entry is empty
+         continue # Skip the entry
+      info, path = entry.split("\t", 1) # Split the entry information and the file path
+      _, object_type, blob_sha = info.split() # Get the object type and SHA
+      if object_type == "blob" and path.endswith(".java"): # If it is a Java file
+         java_blobs.append((blob_sha, path)) # Add the blob to the list
+
+   return java_blobs # Return the Java blobs
+
+def write_blobs_from_object_database(repository_directory_path, blobs, destination_directory):
+   """
+   Writes blobs from the Git object database into the destination directory with a single "git cat-file --batch" process, without checking out anything.
+
+   :param repository_directory_path: Path to the repository.
+   :param blobs: List of tuples (blob SHA, file path) to be written.
+   :param destination_directory: Path to the directory in which the files are written, keeping their paths.
+   :return: True if every blob was written, False otherwise.
+   """
+
+   if not blobs: # If there are no blobs to write
+      return True # Nothing to write
+
+   cat_file = subprocess.Popen(["git", "-C", repository_directory_path, "cat-file", "--batch"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) # Start the batch reader of the object database
+   try: # Always stop the batch reader
+      for blob_sha, path in blobs: # Loop through the blobs
+         cat_file.stdin.write(f"{blob_sha}\n".encode()) # Request the blob
+         cat_file.stdin.flush() # Send the request
+         header = cat_file.stdout.readline().split() # The header of the blob, in the format "sha type size", or "sha missing"
+         if len(header) != 3: # If the blob is missing
+            print(f"{BackgroundColors.RED}The {BackgroundColors.CYAN}{path}{BackgroundColors.RED} blob ({blob_sha}) is missing from the object database.{Style.RESET_ALL}")
+            return False # Return False if the blob is missing
+
+         file_path = os.path.join(destination_directory, path) # The path of the file in the destination directory
+         os.makedirs(os.path.dirname(file_path), exist_ok=True) # Create the directory of the file
+         with open(file_path, "wb") as file: # Open the file to write
+            file.write(cat_file.stdout.read(int(header[2]))) # Write the content of the blob
+         cat_file.stdout.read(1) # Skip the newline after the content
+   finally: # Stop the batch reader
+      cat_file.stdin.close() # Close its standard input, so it finishes
+      cat_file.wait() # Wait for it to finish
+
+   return True # Every blob was written
+
+def get_ck_snapshot():
+   """
+   Gets the CK snapshot of the current CK worker thread, creating its directory in the CK_SNAPSHOTS_DIRECTORY_PATH directory if needed.
+
+   :return: The thread local CK snapshot, with the "directory" and "files" (path: blob SHA) attributes.
+   """
+
+   if getattr(CK_SNAPSHOT, "directory", None) is None: # If the thread has no CK snapshot yet
+      snapshots_directory = CK_SNAPSHOTS_DIRECTORY_PATH if os.path.isdir(CK_SNAPSHOTS_DIRECTORY_PATH) else None # The RAM-backed directory, or None for the temporary directory of the system
+      CK_SNAPSHOT.directory = tempfile.mkdtemp(prefix="ck-snapshot-", dir=snapshots_directory) # Create the snapshot directory
+      CK_SNAPSHOT.files = {} # The blob SHA of every file in the snapshot
+      with CK_SNAPSHOT_DIRECTORIES_LOCK: # Lock the CK snapshot directories list
+         CK_SNAPSHOT_DIRECTORIES.append(CK_SNAPSHOT.directory) # Register the snapshot directory, so it is removed at the end
+
+   return CK_SNAPSHOT # Return the CK snapshot of the thread
+
+def materialize_ck_snapshot(repository_directory_path, commit_hash, snapshot):
+   """
+   Updates the CK snapshot to the Java files of the commit, removing the files that are no longer in the commit and writing only the files whose blobs changed.
+
+   :param repository_directory_path: Path to the repository.
+   :param commit_hash: Commit hash of the commit.
+   :param snapshot: The CK snapshot of the thread.
+   :return: True if the snapshot has the Java files of the commit, False otherwise.
+   """
+
+   java_blobs = get_commit_java_blobs(repository_directory_path, commit_hash) # The blob SHA and path of the Java files of the commit
+   if java_blobs is None: # If the commit tree could not be read
+      return False # The snapshot could not be materialized
+
+   commit_files = {path: blob_sha for blob_sha, path in java_blobs} # The blob SHA of every Java file of the commit
+   for path in [path for path, blob_sha in snapshot.files.items() if commit_files.get(path) != blob_sha]: # Loop through the files that were removed or changed
+      try: # Try to remove the file
+         os.remove(os.path.join(snapshot.directory, path)) # Remove the file from the snapshot
+      except OSError: # If the file was already removed
+         pass # Nothing to remove
+      del snapshot.files[path] # Forget the file
+
+   changed_blobs = [(blob_sha, path) for path, blob_sha in commit_files.items() if snapshot.files.get(path) != blob_sha] # The files that are not in the snapshot yet
+   written = write_blobs_from_object_database(repository_directory_path, changed_blobs, snapshot.directory) # Write the changed files
+   snapshot.files = commit_files if written else {} # The files of the snapshot, which is rebuilt from scratch if it could not be written
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}The CK snapshot of the {BackgroundColors.CYAN}{commit_hash}{BackgroundColors.GREEN} commit reused {BackgroundColors.CYAN}{len(commit_files) - len(changed_blobs)}{BackgroundColors.GREEN} and wrote {BackgroundColors.CYAN}{len(changed_blobs)}{BackgroundColors.GREEN} Java files.{Style.RESET_ALL}")
+   return written # Return True if the snapshot has the Java files of the commit
+
+def run_ck_in_snapshot(repository_name, commit_number, commit_hash):
+   """
+   Runs CK for the commit in the CK snapshot of the current CK worker thread, without checking out the commit.
+
+   :param repository_name: Name of the repository to be analyzed.
+   :param commit_number: Number of the commit to be analyzed.
+   :param commit_hash: Commit hash of the commit to be analyzed.
+   :return: None
+   """
+
+   repository_directory_path = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the repository directory
+   snapshot = get_ck_snapshot() # Get the CK snapshot of the thread
+
+   if not materialize_ck_snapshot(repository_directory_path, commit_hash, snapshot): # If the snapshot could not be materialized
+      print(f"{BackgroundColors.RED}The CK snapshot of the {BackgroundColors.CYAN}{commit_number}-{commit_hash}{BackgroundColors.RED} commit could not be materialized.{Style.RESET_ALL}")
+      return # Don't run CK for an incomplete snapshot
+
+   run_ck_for_commit(repository_name, commit_number, commit_hash, snapshot.directory) # Run CK for the snapshot, whose paths are rewritten to the repository directory
+
+def remove_ck_snapshots():
+   """
+   Removes every CK snapshot directory.
+
+   :return: None
+   """
+
+   with CK_SNAPSHOT_DIRECTORIES_LOCK: # Lock the CK snapshot directories list
+      while CK_SNAPSHOT_DIRECTORIES: # While there are CK snapshot directories
+         shutil.rmtree(CK_SNAPSHOT_DIRECTORIES.pop(), ignore_errors=True) # Remove the CK snapshot directory
+
+   CK_SNAPSHOT.__dict__.clear() # Forget the CK snapshot of the current thread
+
+def read_ck_metric_file_rows(ck_metric_file_path):
+   """
+   Reads the header and the rows of a CK metric file.
+
+   :param ck_metric_file_path: Path to the CK metric file.
+   :return: A tuple with the header (or None) and the list of rows.
+   """
+
+   if not verify_filepath_exists(ck_metric_file_path): # If the CK metric file does not exist
+      return None, [] # Return no header and no rows
+
+   with open(ck_metric_file_path, "r", newline="", encoding="utf-8", errors="ignore") as ck_file: # Open the CK metric file
+      reader = csv.reader(ck_file) # Create a CSV reader
+      header = next(reader, None) # Read the header
+      return header, [row for row in reader if row] # Return the header and the rows
+
+def get_cached_ck_rows(connection, ck_key, blob_shas):
+   """
+   Gets the cached CK rows of the blobs, updating their last access time.
+
+   :param connection: The connection to the CK cache database.
+   :param ck_key: The CK cache key.
+   :param blob_shas: List of the blob SHAs to be searched.
+   :return: Dictionary with the blob SHA as key and a dictionary with the CK metric file as key and its rows as value.
+   """
+
+   cached_rows = {} # The cached rows of the blobs
+   for i in range(0, len(blob_shas), 500): # Loop through the blobs in batches, as SQLite limits the number of parameters
+      blob_shas_batch = blob_shas[i:i + 500] # The current batch of blobs
+      placeholders = ",".join("?" * len(blob_shas_batch)) # The query placeholders
+      for blob_sha, class_rows, method_rows in connection.execute(f"SELECT blob_sha, class_rows, method_rows FROM ck_results WHERE ck_key = ? AND blob_sha IN ({placeholders})", [ck_key] + blob_shas_batch): # Loop through the cached blobs
+         cached_rows[blob_sha] = {CK_METRICS_FILES[0]: json.loads(class_rows), CK_METRICS_FILES[1]: json.loads(method_rows)} # Store the cached rows
+
+   with connection: # Commit the transaction
+      connection.executemany("UPDATE ck_results SET last_access = ? WHERE blob_sha = ? AND ck_key = ?", [(time.time(), blob_sha, ck_key) for blob_sha in cached_rows]) # Update the last access time of the hits
+
+   return cached_rows # Return the cached rows
+
+def get_cached_ck_headers(connection, ck_key):
+   """
+   Gets the cached headers of the CK metrics files.
+
+   :param connection: The connection to the CK cache database.
+   :param ck_key: The CK cache key.
+   :return: Dictionary with the CK metric file as key and its header as value.
+   """
+
+   return {ck_metric_file: json.loads(header) for ck_metric_file, header in connection.execute("SELECT ck_metric_file, header FROM ck_headers WHERE ck_key = ?", (ck_key,))} # Return the cached headers
+
+def store_ck_rows(connection, ck_key, blobs_rows, headers):
+   """
+   Stores the CK rows of the blobs and the headers of the CK metrics files in the CK cache.
+
+   :param connection: The connection to the CK cache database.
+   :param ck_key: The CK cache key.
+   :param blobs_rows: Dictionary with the blob SHA as key and a dictionary with the CK metric file as key and its rows as value.
+   :param headers: Dictionary with the CK metric file as key and its header as value.
+   :return: None
+   """
+
+   entries = [] # The entries to be stored
+   for blob_sha, rows in blobs_rows.items(): # Loop through the blobs
+      class_rows, method_rows = json.dumps(rows[CK_METRICS_FILES[0]]), json.dumps(rows[CK_METRICS_FILES[1]]) # Serialize the rows
+      entries.append((blob_sha, ck_key, class_rows, method_rows, len(class_rows) + len(method_rows), time.time())) # Add the entry
+
+   with connection: # Commit the transaction
+      connection.executemany("INSERT OR REPLACE INTO ck_results (blob_sha, ck_key, class_rows, method_rows, size, last_access) VALUES (?, ?, ?, ?, ?, ?)", entries) # Store the rows
+      connection.executemany("INSERT OR REPLACE INTO ck_headers (ck_key, ck_metric_file, header) VALUES (?, ?, ?)", [(ck_key, ck_metric_file, json.dumps(header)) for ck_metric_file, header in headers.items() if header]) # Store the headers
+
+def evict_ck_cache(connection):
+   """
+   Evicts the least recently used entries of the CK cache while its size exceeds CK_CACHE_MAX_SIZE_MB.
+
+   :param connection: The connection to the CK cache database.
+   :return: None
+   """
+
+   max_size = CK_CACHE_MAX_SIZE_MB * 1024 * 1024 # The maximum size in bytes
+   cache_size = connection.execute("SELECT COALESCE(SUM(size), 0) FROM ck_results").fetchone()[0] # The current size of the cached rows
+
+   if cache_size <= max_size: # If the cache size is within the limit
+      return # Nothing to evict
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Evicting the least recently used entries of the CK cache...{Style.RESET_ALL}")
+
+   size_to_free = cache_size - int(max_size * 0.9) # Free a bit more than needed, so the eviction doesn't run for every commit
+   blob_keys, freed_size = [], 0 # The keys of the entries to be evicted and their size
+   for blob_sha, ck_key, size in connection.execute("SELECT blob_sha, ck_key, size FROM ck_results ORDER BY last_access"): # Loop through the entries from the least recently used
+      blob_keys.append((blob_sha, ck_key)) # Add the entry to be evicted
+      freed_size += size # Update the freed size
+      if freed_size >= size_to_free: # If enough size will be freed
+         break # Stop selecting entries
+
+   with connection: # Commit the transaction
+      connection.executemany("DELETE FROM ck_results WHERE blob_sha = ? AND ck_key = ?", blob_keys) # Evict the entries
+
+def run_ck_for_blobs(repository_directory_path, commit_hash, missing_blobs):
+   """
+   Runs CK for the blobs that are not in the CK cache, extracting one path of each blob into a temporary directory.
+
+   :param repository_directory_path: Path to the repository.
+   :param commit_hash: Commit hash of the commit that contains the blobs.
+   :param missing_blobs: Dictionary with the blob SHA as key and one of its file paths as value.
+   :return: A tuple with the dictionary of the rows of each blob (the "file" column is left empty) and the dictionary of the headers, or (None, None) if CK failed.
+   """
+
+   snapshot_directory = tempfile.mkdtemp(prefix="ck-cache-") # The temporary directory of the missing blobs
+   output_directory = tempfile.mkdtemp(prefix="ck-cache-output-") + "/" # The temporary directory of the CK metrics files
+
+   try: # Try to run CK for the missing blobs
+      if not extract_commit_files(repository_directory_path, commit_hash, snapshot_directory, list(missing_blobs.values())): # If the files could not be extracted
+         return None, None # Return None as CK could not run
+
+      run_ck(snapshot_directory, output_directory) # Run CK for the missing blobs
+      if not verify_ck_metrics_files(output_directory, CK_METRICS_FILES): # If CK failed
+         return None, None # Return None as CK failed
+
+      path_blobs = {f"{snapshot_directory}/{path}": blob_sha for blob_sha, path in missing_blobs.items()} # Map the analyzed file paths to their blobs
+      blobs_rows = {blob_sha: {ck_metric_file: [] for ck_metric_file in CK_METRICS_FILES} for blob_sha in missing_blobs} # The rows of each blob, also caching the blobs without classes
+      headers = {} # The headers of the CK metrics files
+
+      for ck_metric_file in CK_METRICS_FILES: # Loop through the CK metrics files
+         header, rows = read_ck_metric_file_rows(os.path.join(output_directory, ck_metric_file)) # Read the rows of the CK metric file
+         headers[ck_metric_file] = header # Store the header
+         file_index = header.index("file") if header and "file" in header else 0 # The index of the "file" column
+         for row in rows: # Loop through the rows
+            blob_sha = path_blobs.get(row[file_index]) # Get the blob of the row
+            if blob_sha is not None: # If the row belongs to a missing blob
+               row[file_index] = "" # The file path is filled when the CK metrics files are assembled
+               blobs_rows[blob_sha][ck_metric_file].append(row) # Add the row to the blob rows
+
+      return blobs_rows, headers # Return the rows of each blob and the headers
+   finally: # Always delete the temporary directories
+      shutil.rmtree(snapshot_directory, ignore_errors=True) # Delete the temporary directory of the missing blobs
+      shutil.rmtree(output_directory, ignore_errors=True) # Delete the temporary directory of the CK metrics files
+
+def run_cached_ck_for_commit(repository_name, commit_number, commit_hash):
+   """
+   Generates the CK metrics files of the commit from the CK cache, running CK only for the Java files whose blobs were never analyzed.
+
+   :param repository_name: Name of the repository to be analyzed.
+   :param commit_number: Number of the commit to be analyzed.
+   :param commit_hash: Commit hash of the commit to be analyzed.
+   :return: None
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Generating the CK metrics files of the {BackgroundColors.CYAN}{commit_number}-{commit_hash}{BackgroundColors.GREEN} commit from the CK cache...{Style.RESET_ALL}")
+
+   repository_directory_path = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the repository directory
+   java_blobs = get_commit_java_blobs(repository_directory_path, commit_hash) # Get the Java blobs of the commit
+   if java_blobs is None: # If the commit tree could not be read
+      print(f"{BackgroundColors.RED}The tree of the {BackgroundColors.CYAN}{commit_hash}{BackgroundColors.RED} commit could not be read.{Style.RESET_ALL}")
+      return # Return as the CK metrics files can't be generated
+
+   ck_key = get_ck_cache_key() # Get the CK cache key
+   connection = open_ck_cache() # Open the CK cache
+
+   try: # Try to assemble the CK metrics files
+      blobs_rows = get_cached_ck_rows(connection, ck_key, list({blob_sha for blob_sha, _ in java_blobs})) # Get the cached rows of the blobs
+      missing_blobs = {blob_sha: path for blob_sha, path in java_blobs if blob_sha not in blobs_rows} # The blobs that are not in the cache, with one of their paths
+      update_ck_cache_statistics(sum(1 for blob_sha, _ in java_blobs if blob_sha in blobs_rows), sum(1 for blob_sha, _ in java_blobs if blob_sha not in blobs_rows)) # Update the CK cache statistics
+
+      headers = get_cached_ck_headers(connection, ck_key) # Get the cached headers
+      if missing_blobs: # If there are blobs that were never analyzed
+         missing_blobs_rows, missing_headers = run_ck_for_blobs(repository_directory_path, commit_hash, missing_blobs) # Run CK for the missing blobs
+         if missing_blobs_rows is None: # If CK failed
+            print(f"{BackgroundColors.RED}CK failed for the {BackgroundColors.CYAN}{commit_number}-{commit_hash}{BackgroundColors.RED} commit of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository.{Style.RESET_ALL}")
+            return # Return as the CK metrics files can't be generated
+         store_ck_rows(connection, ck_key, missing_blobs_rows, missing_headers) # Store the rows of the missing blobs
+         evict_ck_cache(connection) # Evict the least recently used entries, if needed
+         blobs_rows.update(missing_blobs_rows) # Add the rows of the missing blobs
+         headers.update({ck_metric_file: header for ck_metric_file, header in missing_headers.items() if header}) # Add the headers of the CK output
+   finally: # Always close the CK cache
+      connection.close() # Close the connection
+
+   output_directory, relative_output_directory = generate_output_directory_paths(repository_name, commit_number, commit_hash) # Generate the output directory paths
+   create_directory(output_directory, relative_output_directory) # Create the ck_metrics directory
+
+   for ck_metric_file in CK_METRICS_FILES: # Loop through the CK metrics files
+      header = headers.get(ck_metric_file) # Get the header of the CK metric file
+      file_index = header.index("file") if header and "file" in header else 0 # The index of the "file" column
+      with open(os.path.join(output_directory, ck_metric_file), "w", newline="", encoding="utf-8") as output_file: # Open the CK metric file of the commit
+         writer = csv.writer(output_file) # Create a CSV writer
+         writer.writerow(header) if header else None # Write the header
+         for blob_sha, path in java_blobs: # Loop through the Java files of the commit
+            for row in blobs_rows[blob_sha][ck_metric_file]: # Loop through the cached rows of the file
+               writer.writerow(row[:file_index] + [f"{repository_directory_path}/{path}"] + row[file_index + 1:]) # Write the row with the file path
+
+def create_worktree(repository_directory_path, worktree_path):
+   """
+   Creates a detached git worktree of the repository in the worktree path, removing any stale worktree left by a previous execution.
+
+   :param repository_directory_path: Path to the repository.
+   :param worktree_path: Path in which the worktree will be created.
+   :return: True if the worktree was created, False otherwise.
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Creating the {BackgroundColors.CYAN}{worktree_path}{BackgroundColors.GREEN} worktree...{Style.RESET_ALL}")
+
+   remove_worktree(repository_directory_path, worktree_path) # Remove the stale worktree, if any
+
+   result = subprocess.run(["git", "-C", repository_directory_path, "worktree", "add", "--detach", "--force", *(["--no-checkout"] if SPARSE_CLONES else []), worktree_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) # Create the detached worktree, which is only checked out after the sparse-checkout patterns are applied if the clones are sparse
+   return result.returncode == 0 and (not SPARSE_CLONES or apply_sparse_checkout(worktree_path)) # Return True if the worktree was created
+
+def remove_worktree(repository_directory_path, worktree_path):
+   """
+   Removes a git worktree of the repository and prunes its administrative files.
+
+   :param repository_directory_path: Path to the repository.
+   :param worktree_path: Path of the worktree to be removed.
+   :return: None
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Removing the {BackgroundColors.CYAN}{worktree_path}{BackgroundColors.GREEN} worktree...{Style.RESET_ALL}")
+
+   subprocess.run(["git", "-C", repository_directory_path, "worktree", "remove", "--force", worktree_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) # Remove the worktree
+   if os.path.isdir(worktree_path): # If the worktree directory was not registered in the repository
+      shutil.rmtree(worktree_path, ignore_errors=True) # Delete the leftover directory
+   subprocess.run(["git", "-C", repository_directory_path, "worktree", "prune"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) # Prune the worktrees administrative files
+
+def setup_worktrees_pool(repository_name, workers):
+   """
+   Creates one git worktree per worker and returns them in a queue, so every CK worker analyzes its commit in its own working tree.
+
+   :param repository_name: Name of the repository to be analyzed.
+   :param workers: The number of worktrees to be created.
+   :return: A queue containing the worktrees paths, or None if the worktrees could not be created.
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Setting up {BackgroundColors.CYAN}{workers}{BackgroundColors.GREEN} worktrees for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+
+   repository_directory_path = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the repository directory
+   create_directory(f"{FULL_WORKTREES_DIRECTORY_PATH}/{repository_name}", f"{RELATIVE_WORKTREES_DIRECTORY_PATH}/{repository_name}") # Create the worktrees directory of the repository
+
+   worktrees_pool = queue.Queue() # The queue of the available worktrees
+   for worker in range(1, workers + 1): # Loop through the workers
+      worktree_path = f"{FULL_WORKTREES_DIRECTORY_PATH}/{repository_name}/{worker}" # The path to the worktree of the worker
+      if not create_worktree(repository_directory_path, worktree_path): # If the worktree could not be created
+         print(f"{BackgroundColors.RED}The {BackgroundColors.CYAN}{worktree_path}{BackgroundColors.RED} worktree could not be created. Analyzing the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} commits serially.{Style.RESET_ALL}")
+         teardown_worktrees_pool(repository_name, worktrees_pool) # Remove the worktrees that were already created
+         return None # Return None so the commits are analyzed serially
+      worktrees_pool.put(worktree_path) # Add the worktree to the pool
+
+   return worktrees_pool # Return the worktrees pool
+
+def teardown_worktrees_pool(repository_name, worktrees_pool):
+   """
+   Removes every worktree of the pool.
+
+   :param repository_name: Name of the repository that was analyzed.
+   :param worktrees_pool: The queue containing the worktrees paths.
+   :return: None
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Removing the worktrees of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+
+   repository_directory_path = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the repository directory
+   while not worktrees_pool.empty(): # While there are worktrees in the pool
+      remove_worktree(repository_directory_path, worktrees_pool.get()) # Remove the worktree
+
+def run_ck_in_repository(repository_name, commit_number, commit_hash):
+   """
+   Checks out the commit in the repository clone and runs CK for it. It runs in the single CK worker when the commits are analyzed serially, so the checkouts happen in the commit order.
+
+   :param repository_name: Name of the repository to be analyzed.
+   :param commit_number: Number of the commit to be analyzed.
+   :param commit_hash: Commit hash of the commit to be analyzed.
+   :return: None
+   """
+
+   workdir = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the repository directory
+   checkout_branch(commit_hash, workdir) # Checkout the current commit hash branch to run ck
+   run_ck_for_commit(repository_name, commit_number, commit_hash, workdir) # Run the CK metrics generator
+
+def run_ck_in_worktree(repository_name, commit_number, commit_hash, worktrees_pool):
+   """
+   Takes a worktree from the pool, checks out the commit in it, runs CK and gives the worktree back to the pool.
+
+   :param repository_name: Name of the repository to be analyzed.
+   :param commit_number: Number of the commit to be analyzed.
+   :param commit_hash: Commit hash of the commit to be analyzed.
+   :param worktrees_pool: The queue containing the available worktrees paths.
+   :return: None
+   """
+
+   worktree_path = worktrees_pool.get() # Wait for an available worktree
+   try: # Try to run CK in the worktree
+      subprocess.run(["git", "checkout", "--force", "--detach", commit_hash], cwd=worktree_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) # Checkout the commit in the worktree
+      run_ck_for_commit(repository_name, commit_number, commit_hash, worktree_path) # Run CK for the commit
+   finally: # Always give the worktree back to the pool
+      worktrees_pool.put(worktree_path) # Give the worktree back to the pool
+
+def get_metrics_store_commits_filepath(repository_name):
+   """
+   Gets the path of the file that lists the commits stored in the CK metrics store of the repository. A commit is only listed after its rows are written, so this file marks which commits are stored.
+
+   :param repository_name: Name of the repository.
+   :return: The path of the stored commits file.
+   """
+
+   return f"{FULL_CK_METRICS_STORE_DIRECTORY_PATH}/{repository_name}/commits{CSV_FILE_EXTENSION}" # Return the path of the stored commits file
+
+def verify_metrics_store_exists(repository_name):
+   """
+   Verifies if the CK metrics store of the repository exists.
+
+   :param repository_name: Name of the repository.
+   :return: True if the CK metrics store exists and can be read, False otherwise.
+   """
+
+   return pq is not None and verify_filepath_exists(get_metrics_store_commits_filepath(repository_name)) # Return True if the stored commits file exists and PyArrow is installed to read it
+
+def get_metrics_store_commits(repository_name):
+   """
+   Gets the commits stored in the CK metrics store of the repository.
+
+   :param repository_name: Name of the repository.
+   :return: Dictionary with the commit number as key and the commit hash as value, sorted by the commit number.
+   """
+
+   stored_commits = {} # The stored commits
+   if verify_metrics_store_exists(repository_name): # If the CK metrics store exists
+      with open(get_metrics_store_commits_filepath(repository_name), "r", newline="") as commits_file: # Open the stored commits file
+         for row in csv.DictReader(commits_file): # Loop through the stored commits
+            stored_commits[int(row["Commit Number"])] = row["Commit Hash"] # Store the commit
+
+   return dict(sorted(stored_commits.items())) # Return the stored commits sorted by the commit number
+
+def get_metrics_store_kind_directory(repository_name, ck_metric_file):
+   """
+   Gets the directory of the CK metrics store that contains the rows of a CK metric file, such as "ck_metrics_store/<repository_name>/class".
+
+   :param repository_name: Name of the repository.
+   :param ck_metric_file: The CK metric file, such as "class.csv".
+   :return: The directory of the CK metric file in the CK metrics store.
+   """
+
+   return f"{FULL_CK_METRICS_STORE_DIRECTORY_PATH}/{repository_name}/{ck_metric_file.replace(CSV_FILE_EXTENSION, '')}" # Return the directory of the CK metric file
+
+def get_metrics_store_buckets_directories(repository_name, ck_metric_file):
+   """
+   Gets the partitions (commit buckets) directories of a CK metric file in the CK metrics store, sorted by the bucket number.
+
+   :param repository_name: Name of the repository.
+   :param ck_metric_file: The CK metric file, such as "class.csv".
+   :return: List of the buckets directories paths.
+   """
+
+   kind_directory = get_metrics_store_kind_directory(repository_name, ck_metric_file) # The directory of the CK metric file
+   if not os.path.isdir(kind_directory): # If the directory does not exist
+      return [] # Return an empty list
+
+   buckets = [dirname for dirname in os.listdir(kind_directory) if dirname.startswith("commit_bucket=")] # The buckets directories names
+   return [os.path.join(kind_directory, bucket) for bucket in sorted(buckets, key=lambda bucket: int(bucket.split("=")[1]))] # Return the sorted buckets directories
+
+def buffer_commit_in_metrics_store(repository_name, commit_number, commit_hash):
+   """
+   Buffers the CK metrics files of the commit to be written to the CK metrics store, writing the buffer when it has CK_METRICS_STORE_FLUSH_COMMITS commits.
+
+   :param repository_name: Name of the repository.
+   :param commit_number: Number of the commit.
+   :param commit_hash: Commit hash of the commit.
+   :return: None
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Buffering the {BackgroundColors.CYAN}{commit_number}-{commit_hash}{BackgroundColors.GREEN} commit in the CK metrics store...{Style.RESET_ALL}")
+
+   output_directory = f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}/{commit_number}-{commit_hash}" # The CK metrics directory of the commit
+   if not verify_ck_metrics_files(output_directory, CK_METRICS_FILES): # If the CK metrics files of the commit do not exist
+      return # Nothing to buffer
+
+   buffer = CK_METRICS_STORE_BUFFERS.setdefault(repository_name, {"commits": [], "files": {}}) # Get the buffer of the repository
+
+   for ck_metric_file in CK_METRICS_FILES: # Loop through the CK metrics files
+      header, rows = read_ck_metric_file_rows(os.path.join(output_directory, ck_metric_file)) # Read the CK metric file
+      if header is None: # If the CK metric file is empty
+         continue # Skip the file
+
+      file_buffer = buffer["files"].setdefault(ck_metric_file, {"header": header, "rows": []}) # Get the buffer of the CK metric file
+      for row_number, row in enumerate(rows): # Loop through the rows
+         values = row if header == file_buffer["header"] else [dict(zip(header, row)).get(column, "") for column in file_buffer["header"]] # Align the row with the buffered header
+         file_buffer["rows"].append(values + [commit_number, commit_hash, row_number]) # Add the row with the commit columns
+
+   buffer["commits"].append((commit_number, commit_hash)) # Add the commit to the buffer
+
+   if len(buffer["commits"]) >= CK_METRICS_STORE_FLUSH_COMMITS: # If the buffer is full
+      flush_metrics_store(repository_name) # Write the buffer to the CK metrics store
+
+def build_metrics_store_table(header, rows):
+   """
+   Builds the Arrow table of the buffered rows of a CK metric file. The CK columns are kept as strings, so the CSV files can be exported exactly as CK generated them, and the columns with many repeated values are dictionary encoded.
+
+   :param header: The header of the CK metric file.
+   :param rows: The buffered rows, each one with the commit number, commit hash and row number appended.
+   :return: The Arrow table.
+   """
+
+   columns = list(zip(*rows)) # Transpose the rows into columns
+   arrays = [] # The Arrow arrays of the table
+
+   for index, column_name in enumerate(header): # Loop through the CK columns
+      array = pa.array(columns[index], type=pa.string()) # Build the column array
+      arrays.append(array.dictionary_encode() if column_name in CK_METRICS_STORE_DICTIONARY_COLUMNS else array) # Dictionary encode the columns with many repeated values
+
+   arrays.append(pa.array(columns[len(header)], type=pa.int32())) # The commit number column
+   arrays.append(pa.array(columns[len(header) + 1], type=pa.string()).dictionary_encode()) # The commit hash column
+   arrays.append(pa.array(columns[len(header) + 2], type=pa.int32())) # The row number column, which keeps the CK rows order
+
+   return pa.Table.from_arrays(arrays, names=header + ["commit_number", "commit_hash", "row_number"]) # Return the Arrow table
+
+def delete_stored_commits_directories(repository_name, stored_commits):
+   """
+   Deletes the CK metrics directories of the stored commits, keeping only the last one, which is needed to resume the execution and to generate the repository attributes.
+
+   :param repository_name: Name of the repository.
+   :param stored_commits: Dictionary with the commit number as key and the commit hash as value.
+   :return: None
+   """
+
+   repository_ck_metrics_directory = f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}" # The CK metrics directory of the repository
+   if not stored_commits or not os.path.isdir(repository_ck_metrics_directory): # If there are no stored commits or no CK metrics directory
+      return # Nothing to delete
+
+   last_commit_number = max(stored_commits.keys()) # The last stored commit number
+   for dirname in get_filtered_sorted_directories(repository_ck_metrics_directory): # Loop through the commits directories
+      commit_number = int(dirname.split("-")[0]) # Get the commit number of the directory
+      if commit_number < last_commit_number and commit_number in stored_commits: # If the commit is stored and it is not the last one
+         shutil.rmtree(os.path.join(repository_ck_metrics_directory, dirname), ignore_errors=True) # Delete the commit directory
+         remove_output_directory_from_manifest(repository_name, os.path.join(repository_ck_metrics_directory, dirname)) if USE_OUTPUT_MANIFEST else None # Remove the deleted files from the output manifest
+
+def flush_metrics_store(repository_name):
+   """
+   Writes the buffered commits of the repository to the CK metrics store, as one Parquet file per commit bucket and CK metric file, and then lists them in the stored commits file.
+
+   :param repository_name: Name of the repository.
+   :return: None
+   """
+
+   buffer = CK_METRICS_STORE_BUFFERS.pop(repository_name, None) # Get and remove the buffer of the repository
+   if not buffer or not buffer["commits"]: # If there is nothing buffered
+      return # Nothing to write
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Writing {BackgroundColors.CYAN}{len(buffer['commits'])}{BackgroundColors.GREEN} commits of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository to the CK metrics store...{Style.RESET_ALL}")
+
+   for ck_metric_file, file_buffer in buffer["files"].items(): # Loop through the buffered CK metrics files
+      buckets_rows = {} # The rows of each commit bucket
+      for row in file_buffer["rows"]: # Loop through the buffered rows
+         buckets_rows.setdefault((row[-3] - 1) // CK_METRICS_STORE_BUCKET_COMMITS, []).append(row) # Add the row to its commit bucket
+
+      for bucket, rows in buckets_rows.items(): # Loop through the commit buckets
+         bucket_directory = f"{get_metrics_store_kind_directory(repository_name, ck_metric_file)}/commit_bucket={bucket}" # The directory of the commit bucket
+         os.makedirs(bucket_directory, exist_ok=True) # Create the directory of the commit bucket
+         part_filepath = f"{bucket_directory}/part-{rows[0][-3]}-{rows[-1][-3]}.parquet" # The path of the Parquet file
+         pq.write_table(build_metrics_store_table(file_buffer["header"], rows), f"{part_filepath}.tmp", use_dictionary=True, compression="zstd") # Write the Parquet file
+         os.replace(f"{part_filepath}.tmp", part_filepath) # Atomically move the Parquet file to its path
+         record_output_files(repository_name, "ck_metrics_store", [part_filepath]) if USE_OUTPUT_MANIFEST else None # Record the Parquet file in the output manifest
+
+   commits_filepath = get_metrics_store_commits_filepath(repository_name) # The path of the stored commits file
+   file_exists = verify_filepath_exists(commits_filepath) # Verify if the stored commits file already exists
+   with open(commits_filepath, "a", newline="") as commits_file: # Open the stored commits file to append
+      writer = csv.writer(commits_file) # Create a CSV writer
+      writer.writerow(["Commit Number", "Commit Hash"]) if not file_exists else None # Write the header
+      writer.writerows(buffer["commits"]) # List the stored commits
+   record_output_files(repository_name, "ck_metrics_store", [commits_filepath]) if USE_OUTPUT_MANIFEST else None # Record the stored commits file in the output manifest
+
+   delete_stored_commits_directories(repository_name, get_metrics_store_commits(repository_name)) if CK_METRICS_STORE_ONLY else None # Delete the CK metrics directories of the stored commits
+
+def sync_metrics_store(repository_name):
+   """
+   Synchronizes the CK metrics store of the repository with its CK metrics directories: the Parquet files of a write that was interrupted before its commits were listed are deleted, and the commits that have a CK metrics directory but are not stored yet are stored.
+
+   :param repository_name: Name of the repository.
+   :return: None
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Synchronizing the CK metrics store of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+
+   os.makedirs(f"{FULL_CK_METRICS_STORE_DIRECTORY_PATH}/{repository_name}", exist_ok=True) # Create the CK metrics store directory of the repository
+   stored_commits = get_metrics_store_commits(repository_name) # Get the stored commits
+
+   for ck_metric_file in CK_METRICS_FILES: # Loop through the CK metrics files
+      for bucket_directory in get_metrics_store_buckets_directories(repository_name, ck_metric_file): # Loop through the commit buckets
+         for part_filename in os.listdir(bucket_directory): # Loop through the Parquet files
+            first_commit_number = part_filename.split("-")[1] if part_filename.startswith("part-") else "" # The first commit number of the Parquet file
+            if not first_commit_number.isdigit() or int(first_commit_number) not in stored_commits: # If the file was not completely written
+               os.remove(os.path.join(bucket_directory, part_filename)) # Delete the file
+
+   repository_ck_metrics_directory = f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}" # The CK metrics directory of the repository
+   if os.path.isdir(repository_ck_metrics_directory): # If the CK metrics directory exists
+      for dirname in get_filtered_sorted_directories(repository_ck_metrics_directory): # Loop through the commits directories
+         commit_number, commit_hash = int(dirname.split("-")[0]), dirname.split("-")[1] # Get the commit number and hash
+         if commit_number not in stored_commits: # If the commit is not stored
+            buffer_commit_in_metrics_store(repository_name, commit_number, commit_hash) # Buffer the commit
+
+   flush_metrics_store(repository_name) # Write the buffered commits
+
+def read_metrics_store(repository_name, ck_metric_file, columns=None):
+   """
+   Reads the CK metrics store of the repository, one commit bucket at a time, reading only the desired columns.
+
+   :param repository_name: Name of the repository.
+   :param ck_metric_file: The CK metric file, such as "class.csv".
+   :param columns: List of the CK columns to be read. If None, every column is read.
+   :return: A generator of tuples (commit number, commit hash, list of the rows as dictionaries), in the commit order, including the stored commits without rows.
+   """
 
-   output_directory = f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}/{commit_number}-{commit_hash}/" # Define the output directory path
-   relative_output_directory = f"{RELATIVE_CK_METRICS_DIRECTORY_PATH}/{repository_name}/{commit_number}-{commit_hash}/" # Define the relative output directory path
+   stored_commits = sorted(get_metrics_store_commits(repository_name).items()) # Get the stored commits, in the commit order
+   position = 0 # The position of the next stored commit to be yielded
 
-   return output_directory, relative_output_directory # Return the output_directory and relative_output_directory paths
-   
-def run_ck_metrics_generator(cmd):
+   for bucket_directory in get_metrics_store_buckets_directories(repository_name, ck_metric_file): # Loop through the commit buckets
+      commits_rows = {} # The rows of each commit of the bucket, so only one bucket is in memory at a time
+      part_filenames = sorted(filename for filename in os.listdir(bucket_directory) if filename.endswith(".parquet")) # The Parquet files of the bucket
+
+      if part_filenames: # If the bucket is not empty
+         schema_names = pq.read_schema(os.path.join(bucket_directory, part_filenames[0])).names # The columns of the bucket
+         read_columns = [column for column in columns if column in schema_names] + ["commit_number", "commit_hash", "row_number"] if columns is not None else None # The columns to be read
+         table = pq.read_table(bucket_directory, columns=read_columns).sort_by([("commit_number", "ascending"), ("row_number", "ascending")]) # Read and sort the rows of the bucket
+
+         for row in table.to_pylist(): # Loop through the rows of the bucket
+            commits_rows.setdefault(row.pop("commit_number"), []).append(row) # Add the row to its commit
+
+      last_bucket_commit = (int(bucket_directory.split("=")[-1]) + 1) * CK_METRICS_STORE_BUCKET_COMMITS # The last commit number of the bucket
+      while position < len(stored_commits) and stored_commits[position][0] <= last_bucket_commit: # While the next stored commit belongs to this bucket or to an earlier one without rows
+         commit_number, commit_hash = stored_commits[position] # Get the stored commit
+         rows = commits_rows.pop(commit_number, []) # Get the rows of the commit
+         for row in rows: # Loop through the rows
+            del row["commit_hash"], row["row_number"] # Remove the store columns
+         yield commit_number, commit_hash, rows # Yield the commit rows
+         position += 1 # Move to the next stored commit
+
+   for commit_number, commit_hash in stored_commits[position:]: # Loop through the stored commits after the last bucket, which have no rows
+      yield commit_number, commit_hash, [] # Yield the commit without rows
+
+def export_metrics_store_to_csv(repository_name):
    """
-   Runs the CK metrics generator in a subprocess.
+   Exports the CK metrics store of the repository back to the legacy layout, with one "ck_metrics/<repository_name>/<commit_number>-<commit_hash>" directory per commit containing the CK metrics files.
 
-   :param cmd: Command to be executed.
+   :param repository_name: Name of the repository.
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Running the CK Metrics Generator Command...{Style.RESET_ALL}")
+   print(f"{BackgroundColors.GREEN}Exporting the CK metrics store of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository to the {BackgroundColors.CYAN}{RELATIVE_CK_METRICS_DIRECTORY_PATH}{BackgroundColors.GREEN} directory...{Style.RESET_ALL}")
 
-   thread = subprocess.Popen(cmd.split(), stdout=subprocess.PIPE, stderr=subprocess.PIPE) # Run the CK metrics generator command
-   stdout, stderr = thread.communicate() # Get the stdout and stderr of the thread
+   for ck_metric_file in CK_METRICS_FILES: # Loop through the CK metrics files
+      buckets_directories = get_metrics_store_buckets_directories(repository_name, ck_metric_file) # The commit buckets of the CK metric file
+      parquet_files = [os.path.join(directory, filename) for directory in buckets_directories for filename in os.listdir(directory) if filename.endswith(".parquet")] # The Parquet files of the CK metric file
+      header = [name for name in pq.read_schema(parquet_files[0]).names if name not in ("commit_number", "commit_hash", "row_number")] if parquet_files else None # The header of the CK metric file
+
+      for commit_number, commit_hash, rows in read_metrics_store(repository_name, ck_metric_file): # Loop through the stored commits
+         output_directory, relative_output_directory = generate_output_directory_paths(repository_name, commit_number, commit_hash) # Generate the output directory paths
+         create_directory(output_directory, relative_output_directory) # Create the ck_metrics directory of the commit
+
+         with open(os.path.join(output_directory, ck_metric_file), "w", newline="", encoding="utf-8") as output_file: # Open the CK metric file of the commit
+            writer = csv.writer(output_file) # Create a CSV writer
+            writer.writerow(header) if header else None # Write the header
+            writer.writerows([row.get(column) for column in header] for row in rows) if header else None # Write the rows in the header order
+
+def merge_metrics_store(repository_name, source_directory):
+   """
+   Copies the Parquet files of the CK metrics store of a shard analyzed in another host to the CK metrics store of the repository, and then lists its commits in the stored commits file. As the shards have disjoint commit ranges, their Parquet files never have the same name.
+
+   :param repository_name: Name of the repository.
+   :param source_directory: The directory that contains the CK metrics store directory of the shard.
+   :return: None
+   """
+
+   source_store_directory = f"{source_directory}{RELATIVE_CK_METRICS_STORE_DIRECTORY_PATH}/{repository_name}" # The CK metrics store of the shard
+   source_commits_filepath = f"{source_store_directory}/commits{CSV_FILE_EXTENSION}" # The stored commits file of the shard
+   if not verify_filepath_exists(source_commits_filepath): # If the shard has no CK metrics store
+      return # Nothing to merge
+
+   target_store_directory = f"{FULL_CK_METRICS_STORE_DIRECTORY_PATH}/{repository_name}" # The CK metrics store of the repository
+   for root, _, filenames in os.walk(source_store_directory): # Walk through the CK metrics store of the shard
+      for filename in filenames: # Loop through its files
+         if filename.endswith(".parquet"): # If it is a Parquet file
+            target_directory = root.replace(source_store_directory, target_store_directory, 1) # The same directory in the CK metrics store of the repository
+            os.makedirs(target_directory, exist_ok=True) # Create the directory
+            shutil.copy2(os.path.join(root, filename), os.path.join(target_directory, filename)) # Copy the Parquet file
+            record_output_files(repository_name, "ck_metrics_store", [os.path.join(target_directory, filename)]) if USE_OUTPUT_MANIFEST else None # Record the copied Parquet file in the output manifest
+
+   with open(source_commits_filepath, "r", newline="") as source_commits_file: # Open the stored commits file of the shard
+      source_commits = [(row["Commit Number"], row["Commit Hash"]) for row in csv.DictReader(source_commits_file)] # Read the stored commits of the shard
+
+   commits_filepath = get_metrics_store_commits_filepath(repository_name) # The stored commits file of the repository
+   file_exists = verify_filepath_exists(commits_filepath) # Verify if the stored commits file already exists
+   with open(commits_filepath, "a", newline="") as commits_file: # Open the stored commits file to append
+      writer = csv.writer(commits_file) # Create a CSV writer
+      writer.writerow(["Commit Number", "Commit Hash"]) if not file_exists else None # Write the header
+      writer.writerows(source_commits) # List the stored commits of the shard
+   record_output_files(repository_name, "ck_metrics_store", [commits_filepath]) if USE_OUTPUT_MANIFEST else None # Record the stored commits file in the output manifest
+
+def write_progress_line(saved_progress_file, commit_tuple):
+   """
+   Appends the commit information tuple to the progress file.
+
+   :param saved_progress_file: Path to the saved progress file.
+   :param commit_tuple: The commit information tuple.
+   :return: None
+   """
+
+   with open(saved_progress_file, "a") as progress_file: # Open the progress file to append
+      progress_file.write(f",".join(map(str, commit_tuple)) + "\n") # Write the current tuple to the progress file
+
+def flush_progress_journal(repository_name):
+   """
+   Writes the buffered completed commits of the repository to its progress journal in a single transaction.
+
+   :param repository_name: Name of the repository being analyzed.
+   :return: None
+   """
+
+   buffered_commits = PROGRESS_JOURNAL_BUFFERS.pop(repository_name, []) # Get and remove the buffered completed commits
+   if not buffered_commits: # If there are no buffered commits
+      return # Nothing to write
+
+   connection = open_progress_journal(repository_name) # Open the progress journal
+   try: # Always close the progress journal
+      write_progress_journal_commits(connection, [commit_tuple for commit_tuple, _ in buffered_commits], [commit_stages_done for _, commit_stages_done in buffered_commits]) # Write the completed commits and their completion state
+   finally: # Close the progress journal
+      connection.close() # Close the connection
+
+def record_completed_commit(repository_name, saved_progress_file, commit_tuple, stages_done=(None, None)):
+   """
+   Records a completed commit, buffering it to be written to the progress journal in batches of PROGRESS_JOURNAL_BATCH_COMMITS commits, or appending it to the progress file if the progress journal is not used.
+
+   :param repository_name: Name of the repository being analyzed.
+   :param saved_progress_file: Path to the saved progress file.
+   :param commit_tuple: The commit information tuple.
+   :param stages_done: The tuple (ck_done, diffs_done) of the commit, whose values are 1 if the stage output of the commit was written by this execution, 0 if it wasn't or None if it is unknown.
+   :return: None
+   """
+
+   if not USE_PROGRESS_JOURNAL: # If the progress is stored in the progress file
+      write_progress_line(saved_progress_file, commit_tuple) # Append the commit to the progress file
+      return # The commit is recorded
+
+   PROGRESS_JOURNAL_BUFFERS.setdefault(repository_name, []).append((commit_tuple, stages_done)) # Buffer the commit and its completion state
+   if len(PROGRESS_JOURNAL_BUFFERS[repository_name]) >= PROGRESS_JOURNAL_BATCH_COMMITS: # If the buffer is full
+      flush_progress_journal(repository_name) # Write the buffered commits to the progress journal
+
+def flush_completed_commits(repository_name, saved_progress_file, pending_commits, pbar, max_pending_commits=0):
+   """
+   Writes the completed commits to the progress journal (or file) in commit number order. A commit is completed when both its diffs and its CK metrics are written, and it is only written after every previous commit was written, so the progress stays ordered and resumable.
+
+   :param repository_name: Name of the repository being analyzed.
+   :param saved_progress_file: Path to the saved progress file.
+   :param pending_commits: Dictionary with the commit number as key and a tuple (commit information tuple, CK future or None, diffs future or None) as value. If the CK future returns a function, it is called to finalize the CK metrics files of the commit.
+   :param pbar: The progress bar to be updated.
+   :param max_pending_commits: The maximum number of pending commits. While there are more pending commits than that, it waits for the oldest one.
+   :return: The number of the first commit that was written, or None if the first commit was not written.
+   """
+
+   first_commit_written = None # The number of the first commit, if it was written now
+
+   for commit_number in sorted(pending_commits.keys()): # Loop through the pending commits in order
+      commit_tuple, future, diffs_future = pending_commits[commit_number] # Get the commit tuple and its CK and diffs futures
+      running_futures = [pending_future for pending_future in (future, diffs_future) if pending_future is not None and not pending_future.done()] # The futures still running for the commit
+      if running_futures: # If CK or the diffs writer is still running for the commit
+         if len(pending_commits) <= max_pending_commits: # If there is still room for more pending commits
+            break # Stop writing, as the progress file must stay ordered
+         concurrent.futures.wait(running_futures) # Wait for the oldest commit to finish
+
+      diffs_future.result() if diffs_future is not None else None # Raise the exception of the diffs writer, if any
+      record_output_directory(repository_name, "diffs", f"{FULL_DIFFS_DIRECTORY_PATH}/{repository_name}/{commit_number}-{commit_tuple[1]}") if USE_OUTPUT_MANIFEST and diffs_future is not None and not PACKED_DIFFS else None # Record the diffs of the commit in the output manifest
+      ck_finalizer = future.result() if future is not None else None # Get the finalizer of the CK worker, raising its exception, if any
+      ck_finalizer() if callable(ck_finalizer) else None # Finalize the CK metrics files of the commit, such as merging the Delta-CK metrics files
+      record_output_directory(repository_name, "ck_metrics", f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}/{commit_number}-{commit_tuple[1]}") if USE_OUTPUT_MANIFEST else None # Record the CK metrics files of the commit in the output manifest
+      stages_done = (int(future is not None and verify_ck_metrics_files(f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}/{commit_number}-{commit_tuple[1]}")), int(diffs_future is not None)) # The stages whose outputs were written for the commit, verified before the CK metrics store may move them, as the diffs writer raised its exception above if it failed
+      buffer_commit_in_metrics_store(repository_name, commit_number, commit_tuple[1]) if CK_METRICS_STORE else None # Buffer the commit in the CK metrics store
+
+      record_completed_commit(repository_name, saved_progress_file, commit_tuple, stages_done) # Record the commit in the progress journal or file
+      first_commit_written = commit_number if commit_number == 1 else first_commit_written # Store if the first commit was written
+      del pending_commits[commit_number] # Remove the commit from the pending commits
+      pbar.update(1) # Update the progress bar
+
+   return first_commit_written # Return the number of the first commit that was written
 
 def get_classes_count_and_loc_metrics(output_directory):
    """
@@ -778,13 +2905,27 @@ def show_execution_time(first_iteration_duration, elapsed_time, number_of_commit
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Showing the execution time of the CK metrics generator...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Showing the execution time of the CK metrics generator...{Style.RESET_ALL}")
 
    estimated_time_string = f"{BackgroundColors.GREEN}Estimated time for running all the of the iterations in {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN}: "
    output_time(estimated_time_string, round(first_iteration_duration * number_of_commits, 2)) # Output the estimated time for running all of the iterations for the repository
    time_taken_string = f"{BackgroundColors.GREEN}Time taken to generate CK metrics for {BackgroundColors.CYAN}{number_of_commits}{BackgroundColors.GREEN} commits in {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository: "
    output_time(time_taken_string, round(elapsed_time, 2)) # Output the time taken to generate CK metrics for the commits in the repository
 
+def show_ck_cache_statistics(repository_name):
+   """
+   Shows the CK cache hits and misses of the current worker process.
+
+   :param repository_name: Name of the repository that was analyzed.
+   :return: None
+   """
+
+   with CK_CACHE_LOCK: # Lock the CK cache statistics
+      hits, misses = CK_CACHE_STATISTICS["hits"], CK_CACHE_STATISTICS["misses"] # Get the hits and misses counters
+
+   hit_rate = round((hits / (hits + misses)) * 100, 2) if hits + misses > 0 else 0 # Calculate the hit rate
+   print(f"{BackgroundColors.GREEN}CK cache statistics after the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository: {BackgroundColors.CYAN}{hits}{BackgroundColors.GREEN} hits, {BackgroundColors.CYAN}{misses}{BackgroundColors.GREEN} misses ({BackgroundColors.CYAN}{hit_rate}%{BackgroundColors.GREEN} hit rate).{Style.RESET_ALL}")
+
 def get_filtered_sorted_directories(directory_path):
    """
    Get and sort directories by the commit number.
@@ -825,12 +2966,16 @@ def get_directories_size_in_gb(repository_name, directories=OUTPUT_DIRECTORIES):
    :return: Total size of the output directories in GB
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Getting the size of the output directories in {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Getting the size of the output directories in {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 
    output_dirs_size = 0 # Total size of the output directories in GB
+   manifest_stages = {output_directory: stage for stage, output_directory in OUTPUT_MANIFEST_STAGES.items()} # The stages indexed in the output manifest, by their output directory
    for output_dir in directories: # Loop through the output directories
       repository_output_dir = os.path.join(output_dir, repository_name) # Update the output directory with the repository name
-      if verify_filepath_exists(os.path.join(output_dir, repository_name)): # Verify if the directory exists
+      manifest_size = get_manifest_stage_size(repository_name, manifest_stages[output_dir]) if output_dir in manifest_stages else None # Get the size of the directory from the output manifest
+      if manifest_size is not None: # If the directory is indexed in the output manifest
+         output_dirs_size += manifest_size / (1024 ** 3) # Size in GB, without walking the directory
+      elif verify_filepath_exists(os.path.join(output_dir, repository_name)): # Verify if the directory exists
          output_dirs_size += get_directory_size_in_gb(repository_output_dir) # Get the size of each output directory in GB
    
    return output_dirs_size # Return the total size of the output directories in GB
@@ -850,6 +2995,200 @@ def get_file_size_in_gb(filepath):
       file_size = 0 # File does not exist, size is 0 GB
    return file_size # Return the size of the progress file in GB
 
+def update_live_eta(repository_name, pbar, eta_state):
+   """
+   Updates the live ETA of the repository in the progress bar postfix and, every ETA_UPDATE_SECONDS, in the progress/<repository_name>-eta.json file. The seconds per commit are blended from the execution time estimator to the observed throughput of the current execution during its first ETA_WARMUP_COMMITS commits.
+
+   :param repository_name: Name of the repository being analyzed.
+   :param pbar: The progress bar of the repository, whose counter is the number of commits processed in the current execution.
+   :param eta_state: Dictionary with the "start_time", the "estimated_seconds_per_commit" and the "last_update" time, which is updated.
+   :return: None
+   """
+
+   processed_commits, remaining_commits = pbar.n, max(0, pbar.total - pbar.n) # The commits processed in the current execution and the remaining ones
+   elapsed_time = time.time() - eta_state["start_time"] # The elapsed time of the current execution
+   observed_weight = min(1.0, processed_commits / ETA_WARMUP_COMMITS) # The weight of the observed throughput
+   observed_seconds_per_commit = elapsed_time / processed_commits if processed_commits > 0 else eta_state["estimated_seconds_per_commit"] # The observed seconds per commit
+   seconds_per_commit = observed_weight * observed_seconds_per_commit + (1 - observed_weight) * eta_state["estimated_seconds_per_commit"] # The blended seconds per commit
+   eta_seconds = remaining_commits * seconds_per_commit # The estimated remaining time
+
+   pbar.set_postfix_str(f"ETA {str(timedelta(seconds=int(eta_seconds)))}", refresh=False) # Show the ETA in the progress bar
+
+   if time.time() - eta_state["last_update"] < ETA_UPDATE_SECONDS and remaining_commits > 0: # If the ETA file was updated recently and the repository is not finished
+      return # Don't update the ETA file
+
+   eta_state["last_update"] = time.time() # Store the ETA file update time
+   eta_filepath = FULL_REPOSITORY_ETA_FILE_PATH.replace("REPOSITORY_NAME", repository_name) # The path to the ETA file
+   with open(f"{eta_filepath}.tmp", "w") as eta_file: # Write the ETA to a temporary file
+      json.dump({"repository_name": repository_name, "processed_commits": processed_commits, "remaining_commits": remaining_commits, "seconds_per_commit": round(seconds_per_commit, 4), "eta_seconds": round(eta_seconds, 2), "estimated_finish": (datetime.now() + timedelta(seconds=eta_seconds)).isoformat(timespec="seconds")}, eta_file, indent=3) # Write the ETA
+   os.replace(f"{eta_filepath}.tmp", eta_filepath) # Atomically move the ETA file to its path
+
+def get_shard_range(number_of_commits, shard_index):
+   """
+   Gets the commit number range of a shard, splitting the commits in SHARD_COUNT contiguous ranges of about the same size.
+
+   :param number_of_commits: Number of commits of the repository.
+   :param shard_index: The index of the shard.
+   :return: A tuple with the first and last commit numbers of the shard. If the shard is empty, the first is greater than the last.
+   """
+
+   return number_of_commits * shard_index // SHARD_COUNT + 1, number_of_commits * (shard_index + 1) // SHARD_COUNT # Return the first and last commit numbers of the shard
+
+def get_sampling_policy_description():
+   """
+   Gets the description of the commit sampling policy, which is recorded in the progress journal.
+
+   :return: The description of the commit sampling policy, such as "every_k:10", "tags", "week" or "none".
+   """
+
+   if not COMMIT_SAMPLING_POLICY: # If every commit is analyzed
+      return "none" # Return the description of no sampling
+
+   return f"{COMMIT_SAMPLING_POLICY}:{COMMIT_SAMPLING_K}" if COMMIT_SAMPLING_POLICY == "every_k" else COMMIT_SAMPLING_POLICY # Return the description of the commit sampling policy
+
+def get_tagged_commit_hashes(repository_directory_path):
+   """
+   Gets the hashes of the commits pointed by the tags of the repository, peeling the annotated tags.
+
+   :param repository_directory_path: Path to the repository directory.
+   :return: Set of the tagged commit hashes.
+   """
+
+   result = subprocess.run(["git", "for-each-ref", "refs/tags", "--format=%(objectname) %(*objectname)"], cwd=repository_directory_path, capture_output=True, text=True) # List the tags and their peeled commits
+   return {line.split()[-1] for line in result.stdout.splitlines() if line.strip()} # Return the peeled commit of the annotated tags or the commit of the lightweight tags
+
+def get_commit_timestamps(repository_directory_path):
+   """
+   Gets the committer timestamp of every commit of the repository.
+
+   :param repository_directory_path: Path to the repository directory.
+   :return: Dictionary with the commit hash as key and the committer timestamp as value.
+   """
+
+   result = subprocess.run(["git", "log", "--format=%H %ct", "HEAD"], cwd=repository_directory_path, capture_output=True, text=True) # List the commits and their committer timestamps
+   return {commit_hash: int(timestamp) for commit_hash, timestamp in (line.split() for line in result.stdout.splitlines() if line.strip())} # Return the committer timestamps
+
+def get_sampling_bucket(timestamp):
+   """
+   Gets the time bucket of a commit for the "day", "week" and "month" commit sampling policies.
+
+   :param timestamp: The committer timestamp of the commit.
+   :return: The time bucket of the commit.
+   """
+
+   commit_date = datetime.fromtimestamp(timestamp, timezone.utc) # The committer date, in UTC
+   return commit_date.date() if COMMIT_SAMPLING_POLICY == "day" else commit_date.isocalendar()[:2] if COMMIT_SAMPLING_POLICY == "week" else (commit_date.year, commit_date.month) # Return the day, ISO week or month of the commit
+
+def sample_commits(repository_name, repository_url, commits):
+   """
+   Samples the commits according to the COMMIT_SAMPLING_POLICY constant.
+
+   :param repository_name: Name of the repository.
+   :param repository_url: URL of the repository.
+   :param commits: Dictionary with the global commit number as key and the commit hash as value, in the commit number order.
+   :return: Dictionary with the global commit number as key and the commit hash as value of the sampled commits.
+   """
+
+   if not COMMIT_SAMPLING_POLICY or not commits: # If every commit is analyzed
+      return commits # Return every commit
+
+   repository_directory_path = get_local_repository_path(repository_name, repository_url) # The path to the local clone
+   last_commit_number = max(commits) # The last commit number
+
+   if COMMIT_SAMPLING_POLICY == "every_k": # If every k-th commit is sampled
+      return {number: commit_hash for number, commit_hash in commits.items() if (number - 1) % COMMIT_SAMPLING_K == 0 or number == last_commit_number} # Return every k-th commit and the last one
+
+   if COMMIT_SAMPLING_POLICY == "tags": # If the tagged commits are sampled
+      tagged_commit_hashes = get_tagged_commit_hashes(repository_directory_path) # Get the tagged commits
+      return {number: commit_hash for number, commit_hash in commits.items() if commit_hash in tagged_commit_hashes} # Return the tagged commits
+
+   if COMMIT_SAMPLING_POLICY in ["day", "week", "month"]: # If the last commit of every time bucket is sampled
+      commit_timestamps = get_commit_timestamps(repository_directory_path) # Get the committer timestamps
+      buckets_last_commits = {get_sampling_bucket(commit_timestamps.get(commit_hash, 0)): number for number, commit_hash in commits.items()} # The last commit number of every time bucket
+      return {number: commits[number] for number in sorted(buckets_last_commits.values())} # Return the last commit of every time bucket
+
+   print(f"{BackgroundColors.RED}The {BackgroundColors.CYAN}{COMMIT_SAMPLING_POLICY}{BackgroundColors.RED} commit sampling policy is not valid, so every commit is analyzed.{Style.RESET_ALL}")
+   return commits # Return every commit
+
+def get_selected_commits(repository_name, repository_url):
+   """
+   Gets the commits analyzed by this execution: the commits of the COMMIT_SAMPLING_POLICY sample that are in the shard of this execution, with their global commit numbers.
+
+   :param repository_name: Name of the repository.
+   :param repository_url: URL of the repository.
+   :return: Dictionary with the global commit number as key and the commit hash as value, in the commit number order.
+   """
+
+   commit_hashes = get_repository_commit_hashes(repository_name, repository_url) # The commit hashes of the repository, in the global commit numbering order
+   selected_commits = sample_commits(repository_name, repository_url, dict(enumerate(commit_hashes, start=1))) # Sample the commits of the whole repository, so the time buckets don't depend on the shards
+
+   if SHARD_COUNT > 1: # If only a shard of the repository is analyzed
+      first_commit_number, last_commit_number = get_shard_range(len(commit_hashes), SHARD_INDEX) # Get the commit number range of the shard
+      selected_commits = {number: commit_hash for number, commit_hash in selected_commits.items() if first_commit_number <= number <= last_commit_number} # Keep only the commits of the shard
+
+   return selected_commits # Return the selected commits
+
+def record_sampling_policy(repository_name):
+   """
+   Records the commit sampling policy in the progress journal, or in the sampling policy file if the progress journal is not used, so the gaps between the analyzed commits are interpreted correctly by the metrics_changes.py script.
+
+   :param repository_name: Name of the repository.
+   :return: None
+   """
+
+   if not USE_PROGRESS_JOURNAL: # If the progress journal is not used
+      policy_filepath = FULL_REPOSITORY_SAMPLING_POLICY_FILE_PATH.replace("REPOSITORY_NAME", repository_name) # The path to the sampling policy file
+      recorded_policy = None # The recorded commit sampling policy
+      if verify_filepath_exists(policy_filepath): # If the commit sampling policy was recorded
+         with open(policy_filepath, "r") as policy_file: # Open the sampling policy file
+            recorded_policy = policy_file.read().strip() # Read the recorded commit sampling policy
+      if recorded_policy is not None and recorded_policy != get_sampling_policy_description(): # If the commit sampling policy changed
+         print(f"{BackgroundColors.YELLOW}The commit sampling policy of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.YELLOW} repository changed from {BackgroundColors.CYAN}{recorded_policy}{BackgroundColors.YELLOW} to {BackgroundColors.CYAN}{get_sampling_policy_description()}{BackgroundColors.YELLOW}.{Style.RESET_ALL}")
+      os.makedirs(os.path.dirname(policy_filepath), exist_ok=True) # Create the progress directory
+      with open(policy_filepath, "w") as policy_file: # Open the sampling policy file
+         policy_file.write(get_sampling_policy_description()) # Record the commit sampling policy
+      return # Return as the commit sampling policy was recorded
+
+   connection = open_progress_journal(repository_name) # Open the progress journal
+   try: # Always close the progress journal
+      recorded_policy = connection.execute("SELECT value FROM meta WHERE key = 'sampling_policy'").fetchone() # The recorded commit sampling policy
+      if recorded_policy is not None and recorded_policy[0] != get_sampling_policy_description(): # If the commit sampling policy changed
+         print(f"{BackgroundColors.YELLOW}The commit sampling policy of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.YELLOW} repository changed from {BackgroundColors.CYAN}{recorded_policy[0]}{BackgroundColors.YELLOW} to {BackgroundColors.CYAN}{get_sampling_policy_description()}{BackgroundColors.YELLOW}.{Style.RESET_ALL}")
+      with connection: # Record the commit sampling policy
+         connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('sampling_policy', ?)", (get_sampling_policy_description(),)) # Record the commit sampling policy
+   finally: # Close the progress journal
+      connection.close() # Close the connection
+
+def get_repository_sampling(repository_name):
+   """
+   Gets the commit sampling policy recorded in the progress journal of the repository, or in its sampling policy file if it is more recent, and its analyzed commits.
+
+   :param repository_name: Name of the repository.
+   :return: A tuple with the commit sampling policy description (or "none") and the set of the analyzed commit hashes, which is None if every commit was analyzed.
+   """
+
+   journal_filepath = get_progress_journal_filepath(repository_name) # The progress journal of the whole repository
+   policy_filepath = FULL_REPOSITORY_SAMPLING_POLICY_FILE_PATH.replace("REPOSITORY_NAME", repository_name) # The sampling policy file, written when the progress journal is not used
+
+   if verify_filepath_exists(policy_filepath) and (not verify_filepath_exists(journal_filepath) or os.path.getmtime(policy_filepath) >= os.path.getmtime(journal_filepath)): # If the last execution didn't use the progress journal
+      with open(policy_filepath, "r") as policy_file: # Open the sampling policy file
+         sampling_policy = policy_file.read().strip() or "none" # The commit sampling policy
+      commits_df = read_commit_file(f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}-commits_list{CSV_FILE_EXTENSION}") if sampling_policy != "none" and verify_filepath_exists(f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}-commits_list{CSV_FILE_EXTENSION}") else None # The analyzed commits, listed in the commits list file
+      return sampling_policy, set(commits_df["Commit Hash"]) if commits_df is not None else None # Return the commit sampling policy and the analyzed commits
+
+   if not verify_filepath_exists(journal_filepath): # If there is no progress journal
+      return "none", None # Every commit was analyzed
+
+   connection = sqlite3.connect(f"file:{journal_filepath}?mode=ro", uri=True) # Connect to the progress journal in read only mode
+   try: # Always close the progress journal
+      recorded_policy = connection.execute("SELECT value FROM meta WHERE key = 'sampling_policy'").fetchone() # The recorded commit sampling policy
+      sampling_policy = recorded_policy[0] if recorded_policy else "none" # The commit sampling policy
+      analyzed_commits = {row[0] for row in connection.execute("SELECT commit_hash FROM commits")} if sampling_policy != "none" else None # The analyzed commits
+   finally: # Close the progress journal
+      connection.close() # Close the connection
+
+   return sampling_policy, analyzed_commits # Return the commit sampling policy and the analyzed commits
+
 def traverse_repository(repository_name, repository_url, number_of_commits):
    """
    Traverses the repository to run CK for every commit hash in the repository.
@@ -861,21 +3200,39 @@ def traverse_repository(repository_name, repository_url, number_of_commits):
    :return: A tuple with the commits information list and a dictionary with repository attributes.
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Traversing the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository to run CK for every commit hash...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Traversing the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository to run CK for every commit hash...{Style.RESET_ALL}")
 
    start_time = time.time() # Start measuring time
    first_iteration_duration = 0 # Duration of the first iteration
    
-   saved_progress_file = get_last_execution_progress_filepath(repository_name) # Get the file path of the saved progress file
+   saved_progress_file = get_last_execution_progress_filepath(repository_name) if not USE_PROGRESS_JOURNAL else None # Get the file path of the saved progress file, which is not used with the progress journal
    commits_info, last_execution_progress = get_last_execution_progress(repository_name, saved_progress_file, number_of_commits) # Get the last execution progress of the repository
+   selected_commits = get_selected_commits(repository_name, repository_url) if SHARD_COUNT > 1 or COMMIT_SAMPLING_POLICY else None # The commits analyzed by this execution (of its shard and commit sample), with their global commit numbers, or None if every commit is analyzed
+   last_commit_number = max(selected_commits, default=0) if selected_commits is not None else number_of_commits # The last commit number to be analyzed
    commit_number = 1 if last_execution_progress[0] == 0 else last_execution_progress[0] + 1 # Set the commit number to 1 if the last commit number is 0, otherwise increment the last commit number
+   record_sampling_policy(repository_name) # Record the commit sampling policy in the progress journal or in the sampling policy file
 
-   if last_execution_progress[0] == number_of_commits: # Return if the last commit number is equal to the total number of commits
+   if last_execution_progress[0] == last_commit_number: # Return if the last commit number is equal to the last commit number to be analyzed
       return commits_info, get_repository_attributes(repository_name, number_of_commits, first_iteration_duration) # Return the commits info and repository attributes
 
+   invalidate_output_manifest(repository_name) if not USE_OUTPUT_MANIFEST else None # Delete the output manifest, as the outputs written by this execution are not indexed in it
+
+   sync_metrics_store(repository_name) if CK_METRICS_STORE else None # Store the commits that were analyzed but not stored yet
+   ensure_full_objects(repository_name, repository_url) if SPARSE_CLONES and RUN_FUNCTIONS["Diffs"] else None # Fetch every blob of a sparse clone at once, as the diffs read the content of every commit, while the checkouts stay sparse
+
+   worktrees_pool = setup_worktrees_pool(repository_name, CK_WORKERS) if CK_WORKERS > 1 and RUN_FUNCTIONS["CK Metrics"] and not CK_CACHE and not CK_SNAPSHOTS else None # The worktrees used to analyze commits concurrently
+   pending_commits = {} # The commits that are not written to the progress file yet, in the format: commit_number: (commit tuple, CK future, diffs future)
+   previous_commit = (last_execution_progress[0], last_execution_progress[1]) if last_execution_progress[0] > 0 else None # The commit number and hash of the previous traversed commit
+
+   eta_state = {"start_time": time.time(), "estimated_seconds_per_commit": estimate_seconds_per_commit(repository_name), "last_update": 0} # The state of the live ETA
+   remaining_commits = {commit_hash: number for number, commit_hash in selected_commits.items() if number > last_execution_progress[0]} if selected_commits is not None else None # The remaining selected commits, in the format: commit_hash: commit_number
+   repository_filters = {"only_commits": list(remaining_commits.keys())} if remaining_commits is not None else {"from_commit": last_execution_progress[1]} # Traverse only the remaining selected commits, or resume from the last commit
+
    # Create a progress bar with the total number of commits
-   with tqdm(total=number_of_commits - last_execution_progress[0], unit=f" {BackgroundColors.GREEN}Traversing the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} commit tree{Style.RESET_ALL}", unit_scale=True) as pbar:
-      for commit in Repository(repository_url, from_commit=last_execution_progress[1]).traverse_commits(): # Loop through the commits of the repository
+   with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, CK_WORKERS)) as executor, concurrent.futures.ThreadPoolExecutor(max_workers=1 if PACKED_DIFFS else max(1, PIPELINE_DIFF_WRITERS)) as diffs_executor, tqdm(total=len(remaining_commits) if remaining_commits is not None else number_of_commits - last_execution_progress[0], unit=f" {BackgroundColors.GREEN}Traversing the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} commit tree{Style.RESET_ALL}", unit_scale=True) as pbar:
+      commits = traverse_commits_metadata(repository_name, repository_url, **repository_filters) if USE_COMMITS_METADATA and not RUN_FUNCTIONS["Diffs"] else Repository(get_local_repository_path(repository_name, repository_url), **repository_filters).traverse_commits() # Use the commits metadata if the diffs are not generated, as the PyDriller commits compute the diff of every modified file
+      for commit in prefetch_commits(commits): # Loop through the commits of the local clone of the repository, read ahead by the history reader thread
+         commit_number = remaining_commits[commit.hash] if remaining_commits is not None else commit_number # Use the global commit number of the selected commits
          lines_added, lines_removed, code_churn = calculate_code_churn(commit) # Calculate the code churn for the commit
          modified_files_count = len(commit.modified_files) # Number of modified files
          code_churn_avg_per_file = code_churn / modified_files_count if modified_files_count > 0 else 0 # Code churn average per file
@@ -893,33 +3250,52 @@ def traverse_repository(repository_name, repository_url, number_of_commits):
          ) # Create a tuple with the commit information
          commits_info.append(current_tuple) # Append the current tuple to the commits_info list
 
-         generate_diffs(repository_name, commit, commit_number) if RUN_FUNCTIONS["Diffs"] else None # Save the diff of the modified files of the current commit
+         diffs_future = diffs_executor.submit(generate_diffs, repository_name, commit, commit_number) if RUN_FUNCTIONS["Diffs"] else None # Save the diff of the modified files of the current commit in a diffs writer thread
 
+         ck_future = None # The future of the CK run of the current commit, if it runs in a worker
          if not verify_ck_metrics_files(f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}/{commit_number}-{commit.hash}", CK_METRICS_FILES): # Verify if the CK metrics files do not exist
-            workdir = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the repository directory
-            os.chdir(workdir) # Change working directory to the repository directory
-
-            checkout_branch(commit.hash) # Checkout the current commit hash branch to run ck
-
-            output_directory, relative_output_directory = generate_output_directory_paths(repository_name, commit_number, commit.hash) # Generate the output directory paths
-            create_directory(output_directory, relative_output_directory) # Create the ck_metrics directory
+            if RUN_FUNCTIONS["CK Metrics"] and is_ck_alias_possible(commit, previous_commit): # If the commit doesn't modify any Java file
+               previous_output_directory = f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}/{previous_commit[0]}-{previous_commit[1]}" # The CK metrics directory of the previous commit
+               ck_future = executor.submit(functools.partial, link_previous_ck_files, repository_name, commit_number, commit.hash, previous_output_directory) # Link the CK metrics files of the previous commit, without checking out the commit nor running CK, when it is finalized
+            elif RUN_FUNCTIONS["CK Metrics"] and CK_CACHE: # If the CK metrics files are assembled from the CK cache
+               ck_future = executor.submit(run_cached_ck_for_commit, repository_name, commit_number, commit.hash) # Run CK only for the blobs that are not cached
+            elif RUN_FUNCTIONS["CK Metrics"] and is_delta_ck_possible(commit, previous_commit): # If only the changed files must be analyzed
+               changed_paths, stale_paths = get_commit_java_changes(commit) # Get the Java files changed by the commit
+               previous_output_directory = f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}/{previous_commit[0]}-{previous_commit[1]}" # The CK metrics directory of the previous commit
+               ck_future = executor.submit(run_delta_ck_for_commit, repository_name, commit_number, commit.hash, changed_paths, stale_paths, previous_output_directory) # Run CK for the changed files
+            elif RUN_FUNCTIONS["CK Metrics"] and CK_SNAPSHOTS: # If CK analyzes a snapshot of the commit
+               ck_future = executor.submit(run_ck_in_snapshot, repository_name, commit_number, commit.hash) # Run CK in the snapshot of an available CK worker, without checking out the commit
+            elif worktrees_pool is not None: # If the commits are analyzed concurrently
+               ck_future = executor.submit(run_ck_in_worktree, repository_name, commit_number, commit.hash, worktrees_pool) # Run CK for the commit in an available worktree
+            elif RUN_FUNCTIONS["CK Metrics"]: # If the commits are analyzed serially
+               ck_future = executor.submit(run_ck_in_repository, repository_name, commit_number, commit.hash) # Checkout the commit and run CK in the single CK worker, so the next commits are read and their diffs written meanwhile
+
+         pending_commits[commit_number] = (current_tuple, ck_future, diffs_future) # Add the commit to the pending commits
+         previous_commit = (commit_number, commit.hash) # Store the current commit as the previous traversed commit
+         if flush_completed_commits(repository_name, saved_progress_file, pending_commits, pbar, 2 * CK_WORKERS + PIPELINE_QUEUE_COMMITS) == 1: # Write the completed commits to the progress file, keeping at most 2 commits per worker and a queue of commits pending, so the memory stays flat
+            first_iteration_duration = time.time() - start_time # Calculate the duration of the first iteration
+         update_live_eta(repository_name, pbar, eta_state) # Update the live ETA of the repository
 
-            os.chdir(output_directory) # Change working directory to the repository directory
+         commit_number += 1 # Increment the commit number
 
-            cmd = f"java -jar {FULL_CK_JAR_PATH} {workdir} false 0 false {output_directory} true" # The command to run the CK metrics generator
-            run_ck_metrics_generator(cmd) if RUN_FUNCTIONS["CK Metrics"] else None # Run the CK metrics generator
+      if flush_completed_commits(repository_name, saved_progress_file, pending_commits, pbar) == 1: # Wait for the remaining commits and write them to the progress file
+         first_iteration_duration = time.time() - start_time # Calculate the duration of the first iteration
+      update_live_eta(repository_name, pbar, eta_state) # Write the final ETA of the repository
+      diffs_executor.submit(close_diff_pack, repository_name).result() if PACKED_DIFFS else None # Close the diff pack in the diffs writer thread, which opened it
 
-         if commit_number == 1: # If it is the first iteration
-            first_iteration_duration = time.time() - start_time # Calculate the duration of the first iteration
+   record_output_files(repository_name, "diffs", list(get_diff_pack_paths(repository_name))) if USE_OUTPUT_MANIFEST and PACKED_DIFFS else None # Record the diff pack and its index in the output manifest
 
-         with open(saved_progress_file, "a") as progress_file: # Open the progress file to append
-            progress_file.write(f",".join(map(str, current_tuple)) + "\n") # Write the current tuple to the progress file
-         
-         commit_number += 1 # Increment the commit number
-         pbar.update(1) # Update the progress bar
+   teardown_worktrees_pool(repository_name, worktrees_pool) if worktrees_pool is not None else None # Remove the worktrees of the repository
+   stop_ck_batch_runners() if CK_BATCH_MODE else None # Stop the CK batch runners of the repository
+   remove_ck_snapshots() if CK_SNAPSHOTS else None # Remove the CK snapshots of the repository
+   flush_metrics_store(repository_name) if CK_METRICS_STORE else None # Write the remaining buffered commits to the CK metrics store
+   close_diff_pack(repository_name) # Close the diff pack of the repository, if it was opened
+   close_output_manifest(repository_name) # Close the output manifest of the repository, if it was opened
+   flush_progress_journal(repository_name) if USE_PROGRESS_JOURNAL else None # Write the remaining completed commits to the progress journal
 
    elapsed_time = time.time() - start_time # Calculate elapsed time
    show_execution_time(first_iteration_duration, elapsed_time, number_of_commits - last_execution_progress[0], repository_name) # Show the execution time of the CK metrics generator
+   show_ck_cache_statistics(repository_name) if CK_CACHE and RUN_FUNCTIONS["CK Metrics"] else None # Show the CK cache hits and misses
 
    return commits_info, get_repository_attributes(repository_name, number_of_commits, elapsed_time) # Return the commits info and repository attributes
 
@@ -931,17 +3307,119 @@ def write_commits_information_to_csv(repository_name):
    :return: None
    """
    
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Moving the commit information to a new csv file...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Moving the commit information to a new csv file...{Style.RESET_ALL}")
    
    saved_progress_filepath = FULL_REPOSITORY_PROGRESS_FILE_PATH.replace("REPOSITORY_NAME", repository_name) # Original path to the saved progress file
    commits_list_filepath = f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}-commits_list{CSV_FILE_EXTENSION}" # The path to the CSV file
 
    try: # Try to move the file the saved progress file (generated bin the traverse_repository function) to the new path with a new name
+      if USE_PROGRESS_JOURNAL: # If the progress is stored in the progress journal
+         export_progress_journal_to_csv(repository_name, commits_list_filepath) # Export the progress journal to the commits list file
+         return # The progress journal stays as the source of truth
+
       shutil.move(saved_progress_filepath, commits_list_filepath) # Move the file
-      verbose_output(true_string=f"{BackgroundColors.GREEN}The {BackgroundColors.CYAN}{repository_name}-commits_list{CSV_FILE_EXTENSION}{BackgroundColors.GREEN} file was successfully moved from {BackgroundColors.CYAN}{saved_progress_filepath}{BackgroundColors.GREEN} to {BackgroundColors.CYAN}{commits_list_filepath}{BackgroundColors.GREEN}.{Style.RESET_ALL}")
+      verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}The {BackgroundColors.CYAN}{repository_name}-commits_list{CSV_FILE_EXTENSION}{BackgroundColors.GREEN} file was successfully moved from {BackgroundColors.CYAN}{saved_progress_filepath}{BackgroundColors.GREEN} to {BackgroundColors.CYAN}{commits_list_filepath}{BackgroundColors.GREEN}.{Style.RESET_ALL}")
    except Exception as e: # Handle exceptions
       print(f"{BackgroundColors.RED}An error occurred while moving the commit information to the {BackgroundColors.CYAN}{repository_name}-commits_list{CSV_FILE_EXTENSION}{BackgroundColors.RED} file: {e}{Style.RESET_ALL}")
 
+def get_shard_directory(repository_name, shard_index):
+   """
+   Gets the directory that contains the outputs of a shard. The outputs of a shard analyzed in another host must be copied to the shards/<repository_name>/shard-<shard_index> directory, with the same layout of this directory (ck_metrics, ck_metrics_store, diffs and progress). If it doesn't exist, the shard was analyzed in this host.
+
+   :param repository_name: Name of the repository.
+   :param shard_index: The index of the shard.
+   :return: The directory that contains the outputs of the shard.
+   """
+
+   shard_directory = f"{FULL_SHARDS_DIRECTORY_PATH}/{repository_name}/shard-{shard_index}" # The directory of the outputs copied from another host
+   return shard_directory if os.path.isdir(shard_directory) else START_PATH # Return the directory that contains the outputs of the shard
+
+def copy_shard_commit_outputs(repository_name, shard_directory, commit_id):
+   """
+   Copies the CK metrics and diffs directories of a commit analyzed in another host to the canonical layout.
+
+   :param repository_name: Name of the repository.
+   :param shard_directory: The directory that contains the outputs of the shard.
+   :param commit_id: The commit id, in the "<commit_number>-<commit_hash>" format.
+   :return: None
+   """
+
+   for relative_directory_path in [RELATIVE_CK_METRICS_DIRECTORY_PATH, RELATIVE_DIFFS_DIRECTORY_PATH]: # Loop through the per commit output directories
+      source_directory = f"{shard_directory}{relative_directory_path}/{repository_name}/{commit_id}" # The output directory of the commit in the shard
+      if os.path.isdir(source_directory): # If the shard has the output directory of the commit
+         shutil.copytree(source_directory, f"{START_PATH}{relative_directory_path}/{repository_name}/{commit_id}", dirs_exist_ok=True) # Copy the output directory of the commit
+         record_output_directory(repository_name, relative_directory_path.strip("/"), f"{START_PATH}{relative_directory_path}/{repository_name}/{commit_id}") if USE_OUTPUT_MANIFEST else None # Record the copied files in the output manifest
+
+def merge_repository_shards(repository_name, repository_url):
+   """
+   Verifies and merges the outputs of the SHARD_COUNT shards of the repository into the canonical layout. The commits of every shard must be exactly its commit number range, with the global commit numbering of "git rev-list --reverse HEAD", so no commit is missing or duplicated.
+
+   :param repository_name: Name of the repository.
+   :param repository_url: URL of the repository.
+   :return: True if the shards were merged, False otherwise.
+   """
+
+   print(f"{BackgroundColors.GREEN}Merging the {BackgroundColors.CYAN}{SHARD_COUNT}{BackgroundColors.GREEN} shards of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+
+   commit_hashes = get_repository_commit_hashes(repository_name, repository_url) # The commit hashes of the repository, in the global commit numbering order
+   merged_commits = {} # The commits of every shard, in the format: commit_number: (commit tuple, shard directory)
+   merged_stages = {} # The completion state of the commits of every shard, in the format: commit_number: (ck_done, diffs_done)
+
+   for shard_index in range(SHARD_COUNT): # Loop through the shards
+      shard_directory = get_shard_directory(repository_name, shard_index) # The directory that contains the outputs of the shard
+      journal_filepath = get_progress_journal_filepath(repository_name, shard_index, shard_directory) # The progress journal of the shard
+      if not verify_filepath_exists(journal_filepath): # If the shard was not analyzed
+         print(f"{BackgroundColors.RED}The progress journal of the {BackgroundColors.CYAN}{shard_index}{BackgroundColors.RED} shard of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository was not found in {BackgroundColors.CYAN}{journal_filepath}{BackgroundColors.RED}.{Style.RESET_ALL}")
+         return False # The shards can't be merged
+
+      connection = open_progress_journal(repository_name, journal_filepath) # Open the progress journal of the shard
+      try: # Always close the progress journal
+         shard_commits_info = read_progress_journal_commits(connection) # Read the commits of the shard
+         merged_stages.update(read_progress_journal_stages(connection)) # Read the completion state of the commits of the shard, as the shards have disjoint commit ranges
+      finally: # Close the progress journal
+         connection.close() # Close the connection
+
+      first_commit_number, last_commit_number = get_shard_range(len(commit_hashes), shard_index) # The commit number range of the shard
+      for commit_tuple in shard_commits_info: # Loop through the commits of the shard
+         commit_number, commit_hash = commit_tuple[0], commit_tuple[1] # Get the commit number and hash
+         if commit_number in merged_commits or not first_commit_number <= commit_number <= last_commit_number or commit_hashes[commit_number - 1] != commit_hash: # If the commit is duplicated, out of the shard range or has another hash
+            print(f"{BackgroundColors.RED}The {BackgroundColors.CYAN}{commit_number}-{commit_hash}{BackgroundColors.RED} commit of the {BackgroundColors.CYAN}{shard_index}{BackgroundColors.RED} shard doesn't match the commit numbering of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository.{Style.RESET_ALL}")
+            return False # The shards can't be merged
+         merged_commits[commit_number] = (commit_tuple, shard_directory) # Store the commit
+
+   expected_commits = sample_commits(repository_name, repository_url, dict(enumerate(commit_hashes, start=1))) # The commits that must be analyzed by the shards
+   missing_commits = [commit_number for commit_number in expected_commits if commit_number not in merged_commits] # The commits that no shard analyzed
+   if missing_commits: # If there are missing commits
+      print(f"{BackgroundColors.RED}The shards of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository are missing {BackgroundColors.CYAN}{len(missing_commits)}{BackgroundColors.RED} commits, starting at the {BackgroundColors.CYAN}{missing_commits[0]}º{BackgroundColors.RED} commit.{Style.RESET_ALL}")
+      return False # The shards can't be merged
+
+   for commit_number, (commit_tuple, shard_directory) in sorted(merged_commits.items()): # Loop through the commits in order
+      copy_shard_commit_outputs(repository_name, shard_directory, f"{commit_number}-{commit_tuple[1]}") if shard_directory != START_PATH else None # Copy the outputs of the commits analyzed in another host
+
+   for shard_directory in {shard_directory for _, shard_directory in merged_commits.values() if shard_directory != START_PATH}: # Loop through the shards analyzed in other hosts
+      merge_diff_pack(repository_name, shard_directory) # Append their packed diffs
+      merge_metrics_store(repository_name, shard_directory) # Copy their CK metrics store
+
+   connection = open_progress_journal(repository_name, get_progress_journal_filepath(repository_name)) # Open the progress journal of the whole repository
+   try: # Always close the progress journal
+      write_progress_journal_commits(connection, [commit_tuple for _, (commit_tuple, _) in sorted(merged_commits.items())], [merged_stages.get(commit_number, (None, None)) for commit_number in sorted(merged_commits)]) # Write the commits of every shard and their completion state
+   finally: # Close the progress journal
+      connection.close() # Close the connection
+
+   record_sampling_policy(repository_name) # Record the commit sampling policy of the shards in the progress journal of the whole repository
+
+   export_progress_journal_to_csv(repository_name, f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}-commits_list{CSV_FILE_EXTENSION}") # Export the commits list of the whole repository
+   sync_metrics_store(repository_name) if CK_METRICS_STORE else None # Store the commits that are not in the CK metrics store yet
+
+   stored_commits = get_metrics_store_commits(repository_name) if CK_METRICS_STORE else {} # Get the commits in the CK metrics store
+   close_output_manifest(repository_name) # Close the output manifest, so its records can be queried
+   missing_files_count = verify_commit_files_exist(f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}", [f"{commit_number}-{commit_hashes[commit_number - 1]}" for commit_number in merged_commits], stored_commits, get_manifest_commit_files(repository_name, "ck_metrics") or {}) if RUN_FUNCTIONS["CK Metrics"] else 0 # Count the commits without CK metrics
+   if missing_files_count > 0: # If there are commits without CK metrics
+      print(f"{BackgroundColors.YELLOW}The merged {BackgroundColors.CYAN}{repository_name}{BackgroundColors.YELLOW} repository is missing the CK metrics of {BackgroundColors.CYAN}{missing_files_count}{BackgroundColors.YELLOW} commits.{Style.RESET_ALL}")
+
+   print(f"{BackgroundColors.GREEN}The {BackgroundColors.CYAN}{len(merged_commits)}{BackgroundColors.GREEN} commits of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository were merged.{Style.RESET_ALL}")
+   return True # The shards were merged
+
 def update_repository_attributes(repository_attributes):
    """
    Updates or adds repository attributes in the CSV file.
@@ -999,7 +3477,7 @@ def write_repositories_attributes_to_csv(repository_attributes):
    :return: None
    """
    
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Writing the {repository_attributes['repository_name']} attributes to the {FULL_REPOSITORIES_ATTRIBUTES_FILE_PATH} file...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Writing the {repository_attributes['repository_name']} attributes to the {FULL_REPOSITORIES_ATTRIBUTES_FILE_PATH} file...{Style.RESET_ALL}")
 
    updated_rows, file_exists = update_repository_attributes(repository_attributes) # Update or add repository attributes and get updated rows
 
@@ -1032,11 +3510,15 @@ def process_repository(repository_name, repository_url, number_of_commits):
 
    commits_info, repository_attributes = traverse_repository(repository_name, repository_url, number_of_commits) # Traverse the repository to run CK for every commit hash in the repository
 
-   write_commits_information_to_csv(repository_name) if RUN_FUNCTIONS["Commits Information"] else None # Write the commits information to a CSV file
+   if SHARD_COUNT > 1: # If only a shard of the repository was analyzed
+      print(f"{BackgroundColors.GREEN}The {BackgroundColors.CYAN}{SHARD_INDEX}{BackgroundColors.GREEN} shard of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository was analyzed. Its outputs are merged by running with {BackgroundColors.CYAN}MERGE_SHARDS{BackgroundColors.GREEN} set to True.{Style.RESET_ALL}")
+   else: # If the whole repository was analyzed
+      write_commits_information_to_csv(repository_name) if RUN_FUNCTIONS["Commits Information"] else None # Write the commits information to a CSV file
 
-   write_repositories_attributes_to_csv(repository_attributes) if RUN_FUNCTIONS["Repositories Attributes"] else None # Save repository attributes to a CSV file
+      write_repositories_attributes_to_csv(repository_attributes) if RUN_FUNCTIONS["Repositories Attributes"] else None # Save repository attributes to a CSV file
 
-   checkout_branch("main") # Checkout the main branch
+   repository_directory_path = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the repository directory
+   checkout_branch(get_default_branch_name(repository_directory_path), repository_directory_path) # Checkout the default branch
 
 def setup_process_repository(repository_name, repository_url, number_of_commits=None):
    """
@@ -1048,9 +3530,9 @@ def setup_process_repository(repository_name, repository_url, number_of_commits=
    """
 
    global RUN_FUNCTIONS # Declare the RUN_FUNCTIONS as a global variable
-   number_of_commits = sum(1 for _ in Repository(repository_url).traverse_commits()) if number_of_commits == None else number_of_commits
+   number_of_commits = get_repository_commits_count(repository_name, repository_url) if number_of_commits == None else number_of_commits
 
-   if RUN_FUNCTIONS["Verify CK Metrics Directory"]: # If the function to verify the CK metrics directory is enabled
+   if RUN_FUNCTIONS["Verify CK Metrics Directory"] and SHARD_COUNT == 1: # If the function to verify the CK metrics directory is enabled and the whole repository is analyzed
       ck_metrics_files_exist, unprocessed_commits = verify_ck_metrics_directory(repository_name, repository_url, number_of_commits)
 
       if ck_metrics_files_exist: # If metrics directory exists and is either up to date or has unprocessed commits
@@ -1065,36 +3547,298 @@ def setup_process_repository(repository_name, repository_url, number_of_commits=
 
    process_repository(repository_name, repository_url, number_of_commits)
 
+def process_and_estimate(repository_name, repository_url):
+   """
+   Estimates the time to process the repository and processes it. It runs in a repository worker process.
+
+   :param repository_name: Name of the repository to be analyzed.
+   :param repository_url: URL of the repository to be analyzed.
+   :return: None
+   """
+
+   estimated_time_string = f"{BackgroundColors.GREEN}Estimated time for running all iterations for {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN}: "
+
+   number_of_commits = get_repository_commits_count(repository_name, repository_url) # Count the commits of the local clone of the repository
+   estimated_time = estimate_repository_execution_time(repository_name, number_of_commits) # Estimate the time to process the repository from the previous executions
+   output_time(estimated_time_string, estimated_time) # Output the estimated time
+   setup_process_repository(repository_name, repository_url, number_of_commits) # Process the repository
+
+def get_jvm_heap_in_gb(jvm_heap):
+   """
+   Converts a JVM heap size, such as "4g", "512m" or "2097152k", to GB.
+
+   :param jvm_heap: The JVM heap size. If None, SCHEDULER_DEFAULT_JVM_HEAP_GB is returned.
+   :return: The JVM heap size in GB.
+   """
+
+   if not jvm_heap: # If the JVM heap size is not set
+      return SCHEDULER_DEFAULT_JVM_HEAP_GB # Return the default JVM heap size
+
+   units = {"k": 1 / (1024 ** 2), "m": 1 / 1024, "g": 1, "t": 1024} # The size of each unit in GB
+   unit = jvm_heap[-1].lower() # The unit of the JVM heap size
+   return float(jvm_heap[:-1]) * units[unit] if unit in units else float(jvm_heap) / (1024 ** 3) # Return the JVM heap size in GB, which is in bytes if it has no unit
+
+def get_repository_estimated_memory_in_gb():
+   """
+   Estimates the memory used by a repository worker: the heap of its CK JVMs plus the Python working set.
+
+   :return: The estimated memory in GB.
+   """
+
+   estimated_memory = get_jvm_heap_in_gb(CK_JVM_MAX_HEAP) * max(1, CK_WORKERS) + SCHEDULER_PYTHON_WORKING_SET_GB # The CK JVMs heap plus the Python working set
+   return min(estimated_memory, REPOSITORY_WORKER_MEMORY_LIMIT_GB) if REPOSITORY_WORKER_MEMORY_LIMIT_GB is not None else estimated_memory # Return the estimated memory, which can't exceed the memory limit of the worker
+
+def read_repositories_attributes():
+   """
+   Reads the number of commits and the size of the repositories from the repositories attributes file of the previous executions.
+
+   :return: Dictionary with the repository name as key and a tuple (number of commits, size in GB) as value.
+   """
+
+   repositories_attributes = {} # The attributes of the repositories
+   if not verify_filepath_exists(FULL_REPOSITORIES_ATTRIBUTES_FILE_PATH): # If the repositories attributes file does not exist
+      return repositories_attributes # Return an empty dictionary
+
+   try: # Try to read the repositories attributes file
+      with open(FULL_REPOSITORIES_ATTRIBUTES_FILE_PATH, "r", newline="") as csv_file: # Open the repositories attributes file
+         for row in csv.DictReader(csv_file): # Loop through the repositories
+            repositories_attributes[row["Repository Name"]] = (int(float(row["Number of Commits"] or 0)), float(row["Size (GB)"] or 0)) # Store the number of commits and the size of the repository
+   except Exception as e: # Handle exceptions
+      print(f"{BackgroundColors.RED}An error occurred while reading the {BackgroundColors.CYAN}{FULL_REPOSITORIES_ATTRIBUTES_FILE_PATH}{BackgroundColors.RED} file: {e}{Style.RESET_ALL}")
+
+   return repositories_attributes # Return the attributes of the repositories
+
+def get_repository_job_size(repository_name, repositories_attributes):
+   """
+   Gets the size of the job of a repository, which is its number of commits and size in the repositories attributes file or, if it is not there, the number of commits of its local clone, if it exists, or else its number of commits and size in the repositories JSON file.
+
+   :param repository_name: Name of the repository.
+   :param repositories_attributes: Dictionary with the repository name as key and a tuple (number of commits, size in GB) as value.
+   :return: A tuple (number of commits, size in GB).
+   """
+
+   if repository_name in repositories_attributes: # If the repository was analyzed before
+      return repositories_attributes[repository_name] # Return its number of commits and size
+
+   repository_directory_path = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the local clone
+   if os.path.isdir(repository_directory_path): # If the repository was cloned before
+      return (count_commits(repository_directory_path), 0) # Return the number of commits of the local clone
+
+   return REPOSITORIES_JSON_JOB_SIZES.get(repository_name, (0, 0)) # Return the number of commits and size of the repositories JSON file, if the repository is there
+
+def sort_repositories_longest_first(repositories):
+   """
+   Sorts the repositories from the longest to the shortest job, by their number of commits and then by their size, both in descending order, so the ascending order of the repositories JSON file is never kept.
+
+   :param repositories: Dictionary with the repository name as key and the repository URL as value.
+   :return: List of tuples (repository name, repository URL), from the longest to the shortest job.
+   """
+
+   repositories_attributes = read_repositories_attributes() # The attributes of the repositories of the previous executions
+   job_sizes = {repository_name: get_repository_job_size(repository_name, repositories_attributes) for repository_name in repositories.keys()} # The number of commits and size of each repository
+   return sorted(repositories.items(), key=lambda repository: (-job_sizes[repository[0]][0], -job_sizes[repository[0]][1])) # Return the repositories from the longest to the shortest job, with the ties broken by the larger size
+
+def get_completed_commits_count(repository_names):
+   """
+   Counts the commits completed by the repositories, reading the last completed commit of their progress journals.
+
+   :param repository_names: The names of the repositories.
+   :return: The total number of completed commits.
+   """
+
+   completed_commits = 0 # The total number of completed commits
+   for repository_name in repository_names: # Loop through the repositories
+      journal_filepath = get_progress_journal_filepath(repository_name, SHARD_INDEX if SHARD_COUNT > 1 else None) # The progress journal of the repository
+      if not verify_filepath_exists(journal_filepath): # If the repository has no progress journal yet
+         continue # Skip the repository
+      try: # Try to read the progress journal, which may be written at the same time by the repository worker
+         connection = sqlite3.connect(f"file:{journal_filepath}?mode=ro", uri=True, timeout=5) # Connect to the progress journal in read only mode
+         completed_commits += get_progress_journal_last_commit(connection)[0] # Add the last completed commit number
+         connection.close() # Close the connection
+      except sqlite3.Error: # If the progress journal is not readable yet
+         continue # Skip the repository
+
+   return completed_commits # Return the total number of completed commits
+
+def adapt_concurrency_limit(scheduler_state, repository_names, max_concurrency):
+   """
+   Adapts the number of concurrent repository workers: it is reduced when the memory pressure is above SCHEDULER_HIGH_MEMORY_PERCENT and, otherwise, every SCHEDULER_ADAPT_SECONDS it keeps moving in the same direction while the throughput (completed commits per second) improves, reversing its direction when the throughput drops. The first measurement is only the baseline, so the number of concurrent repository workers is not moved before there is a throughput to compare with.
+
+   :param scheduler_state: Dictionary with the "limit", "direction", "throughput", "commits" and "time" of the last adaptation, which is updated.
+   :param repository_names: The names of the scheduled repositories.
+   :param max_concurrency: The maximum number of concurrent repository workers.
+   :return: None
+   """
+
+   if psutil.virtual_memory().percent > SCHEDULER_HIGH_MEMORY_PERCENT: # If the memory pressure is high
+      scheduler_state["limit"], scheduler_state["direction"] = max(1, scheduler_state["limit"] - 1), -1 # Reduce the number of concurrent repository workers
+      return # Don't measure the throughput under memory pressure
+
+   elapsed_time = time.time() - scheduler_state["time"] # The time since the last adaptation
+   if not USE_PROGRESS_JOURNAL or elapsed_time < SCHEDULER_ADAPT_SECONDS: # If the throughput can't be measured or it is not time to adapt yet
+      return # Keep the number of concurrent repository workers
+
+   completed_commits = get_completed_commits_count(repository_names) # The total number of completed commits
+   throughput = (completed_commits - scheduler_state["commits"]) / elapsed_time # The completed commits per second since the last adaptation
+
+   if scheduler_state["throughput"] is None: # If it is the first measurement
+      scheduler_state.update({"throughput": throughput, "commits": completed_commits, "time": time.time()}) # Store the baseline throughput
+      return # Keep the number of concurrent repository workers until there is a throughput to compare with
+
+   if throughput < scheduler_state["throughput"]: # If the throughput dropped
+      scheduler_state["direction"] = -scheduler_state["direction"] # Reverse the direction
+
+   scheduler_state["limit"] = min(max_concurrency, max(1, scheduler_state["limit"] + scheduler_state["direction"])) # Move the number of concurrent repository workers
+   scheduler_state.update({"throughput": throughput, "commits": completed_commits, "time": time.time()}) # Store the measurement
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}The throughput is {BackgroundColors.CYAN}{throughput:.2f}{BackgroundColors.GREEN} commits per second, so up to {BackgroundColors.CYAN}{scheduler_state['limit']}{BackgroundColors.GREEN} repositories will be processed at the same time.{Style.RESET_ALL}")
+
+def admit_repositories(executor, pending_repositories, running_repositories, concurrency_limit, suspected_repositories):
+   """
+   Starts the pending repositories, from the longest to the shortest job, while there are less running repositories than the concurrency limit and the estimated memory of the repository fits the free memory budget. The estimated memory of the repositories started in the last SCHEDULER_RAMP_UP_SECONDS stays reserved, as they didn't allocate it yet. If no repository is running, the next one is always started.
+   The repositories suspected of killing a worker process only run alone, so the repository that died can be identified.
+
+   :param executor: The process pool executor.
+   :param pending_repositories: List of tuples (repository name, repository URL) not started yet, which is updated.
+   :param running_repositories: Dictionary with the future as key and a tuple (repository name, start time) as value, which is updated.
+   :param concurrency_limit: The maximum number of concurrent repository workers.
+   :param suspected_repositories: Set with the names of the repositories that were running when a worker process died.
+   :return: None
+   """
+
+   estimated_memory = get_repository_estimated_memory_in_gb() # The estimated memory of a repository worker
+
+   while pending_repositories and len(running_repositories) < concurrency_limit: # While there are pending repositories and room for them
+      reserved_memory = estimated_memory * sum(1 for _, start_time in running_repositories.values() if time.time() - start_time < SCHEDULER_RAMP_UP_SECONDS) # The memory of the workers that are still starting
+      memory_budget = psutil.virtual_memory().available / (1024 ** 3) * SCHEDULER_MEMORY_BUDGET_FRACTION - reserved_memory # The free memory budget in GB
+      if running_repositories and estimated_memory > memory_budget: # If the repository doesn't fit the free memory budget
+         break # Wait for the running repositories
+      if running_repositories and (pending_repositories[0][0] in suspected_repositories or any(repository_name in suspected_repositories for repository_name, _ in running_repositories.values())): # If a suspected repository would not run alone
+         break # Wait for the running repositories
+
+      repository_name, repository_url = pending_repositories.pop(0) # Get the longest pending repository
+      try: # Try to start the repository worker
+         future = executor.submit(process_and_estimate, repository_name, repository_url) # Start the repository worker
+      except BrokenProcessPool: # If a worker process died and broke the process pool
+         pending_repositories.insert(0, (repository_name, repository_url)) # The repository was not started, so it stays pending
+         raise # Let the caller rebuild the process pool
+      running_repositories[future] = (repository_name, time.time()) # Store the running repository
+
+def create_repository_executor(usable_threads):
+   """
+   Creates the process pool in which every repository runs in its own worker process, with a memory limit of REPOSITORY_WORKER_MEMORY_LIMIT_GB.
+
+   :param usable_threads: The maximum number of worker processes.
+   :return: The process pool executor.
+   """
+
+   return concurrent.futures.ProcessPoolExecutor(max_workers=usable_threads, initializer=set_memory_limit, initargs=(REPOSITORY_WORKER_MEMORY_LIMIT_GB,)) # Create the process pool
+
+def recover_from_broken_process_pool(executor, pending_repositories, running_repositories, suspected_repositories, usable_threads):
+   """
+   Recovers from a worker process that died (for example, killed by the OOM killer or by a native crash under the memory limit), which breaks the whole process pool.
+   If a single repository was running, it is the one that died, so it is marked as failed. Otherwise, the repositories that were running are requeued and suspected, so they run alone until the one that died is found.
+
+   :param executor: The broken process pool executor.
+   :param pending_repositories: List of tuples (repository name, repository URL) not started yet, which is updated.
+   :param running_repositories: Dictionary with the future as key and a tuple (repository name, start time) as value, which is emptied.
+   :param suspected_repositories: Set with the names of the repositories that were running when a worker process died, which is updated.
+   :param usable_threads: The maximum number of worker processes of the new process pool.
+   :return: The new process pool executor.
+   """
+
+   concurrent.futures.wait(running_repositories) # The broken process pool fails every running future
+   died_repositories = [] # The repositories whose worker process died or were killed with the process pool
+   for future, (repository_name, _) in running_repositories.items(): # Loop through the running repositories
+      if not isinstance(future.exception(), BrokenProcessPool): # If the repository finished before the process pool broke
+         print(f"{BackgroundColors.RED}An error occurred while processing the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository: {future.exception()}{Style.RESET_ALL}") if future.exception() is not None else None
+         suspected_repositories.discard(repository_name) # The repository is not suspected anymore
+         continue # The repository is not requeued
+      died_repositories.append(repository_name) # The repository was killed with the process pool
+   running_repositories.clear() # No repository is running in the new process pool
+
+   if len(died_repositories) == 1: # If a single repository was running, it is the one that died
+      print(f"{BackgroundColors.RED}The worker process of the {BackgroundColors.CYAN}{died_repositories[0]}{BackgroundColors.RED} repository died (for example, it was killed by the OOM killer or by a native crash), so the repository is marked as failed.{Style.RESET_ALL}")
+      suspected_repositories.discard(died_repositories[0]) # The repository is not processed again
+   elif died_repositories: # If many repositories were running, any of them may be the one that died
+      print(f"{BackgroundColors.YELLOW}A worker process died while the {BackgroundColors.CYAN}{', '.join(died_repositories)}{BackgroundColors.YELLOW} repositories were running, so they are requeued to run alone until the repository that died is found.{Style.RESET_ALL}")
+      suspected_repositories.update(died_repositories) # The repositories only run alone from now on
+      pending_repositories[:0] = [(repository_name, DEFAULT_REPOSITORIES[repository_name]) for repository_name in died_repositories] # Requeue the repositories before the other pending ones
+
+   executor.shutdown(wait=False) # Release the broken process pool
+   return create_repository_executor(usable_threads) # Create a new process pool
+
+def write_execution_time_estimates(repositories):
+   """
+   Writes the estimated execution time of the repositories, before processing them, to the execution time estimates file, so the batch windows can be planned. The commits of a repository are counted in its local clone, if it exists, or read from the repositories attributes file.
+
+   :param repositories: Dictionary with the repository name as key and the repository URL as value.
+   :return: None
+   """
+
+   print(f"{BackgroundColors.GREEN}Writing the estimated execution time of the repositories to the {BackgroundColors.CYAN}{RELATIVE_EXECUTION_TIME_ESTIMATES_FILE_PATH}{BackgroundColors.GREEN} file...{Style.RESET_ALL}")
+
+   repositories_attributes = read_repositories_attributes() # The attributes of the repositories of the previous executions
+   rows = [] # The estimates of the repositories
+   for repository_name in repositories.keys(): # Loop through the repositories
+      number_of_commits = get_repository_job_size(repository_name, repositories_attributes)[0] # The number of commits of the repository
+      remaining_commits = max(0, number_of_commits - get_completed_commits_count([repository_name])) # The commits not processed yet
+      seconds_per_commit = estimate_seconds_per_commit(repository_name) # The estimated seconds per commit
+      rows.append([repository_name, number_of_commits, remaining_commits, round(seconds_per_commit, 4), round(seconds_per_commit * remaining_commits / 60, 2)]) # Store the estimate
+
+   os.makedirs(os.path.dirname(FULL_EXECUTION_TIME_ESTIMATES_FILE_PATH), exist_ok=True) # Create the directory of the estimates file
+   with open(FULL_EXECUTION_TIME_ESTIMATES_FILE_PATH, "w", newline="") as csv_file: # Open the estimates file to write
+      writer = csv.writer(csv_file) # Create a CSV writer
+      writer.writerow(["Repository Name", "Number of Commits", "Remaining Commits", "Estimated Seconds Per Commit", "Estimated Time (Minutes)"]) # Write the header
+      writer.writerows(rows) # Write the estimates
+
+   output_time(f"{BackgroundColors.GREEN}Estimated sequential execution time of the {BackgroundColors.CYAN}{len(rows)}{BackgroundColors.GREEN} repositories: ", round(sum(row[4] for row in rows) * 60, 2)) # Output the total estimated time
+
 def process_repositories_in_parallel():
    """
-   Processes each repository in the DEFAULT_REPOSITORIES dictionary in parallel using a thread pool.
+   Processes each repository in the DEFAULT_REPOSITORIES dictionary in parallel using a process pool, in which every repository runs in its own worker process with a memory limit of REPOSITORY_WORKER_MEMORY_LIMIT_GB.
+   The repositories are started from the longest to the shortest job, only when their estimated memory fits the free memory, and the number of concurrent repositories adapts to the observed throughput and memory pressure.
+   If a worker process dies, the process pool is rebuilt and the repositories that were running are requeued or marked as failed.
 
    :return: None
    """
 
-   print(f"{BackgroundColors.GREEN}Processing each of the repositories in parallel using a Thread Pool...{Style.RESET_ALL}")
+   print(f"{BackgroundColors.GREEN}Processing each of the repositories in parallel using a Process Pool...{Style.RESET_ALL}")
 
    cpu_cores = get_threads() # Get the number of CPU cores
    usable_threads, max_threads = get_adjusted_number_of_threads(cpu_cores) # Get the adjusted number of threads to use
 
    print(f"{BackgroundColors.GREEN}The number of usable threads is {BackgroundColors.CYAN}{usable_threads}{BackgroundColors.GREEN} out of {BackgroundColors.CYAN}{max_threads}{BackgroundColors.GREEN}.{Style.RESET_ALL}")
 
-   def process_and_estimate(repository_name, repository_url): # Function to process each repository and estimate the time
-      estimated_time_string = f"{BackgroundColors.GREEN}Estimated time for running all iterations for {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN}: "
-
-      # Traverse commits in the repository and count them without materializing the entire list
-      number_of_commits = sum(1 for _ in Repository(repository_url).traverse_commits()) # Efficient commit count
-      estimated_time = round(((number_of_commits / 1000) * number_of_commits), 2) # Estimate the time to process the repository
-      output_time(estimated_time_string, estimated_time) # Output the estimated time
-      setup_process_repository(repository_name, repository_url, number_of_commits) # Process the repository
-
-   # Use ThreadPoolExecutor with a limit of usable_threads
-   with concurrent.futures.ThreadPoolExecutor(max_workers=usable_threads) as executor:
-      futures = [ # Create a list of futures. Futures are used to manage the execution of the function in the thread pool
-         executor.submit(process_and_estimate, repository_name, repository_url) # Submit the process_and_estimate function
-         for repository_name, repository_url in DEFAULT_REPOSITORIES.items() # Loop through the DEFAULT_REPOSITORIES dictionary
-      ]
-      concurrent.futures.wait(futures) # Wait for all tasks to complete
+   pending_repositories = sort_repositories_longest_first(DEFAULT_REPOSITORIES) # The repositories not started yet, from the longest to the shortest job
+   running_repositories = {} # The running repositories, in the format: future: (repository_name, start_time)
+   scheduler_state = {"limit": usable_threads, "direction": 1, "throughput": None, "commits": get_completed_commits_count(DEFAULT_REPOSITORIES.keys()), "time": time.time()} # The state of the adaptive concurrency
+   suspected_repositories = set() # The repositories that were running when a worker process died
+
+   executor = create_repository_executor(usable_threads) # Use a ProcessPoolExecutor with a limit of usable_threads
+   try: # Shut down the process pool even if the execution is interrupted
+      while pending_repositories or running_repositories: # While there are repositories to process
+         try: # Try to start the repositories that fit
+            admit_repositories(executor, pending_repositories, running_repositories, scheduler_state["limit"], suspected_repositories) # Start the repositories that fit
+         except BrokenProcessPool: # If a worker process died and broke the process pool
+            executor = recover_from_broken_process_pool(executor, pending_repositories, running_repositories, suspected_repositories, usable_threads) # Rebuild the process pool
+            continue # Start the repositories in the new process pool
+         done_futures, _ = concurrent.futures.wait(running_repositories, timeout=5, return_when=concurrent.futures.FIRST_COMPLETED) # Wait for a repository to finish or for the next scheduling round
+
+         if any(isinstance(future.exception(), BrokenProcessPool) for future in done_futures): # If a worker process died and broke the process pool
+            executor = recover_from_broken_process_pool(executor, pending_repositories, running_repositories, suspected_repositories, usable_threads) # Rebuild the process pool
+            continue # Start the repositories in the new process pool
+
+         for future in done_futures: # Loop through the finished repositories
+            repository_name, _ = running_repositories.pop(future) # Remove the repository from the running repositories
+            suspected_repositories.discard(repository_name) # The repository didn't kill its worker process
+            try: # Try to get the result of the repository worker
+               future.result() # Raise the exception of the repository worker, if any
+            except Exception as e: # If the repository worker failed (for example, by exceeding the memory limit)
+               print(f"{BackgroundColors.RED}An error occurred while processing the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository: {e}{Style.RESET_ALL}")
+
+         adapt_concurrency_limit(scheduler_state, DEFAULT_REPOSITORIES.keys(), usable_threads) # Adapt the number of concurrent repositories
+   finally: # After the repositories are processed or the execution is interrupted
+      executor.shutdown() # Wait for the worker processes to finish
 
 atexit.register(play_sound) # Register the function to play a sound when the program finishes
 
@@ -1120,6 +3864,10 @@ def main():
    if RUN_FUNCTIONS["CK Metrics"] and not ensure_ck_jar_file_exists(): # Verify and ensure that the CK JAR file exists
       return # Return if the CK JAR file does not exist
 
+   if CK_METRICS_STORE and pq is None: # If the CK metrics store is enabled without PyArrow
+      print(f"{BackgroundColors.RED}The {BackgroundColors.CYAN}CK_METRICS_STORE{BackgroundColors.RED} constant requires the {BackgroundColors.CYAN}pyarrow{BackgroundColors.RED} package. Please install it!{Style.RESET_ALL}")
+      return # Return if the CK metrics store can't be written
+
    global DEFAULT_REPOSITORIES # Declare the DEFAULT_REPOSITORIES as a global variable
    DEFAULT_REPOSITORIES = get_repositories_dictionary() # Get the repositories dictionary and load it into the DEFAULT_REPOSITORIES variable
    
@@ -1128,7 +3876,16 @@ def main():
    print(f"{BackgroundColors.GREEN}This script will process the repositories: {BackgroundColors.CYAN}{', '.join(f'{i}º {repo.title()}' for i, repo in enumerate(DEFAULT_REPOSITORIES.keys(), start=1))}{BackgroundColors.GREEN} in parallel using threads.{Style.RESET_ALL}")
    print(f"{BackgroundColors.GREEN}The files that this script will generate are the {BackgroundColors.CYAN}ck metrics files, the commit hashes list file and the diffs of each commit{BackgroundColors.GREEN}, in which are used by the {BackgroundColors.CYAN}Metrics Changes{BackgroundColors.GREEN} Python script.{Style.RESET_ALL}", end="\n\n")   
 
-   process_repositories_in_parallel() # Process each of the repositories in parallel
+   if SHARD_COUNT > 1 and not USE_PROGRESS_JOURNAL: # If the repositories are sharded without the progress journal
+      print(f"{BackgroundColors.RED}The {BackgroundColors.CYAN}SHARD_COUNT{BackgroundColors.RED} constant requires the {BackgroundColors.CYAN}USE_PROGRESS_JOURNAL{BackgroundColors.RED} constant to be set to True.{Style.RESET_ALL}")
+      return # Return if the shards can't be resumed nor merged
+
+   if MERGE_SHARDS: # If the shards of the repositories must be merged
+      for repository_name, repository_url in DEFAULT_REPOSITORIES.items(): # Loop through the repositories
+         merge_repository_shards(repository_name, repository_url) # Merge the shards of the repository
+   else: # If the repositories must be analyzed
+      write_execution_time_estimates(DEFAULT_REPOSITORIES) if RUN_FUNCTIONS["Execution Time Estimates"] else None # Write the estimated execution time of the repositories
+      process_repositories_in_parallel() # Process each of the repositories in parallel
 
    end_time = datetime.now() # Get the end time
    output_time(f"\n{BackgroundColors.GREEN}Total execution time: ", (end_time - start_time).total_seconds()) # Output the total execution time
@@ -0,0 +1,47 @@
+import json # For the JSON log messages
+import os # For getting the name of the module that output the message
+import re # For removing the terminal colors from the JSON log messages
+import time # For the timestamp of the JSON log messages
+
+def write_log_message(message, level, module_globals):
+   """
+   Outputs a message of the verbose_output function, in the LOG_FORMAT format of the module that output it.
+
+   :param message: The message string, or a callable that returns it.
+   :param level: The level of the message, which is "verbose" or "info".
+   :param module_globals: The globals of the module that output the message.
+   :return: None
+   """
+
+   message = message() if callable(message) else message # Build the message only now, as it is going to be output
+   if module_globals.get("LOG_FORMAT", "text") != "json": # If the messages are output as text
+      print(message) # Output the message
+      return # Return as the message was output
+
+   module = os.path.splitext(os.path.basename(module_globals.get("__file__", "")))[0] or module_globals.get("__name__") # The name of the module, even if it is the executed script
+   print(json.dumps({"timestamp": time.time(), "module": module, "level": level, "message": re.sub(r"\033\[[0-9;]*[A-Za-z]", "", message)})) # Output the message as a JSON line, without the terminal colors
+
+def create_verbose_output(module_globals):
+   """
+   Creates the verbose_output function of a module, bound to its globals, so every script has its own verbose mode without inspecting the caller of each message.
+
+   :param module_globals: The globals() of the module, whose VERBOSE and LOG_FORMAT constants are used.
+   :return: The verbose_output function of the module.
+   """
+
+   def verbose_output(true_string="", false_string=""):
+      """
+      Outputs a message if the VERBOSE constant of the module is set to True.
+      The messages can be callables, such as "lambda: f'...'", which are only called when the message is output, so the disabled messages are never formatted.
+
+      :param true_string: The string (or callable) to be outputted if the VERBOSE constant is set to True.
+      :param false_string: The string (or callable) to be outputted if the VERBOSE constant is set to False.
+      :return: None
+      """
+
+      if true_string != "" and module_globals.get("VERBOSE", False): # If the VERBOSE constant of the module is set to True and the true_string is set
+         write_log_message(true_string, "verbose", module_globals) # Output the true statement string
+      elif false_string != "":
+         write_log_message(false_string, "info", module_globals) # Output the false statement string
+
+   return verbose_output # Return the verbose_output function of the module
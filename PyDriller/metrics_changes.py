@@ -7,27 +7,34 @@ import os # For walking through directories
 import pandas as pd # For the csv file operations
 import platform # For determining the system's null device to discard output
 import select # For waiting for input with a timeout
+import sqlite3 # For spilling the metrics track records to disk
 import subprocess # For running the RefactoringMiner
 import sys # For reading the input
 import time # For measuring the time
+from array import array # For the compact metrics track records
 from colorama import Style # For coloring the terminal
 from datetime import datetime # For date manipulation
+from log_messages import create_verbose_output # For the verbose_output function of this script
 from pydriller import Repository # PyDriller is a Python framework that helps developers in analyzing Git repositories. 
 from sklearn.linear_model import LinearRegression # For the linear regression
 from tqdm import tqdm # For progress bar
 
 # Imports from the repositories_picker.py file
 from repositories_picker import BackgroundColors # Import the BackgroundColors class
-from repositories_picker import RELATIVE_REPOSITORIES_DIRECTORY_PATH, REPOSITORIES_SORTING_ATTRIBUTES, SOUND_FILE_PATH, START_PATH # Importing Constants from the repositories_picker.py file
-from repositories_picker import create_directory, output_time, path_contains_whitespaces, play_sound, setup_repository, update_sound_file_path, verbose_output, verify_filepath_exists # Importing Functions from the repositories_picker.py file
+from repositories_picker import LOG_FORMAT, RELATIVE_REPOSITORIES_DIRECTORY_PATH, REPOSITORIES_SORTING_ATTRIBUTES, SOUND_FILE_PATH, START_PATH # Importing Constants from the repositories_picker.py file
+from repositories_picker import create_directory, ensure_full_checkout, get_local_repository_path, get_repository_commits_count, output_time, path_contains_whitespaces, play_sound, update_sound_file_path, verify_filepath_exists # Importing Functions from the repositories_picker.py file
 
 # Imports from the code_metrics.py file
 from code_metrics import RUN_FUNCTIONS as CODE_METRICS_RUN_FUNCTIONS # Importing the RUN_FUNCTIONS dictionary from the code_metrics.py file
-from code_metrics import CK_METRICS_FILES, CSV_FILE_EXTENSION, FULL_CK_METRICS_DIRECTORY_PATH, FULL_DIFFS_DIRECTORY_PATH, FULL_REFACTORINGS_DIRECTORY_PATH, FULL_REPOSITORIES_ATTRIBUTES_FILE_PATH, FULL_REPOSITORIES_LIST_JSON_FILEPATH, RELATIVE_DIFFS_DIRECTORY_PATH, RELATIVE_REFACTORINGS_DIRECTORY_PATH # Importing Constants from the code_metrics.py file
-from code_metrics import get_directories_size_in_gb, setup_process_repository, get_repositories_dictionary # Importing Functions from the code_metrics.py file
+from code_metrics import CK_METRICS_FILES, CSV_FILE_EXTENSION, USE_COMMITS_METADATA, FULL_CK_METRICS_DIRECTORY_PATH, FULL_DIFFS_DIRECTORY_PATH, FULL_REFACTORINGS_DIRECTORY_PATH, FULL_REPOSITORIES_ATTRIBUTES_FILE_PATH, FULL_REPOSITORIES_LIST_JSON_FILEPATH, RELATIVE_DIFFS_DIRECTORY_PATH, RELATIVE_REFACTORINGS_DIRECTORY_PATH # Importing Constants from the code_metrics.py file
+from code_metrics import close_output_manifest, get_commits_metadata, get_directories_size_in_gb, get_repository_sampling, read_metrics_store, read_packed_diff, setup_process_repository, get_repositories_dictionary, remove_output_directory_from_manifest, verify_diff_pack_exists, verify_metrics_store_exists # Importing Functions from the code_metrics.py file
+
+verbose_output = create_verbose_output(globals()) # The verbose_output function of this script, bound to its VERBOSE constant and the LOG_FORMAT constant of the repositories_picker.py file
 
 # Default values that can be changed:
 VERBOSE = False # If True, then the program will output the progress of the execution
+VECTORIZED_CK_INGESTION = True # If True, then the CK metrics of each commit are loaded as a typed dataframe and only the classes or methods whose metrics changed are processed row by row
+USE_CK_METRICS_STORE = True # If True, then the CK metrics are read from the CK metrics store (generated by code_metrics.py with CK_METRICS_STORE) when it exists, instead of the CK metrics directories
 MINIMUM_CHANGES = 1 # The minimum number of changes a class/method should have to be considered
 DESIRED_DECREASE = 0.00 # The desired decrease in the metric
 IGNORE_CLASS_NAME_KEYWORDS = ["Anonymous"] # The keywords to ignore in the class name
@@ -55,6 +62,14 @@ RUN_FUNCTIONS = { # Dictionary with the functions to run and their respective bo
 
 # Constants:
 PROCESS_CLASSES = True # If True, then the classes will be processed, otherwise the methods will be processed
+SINGLE_PASS_CLASSES_AND_METHODS = True # If True, then the classes and methods of each repository are processed in a single pass, reading each commit once and sharing the commits modified files and the code churn of the diffs
+PROCESSING_GLOBALS_NAMES = ["CK_CSV_FILE", "CLASSES_OR_METHODS", "METRICS_INDEXES", "METRICS_VALUES_MAX_THRESHOLDS", "NUMBER_OF_METRICS", "PROCESS_CLASSES", "SORTED_CHANGED_METHODS_CSV_FILENAME", "SUBSTANTIAL_CHANGES_FILENAME", "UNSORTED_CHANGED_METHODS_CSV_FILENAME"] # The global variables updated to process the classes or methods
+COMPACT_METRICS_TRACK_RECORD = True # If True, then the metrics track record of each class or method is stored in numeric arrays, with commit indexes into a commit table of the repository, instead of lists of tuples and strings
+TRACK_RECORD_MEMORY_BUDGET_MB = 2048 # The memory budget, in MB, of the compact metrics track records of a repository, shared by its classes and methods. When it is exceeded, the histories are spilled to a SQLite database and streamed back, sorted by identifier, when the outputs are written. If None, the histories are always kept in memory
+TRACK_RECORD_IDENTIFIER_OVERHEAD_BYTES = 1024 # The estimated memory, in bytes, of each class or method in the track records besides its history (the identifier, the track record object, its arrays and its latest metrics), which is never spilled
+TRACK_RECORD_COMMITS = {} # The commit table of each repository URL used by the compact metrics track records
+CODE_CHURN_CACHE = None # The code churn attributes of the current commit, shared by its classes and methods in the single pass mode
+DIFF_PACK_REPOSITORIES = {} # If the diffs of each repository are packed, verified once per repository instead of once per changed class or method
 
 # Extensions:
 PNG_FILE_EXTENSION = ".png" # The extension of the PNG files
@@ -84,6 +99,280 @@ FULL_METRICS_STATISTICS_DIRECTORY_PATH = f"{START_PATH}{RELATIVE_METRICS_STATIST
 FULL_METRICS_PREDICTION_DIRECTORY_PATH = f"{START_PATH}{RELATIVE_METRICS_PREDICTION_DIRECTORY_PATH}" # The full path to the directory containing the metrics prediction
 OUTPUT_DIRECTORIES = [FULL_METRICS_DATA_DIRECTORY_PATH, FULL_METRICS_EVOLUTION_DIRECTORY_PATH, FULL_METRICS_STATISTICS_DIRECTORY_PATH, FULL_METRICS_PREDICTION_DIRECTORY_PATH, FULL_CANDIDATES_DIRECTORY_PATH] # The output directories list
 
+# Classes:
+class CompactTrackRecord: # The track record of the metrics of a class or method, stored in numeric arrays
+	"""
+	Stores the track record of the metrics of a class or method in numeric arrays, with the commits stored as indexes into the commit table of the repository.
+	It is read as the dictionary track record ("metrics", "commit_hashes", "changed", "diff_urls", "code_churns", "lines_added", "lines_deleted", "modified_files_count" and "methods_invoked" keys), whose lists are built when read.
+	"""
+
+	__slots__ = ("commits", "commit_indexes", "metrics_values", "metrics_count", "code_churns", "lines_added", "lines_deleted", "modified_files_count", "methods_invoked", "spilled_metrics") # No per instance dictionary
+
+	def __init__(self, commits, methods_invoked):
+		"""
+		Creates an empty track record.
+
+		:param commits: The commit table of the repository, with the "repository_url", "commit_ids" and "commit_indexes" keys
+		:param methods_invoked: The method invoked str or methodsInvokedQty int
+		"""
+
+		self.commits = commits # The commit table of the repository
+		self.commit_indexes = array("i") # The index of each commit in the commit table, as a 4 bytes integer
+		self.metrics_values = array("d") # The metrics of every commit, one after the other
+		self.metrics_count = 0 # The number of metrics of each commit
+		self.code_churns = array("i") # The code churns values
+		self.lines_added = array("i") # The lines added values
+		self.lines_deleted = array("i") # The lines deleted values
+		self.modified_files_count = array("i") # The modified files count values
+		self.methods_invoked = sys.intern(methods_invoked) if isinstance(methods_invoked, str) else methods_invoked # The methods_invoked str, which is shared by the equal ones, or methodsInvokedQty int
+		self.spilled_metrics = None # The latest metrics, if the whole history was spilled to disk
+
+	def append_metrics(self, commit_id, ck_metrics):
+		"""
+		Appends the metrics of a commit.
+
+		:param commit_id: The commit id which is the commit number and the commit hash
+		:param ck_metrics: A tuple containing the CK metrics
+		:return: None
+		"""
+
+		if commit_id not in self.commits["commit_indexes"]: # If the commit is not in the commit table yet
+			self.commits["commit_indexes"][commit_id] = len(self.commits["commit_ids"]) # Add the commit index to the commit table
+			self.commits["commit_ids"].append(commit_id) # Add the commit id to the commit table
+
+		self.commit_indexes.append(self.commits["commit_indexes"][commit_id]) # Append the commit index
+		self.metrics_values.extend(ck_metrics) # Append the metrics
+		self.metrics_count = len(ck_metrics) # The number of metrics of each commit
+
+	def append_code_churn(self, lines_added, lines_deleted, code_churn_value, modified_files_count):
+		"""
+		Appends the code churn and modified files count of a commit.
+
+		:param lines_added: The number of lines added
+		:param lines_deleted: The number of lines deleted
+		:param code_churn_value: The code churn value
+		:param modified_files_count: The number of modified files of the commit
+		:return: None
+		"""
+
+		self.code_churns.append(code_churn_value) # Append the code churn value
+		self.lines_added.append(lines_added) # Append the lines added
+		self.lines_deleted.append(lines_deleted) # Append the lines deleted
+		self.modified_files_count.append(modified_files_count) # Append the modified files count
+
+	def latest_metrics(self):
+		"""
+		Gets the metrics of the latest commit, without building the metrics list.
+
+		:return: A tuple containing the CK metrics of the latest commit
+		"""
+
+		return tuple(self.metrics_values[-self.metrics_count:]) if self.metrics_values else self.spilled_metrics # Return the metrics of the latest commit, even if they were spilled to disk
+
+	def pop_history(self):
+		"""
+		Removes the history of the track record from memory, keeping only its latest metrics.
+
+		:return: A tuple containing the bytes of the commit indexes, metrics, code churns, lines added, lines deleted and modified files count arrays
+		"""
+
+		history = tuple(values.tobytes() for values in (self.commit_indexes, self.metrics_values, self.code_churns, self.lines_added, self.lines_deleted, self.modified_files_count)) # The bytes of the history arrays
+		self.spilled_metrics = self.latest_metrics() # Keep the latest metrics, used to verify if the next metrics changed
+		for name, typecode in (("commit_indexes", "i"), ("metrics_values", "d"), ("code_churns", "i"), ("lines_added", "i"), ("lines_deleted", "i"), ("modified_files_count", "i")): # For each history array
+			setattr(self, name, array(typecode)) # Release the history array
+
+		return history # Return the bytes of the history
+
+	def with_spilled_history(self, spilled_histories):
+		"""
+		Builds a track record with the spilled histories followed by the history in memory.
+
+		:param spilled_histories: An iterable of the tuples returned by the pop_history method, in the spilling order
+		:return: The track record with the whole history
+		"""
+
+		record = CompactTrackRecord(self.commits, self.methods_invoked) # The track record with the whole history
+		record.metrics_count = self.metrics_count # The number of metrics of each commit
+		for history in list(spilled_histories) + [tuple(values.tobytes() for values in (self.commit_indexes, self.metrics_values, self.code_churns, self.lines_added, self.lines_deleted, self.modified_files_count))]: # For each spilled history and the history in memory
+			for values, history_bytes in zip((record.commit_indexes, record.metrics_values, record.code_churns, record.lines_added, record.lines_deleted, record.modified_files_count), history): # For each history array
+				values.frombytes(history_bytes) # Append the history
+
+		return record # Return the track record with the whole history
+
+	def __getitem__(self, key):
+		"""
+		Gets a field of the track record, in the format of the dictionary track record.
+
+		:param key: The field name
+		:return: The field value
+		"""
+
+		if key == "metrics": # If the metrics list is requested
+			return [tuple(self.metrics_values[position:position + self.metrics_count]) for position in range(0, len(self.metrics_values), self.metrics_count or 1)] # Return the metrics tuples of every commit
+		if key == "commit_hashes": # If the commit ids list is requested
+			return [self.commits["commit_ids"][index] for index in self.commit_indexes] # Return the commit ids
+		if key == "changed": # If the number of changes is requested
+			return len(self.commit_indexes) # Return the number of times the metrics changed
+		if key == "diff_urls": # If the diff urls list is requested
+			return [generate_commit_url(self.commits["repository_url"], self.commits["commit_ids"][index].split("-")[1]) for index in self.commit_indexes] # Return the diff urls, which are built only now
+		if key in ("code_churns", "lines_added", "lines_deleted", "modified_files_count"): # If a numeric list is requested
+			return getattr(self, key).tolist() # Return the numeric list
+		if key == "methods_invoked": # If the methods invoked is requested
+			return self.methods_invoked # Return the methods invoked
+
+		raise KeyError(key) # The field doesn't exist
+
+	def to_dict(self):
+		"""
+		Builds the dictionary track record, with each list built once, so the writers can index it without rebuilding the lists.
+
+		:return: The dictionary track record
+		"""
+
+		return {key: self[key] for key in ("metrics", "commit_hashes", "changed", "diff_urls", "code_churns", "lines_added", "lines_deleted", "modified_files_count", "methods_invoked")} # Return the dictionary track record
+
+	def __setitem__(self, key, value):
+		"""
+		Sets the commit ids list of the track record, such as after sorting it.
+
+		:param key: The field name, which must be "commit_hashes"
+		:param value: The commit ids list
+		:return: None
+		"""
+
+		if key != "commit_hashes": # If the field can't be set
+			raise KeyError(key) # Only the commit ids can be reordered
+
+		self.commit_indexes = array("i", (self.commits["commit_indexes"][commit_id] for commit_id in value)) # Store the indexes of the commit ids
+
+
+class TrackRecordsMemoryBudget: # The memory budget shared by the compact metrics track records of the classes and methods of a repository
+	"""
+	Estimates the memory used by the compact metrics track records of a repository, which are kept in the same process for the classes and the methods, so a single TRACK_RECORD_MEMORY_BUDGET_MB budget is shared by all of them.
+	"""
+
+	__slots__ = ("history_bytes", "identifiers_bytes", "track_records") # No per instance dictionary
+
+	def __init__(self):
+		"""
+		Creates an empty memory budget.
+		"""
+
+		self.history_bytes = 0 # The estimated size of the histories in memory
+		self.identifiers_bytes = 0 # The estimated size of the identifiers and their track records, which are never spilled
+		self.track_records = [] # The track records dictionaries sharing the memory budget
+
+	def spill_if_over_budget(self):
+		"""
+		Spills the histories of every track records dictionary sharing the memory budget to disk if their estimated size exceeds it.
+
+		:return: None
+		"""
+
+		if not self.history_bytes or self.history_bytes + self.identifiers_bytes < TRACK_RECORD_MEMORY_BUDGET_MB * 1024 * 1024: # If there is no history in memory or the estimated size is within the memory budget
+			return # Keep the histories in memory
+
+		for track_records in self.track_records: # For each track records dictionary, such as the classes and the methods ones
+			track_records.spill() # Spill its histories
+		self.history_bytes = 0 # The histories are no longer in memory
+
+class SpillableTrackRecords(dict): # The compact metrics track records of a repository, which are spilled to disk when the memory budget is exceeded
+	"""
+	Stores the compact metrics track records of a repository, spilling their histories to a SQLite database when the estimated size of the track records sharing its memory budget exceeds the TRACK_RECORD_MEMORY_BUDGET_MB constant.
+	The track records keep only their latest metrics in memory after being spilled, and the items method streams back the whole histories, sorted by identifier.
+	"""
+
+	def __init__(self, spill_file_path, memory_budget):
+		"""
+		Creates an empty dictionary of track records.
+
+		:param spill_file_path: The path of the SQLite database used to spill the histories
+		:param memory_budget: The TrackRecordsMemoryBudget shared with the other track records of the repository
+		"""
+
+		super().__init__() # Create the dictionary
+		self.spill_file_path = spill_file_path # The path of the SQLite database
+		self.connection = None # The connection to the SQLite database, created on the first spill
+		self.spills = 0 # The number of spills
+		self.memory_budget = memory_budget # The shared memory budget
+		memory_budget.track_records.append(self) # Register the dictionary, so it is spilled with the others
+
+	def __setitem__(self, identifier, record):
+		"""
+		Adds the track record of an identifier, accounting its memory in the memory budget.
+
+		:param identifier: The identifier (class or method name)
+		:param record: The CompactTrackRecord of the identifier
+		:return: None
+		"""
+
+		self.memory_budget.identifiers_bytes += TRACK_RECORD_IDENTIFIER_OVERHEAD_BYTES + len(identifier) if identifier not in self else 0 # Account the memory of the new identifier
+		super().__setitem__(identifier, record) # Add the track record
+
+	def spill_if_over_budget(self):
+		"""
+		Spills the histories of the track records sharing the memory budget to disk if their estimated size exceeds it.
+
+		:return: None
+		"""
+
+		self.memory_budget.spill_if_over_budget() # Spill the histories of every track records dictionary of the memory budget
+
+	def spill(self):
+		"""
+		Spills the histories of the track records in memory to the SQLite database.
+
+		:return: None
+		"""
+
+		if not any(len(record.commit_indexes) for record in dict.values(self)): # If there is no history in memory
+			return # Nothing to spill
+
+		if self.connection is None: # If it is the first spill
+			print(f"{BackgroundColors.YELLOW}The metrics track records exceeded the memory budget of {BackgroundColors.CYAN}{TRACK_RECORD_MEMORY_BUDGET_MB} MB{BackgroundColors.YELLOW}, so their histories are spilled to {BackgroundColors.CYAN}{self.spill_file_path}{BackgroundColors.YELLOW}.{Style.RESET_ALL}")
+			os.makedirs(os.path.dirname(self.spill_file_path), exist_ok=True) # Create the directory of the SQLite database
+			os.remove(self.spill_file_path) if os.path.exists(self.spill_file_path) else None # Remove the SQLite database of an interrupted execution
+			self.connection = sqlite3.connect(self.spill_file_path) # Connect to the SQLite database
+			self.connection.execute("PRAGMA journal_mode=OFF") # The database is temporary, so it doesn't need a journal
+			self.connection.execute("PRAGMA synchronous=OFF") # Don't wait for the disk
+			self.connection.execute("CREATE TABLE histories (identifier TEXT, spill INTEGER, commit_indexes BLOB, metrics BLOB, code_churns BLOB, lines_added BLOB, lines_deleted BLOB, modified_files_count BLOB, PRIMARY KEY (identifier, spill))") # The spilled histories of each identifier
+
+		self.connection.executemany("INSERT INTO histories VALUES (?, ?, ?, ?, ?, ?, ?, ?)", ((identifier, self.spills, *record.pop_history()) for identifier, record in dict.items(self) if len(record.commit_indexes))) # Spill the histories in memory
+		self.connection.commit() # Write the spilled histories
+		self.spills += 1 # Increment the number of spills
+
+	def items(self):
+		"""
+		Gets the identifiers and their track records with the whole history. If the histories were spilled, they are streamed back sorted by identifier, one track record at a time.
+
+		:return: An iterable of tuples (identifier, track record)
+		"""
+
+		if self.connection is None: # If the histories were never spilled
+			yield from dict.items(self) # Yield the track records in memory
+			return # Return as every track record was yielded
+
+		cursor = self.connection.execute("SELECT identifier, commit_indexes, metrics, code_churns, lines_added, lines_deleted, modified_files_count FROM histories ORDER BY identifier, spill") # The spilled histories, sorted by identifier
+		spilled_row = cursor.fetchone() # The current spilled history
+		for identifier in sorted(self.keys()): # For each identifier, in the same order of the spilled histories
+			spilled_histories = [] # The spilled histories of the identifier
+			while spilled_row is not None and spilled_row[0] == identifier: # While the spilled history is of the identifier
+				spilled_histories.append(spilled_row[1:]) # Add the spilled history
+				spilled_row = cursor.fetchone() # Get the next spilled history
+			yield identifier, self[identifier].with_spilled_history(spilled_histories) # Yield the track record with the whole history
+
+	def close(self):
+		"""
+		Closes and removes the SQLite database of the spilled histories.
+
+		:return: None
+		"""
+
+		if self.connection is not None: # If the histories were spilled
+			self.connection.close() # Close the connection
+			self.connection = None # Forget the connection
+			os.remove(self.spill_file_path) if os.path.exists(self.spill_file_path) else None # Remove the SQLite database
+
 def generate_tasks_description(filter_list=[]):
 	"""
 	Generates the description of the tasks/processing that will be executed in this run.
@@ -142,11 +431,32 @@ def update_global_variables_for_processing(process_classes):
 
 	NUMBER_OF_METRICS = len(METRICS_INDEXES) # Update NUMBER_OF_METRICS to reflect the current number of metrics in METRICS_INDEXES
 
+def get_classes_and_methods_processing_globals():
+	"""
+	Gets the global variables used to process the classes and the ones used to process the methods, so the single pass mode can switch between them.
+
+	:return: A dictionary containing the PROCESS_CLASSES values (True for classes and False for methods) as keys and the dictionaries of their global variables as values
+	"""
+
+	original_globals = {name: globals()[name] for name in PROCESSING_GLOBALS_NAMES} # The current global variables
+	processing_globals = {} # The global variables of the classes and methods
+
+	for process_classes in (True, False): # For the classes and the methods
+		update_global_variables_for_processing(process_classes) # Update the global variables for processing the classes or methods
+		processing_globals[process_classes] = {name: globals()[name] for name in PROCESSING_GLOBALS_NAMES} # Store the global variables of the classes or methods
+		globals().update(original_globals) # Restore the current global variables, as the metrics are filtered from them
+
+	return processing_globals # Return the global variables of the classes and methods
+
 def process_classes_and_methods():
 	"""
 	Processes data for both classes and methods.
 	"""
 
+	if SINGLE_PASS_CLASSES_AND_METHODS: # If the classes and methods are processed in a single pass
+		process_all_repositories(get_classes_and_methods_processing_globals()) # Process all repositories
+		return # Return as the classes and methods were processed
+
 	# Process classes
 	update_global_variables_for_processing(True) # Update the global variables for processing classes
 	process_all_repositories() # Process all repositories
@@ -174,7 +484,7 @@ def get_directory_path(repository_name):
 	:return: The path to the directory of the CK metrics related to the repository
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Getting the directory path for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Getting the directory path for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 	
 	repository_ck_metrics_path = f"{FULL_CK_METRICS_DIRECTORY_PATH}/{repository_name}" # Get the directory path for the specified repository name
 	return repository_ck_metrics_path # Return the path to the directory of the CK metrics related to the repository
@@ -187,7 +497,7 @@ def create_directories(repository_name):
 	:return: None
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Creating the desired directories for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Creating the desired directories for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 
 	# Create the output METRICS_DATA directories if they does not exist
 	create_directory(FULL_METRICS_DATA_DIRECTORY_PATH, RELATIVE_METRICS_DATA_DIRECTORY_PATH)
@@ -218,17 +528,26 @@ def generate_repository_commits_modified_files_dict(repository_name, commit_hash
 	:return: A dictionary containing the modified files paths list for each commit (or for the specified commit)
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Generating the commit dictionary for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Generating the commit dictionary for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 
 	commit_modified_files_dict = {} # A dictionary containing commit hashes as keys and the modified files path list as values
-	repo_url = DEFAULT_REPOSITORIES[repository_name] # Access the repository URL
+	repo_path = get_local_repository_path(repository_name, DEFAULT_REPOSITORIES[repository_name]) # Get the path to the local clone of the repository
 
 	if commit_hash: # Process only the given commit hash if it is provided
-		commit = next(Repository(repo_url, single=commit_hash).traverse_commits()) # Get the specific commit
+		commit = next(Repository(repo_path, single=commit_hash).traverse_commits()) # Get the specific commit
 		commit_modified_files_dict[commit.hash] = list(set(path for modified_file in commit.modified_files for path in (modified_file.old_path, modified_file.new_path) if path)) # Get the modified files paths for the specific commit
 	else: # Process all commits if no specific commit hash is given
-		for commit in Repository(repo_url).traverse_commits(): # Traverse through all commits
-			commit_modified_files_dict[commit.hash] = list(set(path for modified_file in commit.modified_files for path in (modified_file.old_path, modified_file.new_path) if path)) # Get the modified files paths for each commit
+		sampling_policy, analyzed_commits = get_repository_sampling(repository_name) # Get the commit sampling policy used by the code_metrics.py script
+		if analyzed_commits is not None: # If only a sample of the commits was analyzed
+			print(f"{BackgroundColors.YELLOW}The {BackgroundColors.CYAN}{repository_name}{BackgroundColors.YELLOW} repository was analyzed with the {BackgroundColors.CYAN}{sampling_policy}{BackgroundColors.YELLOW} commit sampling policy, so the modified files of every analyzed commit include the ones of the skipped commits before it.{Style.RESET_ALL}")
+
+		skipped_modified_files = set() # The modified files paths of the skipped commits since the last analyzed commit
+		commits = get_commits_metadata(repository_name, DEFAULT_REPOSITORIES[repository_name]) if USE_COMMITS_METADATA else Repository(repo_path).traverse_commits() # Read the commits from the commits metadata file, which doesn't compute the diffs of the modified files
+		for commit in commits: # Traverse through all commits
+			skipped_modified_files.update(path for modified_file in commit.modified_files for path in (modified_file.old_path, modified_file.new_path) if path) # Add the modified files paths of the commit
+			if analyzed_commits is None or commit.hash in analyzed_commits: # If the commit was analyzed
+				commit_modified_files_dict[commit.hash] = list(skipped_modified_files) # Get the modified files paths since the last analyzed commit
+				skipped_modified_files = set() # Reset the modified files paths of the skipped commits
 
 	return commit_modified_files_dict # Return the commit dictionary containing the modified files paths
 
@@ -240,7 +559,7 @@ def valid_class_name(class_name):
 	:return: True if the class name is valid, False otherwise
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Validating the class name...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Validating the class name...{Style.RESET_ALL}")
 	
 	return "." in class_name # If the class name contains a dot, then it is valid (it is a package name) and returns True
 
@@ -252,7 +571,7 @@ def get_class_package_name(file_name):
 	:return: The package name of the class
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Getting the package name of the class...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Getting the package name of the class...{Style.RESET_ALL}")
 	
 	start_substring = "/src/" # The start substring
 	package_name = file_name[file_name.find(start_substring) + len(start_substring):file_name.rfind(".")] # Get the substring that comes after the: /src/ and before the last dot
@@ -269,7 +588,7 @@ def get_identifier(row):
 	:return: The identifier of the class or method
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Getting the identifier and metrics of the class or method...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Getting the identifier and metrics of the class or method...{Style.RESET_ALL}")
 	
 	if not valid_class_name(row["class"]): # If the class name is not valid (it is not a package name)
 		return None # Return None if the class name is not valid
@@ -303,6 +622,44 @@ def get_methods_invoked(row):
 	
 	return methods_invoked # Return the methods_invoked of the class or method
 
+def get_latest_metrics(record):
+	"""
+	Gets the latest metrics of the track record of a class or method.
+
+	:param record: The track record of the class or method
+	:return: A tuple containing the latest CK metrics
+	"""
+
+	return record.latest_metrics() if isinstance(record, CompactTrackRecord) else record["metrics"][-1] # Return the latest metrics, without building the metrics list of the compact track records
+
+def create_metrics_track_record(repository_name, classes_or_methods, memory_budget=None):
+	"""
+	Creates the dictionary of the metrics track records of the classes or methods of the repository, which spills the histories to disk if the TRACK_RECORD_MEMORY_BUDGET_MB is set.
+
+	:param repository_name: The name of the repository
+	:param classes_or_methods: The "classes" or "methods" string, used to name the spill file
+	:param memory_budget: The TrackRecordsMemoryBudget shared with the other track records of the repository. If None, the dictionary has its own memory budget
+	:return: An empty dictionary of metrics track records
+	"""
+
+	if not COMPACT_METRICS_TRACK_RECORD or TRACK_RECORD_MEMORY_BUDGET_MB is None: # If the histories can't or shouldn't be spilled
+		return {} # Return a dictionary that keeps everything in memory
+
+	return SpillableTrackRecords(f"{FULL_METRICS_DATA_DIRECTORY_PATH}/{repository_name}/{classes_or_methods}_track_record_spill.db", memory_budget if memory_budget is not None else TrackRecordsMemoryBudget()) # Return a dictionary that spills the histories to disk
+
+def get_track_record_commits(repository_url):
+	"""
+	Gets the commit table of the repository, shared by its compact track records.
+
+	:param repository_url: The URL of the repository
+	:return: The commit table of the repository, with the "repository_url", "commit_ids" and "commit_indexes" keys
+	"""
+
+	if repository_url not in TRACK_RECORD_COMMITS: # If the repository has no commit table yet
+		TRACK_RECORD_COMMITS[repository_url] = {"repository_url": repository_url, "commit_ids": [], "commit_indexes": {}} # Create the commit table of the repository
+
+	return TRACK_RECORD_COMMITS[repository_url] # Return the commit table of the repository
+
 def was_file_modified(ck_metrics, identifier, metrics_track_record):
 	"""
 	Verifies if the file was modified.
@@ -313,14 +670,12 @@ def was_file_modified(ck_metrics, identifier, metrics_track_record):
 	:return: True if the file was modified, False otherwise
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Verifying if the CK Metrics was modified since the last commit...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Verifying if the CK Metrics was modified since the last commit...{Style.RESET_ALL}")
 
 	if identifier not in metrics_track_record.keys(): # If the identifier is not a key in the metrics_track_record dictionary
 		return True # Return True if the identifier is not in the dictionary
 	
-	ck_metrics_history = metrics_track_record[identifier]["metrics"] # Get the metrics history of the class or method
-	
-	if ck_metrics != ck_metrics_history[-1]: # If the CK Metrics was modified since the last commit
+	if ck_metrics != get_latest_metrics(metrics_track_record[identifier]): # If the CK Metrics was modified since the last commit
 		return True # Return True if the CK Metrics was modified since the last commit, otherwise return False
 
 	return False # Return False if the CK Metrics was not modified since the last commit
@@ -334,7 +689,7 @@ def generate_commit_url(repository_url, commit_hash):
 	:return: The URL of the commit
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Generating the URL of the commit...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Generating the URL of the commit...{Style.RESET_ALL}")
 
 	return f"{repository_url}/commit/{commit_hash}" # Return the URL of the commit
 
@@ -351,6 +706,14 @@ def update_metrics_track_record(metrics_track_record, identifier, commit_id, ck_
 	:return: None
 	"""
 
+	if COMPACT_METRICS_TRACK_RECORD: # If the track records are compact
+		if identifier not in metrics_track_record: # If the identifier is not in the dictionary, add it
+			metrics_track_record[sys.intern(identifier)] = CompactTrackRecord(get_track_record_commits(repository_url), methods_invoked) # Add the identifier to the metrics_track_record dictionary
+		metrics_track_record[identifier].append_metrics(commit_id, ck_metrics) # Append the metrics and the commit, whose diff url is built when read
+		if isinstance(metrics_track_record, SpillableTrackRecords): # If the track records can be spilled to disk
+			metrics_track_record.memory_budget.history_bytes += (len(ck_metrics) + 5) * 8 # Account the history entry in memory: its metrics, commit index, code churn, lines added, lines deleted and modified files count
+		return # Return as the metrics track record was updated
+
 	if identifier not in metrics_track_record: # If the identifier is not in the dictionary, add it
 		metrics_track_record[identifier] = { # Add the identifier to the metrics_track_record dictionary
 			"metrics": [], # The metrics list
@@ -378,7 +741,7 @@ def get_diff_filepath(ck_file_path, file_in_repository_path):
 	:return: The diff file path
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Converting the CK file path to the diff file path...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Converting the CK file path to the diff file path...{Style.RESET_ALL}")
 
 	filename = file_in_repository_path.split("/")[-1]
 	diff_dir = ck_file_path.replace("ck_metrics", "diffs") # Get the diff directory
@@ -457,6 +820,30 @@ def find_diff_file_path(diff_file_path, class_base_name, max_levels=2):
 
 	return None # Return None if the diff file is not found within the max levels
 
+def find_packed_diff(diff_file_path, class_base_name, repository_file_path=None, max_levels=2):
+	"""
+	Traverse up to max_levels to find the diff in the diff pack of the repository.
+
+	:param diff_file_path: The original diff file path, in the "diffs/<repository_name>/<commit_number>-<commit_hash>/<filename>" format.
+	:param class_base_name: The base class name to search for the diff.
+	:param repository_file_path: The path of the file in the repository, used to choose between modified files with the same name.
+	:param max_levels: Maximum number of directory levels to go up while searching.
+	:return: The diff content if found, otherwise None.
+	"""
+
+	repository_name, commit_id = diff_file_path.split("/")[-3:-1] # Get the repository name and the commit id from the diff file path
+	levels_up = 0 # Counter to track levels we have gone up
+
+	while levels_up < max_levels: # While we have not reached the maximum levels up
+		diff_content = read_packed_diff(repository_name, commit_id, f"{class_base_name}.java", repository_file_path) # Read the diff from the diff pack
+		if diff_content is not None: # If the diff exists, return it
+			return diff_content # Return the diff content
+
+		class_base_name = remove_last_capitalized_word(class_base_name) # Update class base name
+		levels_up += 1 # Increment the levels up counter
+
+	return None # Return None if the diff is not found within the max levels
+
 def count_lines_within_code_block(line, lines_added, lines_deleted):
 	"""
 	Count the lines added and deleted based on the diff line content inside a code block.
@@ -534,18 +921,38 @@ def process_diff_file(diff_file_path, class_base_name, inner_class_name, lines_a
 	except Exception as e: # Catch any other exceptions
 		raise Exception(f"{BackgroundColors.RED}Error: An error occurred while reading the diff file {BackgroundColors.GREEN}{diff_file_path}{BackgroundColors.RED}: {e}{Style.RESET_ALL}") # Raise an error if an exception occurs
 
-def get_code_churn_attributes(diff_file_path, class_name):
+def has_diff_pack(repository_name):
+	"""
+	Verifies if the diffs of the repository were packed by code_metrics.py (PACKED_DIFFS), caching the result, as it is verified for every changed class or method.
+
+	:param repository_name: The name of the repository
+	:return: True if the diffs of the repository are packed, False otherwise
+	"""
+
+	if repository_name not in DIFF_PACK_REPOSITORIES: # If the diff pack of the repository was not verified yet
+		DIFF_PACK_REPOSITORIES[repository_name] = verify_diff_pack_exists(repository_name) # Verify if the diff pack exists
+
+	return DIFF_PACK_REPOSITORIES[repository_name] # Return if the diffs of the repository are packed
+
+def get_code_churn_attributes(diff_file_path, class_name, repository_file_path=None):
 	"""
 	Get the code churn attributes (lines added and deleted) from the diff file path, handling inner classes if necessary.
+	If the diffs of the repository were packed by code_metrics.py (PACKED_DIFFS), the diff is read from the diff pack.
 
 	:param diff_file_path: The diff file path.
 	:param class_name: The class name, possibly with an inner class.
+	:param repository_file_path: The path of the file in the repository, used to choose between packed diffs of files with the same name.
 	:return: A tuple containing lines added and lines deleted.
 	"""
 
 	lines_added, lines_deleted = 0, 0 # Initialize the lines added and deleted
 	class_base_name = extract_class_base_name(class_name) # Get base class name and last capitalized word
 	inner_class_name = extract_inner_class_name(class_name) # Extract the inner class name if it exists
+
+	if has_diff_pack(diff_file_path.split("/")[-3]): # If the diffs of the repository are packed
+		diff_content = find_packed_diff(diff_file_path, class_base_name, repository_file_path) # Find the diff in the diff pack
+		return (lines_added, lines_deleted) if diff_content is None else process_diff_file_lines(diff_content.splitlines(keepends=True), class_base_name, inner_class_name, lines_added, lines_deleted) # Process the lines of the diff
+
 	diff_file_path = find_diff_file_path(diff_file_path, class_base_name) # Find the diff file path for the class
 
 	if diff_file_path is None: # If no diff file is found, return 0 for added and deleted lines
@@ -553,6 +960,25 @@ def get_code_churn_attributes(diff_file_path, class_name):
 
 	return process_diff_file(diff_file_path, class_base_name, inner_class_name, lines_added, lines_deleted) # Process the diff file
 
+def get_commit_code_churn_attributes(diff_file_path, class_name, repository_file_path):
+	"""
+	Gets the code churn attributes of the class, reusing the ones already read for the current commit in the single pass mode, as its classes and methods read the same diffs.
+
+	:param diff_file_path: The diff file path.
+	:param class_name: The class name, possibly with an inner class.
+	:param repository_file_path: The path of the file in the repository.
+	:return: A tuple containing lines added and lines deleted.
+	"""
+
+	if CODE_CHURN_CACHE is None: # If the code churn attributes are not shared
+		return get_code_churn_attributes(diff_file_path, class_name, repository_file_path) # Read the code churn attributes from the diff
+
+	cache_key = (diff_file_path, class_name, repository_file_path) # The key of the code churn attributes
+	if cache_key not in CODE_CHURN_CACHE: # If the code churn attributes were not read for the commit yet
+		CODE_CHURN_CACHE[cache_key] = get_code_churn_attributes(diff_file_path, class_name, repository_file_path) # Read the code churn attributes from the diff
+
+	return CODE_CHURN_CACHE[cache_key] # Return the code churn attributes
+
 def get_code_churn(lines_added, lines_deleted):
 	"""
 	Get the code churn value given the churn attributes.
@@ -579,46 +1005,203 @@ def update_code_churn_and_file_info(metrics_track_record, identifier, lines_adde
 	:return: None
 	"""
 
+	modified_files_count = len(commit_modified_files_dict[commit_hash]) # Get the number of modified files for the current commit hash
+
+	if isinstance(metrics_track_record[identifier], CompactTrackRecord): # If it is a compact track record
+		metrics_track_record[identifier].append_code_churn(lines_added, lines_deleted, code_churn_value, modified_files_count) # Append the code churn and modified files count
+		return # Return as the track record was updated
+
 	metrics_track_record[identifier]["code_churns"].append(code_churn_value) # Append the code churn value to the code churns list
 	metrics_track_record[identifier]["lines_added"].append(lines_added) # Append the lines added to the lines added list
 	metrics_track_record[identifier]["lines_deleted"].append(lines_deleted) # Append the lines deleted to the lines deleted list
-
-	modified_files_count = len(commit_modified_files_dict[commit_hash]) # Get the number of modified files for the current commit hash
 	metrics_track_record[identifier]["modified_files_count"].append(modified_files_count) # Append the modified files count to the modified files count list
 
-def process_csv_file(file_path, commit_modified_files_dict, metrics_track_record, repository_url):
+def process_ck_rows(rows, file_path, commit_modified_files_dict, metrics_track_record, repository_url):
+	"""
+	Processes the rows containing the metrics of the classes or methods of a commit.
+
+	:param rows: An iterable of dictionaries, each one being a row of the CK metrics of the commit
+	:param file_path: The path to the csv file of the commit, in the "<commit_number>-<commit_hash>/<ck_csv_file>" format
+	:param commit_modified_files_dict: A dictionary containing the commit hashes as keys and the modified files list as values
+	:param metrics_track_record: A dictionary containing the track record of the metrics of each class or method
+	:param repository_url: The URL of the repository
+	:return: None
+	"""
+
+	commit_number = file_path.split("/")[-2].split("-")[0] # Get the commit number from the file path
+	commit_hash = file_path.split("/")[-2].split("-")[1] # Get the commit hash from the commit number
+	commit_id = f"{commit_number}-{commit_hash}" # Get the commit id
+
+	for row in rows: # For each row of the commit
+		identifier = get_identifier(row) # Get the identifier of the class or method
+
+		if not identifier: # If the identifier is None, skip the row
+			continue # Skip the row if the identifier is None
+
+		ck_metrics = get_ck_metrics_tuple(row) # Get the metrics of the class or method
+		methods_invoked = get_methods_invoked(row) # Get the method invoked of the class or method
+		
+		if was_file_modified(ck_metrics, identifier, metrics_track_record) and commit_modified_files_dict[commit_hash]: # If the file was modified, then update the metrics track record
+			update_metrics_track_record(metrics_track_record, identifier, commit_id, ck_metrics, methods_invoked, repository_url) # Update the metrics track record
+			diff_filepath = get_diff_filepath(file_path, row["file"]) # Get the diff file path
+			class_name = convert_ck_classname_to_filename_format(diff_filepath, row["class"]) # Convert the CK class name to the filename format
+			lines_added, lines_deleted = get_commit_code_churn_attributes(diff_filepath, class_name, row["file"]) # Get the code churn attributes
+			update_code_churn_and_file_info(metrics_track_record, identifier, lines_added, lines_deleted, get_code_churn(lines_added, lines_deleted), commit_modified_files_dict, commit_hash) # Update the code churn and file info
+
+	metrics_track_record.spill_if_over_budget() if isinstance(metrics_track_record, SpillableTrackRecords) else None # Spill the histories to disk if they exceed the memory budget
+
+def process_csv_file(file_path, commit_modified_files_dict, metrics_track_record, repository_url, ingestion_state=None):
 	"""
 	Processes a csv file containing the metrics of a class or method.
 
 	:param file_path: The path to the csv file
 	:param commit_modified_files_dict: A dictionary containing the commit hashes as keys and the modified files list as values
 	:param metrics_track_record: A dictionary containing the track record of the metrics of each class or method
+	:param ingestion_state: The state of the vectorized CK ingestion, or None to process every row of the csv file
 	:return: None
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Processing the csv file containing the metrics of a class or method...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Processing the csv file containing the metrics of a class or method...{Style.RESET_ALL}")
+
+	if ingestion_state is not None: # If the CK metrics are ingested as dataframes
+		process_ck_dataframe(read_ck_csv_file(file_path), file_path, commit_modified_files_dict, metrics_track_record, repository_url, ingestion_state) # Process only the changed rows of the csv file
+		return # Return as the csv file was processed
 
 	with open(file_path, "r") as csvfile: # Open the csv file
 		reader = csv.DictReader(csvfile) # Read the csv file
-		commit_number = file_path.split("/")[-2].split("-")[0] # Get the commit number from the file path
-		commit_hash = file_path.split("/")[-2].split("-")[1] # Get the commit hash from the commit number
-		commit_id = f"{commit_number}-{commit_hash}" # Get the commit id
+		process_ck_rows(reader, file_path, commit_modified_files_dict, metrics_track_record, repository_url) # Process the rows of the csv file
 
-		for row in reader: # For each row in the csv file
-			identifier = get_identifier(row) # Get the identifier of the class or method
+def get_ck_columns_dtypes():
+	"""
+	Gets the data types of the CK columns used to process the classes or methods, so the CK metrics are parsed once, by the columnar reader.
+
+	:return: A dictionary containing the CK columns names as keys and their data types as values
+	"""
 
-			if not identifier: # If the identifier is None, skip the row
-				continue # Skip the row if the identifier is None
+	dtypes = {column: str for column in get_ck_store_columns()} # The identifier, methods invoked and file columns are strings
+	dtypes.update({metric.lower(): "float64" for metric in METRICS_INDEXES.keys()}) # The metrics columns are floats
+	dtypes.update({"methodsInvokedQty": "int64"} if not PROCESS_CLASSES else {}) # The methodsInvokedQty column is an integer
+	return dtypes # Return the CK columns data types
 
-			ck_metrics = get_ck_metrics_tuple(row) # Get the metrics of the class or method
-			methods_invoked = get_methods_invoked(row) # Get the method invoked of the class or method
-			
-			if was_file_modified(ck_metrics, identifier, metrics_track_record) and commit_modified_files_dict[commit_hash]: # If the file was modified, then update the metrics track record
-				update_metrics_track_record(metrics_track_record, identifier, commit_id, ck_metrics, methods_invoked, repository_url) # Update the metrics track record
-				diff_filepath = get_diff_filepath(file_path, row["file"]) # Get the diff file path
-				class_name = convert_ck_classname_to_filename_format(diff_filepath, row["class"]) # Convert the CK class name to the filename format
-				lines_added, lines_deleted = get_code_churn_attributes(diff_filepath, class_name) # Get the code churn attributes
-				update_code_churn_and_file_info(metrics_track_record, identifier, lines_added, lines_deleted, get_code_churn(lines_added, lines_deleted), commit_modified_files_dict, commit_hash) # Update the code churn and file info
+def read_ck_csv_file(file_path):
+	"""
+	Reads only the CK columns used to process the classes or methods of a csv file, with fixed data types.
+
+	:param file_path: The path to the csv file
+	:return: A dataframe containing the CK columns of the csv file
+	"""
+
+	return normalize_ck_dataframe(pd.read_csv(file_path, usecols=get_ck_store_columns(), dtype=get_ck_columns_dtypes(), float_precision="round_trip", keep_default_na=False, na_values={metric.lower(): ["NaN", "nan"] for metric in METRICS_INDEXES.keys()})) # Read the csv file as a typed dataframe
+
+def normalize_ck_dataframe(dataframe):
+	"""
+	Normalizes the CK columns of a dataframe to the data types of the columnar reader, which are the types of the csv.DictReader based processing after the conversions.
+
+	:param dataframe: A dataframe containing the CK columns
+	:return: The normalized dataframe
+	"""
+
+	for column, dtype in get_ck_columns_dtypes().items(): # For each CK column
+		dataframe[column] = dataframe[column].fillna("").astype(str) if dtype is str else pd.to_numeric(dataframe[column]).astype(dtype) # Convert the column to its data type
+
+	return dataframe # Return the normalized dataframe
+
+def get_changed_ck_rows(dataframe, latest_ck_metrics):
+	"""
+	Gets the rows of the classes or methods whose metrics differ from their latest recorded metrics, comparing the whole snapshot at once.
+
+	:param dataframe: A dataframe containing the CK columns of the commit
+	:param latest_ck_metrics: A dataframe indexed by the identifiers, containing their latest recorded metrics, or None if nothing was recorded yet
+	:return: A tuple containing the changed rows dataframe and their identifiers
+	"""
+
+	metrics_columns = [metric.lower() for metric in METRICS_INDEXES.keys()] # The metrics columns, in the METRICS_INDEXES order
+	dataframe = dataframe[dataframe["class"].str.contains(".", regex=False)] # Keep only the valid class names (package names)
+	identifiers = dataframe["class"] + " " + (dataframe["type"] if PROCESS_CLASSES else dataframe["method"]) # The identifiers of the classes or methods
+
+	if latest_ck_metrics is None: # If nothing was recorded yet
+		return dataframe, identifiers # Every row is new
+
+	previous_metrics = latest_ck_metrics.reindex(identifiers.values) # The latest recorded metrics of each row, which are NaN for the new identifiers
+	changed = (dataframe[metrics_columns].values != previous_metrics.values).any(axis=1) # The rows whose metrics changed, including the new identifiers
+	changed |= identifiers.duplicated(keep=False).values # The repeated identifiers are compared row by row, as each one is compared with the previous one
+
+	return dataframe[changed], identifiers[changed] # Return the changed rows and their identifiers
+
+def update_latest_ck_metrics(latest_ck_metrics, metrics_track_record, identifiers):
+	"""
+	Updates the latest recorded metrics of the identifiers with the last metrics of their track record.
+
+	:param latest_ck_metrics: A dataframe indexed by the identifiers, containing their latest recorded metrics, or None if nothing was recorded yet
+	:param metrics_track_record: A dictionary containing the track record of the metrics of each class or method
+	:param identifiers: The identifiers that may have been recorded
+	:return: The updated latest recorded metrics dataframe
+	"""
+
+	identifiers = [identifier for identifier in dict.fromkeys(identifiers) if identifier in metrics_track_record] # The unique identifiers that have a track record
+	if not identifiers: # If no identifier was recorded
+		return latest_ck_metrics # Return the latest recorded metrics unchanged
+
+	recorded_metrics = pd.DataFrame([get_latest_metrics(metrics_track_record[identifier]) for identifier in identifiers], index=identifiers, columns=[metric.lower() for metric in METRICS_INDEXES.keys()]) # The latest recorded metrics of the identifiers
+	return recorded_metrics if latest_ck_metrics is None else pd.concat([latest_ck_metrics[~latest_ck_metrics.index.isin(identifiers)], recorded_metrics]) # Return the latest recorded metrics, replacing the previous ones
+
+def process_ck_dataframe(dataframe, file_path, commit_modified_files_dict, metrics_track_record, repository_url, ingestion_state):
+	"""
+	Processes the dataframe containing the metrics of the classes or methods of a commit, only processing row by row the classes or methods whose metrics changed.
+
+	:param dataframe: A dataframe containing the CK columns of the commit
+	:param file_path: The path to the csv file of the commit, in the "<commit_number>-<commit_hash>/<ck_csv_file>" format
+	:param commit_modified_files_dict: A dictionary containing the commit hashes as keys and the modified files list as values
+	:param metrics_track_record: A dictionary containing the track record of the metrics of each class or method
+	:param repository_url: The URL of the repository
+	:param ingestion_state: A dictionary containing the latest recorded metrics dataframe in the "latest_ck_metrics" key
+	:return: None
+	"""
+
+	commit_hash = file_path.split("/")[-2].split("-")[1] # Get the commit hash from the commit number
+	if not commit_modified_files_dict[commit_hash]: # If the commit has no modified files, then nothing is recorded
+		return # Return as the metrics track record is not updated
+
+	changed_rows, identifiers = get_changed_ck_rows(dataframe, ingestion_state["latest_ck_metrics"]) # Get the rows whose metrics changed
+	process_ck_rows(changed_rows.to_dict("records"), file_path, commit_modified_files_dict, metrics_track_record, repository_url) # Process only the changed rows
+	ingestion_state["latest_ck_metrics"] = update_latest_ck_metrics(ingestion_state["latest_ck_metrics"], metrics_track_record, identifiers.values) # Update the latest recorded metrics of the changed rows
+
+def get_ck_store_columns():
+	"""
+	Gets the CK columns used to process the classes or methods, so only them are read from the CK metrics store.
+
+	:return: A list containing the CK columns names
+	"""
+
+	identifier_columns = ["class", "type", "methodInvocations"] if PROCESS_CLASSES else ["class", "method", "methodsInvokedQty"] # The identifier and methods invoked columns
+	return identifier_columns + ["file"] + [metric.lower() for metric in METRICS_INDEXES.keys()] # Return the CK columns names
+
+def traverse_metrics_store(repository_name, repository_url, repository_ck_metrics_path):
+	"""
+	Traverses the CK metrics store of the repository and processes the rows of every commit.
+
+	:param repository_name: The name of the repository
+	:param repository_url: The URL of the repository
+	:param repository_ck_metrics_path: The path to the CK metrics directory of the repository, used to locate the diffs of the commits
+	:return: A dictionary containing the metrics of each class and method combination
+	"""
+
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Traversing the CK metrics store and processing the {BackgroundColors.CYAN}{CLASSES_OR_METHODS}{BackgroundColors.GREEN} of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+
+	metrics_track_record = create_metrics_track_record(repository_name, CLASSES_OR_METHODS) # Dictionary containing the track record of the metrics of each method nor class
+	commit_modified_files_dict = generate_repository_commits_modified_files_dict(repository_name) # Generate the commit modified files dictionary, having the commit hashes as keys and the modified files list as values
+	ingestion_state = {"latest_ck_metrics": None} # The state of the vectorized CK ingestion
+
+	with tqdm(unit=f" {BackgroundColors.GREEN}Processing all of the {BackgroundColors.CYAN}{repository_name} Stored Commits{Style.RESET_ALL}") as progress_bar:
+		for commit_number, commit_hash, rows in read_metrics_store(repository_name, CK_CSV_FILE, get_ck_store_columns()): # For each stored commit
+			commit_file_path = f"{repository_ck_metrics_path}/{commit_number}-{commit_hash}/{CK_CSV_FILE}" # The path of the csv file of the commit, used to locate its diffs
+			if VECTORIZED_CK_INGESTION: # If the CK metrics are ingested as dataframes
+				process_ck_dataframe(normalize_ck_dataframe(pd.DataFrame.from_records(rows, columns=get_ck_store_columns())), commit_file_path, commit_modified_files_dict, metrics_track_record, repository_url, ingestion_state) # Process only the changed rows of the commit
+			else: # If the CK metrics are ingested row by row
+				process_ck_rows(rows, commit_file_path, commit_modified_files_dict, metrics_track_record, repository_url) # Process the rows of the commit
+			progress_bar.update(1) # Update the progress bar
+
+	return metrics_track_record # Return the metrics track record
 
 def traverse_directory(repository_name, repository_url, repository_ck_metrics_path):
 	"""
@@ -630,11 +1213,15 @@ def traverse_directory(repository_name, repository_url, repository_ck_metrics_pa
 	:return: A dictionary containing the metrics of each class and method combination
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Traversing the directory and processing all the csv files for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Traversing the directory and processing all the csv files for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 	
-	metrics_track_record = {} # Dictionary containing the track record of the metrics of each method nor class. The key is the identifier and the value is a dictionary containing the metrics, commit hashes and the number of times the metrics changed.
+	if USE_CK_METRICS_STORE and verify_metrics_store_exists(repository_name): # If the CK metrics store of the repository exists
+		return traverse_metrics_store(repository_name, repository_url, repository_ck_metrics_path) # Process the CK metrics store instead of the CK metrics directories
+
+	metrics_track_record = create_metrics_track_record(repository_name, CLASSES_OR_METHODS) # Dictionary containing the track record of the metrics of each method nor class. The key is the identifier and the value is a dictionary containing the metrics, commit hashes and the number of times the metrics changed.
 
 	commit_modified_files_dict = generate_repository_commits_modified_files_dict(repository_name) # Generate the commit modified files dictionary, having the commit hashes as keys and the modified files list as values
+	ingestion_state = {"latest_ck_metrics": None} if VECTORIZED_CK_INGESTION else None # The state of the vectorized CK ingestion
 	total_files = sum(file == CK_CSV_FILE for _, _, files in os.walk(repository_ck_metrics_path) for file in files) # Get the total number of files in the directory
 
 	# Iterate through each directory inside the repository_directory and call the process_csv_file function to get the methods metrics of each file
@@ -644,11 +1231,64 @@ def traverse_directory(repository_name, repository_url, repository_ck_metrics_pa
 			for dir in subdirs: # For each subdirectory
 				for file in os.listdir(os.path.join(root, dir)): # For each file in the subdirectory
 					if file == CK_CSV_FILE: # If the file is the desired csv file
-						process_csv_file(os.path.join(root, os.path.join(dir, file)), commit_modified_files_dict, metrics_track_record, repository_url) # Process the csv file
+						process_csv_file(os.path.join(root, os.path.join(dir, file)), commit_modified_files_dict, metrics_track_record, repository_url, ingestion_state) # Process the csv file
 						progress_bar.update(1) # Update the progress bar
 
 	return metrics_track_record # Return the method metrics, which is a dictionary containing the metrics of each method
 
+def traverse_classes_and_methods(repository_name, repository_url, repository_ck_metrics_path, processing_globals):
+	"""
+	Traverses the CK metrics of the repository once, processing the classes and methods of each commit together, so each commit is read once and its code churn is shared.
+
+	:param repository_name: The name of the repository
+	:param repository_url: The URL of the repository
+	:param repository_ck_metrics_path: The path to the CK metrics directory of the repository
+	:param processing_globals: A dictionary containing the global variables of the classes (True) and methods (False)
+	:return: A dictionary containing the metrics track record of the classes (True) and methods (False)
+	"""
+
+	global CODE_CHURN_CACHE # Declare the CODE_CHURN_CACHE as a global variable
+
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Traversing the CK metrics and processing the {BackgroundColors.CYAN}classes and methods{BackgroundColors.GREEN} of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository in a single pass...{Style.RESET_ALL}")
+
+	memory_budget = TrackRecordsMemoryBudget() # The memory budget shared by the track records of the classes and methods, as they are kept in memory at the same time
+	metrics_track_records = {process_classes: create_metrics_track_record(repository_name, processing_globals[process_classes]["CLASSES_OR_METHODS"], memory_budget) for process_classes in processing_globals} # The metrics track record of the classes and methods
+	ingestion_states = {process_classes: {"latest_ck_metrics": None} if VECTORIZED_CK_INGESTION else None for process_classes in processing_globals} # The state of the vectorized CK ingestion of the classes and methods
+	commit_modified_files_dict = generate_repository_commits_modified_files_dict(repository_name) # Generate the commit modified files dictionary once, as it is shared by the classes and methods
+	use_metrics_store = USE_CK_METRICS_STORE and verify_metrics_store_exists(repository_name) # If the CK metrics store of the repository is read instead of the CK metrics directories
+
+	if use_metrics_store: # If the CK metrics store of the repository exists
+		stores_commits = [] # The generators of the stored commits of the classes and methods
+		for process_classes in processing_globals: # For the classes and the methods
+			globals().update(processing_globals[process_classes]) # Switch to the global variables of the classes or methods
+			stores_commits.append(read_metrics_store(repository_name, CK_CSV_FILE, get_ck_store_columns())) # Read the stored commits of the CK metric file
+		commits = zip(*stores_commits) # The stored commits of the classes and methods, which are in the same order
+		total_commits = None # The number of stored commits is unknown
+	else: # If the CK metrics directories are read
+		commits = sorted((dirname for dirname in (os.listdir(repository_ck_metrics_path) if os.path.isdir(repository_ck_metrics_path) else []) if os.path.isdir(os.path.join(repository_ck_metrics_path, dirname))), key=lambda dirname: int(dirname.split("-")[0])) # The commit directories in ascending order by the commit number
+		total_commits = len(commits) # The number of commit directories
+
+	try: # Always stop sharing the code churn attributes
+		with tqdm(total=total_commits, unit=f" {BackgroundColors.GREEN}Processing all of the {BackgroundColors.CYAN}{repository_name} Commits{Style.RESET_ALL}") as progress_bar:
+			for commit in commits: # For each commit
+				CODE_CHURN_CACHE = {} # Share the code churn attributes only within the commit
+				for index, process_classes in enumerate(processing_globals): # For the classes and the methods
+					globals().update(processing_globals[process_classes]) # Switch to the global variables of the classes or methods
+					if use_metrics_store: # If the rows are read from the CK metrics store
+						commit_number, commit_hash, rows = commit[index] # The stored commit of the CK metric file
+						commit_file_path = f"{repository_ck_metrics_path}/{commit_number}-{commit_hash}/{CK_CSV_FILE}" # The path of the csv file of the commit, used to locate its diffs
+						if VECTORIZED_CK_INGESTION: # If the CK metrics are ingested as dataframes
+							process_ck_dataframe(normalize_ck_dataframe(pd.DataFrame.from_records(rows, columns=get_ck_store_columns())), commit_file_path, commit_modified_files_dict, metrics_track_records[process_classes], repository_url, ingestion_states[process_classes]) # Process only the changed rows of the commit
+						else: # If the CK metrics are ingested row by row
+							process_ck_rows(rows, commit_file_path, commit_modified_files_dict, metrics_track_records[process_classes], repository_url) # Process the rows of the commit
+					elif os.path.isfile(os.path.join(repository_ck_metrics_path, commit, CK_CSV_FILE)): # If the commit directory has the csv file
+						process_csv_file(os.path.join(repository_ck_metrics_path, commit, CK_CSV_FILE), commit_modified_files_dict, metrics_track_records[process_classes], repository_url, ingestion_states[process_classes]) # Process the csv file
+				progress_bar.update(1) # Update the progress bar
+	finally: # Stop sharing the code churn attributes
+		CODE_CHURN_CACHE = None # Stop sharing the code churn attributes
+
+	return metrics_track_records # Return the metrics track record of the classes and methods
+
 def sort_commit_hashes_by_commit_number(metrics_track_record):
 	"""
 	Sorts the commit_hashes list for each entry in the metrics_track_record dictionary
@@ -659,7 +1299,7 @@ def sort_commit_hashes_by_commit_number(metrics_track_record):
 	"""
 
 	for key in metrics_track_record: # For each key in the metrics_track_record dictionary
-		metrics_track_record[key]["commit_hashes"].sort(key=lambda x: int(x.split("-")[0])) # Sort the commit hashes list for each class or method according to the commit number
+		metrics_track_record[key]["commit_hashes"] = sorted(metrics_track_record[key]["commit_hashes"], key=lambda x: int(x.split("-")[0])) # Sort the commit hashes list for each class or method according to the commit number
 
 	return metrics_track_record # Return the sorted metrics_track_record
 
@@ -672,7 +1312,7 @@ def generate_progress_bar_description(repository_name, processes):
 	:return: A string containing the description for the progress bar
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Generating the description for the progress bar...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Generating the description for the progress bar...{Style.RESET_ALL}")
 
 	metrics_description = ", ".join(processes) # Join the processes with a comma
 	progress_description = f"{BackgroundColors.GREEN}Generating {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN}'s {BackgroundColors.CYAN}{metrics_description}{BackgroundColors.GREEN}...{Style.RESET_ALL}" if processes else f"{BackgroundColors.GREEN}Processing Metrics..{Style.RESET_ALL}" # Generate the description for the progress bar
@@ -687,7 +1327,7 @@ def get_clean_id(id):
 	:return: ID of the class or method to be analyzed without the slashes
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Getting the clean id for {BackgroundColors.CYAN}{id}{BackgroundColors.GREEN}...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Getting the clean id for {BackgroundColors.CYAN}{id}{BackgroundColors.GREEN}...{Style.RESET_ALL}")
 	
 	if "/" in id: # If the id contains slashes, remove them
 		return str(id.split("/")[0:-1])[2:-2] # Return the id without the slashes
@@ -704,7 +1344,7 @@ def write_metrics_track_record_to_txt(filename, repository_name, identifier, rec
 	:return: None
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Writing the metrics track record for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository to a txt file...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Writing the metrics track record for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository to a txt file...{Style.RESET_ALL}")
 
 	with open(filename, "a") as file: # Open the txt file and write the metrics_track_record to it
 		file.write(f"Identifier: {identifier}: \n") # Write the key
@@ -729,7 +1369,7 @@ def setup_write_metrics_track_record_to_txt(repository_name, identifier, record,
 	:return: None
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Setting up the writing of the metrics track record to a txt file for {identifier.split(' ')[0]} {identifier.split(' ')[1]} in the {repository_name} repository...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Setting up the writing of the metrics track record to a txt file for {identifier.split(' ')[0]} {identifier.split(' ')[1]} in the {repository_name} repository...{Style.RESET_ALL}")
 
 	initial_file_path = f"{CLASSES_OR_METHODS}_metrics_track_record.txt" # The initial file path
 	filename = f"{FULL_METRICS_DATA_DIRECTORY_PATH}/{repository_name}/{initial_file_path}" # The filename of the metrics track record
@@ -749,7 +1389,7 @@ def write_metrics_evolution_to_csv(repository_name, filename, class_name, variab
 	:return: None
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Writing the metrics evolution for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository to a csv file...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Writing the metrics evolution for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository to a csv file...{Style.RESET_ALL}")
 
 	with open(filename, "w") as csvfile: # Open the csv file and write the metrics to it
 		writer = csv.writer(csvfile) # Create the csv writer
@@ -760,12 +1400,13 @@ def write_metrics_evolution_to_csv(repository_name, filename, class_name, variab
 
 		previous_metrics = None # Initialize to None for the first iteration
 		metrics = record["metrics"] # Get the metrics from the record
+		commit_hashes, code_churns, lines_added, lines_deleted, modified_files_count = record["commit_hashes"], record["code_churns"], record["lines_added"], record["lines_deleted"], record["modified_files_count"] # Get the lists from the record once, outside of the loop
 
 		for i in range(len(metrics)): # For each metric in the metrics list
 			current_metrics = list(metrics[i]) # Tuple of current metrics based on METRICS_INDEXES
 			if WRITE_FULL_HISTORY or (previous_metrics is None or current_metrics != previous_metrics): # Verify if the metrics tuple is different from the previous metrics tuple
-				commit_number, commit_hash = record["commit_hashes"][i].split("-") # Split the commit hash to get the commit number and commit hash
-				writer.writerow([class_name, variable_attribute, commit_number, commit_hash, record["code_churns"][i], record["lines_added"][i], record["lines_deleted"][i], record["modified_files_count"][i], *current_metrics, record["methods_invoked"]]) # Write the unique identifier and metrics to the csv file
+				commit_number, commit_hash = commit_hashes[i].split("-") # Split the commit hash to get the commit number and commit hash
+				writer.writerow([class_name, variable_attribute, commit_number, commit_hash, code_churns[i], lines_added[i], lines_deleted[i], modified_files_count[i], *current_metrics, record["methods_invoked"]]) # Write the unique identifier and metrics to the csv file
 			previous_metrics = current_metrics # Update previous metrics
 
 def setup_write_metrics_evolution_to_csv(repository_name, class_name, variable_attribute, record):
@@ -795,12 +1436,12 @@ def found_ignore_keywords(source, keywords, entity_type):
 	:return: True if the source contains any of the ignore keywords, False otherwise
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Verifying if the class name or variable attribute contains any of the ignore keywords...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Verifying if the class name or variable attribute contains any of the ignore keywords...{Style.RESET_ALL}")
 
 	filtered_keywords = [keyword for keyword in keywords if keyword.strip()] # Filter out empty strings from the ignore keywords list
 
 	if any(keyword.lower() in source.lower() for keyword in filtered_keywords): # If any of the ignore keywords is in the source
-		verbose_output(true_string=f"{BackgroundColors.YELLOW}Ignoring {entity_type} {source} as the name contains one of the ignore keywords: {keywords}{Style.RESET_ALL}")
+		verbose_output(true_string=lambda: f"{BackgroundColors.YELLOW}Ignoring {entity_type} {source} as the name contains one of the ignore keywords: {keywords}{Style.RESET_ALL}")
 		return True # Return True if the source contains any of the ignore keywords
 	return False # Return False if the source does not contain any of the ignore keywords
 
@@ -843,7 +1484,7 @@ def write_substantial_decrease_csv_header(csv_filename, expected_header):
 	:return: None
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Writing the header to the {BackgroundColors.CYAN}{csv_filename}{BackgroundColors.GREEN} csv file...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Writing the header to the {BackgroundColors.CYAN}{csv_filename}{BackgroundColors.GREEN} csv file...{Style.RESET_ALL}")
 
 	with open(csv_filename, "w") as csvfile: # Open the csv file in write mode
 		writer = csv.writer(csvfile) # Create the csv writer
@@ -859,7 +1500,7 @@ def setup_substantial_decrease_file(repository_name, metric_name, iteration):
 	:return: The path to the substantial decrease file
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Setting up the substantial decrease file for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Setting up the substantial decrease file for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 
 	csv_filename = f"{FULL_METRICS_STATISTICS_DIRECTORY_PATH}/{repository_name}/{SUBSTANTIAL_CHANGES_FILENAME.replace('METRIC_NAME', metric_name)}" # The csv file name
 
@@ -877,7 +1518,7 @@ def filter_metrics_by_threshold(metrics, metric_name=None, thresholds_dict=METRI
 	:return: The filtered metrics
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Filtering the metrics by the threshold values...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Filtering the metrics by the threshold values...{Style.RESET_ALL}")
 
 	filtered_metrics = [] # Initialize the empty list to store the filtered metrics
 
@@ -933,7 +1574,7 @@ def generate_refactoring_file(repository_name, commit_hash, refactoring_file_pat
 	:return: The refactoring file path
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Generating the refactoring file for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Generating the refactoring file for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 
 	relatively_refactorings_directory_path = f"{RELATIVE_REFACTORINGS_DIRECTORY_PATH}/{repository_name}" # Get the relatively refactorings directory path
 	full_refactorings_directory_path = f"{START_PATH}/{relatively_refactorings_directory_path}" # Get the full refactorings directory path
@@ -941,18 +1582,18 @@ def generate_refactoring_file(repository_name, commit_hash, refactoring_file_pat
 
 	if not verify_filepath_exists(refactoring_file_path) or os.path.getsize(refactoring_file_path) == 0: # If the refactoring file does not exist or is empty
 		null_device = "NUL" if platform.system() == "Windows" else "/dev/null" # Determine the system's null device to discard output
-		setup_repository(repository_name, DEFAULT_REPOSITORIES[repository_name]) # Setup the repository
+		ensure_full_checkout(repository_name, DEFAULT_REPOSITORIES[repository_name]) # Setup the repository, which is only synced in the first call of the execution, with a full checkout, as RefactoringMiner needs the whole tree and every object
 		command = [f"{RELATIVE_REFACTORING_MINER_DIRECTORY_PATH}", "-c", f".{RELATIVE_REPOSITORIES_DIRECTORY_PATH}/{repository_name}", commit_hash, "-json", refactoring_file_path] # RefactoringMiner command
 
 		try: # Try to run the command
 			with open(null_device, "w") as null_output: # Open the null device to discard output
-				result = subprocess.run(command, stdout=null_output, stderr=subprocess.STDOUT, timeout=60) # Run the command and wait for it to finish
+				result = subprocess.run(command, cwd=START_PATH, stdout=null_output, stderr=subprocess.STDOUT, timeout=60) # Run the command from the start path, as it uses relative paths, and wait for it to finish
 
 			if result.returncode != 0: # Verify if the command failed
-				verbose_output(true_string=f"{BackgroundColors.RED}RefactoringMiner failed to generate the refactoring file for {repository_name}.{Style.RESET_ALL}")
+				verbose_output(true_string=lambda: f"{BackgroundColors.RED}RefactoringMiner failed to generate the refactoring file for {repository_name}.{Style.RESET_ALL}")
 				return None # Return None if command failed
 		except subprocess.TimeoutExpired: # Catch the TimeoutExpired exception
-			verbose_output(true_string=f"{BackgroundColors.RED}RefactoringMiner timed out for {repository_name}.{Style.RESET_ALL}")
+			verbose_output(true_string=lambda: f"{BackgroundColors.RED}RefactoringMiner timed out for {repository_name}.{Style.RESET_ALL}")
 			return None # Return None if command timed out
 
 	is_valid, message = verify_refactoring_file(refactoring_file_path) # Verify if the refactoring file was properly generated
@@ -960,7 +1601,7 @@ def generate_refactoring_file(repository_name, commit_hash, refactoring_file_pat
 	if is_valid: # If the refactoring file was properly generated
 		return refactoring_file_path # Return the refactoring file path
 	else: # If the refactoring file was not properly generated
-		verbose_output(true_string=f"{BackgroundColors.RED}The refactoring file for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository was not generated: {BackgroundColors.YELLOW}{message}{Style.RESET_ALL}")
+		verbose_output(true_string=lambda: f"{BackgroundColors.RED}The refactoring file for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository was not generated: {BackgroundColors.YELLOW}{message}{Style.RESET_ALL}")
 		return None # Return None
 
 def process_refactorings(commit, class_name, refactorings_by_filepath):
@@ -983,7 +1624,7 @@ def process_refactorings(commit, class_name, refactorings_by_filepath):
 				if refactoring_type not in refactorings_by_filepath[location["filePath"]]: # If the refactoring type is not in the dictionary, add it
 					refactorings_by_filepath[location["filePath"]][refactoring_type] = 0 # Initialize the refactoring type counter
 				refactorings_by_filepath[location["filePath"]][refactoring_type] += 1 # Increment the refactoring type counter
-				verbose_output(true_string=f"Refactoring: {json.dumps(refactoring, indent=4)}") # Print the refactoring data
+				verbose_output(true_string=lambda: f"Refactoring: {json.dumps(refactoring, indent=4)}") # Print the refactoring data
 
 	return refactorings_by_filepath # Return the updated dictionary
 
@@ -998,7 +1639,7 @@ def get_refactoring_info(repository_name, commit_number, commit_hash, class_name
 	:return: A dictionary containing the file paths and their corresponding refactoring types and occurrences
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Getting the specific information about the refactorings for {BackgroundColors.CYAN}{class_name}{BackgroundColors.GREEN} in the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Getting the specific information about the refactorings for {BackgroundColors.CYAN}{class_name}{BackgroundColors.GREEN} in the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 	
 	refactoring_file_path = f"{FULL_REFACTORINGS_DIRECTORY_PATH}/{repository_name}/{commit_number}-{commit_hash}{REFACTORING_MINER_JSON_FILE_EXTENSION}" # Define the refactoring file path
 
@@ -1014,9 +1655,9 @@ def get_refactoring_info(repository_name, commit_number, commit_hash, class_name
 				if commit["sha1"] == commit_hash: # Verify if the commit hash matches the specified one
 					process_refactorings(commit, class_name, refactorings_by_filepath) # Process the refactorings for the commit
 	except json.JSONDecodeError: # Catch the JSONDecodeError exception
-		verbose_output(true_string=f"{BackgroundColors.RED}Error: The refactoring file contains invalid JSON.{Style.RESET_ALL}")
+		verbose_output(true_string=lambda: f"{BackgroundColors.RED}Error: The refactoring file contains invalid JSON.{Style.RESET_ALL}")
 	except Exception as e: # Catch any other exceptions
-		verbose_output(true_string=f"{BackgroundColors.RED}Error: An unexpected error occurred: {str(e)}{Style.RESET_ALL}")
+		verbose_output(true_string=lambda: f"{BackgroundColors.RED}Error: An unexpected error occurred: {str(e)}{Style.RESET_ALL}")
 
 	return refactorings_by_filepath # Return the dictionary containing the file paths and their corresponding refactoring types and occurrences
 
@@ -1028,7 +1669,7 @@ def is_desired_refactoring(refactorings_info):
 	:return: True if the refactoring is a desired refactoring, False otherwise
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Verifying if the refactoring is a desired refactoring...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Verifying if the refactoring is a desired refactoring...{Style.RESET_ALL}")
 
 	for types in refactorings_info.values(): # For each refactoring type in the refactorings info
 		if any(refactoring_type in types for refactoring_type in DESIRED_REFACTORINGS): # If any of the desired refactoring types are in the refactoring types
@@ -1044,7 +1685,7 @@ def convert_refactorings_dictionary_to_string(refactorings_info):
 	:return: A formatted string containing the refactorings information
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Formatting the refactorings summary...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Formatting the refactorings summary...{Style.RESET_ALL}")
 
 	# Converts the nested dictionary into a formatted string with the file paths and their corresponding refactoring types and occurrences
 	refactorings_summary = " ".join(
@@ -1065,7 +1706,7 @@ def find_biggest_decrease(metric_values, commit_hashes, repository_name, class_n
 	:return: The biggest change and the corresponding commit data
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Finding the biggest decrease in metrics values for the {BackgroundColors.CYAN}{class_name}{BackgroundColors.GREEN} class...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Finding the biggest decrease in metrics values for the {BackgroundColors.CYAN}{class_name}{BackgroundColors.GREEN} class...{Style.RESET_ALL}")
 
 	biggest_change_data = [0, 0, 0.00, ""] # [From, To, Percentual Variation, Refactorings Detected]
 	commit_data = ["", "", "", "", ""] # [Biggest Change Position (i), From Commit Number, From Commit Hash, To Commit Number, To Commit Hash]
@@ -1139,7 +1780,7 @@ def verify_substantial_metric_decrease(repository_name, class_name, variable_att
 	:return: None
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Verifying if the class or method has had a substantial decrease in the {BackgroundColors.CYAN}{metric_name}{BackgroundColors.GREEN} metric...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Verifying if the class or method has had a substantial decrease in the {BackgroundColors.CYAN}{metric_name}{BackgroundColors.GREEN} metric...{Style.RESET_ALL}")
 
 	if not len(record["metrics"]): # If the metrics values list is empty
 		return # If the metrics values list is empty, return
@@ -1185,7 +1826,7 @@ def convert_metrics_to_array(class_name, variable_attribute, metrics):
 	try: # Try to convert the metrics list to a NumPy array
 		return np.array(metrics, dtype=float) # Convert the metrics list to a NumPy array
 	except Exception: # Catch any exceptions
-		verbose_output(true_string=f"{BackgroundColors.RED}Error converting the {BackgroundColors.CYAN}metrics{BackgroundColors.GREEN} to {BackgroundColors.CYAN}NumPy array{BackgroundColors.GREEN} for {class_name} {variable_attribute}.{Style.RESET_ALL}")
+		verbose_output(true_string=lambda: f"{BackgroundColors.RED}Error converting the {BackgroundColors.CYAN}metrics{BackgroundColors.GREEN} to {BackgroundColors.CYAN}NumPy array{BackgroundColors.GREEN} for {class_name} {variable_attribute}.{Style.RESET_ALL}")
 		return None # Return None if an exception occurs
 
 def validate_metrics_structure(class_name, variable_attribute, metrics_array):
@@ -1199,7 +1840,7 @@ def validate_metrics_structure(class_name, variable_attribute, metrics_array):
 	"""
 
 	if metrics_array.ndim != 2 or metrics_array.shape[1] < len(METRICS_INDEXES): # If the metrics array dimensions are not 2 (commit metrics and metrics) or the number of columns is less than the number of metrics
-		verbose_output(true_string=f"{BackgroundColors.RED}Metrics structure for {class_name} {variable_attribute} is not as expected!{Style.RESET_ALL}")
+		verbose_output(true_string=lambda: f"{BackgroundColors.RED}Metrics structure for {class_name} {variable_attribute} is not as expected!{Style.RESET_ALL}")
 		return False # Return False if the metrics structure is not as expected
 	return True # Return True if the metrics structure is as expected
 
@@ -1282,7 +1923,7 @@ def setup_linear_regression_plots(repository_name, class_name, variable_attribut
 	:return: None
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Performing linear regression on the given metrics and saving the plot to a PNG file for {BackgroundColors.CYAN}{class_name}{BackgroundColors.GREEN} in the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Performing linear regression on the given metrics and saving the plot to a PNG file for {BackgroundColors.CYAN}{class_name}{BackgroundColors.GREEN} in the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 	
 	metrics_array = convert_metrics_to_array(class_name, variable_attribute, record["metrics"]) # Convert the metrics list to a NumPy array
 
@@ -1359,9 +2000,10 @@ def write_method_metrics_statistics(csv_writer, id, key, record, first_commit_ha
 	:return: None
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Calculating statistics for class/method {BackgroundColors.CYAN}{id}{BackgroundColors.GREEN}...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Calculating statistics for class/method {BackgroundColors.CYAN}{id}{BackgroundColors.GREEN}...{Style.RESET_ALL}")
 
-	ck_metrics_stats_tuples = [calculate_metric_statistics([record["metrics"][i][metric_position] for i in range(len(record["metrics"]))]) for metric_position in METRICS_INDEXES.values()] # Calculate statistics for all defined metrics
+	metrics = record["metrics"] # Get the metrics list once, outside of the loops
+	ck_metrics_stats_tuples = [calculate_metric_statistics([metric_values[metric_position] for metric_values in metrics]) for metric_position in METRICS_INDEXES.values()] # Calculate statistics for all defined metrics
 	flat_ck_metrics_stats = [stat for ck_metrics_stat in ck_metrics_stats_tuples for stat in ck_metrics_stat] # Flatten the list of tuples
 
 	churn_stats = calculate_metric_statistics(record["code_churns"]) # Calculate statistics for code churn
@@ -1381,7 +2023,7 @@ def add_metrics_track_record_statistics(repository_name, class_name, variable_at
 	:return: None
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Processing the metrics in the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository to calculate the minimum, maximum, average, and third quartile of each metric and writing it to a csv file...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Processing the metrics in the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository to calculate the minimum, maximum, average, and third quartile of each metric and writing it to a csv file...{Style.RESET_ALL}")
 	
 	with open(filename, "a") as csvfile: # Open the csv file in append mode
 		writer = csv.writer(csvfile) # Create the csv writer
@@ -1399,7 +2041,7 @@ def setup_write_metrics_statistics_to_csv(repository_name, class_name, variable_
 	:return: None
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Setting up the writing of the metrics statistics to a CSV file for {BackgroundColors.CYAN}{class_name}{BackgroundColors.GREEN} in the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Setting up the writing of the metrics statistics to a CSV file for {BackgroundColors.CYAN}{class_name}{BackgroundColors.GREEN} in the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 
 	unsorted_metrics_filename = f"{FULL_METRICS_STATISTICS_DIRECTORY_PATH}/{repository_name}/{UNSORTED_CHANGED_METHODS_CSV_FILENAME}" # The unsorted metrics filename
 
@@ -1417,11 +2059,12 @@ def process_metrics_track_record(repository_name, metrics_track_record):
 	:return: None
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Processing the Metrics Track Record Dictionary for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Processing the Metrics Track Record Dictionary for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 
 	progress_description = generate_progress_bar_description(repository_name, generate_tasks_description(["Sort by Percentual Variation"])) # Generate the progress bar description
 	with tqdm(total=len(metrics_track_record), unit=f" {progress_description}") as progress_bar: # For every identifier in the metrics_track_record, process the metrics
 		for iteration, (identifier, record) in enumerate(metrics_track_record.items(), start=1): # For each identifier and record in the metrics_track_record dictionary
+			record = record.to_dict() if isinstance(record, CompactTrackRecord) else record # Build the lists of the compact track record once, as the writers index them many times
 			metrics = record["metrics"] # Get the metrics list
 			class_name = identifier.split(" ")[0] # Get the identifier which is currently the class name
 			variable_attribute = get_clean_id(identifier.split(" ")[1]) # Get the variable attribute which could be the type of the class or the method name
@@ -1444,16 +2087,16 @@ def sort_csv_by_changes(repository_name, unsorted_csv_file_path):
 	:return: None
 	"""
 	
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Sorting the {BackgroundColors.CYAN}metrics statistics files{BackgroundColors.GREEN} by the {BackgroundColors.CYAN}number of changes{BackgroundColors.GREEN}.{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Sorting the {BackgroundColors.CYAN}metrics statistics files{BackgroundColors.GREEN} by the {BackgroundColors.CYAN}number of changes{BackgroundColors.GREEN}.{Style.RESET_ALL}")
 
 	data = pd.read_csv(unsorted_csv_file_path) # Read the csv file
 	
 	if data.empty: # Verify if the DataFrame is empty after the header
-		verbose_output(true_string=f"{BackgroundColors.RED}The unsorted csv file for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository is empty after the header.{Style.RESET_ALL}")
+		verbose_output(true_string=lambda: f"{BackgroundColors.RED}The unsorted csv file for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository is empty after the header.{Style.RESET_ALL}")
 		return # Return if the file is empty after the header
 	
 	if "Changed" not in data.columns: # Verify if the "Changed" column exists
-		verbose_output(true_string=f"{BackgroundColors.RED}The \"Changed\" column is missing in the csv file for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository.{Style.RESET_ALL}")
+		verbose_output(true_string=lambda: f"{BackgroundColors.RED}The \"Changed\" column is missing in the csv file for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository.{Style.RESET_ALL}")
 		return # Return if the "Changed" column is missing
 
 	data = data.sort_values(by=["Changed"], ascending=False) # Sort the csv file by the number of changes
@@ -1470,7 +2113,7 @@ def read_csv(filepath):
 	:return: A tuple containing the header and rows
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Reading the {BackgroundColors.CYAN}{filepath}{BackgroundColors.GREEN} CSV file...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Reading the {BackgroundColors.CYAN}{filepath}{BackgroundColors.GREEN} CSV file...{Style.RESET_ALL}")
 
 	with open(filepath, "r", newline="", encoding="utf-8") as csvfile: # Open the csv file
 		reader = csv.reader(csvfile) # Create the CSV reader
@@ -1489,7 +2132,7 @@ def write_csv(filepath, header, rows):
 	:return: None
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Writing data to the {BackgroundColors.CYAN}{filepath}{BackgroundColors.GREEN} CSV file...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Writing data to the {BackgroundColors.CYAN}{filepath}{BackgroundColors.GREEN} CSV file...{Style.RESET_ALL}")
 
 	with open(filepath, "w", newline="", encoding="utf-8") as csvfile:
 		writer = csv.writer(csvfile) # Create the CSV writer
@@ -1507,7 +2150,7 @@ def handle_missing_column(header, rows, filepath, metric_name):
 	:return: Updated header and rows, with missing 'Percentual Variation' column handled
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Handling missing column in the {BackgroundColors.CYAN}{filepath}{BackgroundColors.GREEN} CSV file...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Handling missing column in the {BackgroundColors.CYAN}{filepath}{BackgroundColors.GREEN} CSV file...{Style.RESET_ALL}")
 
 	variation_column = f"Percentual Variation {metric_name}" # Column name for percentual variation
 
@@ -1528,7 +2171,7 @@ def sort_rows_by_variation(rows, header, metric_name):
 	:return: List of rows sorted by percentual variation
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Sorting rows by the {BackgroundColors.CYAN}percentual variation{BackgroundColors.GREEN} of the {BackgroundColors.CYAN}{metric_name}{BackgroundColors.GREEN} metric...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Sorting rows by the {BackgroundColors.CYAN}percentual variation{BackgroundColors.GREEN} of the {BackgroundColors.CYAN}{metric_name}{BackgroundColors.GREEN} metric...{Style.RESET_ALL}")
 
 	variation_column = f"Percentual Variation {metric_name}" # Column name for percentual variation
 	index = header.index(variation_column) # Get the index of the percentual variation column
@@ -1543,7 +2186,7 @@ def sort_csv_by_percentual_variation(repository_name):
 	:return: None
 	"""
 	
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Sorting the {BackgroundColors.CYAN}interesting changes files{BackgroundColors.GREEN} by the {BackgroundColors.CYAN}percentual variation of the metric{BackgroundColors.GREEN}.{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Sorting the {BackgroundColors.CYAN}interesting changes files{BackgroundColors.GREEN} by the {BackgroundColors.CYAN}percentual variation of the metric{BackgroundColors.GREEN}.{Style.RESET_ALL}")
 	
 	for metric_name in METRICS_INDEXES.keys(): # Iterate over each metric in METRICS_INDEXES
 		filepath = f"{FULL_METRICS_STATISTICS_DIRECTORY_PATH}/{repository_name}/{SUBSTANTIAL_CHANGES_FILENAME.replace('METRIC_NAME', metric_name)}" # Generate the file path for the metric
@@ -1575,7 +2218,7 @@ def process_rows(reader, percentual_var_index):
 	:return: Set of unique rows with the modified structure.
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Processing rows and removing duplicates in the CSV file...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Processing rows and removing duplicates in the CSV file...{Style.RESET_ALL}")
 
 	rows, seen_rows = set(), set() # Initialize sets for rows and seen rows
 	
@@ -1598,7 +2241,7 @@ def process_metric_file(csv_filename, metric_name, csv_header):
 	:return: Tuple of (header, unique rows for this metric).
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Processing the {BackgroundColors.CYAN}{metric_name}{BackgroundColors.GREEN} metric file...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Processing the {BackgroundColors.CYAN}{metric_name}{BackgroundColors.GREEN} metric file...{Style.RESET_ALL}")
 
 	with open(csv_filename, "r") as csvfile: # Open the csv file
 		reader = csv.reader(csvfile) # Create the csv reader
@@ -1625,7 +2268,7 @@ def filter_rows_by_threshold(rows, metric_name, filtered_rows, header, percentua
 	:param percentual_var_index: Index of the Percentual Variation column.
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Filtering rows based on metric thresholds...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Filtering rows based on metric thresholds...{Style.RESET_ALL}")
 	
 	for row in rows: # For each row in the rows set
 		meets_threshold = all( # Verify if all values meet the thresholds
@@ -1645,7 +2288,7 @@ def write_csv_file(filename, header, rows):
 	:param rows: Rows to write in the CSV file.
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Writing the filtered rows to the {BackgroundColors.CYAN}{filename}{BackgroundColors.GREEN} CSV file...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Writing the filtered rows to the {BackgroundColors.CYAN}{filename}{BackgroundColors.GREEN} CSV file...{Style.RESET_ALL}")
 
 	write_substantial_decrease_csv_header(filename, header) # Write the header to the CSV file
 
@@ -1661,7 +2304,7 @@ def generate_worked_examples_candidates(repository_name):
 	:return: None
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Generating worked examples candidates for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Generating worked examples candidates for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 
 	filtered_rows, csv_header = set(), [] # Initialize sets for all rows, filtered rows, and an empty list for the csv header
 	
@@ -1670,7 +2313,7 @@ def generate_worked_examples_candidates(repository_name):
 		csv_filename = os.path.join(FULL_METRICS_STATISTICS_DIRECTORY_PATH, repository_name, f"{SUBSTANTIAL_CHANGES_FILENAME.replace('METRIC_NAME', metric_name)}") # The csv filename for the metric
 		
 		if not verify_filepath_exists(csv_filename): # Verify if the file path exists
-			verbose_output(true_string=f"{BackgroundColors.RED}The {BackgroundColors.CYAN}{csv_filename}{BackgroundColors.RED} file does not exist.{Style.RESET_ALL}")
+			verbose_output(true_string=lambda: f"{BackgroundColors.RED}The {BackgroundColors.CYAN}{csv_filename}{BackgroundColors.RED} file does not exist.{Style.RESET_ALL}")
 			continue # Continue if the file does not exist
 		
 		header, rows = process_metric_file(csv_filename, metric_name, csv_header) # Process the metric file and get the header and rows
@@ -1687,7 +2330,7 @@ def delete_directory(full_path, relative_path):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Attempting to delete the directory: {BackgroundColors.CYAN}{relative_path}{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Attempting to delete the directory: {BackgroundColors.CYAN}{relative_path}{Style.RESET_ALL}")
 
    if os.path.isdir(full_path): # Verify if the directory exists
       try: # Try to delete the directory and its contents
@@ -1697,7 +2340,7 @@ def delete_directory(full_path, relative_path):
             for dir in dirs: # Iterate over the directories
                os.rmdir(os.path.join(root, dir)) # Remove each subdirectory
          os.rmdir(full_path) # Remove the main directory
-         verbose_output(true_string=f"{BackgroundColors.GREEN}Successfully deleted the directory: {BackgroundColors.CYAN}{relative_path}{Style.RESET_ALL}") # Print success message
+         verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Successfully deleted the directory: {BackgroundColors.CYAN}{relative_path}{Style.RESET_ALL}") # Print success message
       except Exception as e: # Handle the exception if the directory deletion fails
          verbose_output(false_string=f"{BackgroundColors.RED}Failed to delete directory: {BackgroundColors.CYAN}{relative_path}. Error: {str(e)}{Style.RESET_ALL}") # Print error message
    else: # If the directory does not exist
@@ -1711,7 +2354,7 @@ def delete_repository_source_data(repository_name):
 	:return: None
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Deleting the source data for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Deleting the source data for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 	
 	directories_to_delete = [ # List of the output directories
 		# (f"{FULL_CANDIDATES_DIRECTORY_PATH}/{repository_name}", f"{RELATIVE_CANDIDATES_DIRECTORY_PATH}/{repository_name}"),  
@@ -1747,6 +2390,9 @@ def delete_repository_source_data(repository_name):
 
 	for full_path, relative_path in directories_to_delete: # Delete each directory in the directories_to_delete list
 		delete_directory(full_path, relative_path) # Delete the directory
+		remove_output_directory_from_manifest(repository_name, full_path) # Remove the deleted files from the output manifest of the code_metrics.py script, if the repository has one
+
+	close_output_manifest(repository_name) # Close the output manifest, if it was opened
 
 def read_csv_as_dict(file_path):
 	"""
@@ -1805,7 +2451,7 @@ def update_json_repository_status(repository_name, file_path):
 	:return: True if the update was successful, False otherwise.
 	"""
 
-	verbose_output(true_string=f"{BackgroundColors.GREEN}Updating the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository status in the {BackgroundColors.CYAN}{file_path}{BackgroundColors.GREEN} JSON file...{Style.RESET_ALL}")
+	verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Updating the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository status in the {BackgroundColors.CYAN}{file_path}{BackgroundColors.GREEN} JSON file...{Style.RESET_ALL}")
 
 	try: # Try to update the repository status
 		with open(file_path, "r", encoding="utf-8") as json_file: # Open the JSON file
@@ -1848,33 +2494,23 @@ def update_repository_attributes(repository_name, elapsed_time):
 
 	return repositories_attributes # Return the updated repositories attributes
 
-def process_repository(repository_name, repository_url):
+def generate_metrics_track_record_outputs(repository_name, metrics_track_record):
 	"""
-	Processes the specified repository.
+	Generates the outputs of the metrics track record of the classes or methods of the repository.
 
 	:param repository_name: The name of the repository to be analyzed
-	:param repository_url: The URL of the repository to be analyzed
+	:param metrics_track_record: A dictionary containing the track record of the metrics of each class or method
 	:return: None
 	"""
 
-	start_time = time.time() # Start the timer
-
-	number_of_commits = sum(1 for _ in Repository(repository_url).traverse_commits()) # Get the number of commits for the specified repository
-	setup_process_repository(repository_name, repository_url, number_of_commits) # Setup to process the repository to caculate missing data (CK Metris)
-	
-	repository_ck_metrics_path = get_directory_path(repository_name) # Get the directory path for the specified repository name
-	
-	create_directories(repository_name) # Create the desired directory if it does not exist
-
-	metrics_track_record = traverse_directory(repository_name, repository_url, repository_ck_metrics_path) # Traverse the directory and get the classes/methods metrics
-
 	sorted_metrics_track_record = sort_commit_hashes_by_commit_number(metrics_track_record) # Sort the commit_hashes list for each entry in the metrics_track_record dictionary by the commit number
 
 	process_metrics_track_record(repository_name, sorted_metrics_track_record) # Process the metrics track record to generate outputs such as linear regression graphics, metrics evolution data, and verification of substantial metric decreases
+	metrics_track_record.close() if isinstance(metrics_track_record, SpillableTrackRecords) else None # Remove the spilled histories, as the outputs were generated
 
 	unsorted_csv_file_path = f"{FULL_METRICS_STATISTICS_DIRECTORY_PATH}/{repository_name}/{UNSORTED_CHANGED_METHODS_CSV_FILENAME}" # The unsorted csv file path
 	if not verify_filepath_exists(unsorted_csv_file_path): # Verify if the unsorted csv file exists
-		verbose_output(true_string=f"{BackgroundColors.RED}The unsorted csv file for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository does not exist.{Style.RESET_ALL}")
+		verbose_output(true_string=lambda: f"{BackgroundColors.RED}The unsorted csv file for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository does not exist.{Style.RESET_ALL}")
 	else: # If the unsorted csv file exists
 		sort_csv_by_changes(repository_name, unsorted_csv_file_path) # Sort the csv file by the number of changes
 		os.remove(unsorted_csv_file_path) # Remove the old csv file
@@ -1882,6 +2518,36 @@ def process_repository(repository_name, repository_url):
 
 	generate_worked_examples_candidates(repository_name) if RUN_FUNCTIONS["Worked Examples Candidates"] else None # Generate worked examples candidates
 
+def process_repository(repository_name, repository_url, processing_globals=None):
+	"""
+	Processes the specified repository.
+
+	:param repository_name: The name of the repository to be analyzed
+	:param repository_url: The URL of the repository to be analyzed
+	:param processing_globals: The global variables of the classes and methods, to process both in a single pass, or None to process only the current PROCESS_CLASSES
+	:return: None
+	"""
+
+	start_time = time.time() # Start the timer
+
+	number_of_commits = get_repository_commits_count(repository_name, repository_url) # Get the number of commits for the specified repository from its local clone
+	setup_process_repository(repository_name, repository_url, number_of_commits) # Setup to process the repository to caculate missing data (CK Metris)
+	DIFF_PACK_REPOSITORIES.pop(repository_name, None) # Verify the diff pack again, as the setup may have generated the diffs
+	
+	repository_ck_metrics_path = get_directory_path(repository_name) # Get the directory path for the specified repository name
+
+	if processing_globals is None: # If only the classes or the methods are processed
+		create_directories(repository_name) # Create the desired directory if it does not exist
+		metrics_track_record = traverse_directory(repository_name, repository_url, repository_ck_metrics_path) # Traverse the directory and get the classes/methods metrics
+		generate_metrics_track_record_outputs(repository_name, metrics_track_record) # Generate the outputs of the classes/methods metrics
+	else: # If the classes and methods are processed in a single pass
+		metrics_track_records = traverse_classes_and_methods(repository_name, repository_url, repository_ck_metrics_path, processing_globals) # Traverse the CK metrics once and get the classes and methods metrics
+		for process_classes, metrics_track_record in metrics_track_records.items(): # For the classes and the methods
+			globals().update(processing_globals[process_classes]) # Switch to the global variables of the classes or methods
+			create_directories(repository_name) # Create the desired directory if it does not exist
+			generate_metrics_track_record_outputs(repository_name, metrics_track_record) # Generate the outputs of the classes or methods metrics
+			metrics_track_records[process_classes] = None # Release the metrics track record, as its outputs were generated
+
 	delete_repository_source_data(repository_name) if RUN_FUNCTIONS["Delete Source Data"] else None # Delete the repository source data if the flag is set to True
 
 	if CODE_METRICS_RUN_FUNCTIONS["Repositories Attributes"]: # If the flag is set to True
@@ -1889,23 +2555,25 @@ def process_repository(repository_name, repository_url):
 		write_dict_to_csv(FULL_REPOSITORIES_ATTRIBUTES_FILE_PATH, repositories_attributes) # Write the updated data back to the CSV file
 
 	update_json_repository_status(repository_name, FULL_REPOSITORIES_LIST_JSON_FILEPATH.replace("SORTING_ATTRIBUTE", REPOSITORIES_SORTING_ATTRIBUTES[0])) # Update the JSON repository status
+	TRACK_RECORD_COMMITS.pop(repository_url, None) # Release the commit table of the repository, as its track records were processed
 
 	elapsed_time = time.time() - start_time # Calculate the elapsed time
-	elapsed_time_string = f"Time taken to generate the {BackgroundColors.CYAN}metrics evolution records, metrics statistics and linear regression{BackgroundColors.GREEN} for the {BackgroundColors.CYAN}{CLASSES_OR_METHODS.capitalize()}{BackgroundColors.GREEN} in {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN}: "
+	elapsed_time_string = f"Time taken to generate the {BackgroundColors.CYAN}metrics evolution records, metrics statistics and linear regression{BackgroundColors.GREEN} for the {BackgroundColors.CYAN}{'Classes and Methods' if processing_globals is not None else CLASSES_OR_METHODS.capitalize()}{BackgroundColors.GREEN} in {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN}: "
 	output_time(elapsed_time_string, round(elapsed_time, 2)) # Output the elapsed time
 
-def process_all_repositories():
+def process_all_repositories(processing_globals=None):
 	"""
 	Processes all the repositories in the DEFAULT_REPOSITORIES dictionary.
 
+	:param processing_globals: The global variables of the classes and methods, to process both in a single pass, or None to process only the current PROCESS_CLASSES
 	:return: None
 	"""
 
 	total = len(DEFAULT_REPOSITORIES) # Get the total number of repositories
 	for index, (repository_name, repository_url) in enumerate(DEFAULT_REPOSITORIES.items(), start=1): # Loop through the DEFAULT_REPOSITORIES dictionary
 		print(f"") # Print an empty line
-		print(f"\n{BackgroundColors.GREEN}Processing the {BackgroundColors.CYAN}{', '.join([process.title() for process in sorted(generate_tasks_description())[:-1]]) + (' and ' + sorted(generate_tasks_description())[-1].title() if len(sorted(generate_tasks_description())) > 1 else '')}{BackgroundColors.GREEN} for the {BackgroundColors.CYAN}{CLASSES_OR_METHODS.capitalize()}{BackgroundColors.GREEN} from the {BackgroundColors.CYAN}{index}°/{total} {repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
-		process_repository(repository_name, repository_url) # Process the current repository
+		print(f"\n{BackgroundColors.GREEN}Processing the {BackgroundColors.CYAN}{', '.join([process.title() for process in sorted(generate_tasks_description())[:-1]]) + (' and ' + sorted(generate_tasks_description())[-1].title() if len(sorted(generate_tasks_description())) > 1 else '')}{BackgroundColors.GREEN} for the {BackgroundColors.CYAN}{'Classes and Methods' if processing_globals is not None else CLASSES_OR_METHODS.capitalize()}{BackgroundColors.GREEN} from the {BackgroundColors.CYAN}{index}°/{total} {repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+		process_repository(repository_name, repository_url, processing_globals) # Process the current repository
 		print(f"\n------------------------------------------------------------") # Print a separator
 
 atexit.register(play_sound) # Register the function to play a sound when the program finishes
@@ -18,9 +18,11 @@ from datetime import datetime, timedelta # For date manipulation
 from dotenv import load_dotenv # For loading environment variables from .env file
 from fpdf import FPDF # For creating PDFs
 from glob import glob # For finding files matching a specified pattern
+from log_messages import create_verbose_output # For the verbose_output function of this script
 
 # Default values that can be changed:
 VERBOSE = False # Verbose mode. If set to True, it will output messages at the start/call of each function
+LOG_FORMAT = "text" # The format of the messages of the verbose_output function. If set to "json", each message is a JSON line with its timestamp, module and level, so the logs can be parsed for timing
 DATETIME_FILTER = None # The datetime filter for the repositories
 HISTOGRAM_REPOSITORY_FIELDS = ["avg_code_churn", "avg_modified_files", "commits", "stars"] # The repository fields to create histograms
 CANDIDATES = 3 # The number of repositories to select
@@ -30,6 +32,9 @@ MINIMUM_STARS = 50 # The minimum number of stars a repository must have
 MAXIMUM_AVG_CODE_CHURN = None # The maximum average code churn allowed
 MAXIMUM_AVG_FILES_MODIFIED = None # The maximum average files modified allowed
 REPOSITORIES_SORTING_ATTRIBUTES = ["commits", "stars"] # The attribute to sort the repositories by
+SPARSE_CLONES = False # Sparse clones. If set to True, the repositories are cloned without blobs ("--filter=blob:none") and only their Java files are checked out, which are the only files analyzed by CK. The stages that need the whole tree, such as RefactoringMiner, convert the clone to a full one with the ensure_full_checkout function.
+SHARED_OBJECT_STORE = False # Shared object store. If set to True, the objects of every repository are fetched into a single bare repository, so forks and mirrors of the same project only download and store the objects they don't share, and the local clones borrow them with "git clone --reference" (git alternates).
+SPARSE_CHECKOUT_MODULE_PATHS = [] # The module paths whose Java files are checked out in the sparse clones, such as ["core/src/main/java"]. If empty, the Java files of every path are checked out.
 
 RUN_FUNCTIONS = { # Dictionary with the functions to run and their respective booleans
    "CSV Files": True, # Create CSV files for the repositories
@@ -56,12 +61,17 @@ JSON_FILE_EXTENSION = ".json" # The JSON file extension
 
 # Global Set for the Processed Repositories:
 PROCESSED_REPOSITORIES = set() # The set of processed repositories
+SYNCED_REPOSITORIES = set() # The set of repositories whose local clone was already cloned or updated in this execution
+FULL_OBJECTS_REPOSITORIES = set() # The set of repositories whose local clone has every object (blob) in this execution
+FULL_CHECKOUT_REPOSITORIES = set() # The set of repositories whose local clone has a full checkout in this execution
+SHARED_REPOSITORIES = set() # The set of repositories whose objects were already fetched into the shared object store in this execution
 
 # Time units:
 TIME_UNITS = [60, 3600, 86400] # Seconds in a minute, seconds in an hour, seconds in a day
 
 # Relative File Path Constants:
 RELATIVE_REPOSITORIES_DIRECTORY_PATH = "/repositories" # The relative path of the directory that contains the repositories
+RELATIVE_SHARED_OBJECT_STORE_PATH = "/shared_objects.git" # The relative path of the bare repository that stores the objects shared by the repositories
 RELATIVE_REPOSITORIES_HISTOGRAM_PNG_FILEPATH = f"{RELATIVE_REPOSITORIES_DIRECTORY_PATH}/repositories_histogram_DATA_TYPE{PNG_FILE_EXTENSION}" # The relative path of the directory that contains the histograms
 RELATIVE_REPOSITORIES_LIST_PDF_FILEPATH = f"{RELATIVE_REPOSITORIES_DIRECTORY_PATH}/repositories_sorted_by_SORTING_ATTRIBUTE{PDF_FILE_EXTENSION}" # The relative path to the repositories PDF file
 RELATIVE_REPOSITORIES_LIST_JSON_FILEPATH = f"{RELATIVE_REPOSITORIES_DIRECTORY_PATH}/repositories_sorted_by_SORTING_ATTRIBUTE{JSON_FILE_EXTENSION}" # The relative path to the repositories JSON file
@@ -70,6 +80,7 @@ RELATIVE_REPOSITORIES_PNG_SCATTER_FILEPATH = f"{RELATIVE_REPOSITORIES_DIRECTORY_
 
 # Full File Path Constants:
 FULL_REPOSITORIES_DIRECTORY_PATH = f"{START_PATH}{RELATIVE_REPOSITORIES_DIRECTORY_PATH}" # The full path of the directory that contains the repositories
+FULL_SHARED_OBJECT_STORE_PATH = f"{START_PATH}{RELATIVE_SHARED_OBJECT_STORE_PATH}" # The full path of the bare repository that stores the objects shared by the repositories
 FULL_REPOSITORIES_HISTOGRAM_PNG_FILEPATH = f"{START_PATH}{RELATIVE_REPOSITORIES_HISTOGRAM_PNG_FILEPATH}" # The full path of the directory that contains the histograms
 FULL_REPOSITORIES_LIST_PDF_FILEPATH = f"{START_PATH}{RELATIVE_REPOSITORIES_LIST_PDF_FILEPATH}" # The full path to the repositories PDF file
 FULL_REPOSITORIES_LIST_JSON_FILEPATH = f"{START_PATH}{RELATIVE_REPOSITORIES_LIST_JSON_FILEPATH}" # The full path to the repositories JSON file
@@ -115,19 +126,7 @@ def play_sound():
    else: # If the sound file does not exist
       print(f"{BackgroundColors.RED}Sound file {BackgroundColors.CYAN}{SOUND_FILE_PATH}{BackgroundColors.RED} not found. Make sure the file exists.{Style.RESET_ALL}")
 
-def verbose_output(true_string="", false_string=""):
-   """
-   Outputs a message if the VERBOSE constant is set to True.
-
-   :param true_string: The string to be outputted if the VERBOSE constant is set to True.
-   :param false_string: The string to be outputted if the VERBOSE constant is set to False.
-   :return: None
-   """
-
-   if VERBOSE and true_string != "": # If the VERBOSE constant is set to True and the true_string is set
-      print(true_string) # Output the true statement string
-   elif false_string != "":
-      print(false_string) # Output the false statement string
+verbose_output = create_verbose_output(globals()) # The verbose_output function of this script, bound to its VERBOSE and LOG_FORMAT constants
 
 def path_contains_whitespaces():
    """
@@ -136,7 +135,7 @@ def path_contains_whitespaces():
    :return: True if the PATH constant contains whitespaces, False otherwise.
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Verifying if the {BackgroundColors.CYAN}PATH{BackgroundColors.GREEN} constant contains whitespaces...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Verifying if the {BackgroundColors.CYAN}PATH{BackgroundColors.GREEN} constant contains whitespaces...{Style.RESET_ALL}")
    
    if " " in START_PATH: # Verify if the PATH constant contains whitespaces
       print(f"{BackgroundColors.RED}The {BackgroundColors.GREEN}{START_PATH}{BackgroundColors.RED} constant contains whitespaces. Please remove them!{Style.RESET_ALL}")
@@ -163,7 +162,7 @@ def update_sound_file_path():
 
    SOUND_FILE_PATH = f"{prefix}{SOUND_FILE_PATH}" # Update the SOUND_FILE_PATH constant
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Updated the {BackgroundColors.CYAN}SOUND_FILE{BackgroundColors.GREEN} path to {BackgroundColors.CYAN}{SOUND_FILE_PATH}{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Updated the {BackgroundColors.CYAN}SOUND_FILE{BackgroundColors.GREEN} path to {BackgroundColors.CYAN}{SOUND_FILE_PATH}{Style.RESET_ALL}")
 
    return SOUND_FILE_PATH # Return the updated sound file path
 
@@ -174,7 +173,7 @@ def verify_git():
    :return: True if Git is installed, False otherwise.
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Verifying if Git is installed...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Verifying if Git is installed...{Style.RESET_ALL}")
 
    try: # Try to run the git --version command
       subprocess.run(["git", "--version"], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) # Run the git --version command
@@ -215,7 +214,7 @@ def init_submodule(repo_path):
 
    try: # Try to run the git submodule update --init --recursive command
       subprocess.run(["git", "-C", repo_path, "submodule", "update", "--init", "--recursive"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True) # Run the git submodule update --init --recursive command
-      verbose_output(true_string=f"{BackgroundColors.GREEN}Submodule initialized successfully.{Style.RESET_ALL}")
+      verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Submodule initialized successfully.{Style.RESET_ALL}")
       return True # Return True if the submodule was initialized successfully
    except subprocess.CalledProcessError as e: # Handle the exception if the command fails
       print(f"{BackgroundColors.RED}Error while initializing the submodule: {e}{Style.RESET_ALL}")
@@ -231,7 +230,7 @@ def update_submodule(repo_path):
 
    try: # Try to run the git submodule update --recursive command
       subprocess.run(["git", "-C", repo_path, "submodule", "update", "--recursive"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True) # Run the git submodule update --recursive command
-      verbose_output(true_string=f"{BackgroundColors.GREEN}Submodule updated successfully.{Style.RESET_ALL}")
+      verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Submodule updated successfully.{Style.RESET_ALL}")
       return True # Return True if the submodule was updated successfully
    except subprocess.CalledProcessError as e: # Handle the exception if the command fails
       print(f"{BackgroundColors.RED}Error while updating the submodule: {e}{Style.RESET_ALL}")
@@ -246,10 +245,10 @@ def setup_submodule(repo_path):
    """
 
    if not verify_filepath_exists(repo_path) or is_directory_empty(repo_path): # Verify if the repository path exists or is empty
-      verbose_output(true_string=f"{BackgroundColors.GREEN}The repository path does not exist. Cloning the submodule repository...{Style.RESET_ALL}")
+      verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}The repository path does not exist. Cloning the submodule repository...{Style.RESET_ALL}")
       return init_submodule(repo_path) # Initialize the submodule
    else: # The repository path exists, update the submodule
-      verbose_output(true_string=f"{BackgroundColors.GREEN}The repository path exists. Updating the submodule repository...{Style.RESET_ALL}")
+      verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}The repository path exists. Updating the submodule repository...{Style.RESET_ALL}")
       return update_submodule(repo_path) # Update the submodule
 
 def get_env_token(env_path=ENV_PATH, key=ENV_VARIABLE):
@@ -261,7 +260,7 @@ def get_env_token(env_path=ENV_PATH, key=ENV_VARIABLE):
    :return: The value of the key if it exists.
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Verifying the .env file...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Verifying the .env file...{Style.RESET_ALL}")
 
    # Verify if the .env file exists
    if not verify_filepath_exists(env_path):
@@ -317,7 +316,7 @@ def fetch_single_page(url, headers, page):
    if response.status_code == 200:
       return response.json() # Get the JSON data from the response
    else:
-      verbose_output(true_string=f"{BackgroundColors.RED}Failed to fetch page {page}: {response.status_code}{Style.RESET_ALL}")
+      verbose_output(true_string=lambda: f"{BackgroundColors.RED}Failed to fetch page {page}: {response.status_code}{Style.RESET_ALL}")
       return None
 
 def fetch_all_pages(url, headers):
@@ -350,7 +349,7 @@ def fetch_repositories(token):
    :return: list
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Fetching the repositories...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Fetching the repositories...{Style.RESET_ALL}")
 
    headers = build_headers(token) # Build the request headers
    query = "topic:distributed-systems language:java" # The query to search for repositories
@@ -397,7 +396,7 @@ def get_adjusted_number_of_threads(cpu_count):
    :return: tuple (int, int)
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Adjusting the number of threads to use...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Adjusting the number of threads to use...{Style.RESET_ALL}")
 
    if cpu_count <= 2: # If there are 2 or fewer CPU cores
       usable_threads = 1 # Use 1 thread
@@ -430,7 +429,7 @@ def get_processed_repositories_names():
    :return: set - Unique names from both candidates and worked examples directories.
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Fetching processed repository names from the Worked-Example-Miner-Candidates Submodule directory...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Fetching processed repository names from the Worked-Example-Miner-Candidates Submodule directory...{Style.RESET_ALL}")
 
    # Get first-level subdirectories inside candidates/*/
    candidates_dirs = glob("../Worked-Example-Miner-Candidates/candidates/*/") # Candidate category directories
@@ -581,7 +580,7 @@ def calculate_average_metrics(repo_path, repo_name, total_commits, lines=None):
       - average files modified per commit (float)
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Calculating average metrics for the {BackgroundColors.CYAN}{repo_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Calculating average metrics for the {BackgroundColors.CYAN}{repo_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 
    lines = run_git_log_numstat(repo_path) if not lines else lines # Get the numstat output if not provided
 
@@ -779,14 +778,13 @@ def update_repository(repository_directory_path):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Updating the {BackgroundColors.CYAN}{repository_directory_path.split('/')[-1]}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Updating the {BackgroundColors.CYAN}{repository_directory_path.split('/')[-1]}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
    
-   os.chdir(repository_directory_path) # Change the current working directory to the repository directory
-   
-   update_thread = subprocess.Popen(["git", "pull", "--force"], stdout=subprocess.PIPE, stderr=subprocess.PIPE) # Create a thread to update the repository
-   update_thread.wait() # Wait for the thread to finish
+   checkout_thread = subprocess.Popen(["git", "checkout", "--force", get_default_branch_name(repository_directory_path)], cwd=repository_directory_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE) # Create a thread to go back to the default branch, as a previous execution may have left a commit checked out
+   checkout_thread.wait() # Wait for the thread to finish
 
-   os.chdir(START_PATH) # Change the current working directory to the default one
+   update_thread = subprocess.Popen(["git", "pull", "--force"], cwd=repository_directory_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE) # Create a thread to update the repository
+   update_thread.wait() # Wait for the thread to finish
 
 def get_default_branch_name(repository_directory_path):
    """
@@ -796,7 +794,12 @@ def get_default_branch_name(repository_directory_path):
    :return: str
    """
 
-   branch_thread = subprocess.Popen(["git", "-C", repository_directory_path, "rev-parse", "--abbrev-ref", "HEAD"], stdout=subprocess.PIPE, stderr=subprocess.PIPE) # Create a thread to get the default branch name
+   branch_thread = subprocess.Popen(["git", "-C", repository_directory_path, "symbolic-ref", "--short", "refs/remotes/origin/HEAD"], stdout=subprocess.PIPE, stderr=subprocess.PIPE) # Create a thread to get the default branch name of the remote
+   branch_name, _ = branch_thread.communicate() # Get the remote default branch name, such as "origin/main"
+   if branch_thread.returncode == 0 and branch_name.strip(): # If the remote default branch is known
+      return branch_name.decode("utf-8").strip().split("/", 1)[-1] # Decode, strip whitespace and remove the remote name
+
+   branch_thread = subprocess.Popen(["git", "-C", repository_directory_path, "rev-parse", "--abbrev-ref", "HEAD"], stdout=subprocess.PIPE, stderr=subprocess.PIPE) # Create a thread to get the current branch name
    branch_name, _ = branch_thread.communicate() # Get the current branch name
    return branch_name.decode("utf-8").strip() # Decode and strip whitespace
 
@@ -808,15 +811,83 @@ def checkout_latest_commit(repository_directory_path):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Checking out the latest commit of the {BackgroundColors.CYAN}{repository_directory_path.split('/')[-1]}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
-
-   os.chdir(repository_directory_path) # Change to the repository directory
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Checking out the latest commit of the {BackgroundColors.CYAN}{repository_directory_path.split('/')[-1]}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
 
    # Pull the latest changes from the default branch and force checkout to HEAD
-   checkout_thread = subprocess.Popen(["git", "pull", "origin", get_default_branch_name(repository_directory_path), "--force"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+   checkout_thread = subprocess.Popen(["git", "pull", "origin", get_default_branch_name(repository_directory_path), "--force"], cwd=repository_directory_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
    checkout_thread.wait() # Wait for the checkout command to finish
 
-   os.chdir(START_PATH) # Change back to the original directory
+def get_sparse_checkout_patterns():
+   """
+   Gets the sparse-checkout patterns of the sparse clones, in the non-cone (gitignore) format.
+
+   :return: The list of the sparse-checkout patterns.
+   """
+
+   return [f"/{module_path.strip('/')}/**/*.java" for module_path in SPARSE_CHECKOUT_MODULE_PATHS] if SPARSE_CHECKOUT_MODULE_PATHS else ["*.java"] # Return the Java files of the module paths, or of every path
+
+def apply_sparse_checkout(repository_directory_path):
+   """
+   Applies the sparse-checkout patterns to a repository (or worktree), so only its Java files are checked out.
+
+   :param repository_directory_path: The path to the repository (or worktree) directory
+   :return: True if the sparse-checkout patterns were applied, False otherwise
+   """
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Applying the sparse-checkout patterns to the {BackgroundColors.CYAN}{repository_directory_path.split('/')[-1]}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+
+   result = subprocess.run(["git", "-C", repository_directory_path, "sparse-checkout", "set", "--no-cone", *get_sparse_checkout_patterns()], capture_output=True, text=True) # Set the sparse-checkout patterns
+   if result.returncode != 0: # If the sparse-checkout patterns could not be applied
+      print(f"{BackgroundColors.RED}Error applying the sparse-checkout patterns to {BackgroundColors.CYAN}{repository_directory_path}{BackgroundColors.RED}: {BackgroundColors.GREEN}{result.stderr.strip()}{Style.RESET_ALL}")
+
+   return result.returncode == 0 # Return True if the sparse-checkout patterns were applied
+
+def setup_shared_object_store():
+   """
+   Creates the bare repository of the shared object store, if it doesn't exist. Its automatic garbage collection is disabled, as the local clones borrow its objects.
+
+   :return: True if the shared object store exists, False otherwise
+   """
+
+   if os.path.isdir(FULL_SHARED_OBJECT_STORE_PATH): # If the shared object store already exists
+      return True # Return True as there is nothing to create
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Creating the shared object store in {BackgroundColors.CYAN}{FULL_SHARED_OBJECT_STORE_PATH}{BackgroundColors.GREEN}...{Style.RESET_ALL}")
+
+   result = subprocess.run(["git", "init", "--bare", FULL_SHARED_OBJECT_STORE_PATH], capture_output=True, text=True) # Create the bare repository
+   if result.returncode != 0: # If the bare repository could not be created
+      print(f"{BackgroundColors.RED}Error creating the shared object store: {BackgroundColors.GREEN}{result.stderr.strip()}{Style.RESET_ALL}")
+      return False # Return False as the shared object store doesn't exist
+
+   subprocess.run(["git", "-C", FULL_SHARED_OBJECT_STORE_PATH, "config", "gc.auto", "0"], capture_output=True) # Never repack or prune automatically, as the local clones depend on its objects
+   subprocess.run(["git", "-C", FULL_SHARED_OBJECT_STORE_PATH, "config", "gc.pruneExpire", "never"], capture_output=True) # Never prune the unreachable objects, even in a manual "git gc"
+   return True # Return True as the shared object store was created
+
+def fetch_into_shared_object_store(repository_url):
+   """
+   Fetches the branches and tags of the repository into the shared object store, under the "refs/shared/OWNER/NAME" namespace, so the objects stay reachable. Git only downloads the objects the store doesn't have yet, such as the commits of a fork that are not in its upstream repository.
+
+   :param repository_url: URL of the repository
+   :return: True if the objects were fetched, False otherwise
+   """
+
+   if repository_url in SHARED_REPOSITORIES: # If the objects were already fetched in this execution
+      return True # Return True as the shared object store is up to date
+   if not setup_shared_object_store(): # If the shared object store could not be created
+      return False # Return False as there is no shared object store
+
+   owner, name = get_repo_owner_and_name(repository_url.rstrip("/").removesuffix(".git")) # The owner and name of the repository, which are its namespace in the shared object store
+   namespace = f"refs/shared/{owner}/{name}" # The namespace of the repository references
+   start_time = time.time() # The start time of the fetch
+
+   result = subprocess.run(["git", "-C", FULL_SHARED_OBJECT_STORE_PATH, "fetch", "--no-tags", "--prune", repository_url, f"+refs/heads/*:{namespace}/heads/*", f"+refs/tags/*:{namespace}/tags/*"], capture_output=True, text=True) # Fetch only the objects that are not in the shared object store
+   if result.returncode != 0: # If the objects could not be fetched
+      print(f"{BackgroundColors.YELLOW}The objects of {BackgroundColors.CYAN}{repository_url}{BackgroundColors.YELLOW} could not be fetched into the shared object store, so it is cloned without it: {BackgroundColors.GREEN}{result.stderr.strip()}{Style.RESET_ALL}")
+      return False # Return False as the objects were not fetched
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Fetched the objects of {BackgroundColors.CYAN}{repository_url}{BackgroundColors.GREEN} into the shared object store in {BackgroundColors.CYAN}{time.time() - start_time:.2f}{BackgroundColors.GREEN} seconds.{Style.RESET_ALL}")
+   SHARED_REPOSITORIES.add(repository_url) # Add the repository to the set of repositories in the shared object store
+   return True # Return True as the objects were fetched
 
 def clone_repository(repository_directory_path, repository_url):
    """
@@ -827,35 +898,49 @@ def clone_repository(repository_directory_path, repository_url):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Cloning the {BackgroundColors.CYAN}{repository_directory_path.split('/')[-1]}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Cloning the {BackgroundColors.CYAN}{repository_directory_path.split('/')[-1]}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
    
    try: # Try to clone the repository
-      thread = subprocess.Popen(["git", "clone", repository_url, repository_directory_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE) # Create a thread to clone the repository
+      shared = SHARED_OBJECT_STORE and fetch_into_shared_object_store(repository_url) # Fetch the objects into the shared object store, so the clone borrows them
+      clone_options = ["--reference", FULL_SHARED_OBJECT_STORE_PATH] if shared else [] # Borrow the objects of the shared object store, which already has every blob, instead of copying them
+      clone_options += ["--filter=blob:none"] if SPARSE_CLONES and not shared else [] # Clone without blobs
+      clone_options += ["--no-checkout"] if SPARSE_CLONES else [] # Check out only after the sparse-checkout patterns are applied
+      thread = subprocess.Popen(["git", "clone", *clone_options, repository_url, repository_directory_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE) # Create a thread to clone the repository
       stdout, stderr = thread.communicate() # Wait for the thread to finish and capture output
       
       if thread.returncode != 0: # Check for errors during cloning
          print(f"{BackgroundColors.RED}Error cloning repository: {BackgroundColors.GREEN}{stderr.decode().strip()}{Style.RESET_ALL}") # Print error message if cloning fails
+      elif SPARSE_CLONES: # If it is a sparse clone
+         apply_sparse_checkout(repository_directory_path) # Check out only the Java files
+         subprocess.run(["git", "-C", repository_directory_path, "checkout", get_default_branch_name(repository_directory_path)], capture_output=True) # Check out the default branch, fetching only the blobs of its Java files
    except Exception as e:
       print(f"{BackgroundColors.RED}An error occurred while cloning the repository: {BackgroundColors.GREEN}{e}{Style.RESET_ALL}")
 
 def setup_repository(repository_name, repository_url):
    """"
-   Setup the repository by cloning it or updating it if it already exists.
+   Setup the repository by cloning it or updating it if it already exists. The repository is synced at most once per execution.
 
    :param repository_name: Name of the repository to be analyzed
    :param repository_url: URL of the repository to be analyzed
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Setting up the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+   if repository_name in SYNCED_REPOSITORIES: # If the repository was already synced in this execution
+      return # Return as the local clone is up to date
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Setting up the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
    
    repository_directory_path = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the repository directory
    
    if os.path.isdir(repository_directory_path) and os.listdir(repository_directory_path): # Verify if the repository directory already exists and if it is not empty
+      fetch_into_shared_object_store(repository_url) if SHARED_OBJECT_STORE and os.path.isfile(f"{repository_directory_path}/.git/objects/info/alternates") else None # Fetch the new objects into the shared object store first, so the update borrows them
       update_repository(repository_directory_path) # Update the repository
       checkout_latest_commit(repository_directory_path) # Check out to the latest commit
+      apply_sparse_checkout(repository_directory_path) if SPARSE_CLONES else None # Check out only the Java files, even if it was a full clone
    else: # If the repository directory does not exist or is empty
       clone_repository(repository_directory_path, repository_url) # Clone the repository
 
+   SYNCED_REPOSITORIES.add(repository_name) # Add the repository to the set of synced repositories
+
 def count_commits(repo_path):
    """
    Counts the number of commits in a repository using the git command.
@@ -877,6 +962,89 @@ def count_commits(repo_path):
       print(f"Error while counting commits: {e}")
       return 0 # Return 0 or handle the error as needed
 
+def get_local_repository_path(repository_name, repository_url):
+   """
+   Gets the path of the managed local clone of the repository, cloning or updating it if it was not synced in this execution yet. It must be used instead of the repository URL, so PyDriller doesn't clone the repository into a temporary directory.
+
+   :param repository_name: Name of the repository
+   :param repository_url: URL of the repository
+   :return: The path to the local clone of the repository
+   """
+
+   setup_repository(repository_name, repository_url) # Clone or update the repository, if it was not synced yet
+
+   return f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # Return the path to the local clone
+
+def ensure_full_objects(repository_name, repository_url):
+   """
+   Ensures the local clone of the repository has every object, fetching the blobs that a blobless clone doesn't have in a single pack. It is used by the stages that read the content of many commits, such as the diffs, which would otherwise fetch the missing blobs commit by commit.
+
+   :param repository_name: Name of the repository
+   :param repository_url: URL of the repository
+   :return: The path to the local clone of the repository
+   """
+
+   repository_directory_path = get_local_repository_path(repository_name, repository_url) # Clone or update the repository, if it was not synced yet
+   if repository_name in FULL_OBJECTS_REPOSITORIES: # If the clone already has every object
+      return repository_directory_path # Return the path to the local clone
+
+   partial_clone_filter = subprocess.run(["git", "-C", repository_directory_path, "config", "--get", "remote.origin.partialclonefilter"], capture_output=True, text=True).stdout.strip() # The filter of the partial clone, if it is one
+   if partial_clone_filter: # If it is a partial clone
+      print(f"{BackgroundColors.GREEN}Fetching the missing objects of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} partial clone...{Style.RESET_ALL}")
+      subprocess.run(["git", "-C", repository_directory_path, "config", "--unset", "remote.origin.partialclonefilter"], capture_output=True) # Stop filtering the next fetches
+      result = subprocess.run(["git", "-C", repository_directory_path, "fetch", "--refetch", "origin"], capture_output=True, text=True) # Fetch every object again, in a single pack
+      if result.returncode != 0: # If the objects could not be fetched, such as with a git older than 2.36
+         print(f"{BackgroundColors.YELLOW}The missing objects of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.YELLOW} partial clone could not be fetched at once, so they are fetched on demand: {BackgroundColors.GREEN}{result.stderr.strip()}{Style.RESET_ALL}")
+
+   FULL_OBJECTS_REPOSITORIES.add(repository_name) # Add the repository to the set of repositories with every object
+   return repository_directory_path # Return the path to the local clone
+
+def ensure_full_checkout(repository_name, repository_url):
+   """
+   Ensures the local clone of the repository is a full clone with a full checkout, disabling its sparse checkout. It must be used by the stages that need the whole tree, such as RefactoringMiner.
+
+   :param repository_name: Name of the repository
+   :param repository_url: URL of the repository
+   :return: The path to the local clone of the repository
+   """
+
+   repository_directory_path = ensure_full_objects(repository_name, repository_url) # Fetch the missing objects, if it is a partial clone
+   if repository_name in FULL_CHECKOUT_REPOSITORIES: # If the clone already has a full checkout
+      return repository_directory_path # Return the path to the local clone
+
+   subprocess.run(["git", "-C", repository_directory_path, "sparse-checkout", "disable"], capture_output=True) # Check out the whole tree, which does nothing if it is not a sparse checkout
+   FULL_CHECKOUT_REPOSITORIES.add(repository_name) # Add the repository to the set of repositories with a full checkout
+   return repository_directory_path # Return the path to the local clone
+
+def get_repository_commits_count(repository_name, repository_url):
+   """
+   Gets the number of commits of the repository from its managed local clone, using "git rev-list --count".
+
+   :param repository_name: Name of the repository
+   :param repository_url: URL of the repository
+   :return: The number of commits of the repository
+   """
+
+   return count_commits(get_local_repository_path(repository_name, repository_url)) # Count the commits of the local clone
+
+def get_repository_commit_hashes(repository_name, repository_url):
+   """
+   Gets the hashes of the commits of the repository from its managed local clone, in the same order PyDriller traverses them ("git rev-list --reverse HEAD"), so the position of a hash is its commit number minus one.
+
+   :param repository_name: Name of the repository
+   :param repository_url: URL of the repository
+   :return: List of the commit hashes, from the oldest to the newest
+   """
+
+   repository_path = get_local_repository_path(repository_name, repository_url) # The path to the local clone
+
+   try:
+      result = subprocess.run(["git", "-C", repository_path, "rev-list", "--reverse", "HEAD"], capture_output=True, text=True, check=True) # List the commits from the oldest to the newest
+      return result.stdout.split() # Return the commit hashes
+   except subprocess.CalledProcessError as e: # Handle the exception if the command fails
+      print(f"{BackgroundColors.RED}Error while listing the commits of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} repository: {e}{Style.RESET_ALL}")
+      return [] # Return an empty list
+
 def process_repository_task(repo, token, datetime_filter, ignore_keywords):
    """
    Processes and filters a single repository.
@@ -902,11 +1070,11 @@ def filter_repositories(repositories, token, ignore_keywords=EXCLUDE_REPOSITORIE
    :return: list
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Applying repository filtering criteria...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Applying repository filtering criteria...{Style.RESET_ALL}")
 
    usable_threads, max_threads = get_adjusted_number_of_threads(get_threads()) # Get the adjusted number of threads to use
    
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Using {BackgroundColors.CYAN}{usable_threads}{BackgroundColors.GREEN} of {BackgroundColors.CYAN}{max_threads}{BackgroundColors.GREEN} threads available...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Using {BackgroundColors.CYAN}{usable_threads}{BackgroundColors.GREEN} of {BackgroundColors.CYAN}{max_threads}{BackgroundColors.GREEN} threads available...{Style.RESET_ALL}")
 
    datetime_filter = get_datetime_filter() # Get the datetime filter for the repositories
 
@@ -937,7 +1105,7 @@ def create_directory(full_directory_name, relative_directory_name):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Creating the {BackgroundColors.CYAN}{relative_directory_name}{BackgroundColors.GREEN} directory...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Creating the {BackgroundColors.CYAN}{relative_directory_name}{BackgroundColors.GREEN} directory...{Style.RESET_ALL}")
 
    if os.path.isdir(full_directory_name): # Verify if the directory already exists
       return # Return if the directory already exists
@@ -955,7 +1123,7 @@ def save_to_json(data, filename=FULL_REPOSITORIES_LIST_JSON_FILEPATH):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Saving the data to {BackgroundColors.CYAN}{filename}{BackgroundColors.GREEN}...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Saving the data to {BackgroundColors.CYAN}{filename}{BackgroundColors.GREEN}...{Style.RESET_ALL}")
 
    create_directory(FULL_REPOSITORIES_DIRECTORY_PATH, RELATIVE_REPOSITORIES_DIRECTORY_PATH) # Create the output directory
 
@@ -1065,7 +1233,7 @@ def save_to_pdf(data, sorting_attribute, filename=FULL_REPOSITORIES_LIST_PDF_FIL
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Saving the data to {BackgroundColors.CYAN}{filename}{BackgroundColors.GREEN}...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Saving the data to {BackgroundColors.CYAN}{filename}{BackgroundColors.GREEN}...{Style.RESET_ALL}")
 
    pdf = FPDF() # Create a PDF object
    pdf.add_page() # Add a page to the PDF
@@ -1159,7 +1327,7 @@ def create_histograms(repositories):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Creating histograms for the repositories...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Creating histograms for the repositories...{Style.RESET_ALL}")
 
    for repository_field in HISTOGRAM_REPOSITORY_FIELDS: # Iterate over the repository fields
       create_repository_field_histogram(repositories, repository_field) # Create a histogram for the repository field
@@ -1253,7 +1421,7 @@ def create_csv_files(repositories):
    return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Creating CSV files and plots for the repositories...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Creating CSV files and plots for the repositories...{Style.RESET_ALL}")
 
    # Topics Occurrences CSV
    topics = sort_values_by_occurrences(collect_field_values_from_list(repositories, "topics")) # Collect and sort the topics from the repositories
@@ -1343,7 +1511,7 @@ def generate_code_churn_scatter_plot(repositories):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Generating a scatter plot for the code churn values...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Generating a scatter plot for the code churn values...{Style.RESET_ALL}")
 
    code_churns = sort_values_by_occurrences(collect_field_values_from_list(repositories, "avg_code_churn")) # Collect and sort the code churns from the repositories
    
@@ -1363,7 +1531,7 @@ def randomly_select_repositories(repositories, num_repos):
    :return: list
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Selecting {BackgroundColors.CYAN}{num_repos}{BackgroundColors.GREEN} repositories randomly...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Selecting {BackgroundColors.CYAN}{num_repos}{BackgroundColors.GREEN} repositories randomly...{Style.RESET_ALL}")
 
    return random.sample(repositories, num_repos) # Return a random sample of repositories
 
@@ -1392,7 +1560,7 @@ def output_time(output_string, time):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Outputting the time in the most appropriate time unit...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Outputting the time in the most appropriate time unit...{Style.RESET_ALL}")
 
    if float(time) < int(TIME_UNITS[0]): # If the time is less than 60 seconds
       time_unit = "seconds" # Set the time unit to seconds
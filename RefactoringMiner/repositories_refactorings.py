@@ -1,13 +1,18 @@
 import atexit # For playing a sound when the program finishes
+import importlib.util # For importing the shared log_messages.py file of the PyDriller directory by its path
 import os # OS module in Python provides functions for interacting with the operating system
 import platform # For getting the operating system name
 import subprocess # The subprocess module allows you to spawn new processes, connect to their input/output/error pipes, and obtain their return codes
 import time # This module provides various time-related functions
 from colorama import Style # For coloring the terminal
 from concurrent.futures import ThreadPoolExecutor # For managing threads
-from pydriller import Repository # PyDriller is a Python framework that helps developers in analyzing Git repositories. 
 from tqdm import tqdm # For creating progress bars
 
+LOG_MESSAGES_SPEC = importlib.util.spec_from_file_location("log_messages", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "PyDriller", "log_messages.py")) # The shared log_messages.py file of the PyDriller directory, imported by its path so the import path is not changed
+log_messages = importlib.util.module_from_spec(LOG_MESSAGES_SPEC) # The log_messages module
+LOG_MESSAGES_SPEC.loader.exec_module(log_messages) # Load the log_messages module
+create_verbose_output = log_messages.create_verbose_output # For the verbose_output function of this script
+
 # Macros:
 class BackgroundColors: # Colors for the terminal
    CYAN = "\033[96m" # Cyan
@@ -20,11 +25,16 @@ class BackgroundColors: # Colors for the terminal
     
 # Default values that can be changed:
 VERBOSE = False # Verbose mode. If set to True, it will output messages at the start/call of each function.
+LOG_FORMAT = "text" # The format of the messages of the verbose_output function. If set to "json", each message is a JSON line with its timestamp, module and level, so the logs can be parsed for timing
 DEFAULT_REPOSITORIES = {"zookeeper": "https://github.com/apache/zookeeper"} # The default repositories to be analyzed
    
 # Default paths:
 START_PATH = os.getcwd() # Get the current working directory
 
+# Global Set for the Synced Repositories:
+SYNCED_REPOSITORIES = set() # The set of repositories whose local clone was already cloned or updated in this execution
+FULL_CHECKOUT_REPOSITORIES = set() # The set of repositories whose local clone has every object and a full checkout in this execution
+
 # Constants:
 SOUND_COMMANDS = {"Darwin": "afplay", "Linux": "aplay", "Windows": "start"} 
 SOUND_FILE = "../.assets/Sounds/NotificationSound.wav" # The path to the sound file
@@ -44,21 +54,9 @@ RELATIVE_REPOSITORIES_DIRECTORY_PATH = "/repositories" # The relative path of th
 # Full paths (Start Path + Relative Paths):
 FULL_REFACTORING_MINER_PATH = START_PATH + RELATIVE_REFACTORING_MINER_PATH # The Full path to the RefactoringMiner Tool
 FULL_JSON_FILES_DIRECTORY_PATH = START_PATH + RELATIVE_JSON_FILES_DIRECTORY_PATH # The Full path of the directory that contains the generated JSON files
-FULL_REPOSITORIES_DIRECTORY_PATH = START_PATH + RELATIVE_REPOSITORIES_DIRECTORY_PATH # The Full path of the directory that contains the repositories
-
-def verbose_output(true_string="", false_string=""):
-   """
-   Outputs a message if the VERBOSE constant is set to True.
-
-   :param true_string: The string to be outputted if the VERBOSE constant is set to True.
-   :param false_string: The string to be outputted if the VERBOSE constant is set to False.
-   :return: None
-   """
+FULL_REPOSITORIES_DIRECTORY_PATH = os.path.join(os.path.dirname(START_PATH), "PyDriller") + RELATIVE_REPOSITORIES_DIRECTORY_PATH # The Full path of the directory that contains the repositories, which is shared with the PyDriller scripts
 
-   if VERBOSE and true_string != "": # If the VERBOSE constant is set to True and the true_string is set
-      print(true_string) # Output the true statement string
-   elif false_string != "":
-      print(false_string) # Output the false statement string
+verbose_output = create_verbose_output(globals()) # The verbose_output function of this script, bound to its VERBOSE and LOG_FORMAT constants
 
 def path_contains_whitespaces():
    """
@@ -67,7 +65,7 @@ def path_contains_whitespaces():
    :return: True if the PATH constant contains whitespaces, False otherwise
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Verifying if the {BackgroundColors.CYAN}PATH{BackgroundColors.GREEN} constant contains whitespaces...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Verifying if the {BackgroundColors.CYAN}PATH{BackgroundColors.GREEN} constant contains whitespaces...{Style.RESET_ALL}")
 
    # Verify if the PATH constant contains whitespaces
    if " " in START_PATH: # If the PATH constant contains whitespaces
@@ -81,7 +79,7 @@ def verify_refactorings():
    :return: Returns a new dictionary with the repositories that weren't processed yet
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Verifying if the {BackgroundColors.CYAN}Refactorings{BackgroundColors.GREEN} for the {BackgroundColors.CYAN}DEFAULT_REFACTORINGS{BackgroundColors.GREEN} were already generated...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Verifying if the {BackgroundColors.CYAN}Refactorings{BackgroundColors.GREEN} for the {BackgroundColors.CYAN}DEFAULT_REFACTORINGS{BackgroundColors.GREEN} were already generated...{Style.RESET_ALL}")
    
    repositories = {} # The repositories dictionary
    # Loop through the default repositories
@@ -103,7 +101,7 @@ def create_directory(full_directory_name, relative_directory_name):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Creating the {BackgroundColors.CYAN}{relative_directory_name}{BackgroundColors.GREEN} directory...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Creating the {BackgroundColors.CYAN}{relative_directory_name}{BackgroundColors.GREEN} directory...{Style.RESET_ALL}")
    
    if os.path.isdir(full_directory_name): # Verify if the directory already exists
       return # Return if the directory already exists
@@ -121,7 +119,7 @@ def output_time(output_string, time):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Outputting the time in the most appropriate time unit...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Outputting the time in the most appropriate time unit...{Style.RESET_ALL}")
 
    if float(time) < int(TIME_UNITS[0]): # If the time is less than 60 seconds
       time_unit = "seconds" # Set the time unit to seconds
@@ -147,14 +145,11 @@ def update_repository(repository_directory_path):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Updating the {BackgroundColors.CYAN}{repository_directory_path.split('/')[-1]}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
-   
-   os.chdir(repository_directory_path) # Change the current working directory to the repository directory
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Updating the {BackgroundColors.CYAN}{repository_directory_path.split('/')[-1]}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
    
    # Create a thread to update the repository located in RELATIVE_REPOSITORY_DIRECTORY + '/' + repository_name
-   update_thread = subprocess.Popen(["git", "pull"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+   update_thread = subprocess.Popen(["git", "pull"], cwd=repository_directory_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
    update_thread.wait() # Wait for the thread to finish
-   os.chdir(START_PATH) # Change the current working directory to the default one
 
 def clone_repository(repository_directory_path, repository_url):
    """
@@ -165,7 +160,7 @@ def clone_repository(repository_directory_path, repository_url):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Cloning the {BackgroundColors.CYAN}{repository_directory_path.split('/')[-1]}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Cloning the {BackgroundColors.CYAN}{repository_directory_path.split('/')[-1]}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
    
    # Create a thread to clone the repository
    thread = subprocess.Popen(["git", "clone", repository_url, repository_directory_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
@@ -180,7 +175,10 @@ def setup_repository(repository_name, repository_url):
    :param repository_url: URL of the repository to be analyzed
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Setting up the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+   if repository_name in SYNCED_REPOSITORIES: # If the repository was already synced in this execution
+      return # Return as the local clone is up to date
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Setting up the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
    
    repository_directory_path = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the repository directory
    
@@ -190,6 +188,56 @@ def setup_repository(repository_name, repository_url):
    else:
       clone_repository(repository_directory_path, repository_url) # Clone the repository
 
+   SYNCED_REPOSITORIES.add(repository_name) # Add the repository to the set of synced repositories
+
+def get_repository_commits_count(repository_name, repository_url):
+   """
+   Gets the number of commits of the repository from its local clone, using "git rev-list --count".
+
+   :param repository_name: Name of the repository
+   :param repository_url: URL of the repository
+   :return: The number of commits of the repository
+   """
+
+   setup_repository(repository_name, repository_url) # Clone or update the repository, if it was not synced yet
+
+   result = subprocess.run(["git", "-C", f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}", "rev-list", "--count", "HEAD"], capture_output=True, text=True) # Count the commits of the local clone
+   return int(result.stdout.strip()) if result.returncode == 0 else 0 # Return the number of commits, or 0 if they could not be counted
+
+def ensure_full_checkout(repository_name):
+   """
+   Ensures the local clone of the repository has every object and a full checkout, as it is shared with the PyDriller scripts, which may have created it as a sparse clone (SPARSE_CLONES), while RefactoringMiner needs the whole tree.
+
+   :param repository_name: Name of the repository
+   :return: True if the local clone has every object and a full checkout, False otherwise
+   """
+
+   if repository_name in FULL_CHECKOUT_REPOSITORIES: # If the clone was already verified in this execution
+      return True # Return True as the clone has every object and a full checkout
+
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Ensuring the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository has a full checkout...{Style.RESET_ALL}")
+
+   repository_directory_path = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the repository directory
+
+   partial_clone_filter = subprocess.run(["git", "-C", repository_directory_path, "config", "--get", "remote.origin.partialclonefilter"], capture_output=True, text=True).stdout.strip() # The filter of the partial clone, if it is one
+   if partial_clone_filter: # If it is a partial clone, which RefactoringMiner can't read, as it doesn't fetch the missing objects
+      print(f"{BackgroundColors.GREEN}Fetching the missing objects of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} partial clone...{Style.RESET_ALL}")
+      subprocess.run(["git", "-C", repository_directory_path, "config", "--unset", "remote.origin.partialclonefilter"], capture_output=True) # Stop filtering the next fetches
+      result = subprocess.run(["git", "-C", repository_directory_path, "fetch", "--refetch", "origin"], capture_output=True, text=True) # Fetch every object again, in a single pack
+      if result.returncode != 0: # If the objects could not be fetched, such as with a git older than 2.36
+         subprocess.run(["git", "-C", repository_directory_path, "config", "remote.origin.partialclonefilter", partial_clone_filter], capture_output=True) # Restore the filter, as the clone is still a partial one
+         print(f"{BackgroundColors.RED}The {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} local clone is a partial clone whose missing objects could not be fetched, so RefactoringMiner can't be run on it. Delete it from {BackgroundColors.CYAN}{repository_directory_path}{BackgroundColors.RED} to clone it again: {BackgroundColors.GREEN}{result.stderr.strip()}{Style.RESET_ALL}")
+         return False # Return False as the clone doesn't have every object
+
+   subprocess.run(["git", "-C", repository_directory_path, "sparse-checkout", "disable"], capture_output=True) # Check out the whole tree, which does nothing if it is not a sparse checkout
+   sparse_checkout = subprocess.run(["git", "-C", repository_directory_path, "config", "--get", "core.sparseCheckout"], capture_output=True, text=True).stdout.strip() # Whether the clone still has a sparse checkout
+   if sparse_checkout == "true": # If the sparse checkout could not be disabled
+      print(f"{BackgroundColors.RED}The sparse checkout of the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.RED} local clone could not be disabled, so RefactoringMiner can't be run on it. Run {BackgroundColors.CYAN}git sparse-checkout disable{BackgroundColors.RED} in {BackgroundColors.CYAN}{repository_directory_path}{BackgroundColors.RED}.{Style.RESET_ALL}")
+      return False # Return False as the clone doesn't have a full checkout
+
+   FULL_CHECKOUT_REPOSITORIES.add(repository_name) # Add the repository to the set of repositories with every object and a full checkout
+   return True # Return True as the clone has every object and a full checkout
+
 def generate_commit_refactorings(repository_name):
    """
    Generate the refactoring instances for the repository.
@@ -198,11 +246,14 @@ def generate_commit_refactorings(repository_name):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Generating the {BackgroundColors.CYAN}refactoring instances{BackgroundColors.GREEN} for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Generating the {BackgroundColors.CYAN}refactoring instances{BackgroundColors.GREEN} for the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
    
    repository_directory_path = f"{FULL_REPOSITORIES_DIRECTORY_PATH}/{repository_name}" # The path to the repository directory
    json_output_filepath = f"{FULL_JSON_FILES_DIRECTORY_PATH}{RELATIVE_REPOSITORIES_REFACTORINGS_DIRECTORY_PATH}/{repository_name}.{JSON_FILE_FORMAT}" # The path to the json directory
 
+   if not ensure_full_checkout(repository_name): # If the local clone is still a sparse or partial clone
+      return # Return as RefactoringMiner would miss the refactorings of the files that are not checked out
+
    # Run the Refactoring Miner Command: REFACTORING_MINER_FULL_PATH -a REPOSITORY_DIRECTORY_PATH -json JSON_FILES_DIRECTORY_PATH
    thread = subprocess.Popen([FULL_REFACTORING_MINER_PATH, "-a", repository_directory_path, "-json", json_output_filepath], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
    stdout, stderr = thread.communicate() # Get the output of the thread
@@ -216,7 +267,7 @@ def process_repository(repository_name, repository_url):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Processing the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Processing the {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN} repository...{Style.RESET_ALL}")
    
    start_time = time.time() # Get the start time
 
@@ -240,7 +291,7 @@ def process_repositories_concurrently(repositories):
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Processing the repositories {BackgroundColors.CYAN}{list(repositories.keys())}{BackgroundColors.GREEN} concurrently...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Processing the repositories {BackgroundColors.CYAN}{list(repositories.keys())}{BackgroundColors.GREEN} concurrently...{Style.RESET_ALL}")
 
    # Using ThreadPoolExecutor to manage threads and a tqdm progress bar
    with ThreadPoolExecutor(max_workers=len(repositories)) as executor, tqdm(total=len(repositories), desc="Processing Repositories") as progress:
@@ -249,7 +300,7 @@ def process_repositories_concurrently(repositories):
       # Loop through the repositories
       for repository_name, repository_url in repositories.items():
          estimated_time_string = f"{BackgroundColors.GREEN}Estimated time for {BackgroundColors.CYAN}generating the refactoring{BackgroundColors.GREEN} for {BackgroundColors.CYAN}{repository_name}{BackgroundColors.GREEN}: "
-         commits_number = sum(1 for _ in Repository(repository_url).traverse_commits()) # Get the number of commits
+         commits_number = get_repository_commits_count(repository_name, repository_url) # Get the number of commits from the local clone
          output_time(estimated_time_string, commits_number / 2) # Output the estimated time for running all of the iterations for the repository
 
          # Schedule the execution of the process_repository function
@@ -268,7 +319,7 @@ def play_sound():
    :return: None
    """
 
-   verbose_output(true_string=f"{BackgroundColors.GREEN}Playing a {BackgroundColors.CYAN}sound{BackgroundColors.GREEN} when the program finishes...{Style.RESET_ALL}")
+   verbose_output(true_string=lambda: f"{BackgroundColors.GREEN}Playing a {BackgroundColors.CYAN}sound{BackgroundColors.GREEN} when the program finishes...{Style.RESET_ALL}")
 
    if os.path.exists(SOUND_FILE):
       if platform.system() in SOUND_COMMANDS: # if the platform.system() is in the SOUND_COMMANDS dictionary